@@ -14,15 +14,32 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from . import board
-from . import core
-from . import debug
-from . import flash
-from . import gdbserver
-from . import target
-from . import utility
-from . import coresight
-from . import trace
+import importlib
+from typing import Any
 
 from ._version import version as __version__
 
+## @brief Subpackages available as attributes of the pyocd package.
+#
+# These are imported on first access rather than when pyocd is imported, so that importing a single
+# module such as pyocd.__main__ doesn't import the entire package.
+_SUBPACKAGES = (
+    'board',
+    'core',
+    'debug',
+    'flash',
+    'gdbserver',
+    'target',
+    'utility',
+    'coresight',
+    'trace',
+    )
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(_SUBPACKAGES))
+
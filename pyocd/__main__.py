@@ -27,23 +27,10 @@ import fnmatch
 from typing import (Any, Optional, Sequence)
 
 from . import __version__
-from .core.session import Session
 from .core import exceptions
-from .probe.pydapaccess import DAPAccess
-from .core import options
+from .utility import daemon
 from .utility.color_log import build_color_logger
-from .subcommands.base import SubcommandBase
-from .subcommands.commander_cmd import CommanderSubcommand
-from .subcommands.erase_cmd import EraseSubcommand
-from .subcommands.gdbserver_cmd import GdbserverSubcommand
-from .subcommands.json_cmd import JsonSubcommand
-from .subcommands.list_cmd import ListSubcommand
-from .subcommands.load_cmd import LoadSubcommand
-from .subcommands.pack_cmd import PackSubcommand
-from .subcommands.reset_cmd import ResetSubcommand
-from .subcommands.server_cmd import ServerSubcommand
-from .subcommands.rtt_cmd import RTTSubcommand
-from .subcommands.run_cmd import RunSubcommand
+from .subcommands.base import (LazySubcommand, SubcommandBase)
 
 ## @brief Logger for this module.
 LOG = logging.getLogger("pyocd.tool")
@@ -54,19 +41,36 @@ class PyOCDTool(SubcommandBase):
 
     HELP = "PyOCD debug tools for Arm Cortex devices"
 
-    ## List of subcommand classes.
+    ## List of subcommands.
+    #
+    # Subcommand modules are imported only when the subcommand is invoked, to keep startup fast.
     SUBCOMMANDS = [
-        CommanderSubcommand,
-        EraseSubcommand,
-        LoadSubcommand,
-        GdbserverSubcommand,
-        JsonSubcommand,
-        ListSubcommand,
-        PackSubcommand,
-        ResetSubcommand,
-        ServerSubcommand,
-        RTTSubcommand,
-        RunSubcommand,
+        LazySubcommand('commander_cmd', 'CommanderSubcommand', ['commander', 'cmd'],
+            "Interactive command console."),
+        LazySubcommand('daemon_cmd', 'DaemonSubcommand', ['daemon'],
+            "Run a daemon that keeps debug sessions open between pyocd invocations."),
+        LazySubcommand('erase_cmd', 'EraseSubcommand', ['erase'],
+            "Erase entire device flash or specified sectors."),
+        LazySubcommand('load_cmd', 'LoadSubcommand', ['load', 'flash'],
+            "Load one or more images into target device memory."),
+        LazySubcommand('gdbserver_cmd', 'GdbserverSubcommand', ['gdbserver', 'gdb'],
+            "Run the gdb remote server(s)."),
+        LazySubcommand('json_cmd', 'JsonSubcommand', ['json'],
+            "Output information as JSON."),
+        LazySubcommand('list_cmd', 'ListSubcommand', ['list'],
+            "List information about probes, targets, or boards."),
+        LazySubcommand('pack_cmd', 'PackSubcommand', ['pack'],
+            "Manage CMSIS-Packs for target support."),
+        LazySubcommand('reset_cmd', 'ResetSubcommand', ['reset'],
+            "Reset a target device."),
+        LazySubcommand('server_cmd', 'ServerSubcommand', ['server'],
+            "Run debug probe server."),
+        LazySubcommand('rtt_cmd', 'RTTSubcommand', ['rtt'],
+            "SEGGER RTT Viewer/Logger."),
+        LazySubcommand('run_cmd', 'RunSubcommand', ['run'],
+            "Load and run the target."),
+        LazySubcommand('swo_cmd', 'SWOSubcommand', ['swo'],
+            "Process captured SWO trace data."),
         ]
 
     ## @brief Logging level names.
@@ -83,8 +87,26 @@ class PyOCDTool(SubcommandBase):
         super().__init__(argparse.Namespace())
         self._parser = self.build_parser()
 
-    def build_parser(self) -> argparse.ArgumentParser:
-        """@brief Construct the command line parser with all subcommands and options."""
+    @classmethod
+    def _find_selected_subcommand(cls, args: Optional[Sequence[str]]) -> Optional[str]:
+        """@brief Return the subcommand name present in a command line, if any.
+
+        The top level parser has no options that take a value, so the first positional argument is
+        the subcommand.
+        """
+        if args is None:
+            args = sys.argv[1:]
+        for arg in args:
+            if not arg.startswith('-'):
+                return arg
+        return None
+
+    def build_parser(self, args: Optional[Sequence[str]] = None) -> argparse.ArgumentParser:
+        """@brief Construct the command line parser with all subcommands and options.
+
+        Only the subcommand selected by _args_ (or sys.argv if _args_ is None) is imported and has its
+        arguments added.
+        """
         # Create top level argument parser.
         parser = argparse.ArgumentParser(description=self.HELP)
         parser.set_defaults(command_class=self, quiet=0, verbose=0, log_level=[])
@@ -93,7 +115,7 @@ class PyOCDTool(SubcommandBase):
         parser.add_argument('--help-options', action='store_true',
             help="Display available session options.")
 
-        self.add_subcommands(parser)
+        self.add_subcommands(parser, self._find_selected_subcommand(args))
 
         return parser
 
@@ -150,12 +172,22 @@ class PyOCDTool(SubcommandBase):
     def run(self, args: Optional[Sequence[str]] = None) -> int:
         """@brief Main entry point for command line processing."""
         try:
+            if args is not None:
+                self._parser = self.build_parser(args)
             self._args = self._parser.parse_args(args)
 
+            # Forward the command to a running daemon if requested.
+            daemon_socket = os.environ.get(daemon.SOCKET_ENV_VAR)
+            if daemon_socket and self._args.command_class.DAEMON_CAPABLE:
+                status = daemon.forward_command(daemon_socket, sys.argv[1:] if args is None else args)
+                if status is not None:
+                    return status
+
             self._setup_logging()
 
             # Pass any options to DAPAccess.
-            if hasattr(self._args, 'daparg'):
+            if getattr(self._args, 'daparg', None):
+                from .probe.pydapaccess import DAPAccess
                 DAPAccess.set_args(self._args.daparg)
 
             # Create an instance of the subcommand and invoke it.
@@ -167,14 +199,23 @@ class PyOCDTool(SubcommandBase):
         except KeyboardInterrupt:
             return 0
         except (exceptions.Error, ValueError, IndexError) as e:
-            LOG.critical(e, exc_info=Session.get_current().log_tracebacks)
+            LOG.critical(e, exc_info=self._log_tracebacks())
             return 1
         except Exception as e:
-            LOG.critical("Error: %s", e, exc_info=Session.get_current().log_tracebacks)
+            LOG.critical("Error: %s", e, exc_info=self._log_tracebacks())
             return 1
 
+    def _log_tracebacks(self) -> bool:
+        """@brief Whether to log tracebacks for errors, per the current session's options."""
+        from .core.session import Session
+        return Session.get_current().log_tracebacks
+
     def show_options_help(self) -> None:
         """@brief Display help for session options."""
+        from .core import options
+        from .core.plugin import load_all_plugins
+
+        load_all_plugins()
         for info_name in sorted(options.OPTIONS_INFO.keys()):
             info = options.OPTIONS_INFO[info_name]
             if isinstance(info.type, tuple):
@@ -19,8 +19,9 @@ from intervaltree import (Interval, IntervalTree)
 import logging
 
 from ..utility import conversion
+from ..utility.mask import (align_down, align_up)
 from .metrics import CacheMetrics
-from ..core.exceptions import TransferFaultError
+from ..core.exceptions import (TransferError, TransferFaultError)
 
 LOG = logging.getLogger(__name__)
 
@@ -32,6 +33,9 @@ class MemoryCache(object):
 
     The cache is invalidated whenever the target has run since the last cache operation (based on run
     tokens). If the target is currently running, all accesses cause the cache to be invalidated.
+    Checking whether the core is running costs a target access, so once set_halted() has been called
+    the core is assumed to stay halted until its run token changes or invalidate() is called. The
+    owner must call invalidate() when the core may have been run or reset by other means.
 
     The target's memory map is referenced. All memory accesses must be fully contained within a single
     memory region, or a TransferFaultError will be raised. However, if an access is outside of all regions,
@@ -43,6 +47,7 @@ class MemoryCache(object):
         self._context = context
         self._core = core
         self._run_token = -1
+        self._halted_token = None
         self._reset_cache()
 
     def _reset_cache(self):
@@ -51,6 +56,8 @@ class MemoryCache(object):
 
     def _check_cache(self):
         """@brief Invalidates the cache if appropriate."""
+        if self._halted_token == self._core.run_token == self._run_token:
+            return
         if self._core.is_running():
             LOG.debug("core is running; invalidating cache")
             self._reset_cache()
@@ -303,6 +310,59 @@ class MemoryCache(object):
     def write_memory_block32(self, addr, data):
         return self.write_memory_block8(addr, conversion.u32le_list_to_byte_list(data))
 
+    def set_halted(self):
+        """@brief Record that the core is halted, so it is not checked again until it next runs.
+
+        The caller must have just verified that the core is halted.
+        """
+        if self._run_token != self._core.run_token:
+            self._dump_metrics()
+            self._reset_cache()
+            self._run_token = self._core.run_token
+        self._halted_token = self._run_token
+
+    def prefetch(self, ranges):
+        """@brief Read memory ranges into the cache ahead of their use.
+
+        Reads of all ranges are started before any is completed, so they can be sent to the debug
+        probe together. Each range is clipped to the memory region containing its start address and
+        expanded to whole words. Ranges that are not cacheable, already partly cached, or whose read
+        fails are skipped.
+
+        Nothing is read unless set_halted() has been called since the core last ran.
+
+        @param self
+        @param ranges Iterable of (address, size) tuples.
+        """
+        # Only prefetch while the core is known to be halted.
+        if not (self._halted_token == self._core.run_token == self._run_token):
+            return
+
+        reads = []
+        for addr, size in ranges:
+            region = self._core.memory_map.get_region_for_address(addr)
+            if region is None or not region.is_cacheable:
+                continue
+            start = align_down(max(addr, region.start), 4)
+            end = align_up(min(addr + size, region.end + 1), 4)
+            if (start < region.start or end > region.end + 1 or end <= start
+                    or self._cache.overlaps(start, end)
+                    or any(start < e and s < end for s, e, _ in reads)):
+                continue
+            try:
+                reads.append((start, end, self._context.read_memory_block32_deferred(start, (end - start) // 4)))
+            except TransferError as e:
+                LOG.debug("prefetch of [%x:%x] failed: %s", start, end, e)
+
+        for start, end, read_cb in reads:
+            try:
+                data = conversion.u32le_list_to_byte_list(read_cb())
+            except TransferError as e:
+                LOG.debug("prefetch of [%x:%x] failed: %s", start, end, e)
+                continue
+            self._cache.addi(start, end, bytearray(data))
+
     def invalidate(self):
+        self._halted_token = None
         self._reset_cache()
 
@@ -33,6 +33,10 @@ class RegisterCache(object):
     invalidate all five.
 
     Same logic applies for XPSR submasks.
+
+    Checking whether the core is running costs a target access, so once set_halted() has been called
+    the core is assumed to stay halted until its run token changes or invalidate() is called. The
+    owner must call invalidate() when the core may have been run or reset by other means.
     """
 
     CFBP_INDEX_LIST = [
@@ -61,6 +65,7 @@ class RegisterCache(object):
         self._context = context
         self._core = core
         self._run_token = -1
+        self._halted_token = None
         self._reset_cache()
 
     def _reset_cache(self):
@@ -75,6 +80,8 @@ class RegisterCache(object):
 
     def _check_cache(self):
         """@brief Invalidates the cache if needed and returns whether the core is running."""
+        if self._halted_token == self._core.run_token == self._run_token:
+            return False
         if self._core.is_running():
             LOG.debug("core is running; invalidating cache")
             self._reset_cache()
@@ -210,5 +217,17 @@ class RegisterCache(object):
             self._reset_cache()
             raise
 
+    def set_halted(self):
+        """@brief Record that the core is halted, so it is not checked again until it next runs.
+
+        The caller must have just verified that the core is halted.
+        """
+        if self._run_token != self._core.run_token:
+            self._dump_metrics()
+            self._reset_cache()
+            self._run_token = self._core.run_token
+        self._halted_token = self._run_token
+
     def invalidate(self):
+        self._halted_token = None
         self._reset_cache()
@@ -19,6 +19,7 @@
 
 from __future__ import annotations
 
+from contextlib import closing
 import logging
 import os
 import time
@@ -51,6 +52,10 @@ from ..utility.mask import (
     bfx,
     bfi,
     )
+from ..utility.memory_stream import (
+    find_first_difference,
+    read_memory_chunks,
+    )
 from .base import CommandBase
 
 if TYPE_CHECKING:
@@ -632,14 +637,16 @@ class SavememCommand(CommandBase):
             except exceptions.FlashFailure:
                 region.flash.init(region.flash.Operation.ERASE)
 
-        data = bytearray(self.context.selected_ap.read_memory_block8(self.addr, self.count))
-
-        if flash_init_required:
-            region.flash.cleanup()
+        # Each chunk is written to the file while the next one is being read.
+        try:
+            with open(self.filename, 'wb') as f:
+                for _, data in read_memory_chunks(self.context.selected_ap, self.addr, self.count):
+                    f.write(data)
+        finally:
+            if flash_init_required:
+                region.flash.cleanup()
 
-        with open(self.filename, 'wb') as f:
-            f.write(data)
-            self.context.writei("Saved %d bytes to %s", self.count, self.filename)
+        self.context.writei("Saved %d bytes to %s", self.count, self.filename)
 
 class LoadmemCommand(CommandBase):
     INFO = {
@@ -686,6 +693,30 @@ class LoadCommand(CommandBase):
         programmer = FileProgrammer(self.context.session, progress=print_progress())
         programmer.program(self.filename, base_address=self.addr)
 
+class VerifyCommand(CommandBase):
+    INFO = {
+            'names': ['verify'],
+            'group': 'standard',
+            'category': 'memory',
+            'nargs': [1, 2],
+            'usage': "FILENAME [ADDR]",
+            'help': "Verify memory contents against a binary, hex, or elf file with optional base address.",
+            'extra_help': "Flash is checked by comparing CRCs computed on the target if the flash "
+                          "algorithm supports it, and only mismatched data is read back.",
+            }
+
+    def parse(self, args):
+        self.filename = args[0]
+        if len(args) > 1:
+            self.addr = self._convert_value(args[1])
+        else:
+            self.addr = None
+
+    def execute(self):
+        programmer = FileProgrammer(self.context.session)
+        programmer.verify(self.filename, base_address=self.addr)
+        self.context.writei("Verified %s", self.filename)
+
 class CompareCommand(CommandBase):
     INFO = {
             'names': ['compare', 'cmp'],
@@ -715,55 +746,40 @@ class CompareCommand(CommandBase):
             except exceptions.FlashFailure:
                 region.flash.init(region.flash.Operation.ERASE)
 
-        with open(self.filename, 'rb') as f:
-            if self.length is None:
-                file_data = bytearray(f.read())
-            else:
-                file_data = bytearray(f.read(self.length))
-
+        file_size = os.path.getsize(self.filename)
         if self.length is None:
-            length = len(file_data)
-        elif len(file_data) < self.length:
-            self.context.writei("File is %d bytes long; reducing comparison length to match.", len(file_data))
-            length = len(file_data)
+            length = file_size
+        elif file_size < self.length:
+            self.context.writei("File is %d bytes long; reducing comparison length to match.", file_size)
+            length = file_size
         else:
             length = self.length
 
-        # Divide into 32 kB chunks.
-        CHUNK_SIZE = 32 * 1024
-        chunk_count = (length + CHUNK_SIZE - 1) // CHUNK_SIZE
-
-        addr = self.addr
-        end_addr = addr + length
-        offset = 0
         mismatch = False
 
-        for chunk in range(chunk_count):
-            # Get this chunk's size.
-            chunk_size = min(end_addr - addr, CHUNK_SIZE)
-            self.context.writei("Comparing %d bytes @ 0x%08x", chunk_size, addr)
-
-            data = bytearray(self.context.selected_ap.read_memory_block8(addr, chunk_size))
-
-            for i in range(chunk_size):
-                if data[i] != file_data[offset+i]:
-                    mismatch = True
-                    self.context.writei("Mismatched byte at 0x%08x (offset 0x%x): 0x%02x (memory) != 0x%02x (file)",
-                        addr + i, offset + i, data[i], file_data[offset+i])
-                    break
-
-            if mismatch:
-                break
-
-            offset += chunk_size
-            addr += chunk_size
+        # The file is read and compared one chunk at a time, while the next chunk of memory is
+        # being read.
+        try:
+            with open(self.filename, 'rb') as f, \
+                    closing(read_memory_chunks(self.context.selected_ap, self.addr, length)) as chunks:
+                for addr, data in chunks:
+                    self.context.writei("Comparing %d bytes @ 0x%08x", len(data), addr)
+
+                    file_data = f.read(len(data))
+                    i = find_first_difference(data, file_data)
+                    if i != -1:
+                        mismatch = True
+                        offset = addr - self.addr + i
+                        self.context.writei("Mismatched byte at 0x%08x (offset 0x%x): 0x%02x (memory) != 0x%02x (file)",
+                            addr + i, offset, data[i], file_data[i])
+                        break
+        finally:
+            if flash_init_required:
+                region.flash.cleanup()
 
         if not mismatch:
             self.context.writei("All %d bytes match.", length)
 
-        if flash_init_required:
-            region.flash.cleanup()
-
 class FillCommand(CommandBase):
     INFO = {
             'names': ['fill'],
@@ -850,8 +866,8 @@ class FindCommand(CommandBase):
             'help': "Search for a value in memory within the given address range.",
             'extra_help': "A pattern of any number of bytes can be searched for. Each BYTE "
                            "parameter must be an 8-bit value. If the -n argument is passed, "
-                           "the search is negated and looks for the first set of bytes that "
-                           "does not match the provided values.",
+                           "the search is negated and looks for the first byte that does not "
+                           "match the pattern repeated from ADDR.",
             }
 
     def parse(self, args):
@@ -870,32 +886,40 @@ class FindCommand(CommandBase):
         self.pattern_str = " ".join("%02x" % p for p in self.pattern)
 
     def execute(self):
-        # Divide into 32 kB chunks.
-        CHUNK_SIZE = 32 * 1024
-        chunk_count = (self.length + CHUNK_SIZE - 1) // CHUNK_SIZE
-
-        addr = self.addr
-        end_addr = addr + self.length
-        self.context.writei("Searching 0x%08x-0x%08x for pattern [%s]", addr, end_addr - 1, self.pattern_str)
-
-        match = False
-        for chunk in range(chunk_count):
-            # Get this chunk's size.
-            chunk_size = min(end_addr - addr, CHUNK_SIZE)
-            self.context.writei("Read %d bytes @ 0x%08x", chunk_size, addr)
-
-            data = bytearray(self.context.selected_ap.read_memory_block8(addr, chunk_size))
-
-            offset = data.find(self.pattern)
-            if (offset != -1) ^ self.negate:
-                match = True
-                self.context.writei("Found pattern at address 0x%08x", addr + offset)
-                break
-
-            addr += chunk_size - len(self.pattern)
-
-        if not match:
+        end_addr = self.addr + self.length
+        self.context.writei("Searching 0x%08x-0x%08x for pattern [%s]", self.addr, end_addr - 1, self.pattern_str)
+
+        pattern = bytes(self.pattern)
+        match_addr = None
+        # The end of the previous chunk, in case a match spans chunks.
+        tail = b""
+
+        # Each chunk is searched while the next chunk is being read.
+        with closing(read_memory_chunks(self.context.selected_ap, self.addr, self.length)) as chunks:
+            for addr, data in chunks:
+                self.context.writei("Read %d bytes @ 0x%08x", len(data), addr)
+
+                if self.negate:
+                    phase = (addr - self.addr) % len(pattern)
+                    expected = (pattern * (len(data) // len(pattern) + 2))[phase:phase + len(data)]
+                    offset = find_first_difference(data, expected)
+                    if offset != -1:
+                        match_addr = addr + offset
+                        break
+                else:
+                    data = tail + data
+                    offset = data.find(pattern)
+                    if offset != -1:
+                        match_addr = addr - len(tail) + offset
+                        break
+                    tail = data[max(0, len(data) - len(pattern) + 1):]
+
+        if match_addr is None:
             self.context.writei("Failed to find pattern in range 0x%08x-0x%08x", self.addr, end_addr - 1)
+        elif self.negate:
+            self.context.writei("Found mismatch with pattern at address 0x%08x", match_addr)
+        else:
+            self.context.writei("Found pattern at address 0x%08x", match_addr)
 
 class EraseCommand(CommandBase):
     INFO = {
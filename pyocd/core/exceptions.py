@@ -158,6 +158,10 @@ class FlashProgramFailure(FlashFailure):
     """@brief An attempt to program flash failed. """
     pass
 
+class FlashVerifyFailure(FlashFailure):
+    """@brief Flash contents do not match the data that was programmed. """
+    pass
+
 class CommandError(Error):
     """@brief Raised when a command encounters an error."""
     pass
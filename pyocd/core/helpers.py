@@ -19,10 +19,11 @@
 from time import sleep
 import colorama
 import prettytable
-from typing import (Any, List, Mapping, Optional, Sequence, TYPE_CHECKING)
+from typing import (Any, List, Mapping, Optional, Sequence, TYPE_CHECKING, cast)
 
 from . import exceptions
 from .session import Session
+from .session_pool import SessionPool
 from ..probe.aggregator import DebugProbeAggregator
 
 if TYPE_CHECKING:
@@ -258,8 +259,22 @@ class ConnectHelper:
         @param options Dictionary of session options.
         @param kwargs Session options passed as keyword arguments.
 
+        If a @ref pyocd.core.session_pool.SessionPool "SessionPool" is active, as is the case when
+        running commands in the pyocd daemon, the session is taken from the pool instead.
+
         @return Either None or a Session instance.
         """
+        # Use a pooled session if available.
+        pool = SessionPool.get_active()
+        if pool is not None:
+            return cast(Optional[Session], pool.acquire(
+                        blocking=blocking,
+                        return_first=return_first,
+                        unique_id=unique_id,
+                        auto_open=auto_open,
+                        options=options,
+                        **kwargs))
+
         # Choose a probe.
         probe = ConnectHelper.choose_probe(
                     blocking=blocking,
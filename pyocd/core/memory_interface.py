@@ -59,6 +59,37 @@ class MemoryInterface:
         """@brief Read an aligned block of 32-bit words."""
         raise NotImplementedError()
 
+    def read_memory_block32_deferred(self, addr: int, size: int) -> Callable[[], Sequence[int]]:
+        """@brief Start reading an aligned block of 32-bit words.
+
+        Memory interfaces that can queue transfers override this method so that several block reads
+        can be sent to the debug probe together. The default implementation reads immediately.
+
+        @return A callable that returns the list of words read. The callable must be invoked once to
+            complete the read, and may raise any exception that read_memory_block32() raises.
+        """
+        result = self.read_memory_block32(addr, size)
+        return lambda: result
+
+    def poll_until(self, addr: int, mask: int, value: int, retries: int) -> bool:
+        """@brief Read an aligned 32-bit word until its value under a mask matches.
+
+        Memory interfaces that can have the debug probe repeat the read override this method, so
+        that waiting for a status bit doesn't cost a round trip per read. The default implementation
+        reads from the host.
+
+        @param self
+        @param addr Word aligned address.
+        @param mask Mask applied to the word before comparing.
+        @param value Expected value of the masked word.
+        @param retries Number of times the read is repeated after the first read does not match.
+        @return Boolean indicating whether the word matched.
+        """
+        for _ in range(retries + 1):
+            if (self.read32(addr) & mask) == value:
+                return True
+        return False
+
     def write64(self, addr: int, value: int) -> None:
         """@brief Shorthand to write a 64-bit word."""
         self.write_memory(addr, value, 64)
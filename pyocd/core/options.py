@@ -39,6 +39,12 @@ BUILTIN_OPTIONS = [
         "Enable the memory read cache. Default is enabled."),
     OptionInfo('cache.enable_register', bool, True,
         "Enable the core register cache. Default is enabled."),
+    OptionInfo('cache.topology', bool, False,
+        "Cache the CoreSight ROM tables and components found during discovery, and restore them on later "
+        "connects to the same target instead of reading every component's ID registers."),
+    OptionInfo('cache.topology.path', str, None,
+        "Path of the file used to store the CoreSight topology cache. Default is a per-user file in the "
+        "temporary directory."),
     OptionInfo('cache.read_code_from_elf', bool, True,
         "Controls whether reads of code sections will be taken from an attached ELF file instead of the "
         "target memory."),
@@ -72,6 +78,12 @@ BUILTIN_OPTIONS = [
     OptionInfo('fast_program', bool, False,
         "Setting this option to True will use CRC checks of existing flash sector contents to "
         "determine whether pages need to be programmed."),
+    OptionInfo('flash.pack_analyzer', bool, False,
+        "Enable the CRC analyzer for flash algos loaded from CMSIS-Packs and FLM files. The analyzer reads "
+        "flash directly, so only enable this if the flash is memory mapped."),
+    OptionInfo('flash.resident_loop', bool, False,
+        "Program and erase flash with a loop running on the target that consumes queued operations, instead "
+        "of halting and resuming the core for every page. Only used if the flash algo has RAM for the loop."),
     OptionInfo('flash.timeout.init', float, 5.0,
         "Flash algorithm init and uninit timeout in seconds."),
     OptionInfo('flash.timeout.analyzer', float, 30.0,
@@ -95,6 +107,10 @@ BUILTIN_OPTIONS = [
     OptionInfo('load.post_reset', str, None,
         "Specify the type of reset to perform after programming. The value must be one of"
         " 'off', 'default', 'hardware', 'system', 'core', 'n_srst', 'sysresetreq', 'vectreset' or 'emulated'."),
+    OptionInfo('load.verify', str, 'off',
+        "Whether and how to verify flash and RAM contents after programming. The value must be one of"
+        " 'off', 'crc', or 'read'. 'crc' compares CRC32s computed on the target and only reads back data"
+        " whose CRC does not match, while 'read' reads back all data. Default is 'off'."),
     OptionInfo('logging', (str, dict), None,
         "Logging configuration dictionary, or path to YAML file containing logging configuration."),
     OptionInfo('no_config', bool, False,
@@ -169,6 +185,16 @@ BUILTIN_OPTIONS = [
         "Base TCP port for the gdbserver."),
     OptionInfo('persist', bool, False,
         "If True, the GDB server will not exit after GDB disconnects."),
+    OptionInfo('prefetch.code_size', int, 64,
+        "Number of bytes of code around the PC that are read into the memory cache when the target "
+        "stops. Only used if the prefetch.enable option is True."),
+    OptionInfo('prefetch.enable', bool, True,
+        "Whether the gdbserver reads registers, stack and code into the debug caches as soon as the "
+        "target stops, and assumes the core stays halted until it is resumed, instead of checking "
+        "the core state for every cached access."),
+    OptionInfo('prefetch.stack_size', int, 128,
+        "Number of bytes of stack at the SP that are read into the memory cache when the target "
+        "stops. Only used if the prefetch.enable option is True."),
     OptionInfo('report_core_number', bool, False,
         "Whether gdb server should report core number as part of the per-thread information."),
     OptionInfo('rtos.enable', bool, True,
@@ -176,6 +202,17 @@ BUILTIN_OPTIONS = [
         "if necessary."),
     OptionInfo('rtos.name', str, None,
         "Name of the RTOS plugin to use. If not set, all RTOS plugins are given a chance to load."),
+    OptionInfo('rtt.buffer_size', int, 65536,
+        "Capacity in bytes of the host side buffer for each RTT channel and direction. Must be at least "
+        "4096."),
+    OptionInfo('rtt.idle_poll_interval', float, 0.02,
+        "Maximum interval in seconds between polls of RTT channels while no data is transferred."),
+    OptionInfo('rtt.overflow', str, 'block',
+        "What to do with RTT channel data when a host side buffer is full. The value must be one of "
+        "'block', 'drop-oldest', or 'drop-newest'. 'block' stops reading the channel, leaving data in "
+        "the target's buffer."),
+    OptionInfo('rtt.poll_interval', float, 0.001,
+        "Interval in seconds between polls of RTT channels while data is transferred."),
     OptionInfo('semihost_console_type', str, 'telnet',
         "If set to 'telnet' then the semihosting telnet server will be started, otherwise "
         "semihosting will print to the console."),
@@ -185,11 +222,19 @@ BUILTIN_OPTIONS = [
         "Program command line string, used for the SYS_GET_CMDLINE semihosting request."),
     OptionInfo('step_into_interrupt', bool, False,
         "Enable interrupts when performing step operations."),
+    OptionInfo('streaming_load', bool, True,
+        "Whether gdb's load command programs flash sectors while the rest of the image is still being "
+        "received. Only applies when the chip_erase option is 'sector'."),
     OptionInfo('swv_clock', int, 1000000,
         "Frequency in Hertz of the SWO baud rate. Default is 1 MHz."),
     OptionInfo('swv_system_clock', int, None,
         "Frequency in Hertz of the target's system clock. Used to compute the SWO baud rate "
         "divider. No default."),
+    OptionInfo('swv_capture_file', str, None,
+        "Path of a file that raw SWO data is captured into. The file is a preallocated ring buffer "
+        "written at full rate, decoded separately from reading the probe. No default."),
+    OptionInfo('swv_capture_size', int, 16 * 1024 * 1024,
+        "Size in bytes of the SWO capture ring buffer. Default is 16 MiB."),
     OptionInfo('swv_raw_enable', bool, True,
         "Enable flag for the raw SWV stream server."),
     OptionInfo('swv_raw_port', int, 3443,
@@ -95,6 +95,21 @@ class OptionsManager(Notifier):
         """
         self._update_layers(new_options, self._layers.append)
 
+    def remove_front(self) -> None:
+        """@brief Remove the current highest priority layer of option values.
+
+        Notifications are sent for any options whose value changes as a result.
+
+        @param self
+        """
+        if not self._layers:
+            return
+        removed = self._layers[0]
+        previous_values = {name: self.get(name) for name in removed.keys()}
+        del self._layers[0]
+        new_values = {name: self.get(name) for name in removed.keys()}
+        self._notify_changes(previous_values, new_values)
+
     def _convert_options(self, new_options: LayerType) -> LayerType:
         """@brief Prepare a dictionary of session options for use by the manager.
 
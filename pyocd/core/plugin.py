@@ -16,11 +16,18 @@
 # limitations under the License.
 
 import logging
+import threading
 from importlib_metadata import entry_points
 from typing import (
     Any,
     Dict,
+    Iterator,
     List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    cast,
     )
 
 from .._version import version as pyocd_version
@@ -82,6 +89,34 @@ class Plugin:
         """@brief Short description of the plugin."""
         return ""
 
+def _load_plugin_entry_point(entry_point: Any, plugin_group: str, base_class: type) -> Optional[Tuple[str, Any]]:
+    """@brief Load a single plugin entry point.
+
+    @return Bi-tuple of plugin name and implementation class, or None if the plugin is invalid or
+        declined to load.
+    """
+    # Instantiate the plugin class.
+    plugin = entry_point.load()()
+    if not isinstance(plugin, Plugin):
+        LOG.warning("Plugin '%s' of type '%s' has an invalid plugin object",
+                entry_point.name, plugin_group)
+        return None
+
+    # Ask the plugin whether it should be loaded.
+    if not plugin.should_load():
+        return None
+
+    # Load the plugin and stuff the implementation class it gives
+    impl_class = plugin.load()
+    if not issubclass(impl_class, base_class):
+        LOG.warning("Plugin '%s' of type '%s' returned an unexpected implementation class",
+                plugin.name, plugin_group)
+        return None
+
+    # Add any plugin options.
+    add_option_set(plugin.options)
+    return plugin.name, impl_class
+
 def load_plugin_classes_of_type(plugin_group: str, plugin_dict: Dict[str, Any], base_class: type) -> None:
     """@brief Helper method to load plugins.
 
@@ -93,23 +128,103 @@ def load_plugin_classes_of_type(plugin_group: str, plugin_dict: Dict[str, Any],
     @param base_class The required superclass for plugin implementation classes.
     """
     for entry_point in entry_points(group=plugin_group):
-        # Instantiate the plugin class.
-        plugin = entry_point.load()()
-        if not isinstance(plugin, Plugin):
-            LOG.warning("Plugin '%s' of type '%s' has an invalid plugin object",
-                    entry_point.name, plugin_group)
-            continue
-
-        # Ask the plugin whether it should be loaded.
-        if plugin.should_load():
-            # Load the plugin and stuff the implementation class it gives
-            impl_class = plugin.load()
-            if not issubclass(impl_class, base_class):
-                LOG.warning("Plugin '%s' of type '%s' returned an unexpected implementation class",
-                        plugin.name, plugin_group)
-                continue
-            plugin_dict[plugin.name] = impl_class
-
-            # Add any plugin options.
-            add_option_set(plugin.options)
+        result = _load_plugin_entry_point(entry_point, plugin_group, base_class)
+        if result is not None:
+            plugin_dict[result[0]] = result[1]
+
+class PluginClassDict(Mapping[str, Any]):
+    """@brief Read-only dictionary of plugin implementation classes that loads plugins on demand.
 
+    Loading a plugin imports its module, which may in turn import large third party packages. This
+    dictionary defers that cost until a plugin is actually needed. Looking up a plugin by name loads
+    only that plugin, while iterating or taking the length loads all plugins of the group.
+
+    Plugin entry points are expected to be named the same as the plugin. If a name lookup doesn't match
+    any entry point name, all plugins are loaded before giving up.
+    """
+
+    def __init__(self, plugin_group: str, base_class: type) -> None:
+        """@brief Constructor.
+        @param self
+        @param plugin_group String of the plugin group, e.g. 'pyocd.probe'.
+        @param base_class The required superclass for plugin implementation classes.
+        """
+        self._group = plugin_group
+        self._base_class = base_class
+        self._classes: Dict[str, Any] = {}
+        self._loaded_entry_points: Set[str] = set()
+        self._did_load_all = False
+        self._lock = threading.RLock()
+
+    def _load(self, entry_point: Any) -> None:
+        if entry_point.name in self._loaded_entry_points:
+            return
+        self._loaded_entry_points.add(entry_point.name)
+        result = _load_plugin_entry_point(entry_point, self._group, self._base_class)
+        if result is not None:
+            self._classes[result[0]] = result[1]
+
+    def load_all(self) -> None:
+        """@brief Load all plugins of the group."""
+        with self._lock:
+            if self._did_load_all:
+                return
+            for entry_point in entry_points(group=self._group):
+                self._load(entry_point)
+            self._did_load_all = True
+
+    def find(self, name: str) -> Optional[Any]:
+        """@brief Return the implementation class for a plugin, using a case-insensitive name match.
+
+        @return The implementation class, or None if there is no such plugin.
+        """
+        name = name.lower()
+        with self._lock:
+            klass = self._find_loaded(name)
+            if klass is None:
+                for entry_point in entry_points(group=self._group):
+                    if entry_point.name.lower() == name:
+                        self._load(entry_point)
+                klass = self._find_loaded(name)
+            if klass is None:
+                self.load_all()
+                klass = self._find_loaded(name)
+            return klass
+
+    def _find_loaded(self, lower_name: str) -> Optional[Any]:
+        for plugin_name, klass in self._classes.items():
+            if plugin_name.lower() == lower_name:
+                return klass
+        return None
+
+    def __getitem__(self, name: str) -> Any:
+        with self._lock:
+            if name not in self._classes:
+                self.find(name)
+            return self._classes[name]
+
+    def __contains__(self, name: object) -> bool:
+        try:
+            self[cast(str, name)]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        self.load_all()
+        return iter(list(self._classes.keys()))
+
+    def __len__(self) -> int:
+        self.load_all()
+        return len(self._classes)
+
+def load_all_plugins() -> None:
+    """@brief Load plugins of all types used by pyOCD.
+
+    Mainly useful to ensure that all options added by plugins are available.
+    """
+    # Imported here because the plugin dictionaries live in modules that depend on this one.
+    from ..probe.aggregator import PROBE_CLASSES
+    from ..rtos import RTOS
+    PROBE_CLASSES.load_all()
+    RTOS.load_all()
@@ -387,6 +387,14 @@ class Session(Notifier):
         """@brief The current command being executed in the session."""
         return self._command
 
+    @command.setter
+    def command(self, new_command: Optional[str]) -> None:
+        """@brief Change the current command.
+
+        Used when a session is kept open and reused to execute multiple commands.
+        """
+        self._command = new_command
+
     @property
     def board(self) -> Optional[Board]:
         """@brief The @ref pyocd.board.board.Board "Board" object."""
@@ -0,0 +1,223 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+import weakref
+from typing import (Any, Dict, Mapping, Optional, TYPE_CHECKING)
+
+from . import exceptions
+from .session import Session
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+LOG = logging.getLogger(__name__)
+
+## @brief Session options that determine how a session connects to its target.
+#
+# Sessions are only reused for a command if these options have the same values as when the session
+# was created. All other options are applied to a reused session only while a command is using it.
+CONNECTION_OPTIONS = (
+    'project_dir',
+    'config_file',
+    'user_script',
+    'no_config',
+    'pack',
+    'cbuild_run',
+    'target_override',
+    'frequency',
+    'connect_mode',
+    )
+
+class PooledSession:
+    """@brief Proxy for a Session owned by a SessionPool.
+
+    The proxy forwards all attributes to the real session, except that closing the proxy returns
+    the session to the pool instead of closing it. Opening an already open session does nothing.
+    """
+
+    def __init__(self, pool: "SessionPool", key: str, session: Session, auto_open: bool) -> None:
+        self._pool = pool
+        self._key = key
+        self._session = session
+        self._auto_open = auto_open
+        self._released = False
+
+    @property
+    def session(self) -> Session:
+        """@brief The real Session object."""
+        return self._session
+
+    def open(self, init_board: bool = True) -> None:
+        if not self._session.is_open:
+            self._session.open(init_board=init_board)
+
+    def close(self) -> None:
+        if not self._released:
+            self._released = True
+            self._pool._release(self._key, self._session)
+
+    def __enter__(self) -> "PooledSession":
+        if self._auto_open:
+            try:
+                self.open()
+            except Exception:
+                self.close()
+                raise
+        return self
+
+    def __exit__(self, exc_type: type, value: Any, traceback: "TracebackType") -> bool:
+        self.close()
+        return False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+class SessionPool:
+    """@brief Keeps sessions open between commands.
+
+    While a pool is active, ConnectHelper.session_with_chosen_probe() returns sessions from the pool.
+    If an open session exists that was created with the same connection options, it is checked for
+    staleness and returned without enumerating probes or reinitialising the target. Otherwise a new
+    session is created. Only one session is kept per debug probe.
+
+    Per-command session options are layered on top of a reused session's options, and removed when
+    the session is closed by the command. The command's option defaults are added to the same layer,
+    for options that are not set by the session's configuration.
+    """
+
+    ## @brief The currently active pool, if any.
+    _active: Optional["SessionPool"] = None
+
+    @classmethod
+    def get_active(cls) -> Optional["SessionPool"]:
+        """@brief Return the active pool, or None."""
+        return cls._active
+
+    def __init__(self) -> None:
+        self._sessions: Dict[str, Session] = {}
+
+    def activate(self) -> None:
+        """@brief Make this the active pool."""
+        SessionPool._active = self
+
+    def deactivate(self) -> None:
+        """@brief Deactivate and close all pooled sessions."""
+        if SessionPool._active is self:
+            SessionPool._active = None
+        self.close_all()
+
+    def close_all(self) -> None:
+        """@brief Close all pooled sessions."""
+        for key in list(self._sessions.keys()):
+            self._discard(key)
+
+    def acquire(
+            self,
+            blocking: bool = True,
+            return_first: bool = False,
+            unique_id: Optional[str] = None,
+            auto_open: bool = True,
+            options: Optional[Mapping[str, Any]] = None,
+            **kwargs
+            ) -> Optional[PooledSession]:
+        """@brief Return a session from the pool, creating it if necessary.
+
+        Parameters are the same as ConnectHelper.session_with_chosen_probe().
+        """
+        from .helpers import ConnectHelper
+
+        connection_options = {name: kwargs.pop(name) for name in CONNECTION_OPTIONS if name in kwargs}
+        if connection_options.get('project_dir') is None:
+            connection_options['project_dir'] = os.getcwd()
+        command = kwargs.pop('command', None)
+        option_defaults = kwargs.pop('option_defaults', None)
+        key = repr((unique_id, sorted((k, v) for k, v in connection_options.items() if v is not None),
+                sorted((options or {}).items()),
+                command if connection_options.get('cbuild_run') else None))
+
+        session = self._sessions.get(key)
+        if session is not None and not self._is_alive(session):
+            LOG.info("Reconnecting stale session for probe %s", session.probe.unique_id)
+            self._discard(key)
+            session = None
+
+        if session is None:
+            probe = ConnectHelper.choose_probe(blocking=blocking, return_first=return_first,
+                    unique_id=unique_id)
+            if probe is None:
+                return None
+
+            # Only one session may own a probe.
+            for other_key, other in list(self._sessions.items()):
+                if other.probe.unique_id == probe.unique_id:
+                    self._discard(other_key)
+
+            # Option defaults are not passed to the session, since they can differ for each command.
+            session = Session(probe, options=options, command=command, **connection_options)
+            self._sessions[key] = session
+        else:
+            LOG.debug("Reusing session for probe %s", session.probe.unique_id)
+            Session._current_session = weakref.ref(session)
+
+        session.command = command
+        layer = {name: value for name, value in (option_defaults or {}).items()
+                if not session.options.is_set(name)}
+        layer.update(kwargs)
+        session.options.add_front(layer)
+        return PooledSession(self, key, session, auto_open)
+
+    def _is_alive(self, session: Session) -> bool:
+        """@brief Check whether a pooled session can still talk to its target."""
+        if not session.is_open or not session.probe.is_open:
+            return False
+        try:
+            assert session.target
+            session.target.get_state()
+            return True
+        except exceptions.Error as err:
+            LOG.debug("Pooled session failed check: %s", err)
+            return False
+
+    def _release(self, key: str, session: Session) -> None:
+        """@brief Return a session to the pool after a command has finished with it.
+
+        Breakpoints are removed and, if the `resume_on_disconnect` option is set, halted cores are
+        resumed. This mirrors what closing the session would have done, without tearing down the
+        connection.
+        """
+        try:
+            if not session.is_open:
+                self._discard(key)
+                return
+
+            assert session.target
+            resume = session.options.get('resume_on_disconnect')
+            for core in session.target.cores.values():
+                core.bp_manager.remove_all_breakpoints()
+                if resume and core.is_halted():
+                    core.resume()
+        except exceptions.Error as err:
+            LOG.warning("Error returning session to pool: %s", err, exc_info=session.log_tracebacks)
+            self._discard(key)
+        finally:
+            session.options.remove_front()
+
+    def _discard(self, key: str) -> None:
+        session = self._sessions.pop(key, None)
+        if session is not None:
+            session.close()
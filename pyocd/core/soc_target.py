@@ -243,6 +243,12 @@ class SoCTarget(TargetGraphNode):
     def read_memory_block32(self, addr: int, size: int) -> Sequence[int]:
         return self.selected_core_or_raise.read_memory_block32(addr, size)
 
+    def read_memory_block32_deferred(self, addr: int, size: int) -> Callable[[], Sequence[int]]:
+        return self.selected_core_or_raise.read_memory_block32_deferred(addr, size)
+
+    def poll_until(self, addr: int, mask: int, value: int, retries: int) -> bool:
+        return self.selected_core_or_raise.poll_until(addr, mask, value, retries)
+
     def read_core_register(self, id: CoreRegisterNameOrNumberType) -> CoreRegisterValueType:
         return self.selected_core_or_raise.read_core_register(id)
 
@@ -295,6 +301,9 @@ class SoCTarget(TargetGraphNode):
     def get_state(self) -> Target.State:
         return self.selected_core_or_raise.get_state()
 
+    def get_state_deferred(self) -> Callable[[], Target.State]:
+        return self.selected_core_or_raise.get_state_deferred()
+
     def get_security_state(self) -> Target.SecurityState:
         return self.selected_core_or_raise.get_security_state()
 
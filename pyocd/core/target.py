@@ -297,6 +297,18 @@ class Target(MemoryInterface, DelegateHavingMixIn):
     def get_state(self) -> State:
         raise NotImplementedError()
 
+    def get_state_deferred(self) -> Callable[[], State]:
+        """@brief Start reading the state of the target.
+
+        Targets that can queue the status read override this method so that the states of several
+        cores can be read in a single batch of transfers. The default implementation reads immediately.
+
+        @return A callable that returns the target's state. The callable must be invoked once, and
+            may raise any exception that get_state() raises.
+        """
+        state = self.get_state()
+        return lambda: state
+
     def get_security_state(self) -> SecurityState:
         raise NotImplementedError()
 
@@ -21,7 +21,7 @@ import logging
 from contextlib import contextmanager
 from functools import total_ordering
 from enum import Enum
-from typing import (Any, Callable, Dict, Generator, Optional, TYPE_CHECKING, Sequence, Set, Tuple, Type, Union, overload)
+from typing import (Any, Callable, Dict, Generator, List, Optional, TYPE_CHECKING, Sequence, Set, Tuple, Type, Union, overload)
 from typing_extensions import Literal
 
 from ..core import (exceptions, memory_interface)
@@ -33,6 +33,7 @@ if TYPE_CHECKING:
     from ..core.core_target import CoreTarget
     from .dap import DebugPort
     from .rom_table import CoreSightComponentID
+    from .topology_cache import TargetTopology
     from ..utility.notification import Notification
 
 LOG = logging.getLogger(__name__)
@@ -499,8 +500,12 @@ class AccessPort:
         self.ap_class = (self.idr & AP_IDR_CLASS_MASK) >> AP_IDR_CLASS_SHIFT
         self.ap_type = self.idr & AP_IDR_TYPE_MASK
 
-    def find_components(self) -> None:
-        """@brief Find CoreSight components attached to this AP."""
+    def find_components(self, topology: Optional[TargetTopology] = None) -> None:
+        """@brief Find CoreSight components attached to this AP.
+
+        @param self
+        @param topology Optional topology cache used to restore the AP's ROM table without reading it.
+        """
         pass
 
     @overload
@@ -879,7 +884,7 @@ class MEM_AP(AccessPort, memory_interface.MemoryInterface):
         AccessPort.write_reg(self, self._reg_offset + MEM_AP_CSW, self.original_csw)
 
     @locked
-    def find_components(self) -> None:
+    def find_components(self, topology: Optional[TargetTopology] = None) -> None:
         try:
             if self.has_rom_table:
                 if not self.is_enabled:
@@ -896,7 +901,10 @@ class MEM_AP(AccessPort, memory_interface.MemoryInterface):
                 # Instantiate the ROM table and parse it.
                 if cmpid.is_rom_table:
                     self.rom_table = ROMTable.create(self, cmpid, self.rom_addr)
-                    self.rom_table.init()
+                    if topology is not None:
+                        topology.init_rom_table(self.rom_table, f"ap{self.address}:idr={self.idr:08x}")
+                    else:
+                        self.rom_table.init()
         except exceptions.TransferError as error:
             LOG.error("Transfer error while reading %s ROM table: %s", self.short_description, error,
                 exc_info=self.dp.session.log_tracebacks)
@@ -1232,7 +1240,8 @@ class MEM_AP(AccessPort, memory_interface.MemoryInterface):
             raise
         TRACE.debug("_write_block32:%06d }", num)
 
-    def _read_block32_page(self, addr: int, size: int) -> Sequence[int]:
+    def _read_block32_page(self, addr: int, size: int, now: bool = True) \
+            -> Union[Sequence[int], Callable[[], Sequence[int]]]:
         """@brief Read a single transaction's worth of aligned words.
 
         The transaction must not cross the MEM-AP's auto-increment boundary.
@@ -1247,7 +1256,8 @@ class MEM_AP(AccessPort, memory_interface.MemoryInterface):
         self.write_reg(self._reg_offset + MEM_AP_CSW, self._csw | CSW_SIZE32)
         self.write_reg(self._reg_offset + MEM_AP_TAR, addr)
         try:
-            resp = self.dp.read_ap_multiple(self.address.address + self._reg_offset + MEM_AP_DRW, size)
+            resp_cb = self.dp.read_ap_multiple(self.address.address + self._reg_offset + MEM_AP_DRW, size,
+                    now=False)
         except exceptions.TransferFaultError as error:
             # Annotate error with target address.
             self._handle_error(error, num)
@@ -1257,8 +1267,26 @@ class MEM_AP(AccessPort, memory_interface.MemoryInterface):
         except exceptions.Error as error:
             self._handle_error(error, num)
             raise
-        TRACE.debug("_read_block32:%06d }", num)
-        return resp
+
+        def read_block32_page_cb() -> Sequence[int]:
+            try:
+                resp = resp_cb()
+            except exceptions.TransferFaultError as error:
+                # Annotate error with target address.
+                self._handle_error(error, num)
+                error.fault_address = addr
+                error.fault_length = size * 4
+                raise
+            except exceptions.Error as error:
+                self._handle_error(error, num)
+                raise
+            TRACE.debug("_read_block32:%06d %s}", num, "" if now else "...")
+            return resp
+
+        if now:
+            return read_block32_page_cb()
+        else:
+            return read_block32_page_cb
 
     @locked
     def _write_memory_block32(self, addr: int, data: Sequence[int]) -> None:
@@ -1276,23 +1304,90 @@ class MEM_AP(AccessPort, memory_interface.MemoryInterface):
             addr += n
         return
 
-    @locked
+    @overload
     def _read_memory_block32(self, addr: int, size: int) -> Sequence[int]:
+        ...
+
+    @overload
+    def _read_memory_block32(self, addr: int, size: int, now: Literal[True] = True) -> Sequence[int]:
+        ...
+
+    @overload
+    def _read_memory_block32(self, addr: int, size: int, now: Literal[False]) -> Callable[[], Sequence[int]]:
+        ...
+
+    @locked
+    def _read_memory_block32(self, addr: int, size: int, now: bool = True) \
+            -> Union[Sequence[int], Callable[[], Sequence[int]]]:
         """@brief Read a block of aligned words in memory.
 
-        @return A list of word values.
+        @return A list of word values, or if _now_ is False a callable returning the list.
         """
         assert (addr & 0x3) == 0
         addr &= self._address_mask
-        resp = []
+        page_cbs = []
         while size > 0:
             n = self.auto_increment_page_size - (addr & (self.auto_increment_page_size - 1))
             if size*4 < n:
                 n = (size*4) & 0xfffffffc
-            resp += self._read_block32_page(addr, n//4)
+            page_cbs.append(self._read_block32_page(addr, n//4, now=False))
             size -= n//4
             addr += n
-        return resp
+
+        def read_memory_block32_cb() -> Sequence[int]:
+            resp: List[int] = []
+            error = None
+            # Invoke every callback, even after an error, so none of the transfers is left pending.
+            for cb in page_cbs:
+                try:
+                    resp += cb()
+                except exceptions.Error as err:
+                    error = error or err
+            if error is not None:
+                raise error
+            return resp
+
+        if now:
+            return read_memory_block32_cb()
+        else:
+            return read_memory_block32_cb
+
+    def read_memory_block32_deferred(self, addr: int, size: int) -> Callable[[], Sequence[int]]:
+        if self._accelerated_memory_interface is not None:
+            return super().read_memory_block32_deferred(addr, size)
+        return self._read_memory_block32(addr, size, now=False)
+
+    @locked
+    def poll_until(self, addr: int, mask: int, value: int, retries: int) -> bool:
+        """@brief Read an aligned 32-bit word until its value under a mask matches.
+
+        TAR is set once and DRW is polled with address increment disabled, letting the probe repeat
+        the read without host round trips if it supports that. Accelerated memory interfaces fall
+        back to reads from the host.
+        """
+        if self._accelerated_memory_interface is not None:
+            return super().poll_until(addr, mask, value, retries)
+        assert (addr & 0x3) == 0
+        addr &= self._address_mask
+        num = self.dp.next_access_number
+        TRACE.debug("poll_mem:%06d (ap=0x%x; addr=0x%08x, mask=0x%08x, value=0x%08x) {",
+            num, self.address.nominal_address, addr, mask, value)
+        try:
+            self.write_reg(self._reg_offset + MEM_AP_CSW, (self._csw & ~CSW_ADDRINC) | CSW_SIZE32)
+            self.write_reg(self._reg_offset + MEM_AP_TAR, addr)
+            result = self.dp.poll_ap(self.address.address + self._reg_offset + MEM_AP_DRW,
+                    mask, value, retries)
+        except exceptions.TransferFaultError as error:
+            # Annotate error with target address.
+            self._handle_error(error, num)
+            error.fault_address = addr
+            error.fault_length = 4
+            raise
+        except exceptions.Error as error:
+            self._handle_error(error, num)
+            raise
+        TRACE.debug("poll_mem:%06d -> %s }", num, result)
+        return result
 
     # Note: the "type: ignore"s below are ok because the accelerated memory interface accepts
     # attribute keyword args. The MemoryInterface class should be extended to accept attribute args
@@ -1469,7 +1564,7 @@ class AHB_AP(MEM_AP):
             if (self.original_csw & CSW_SDEVICEEN) == 0:
                 self.hnonsec = NONSECURE
 
-    def find_components(self) -> None:
+    def find_components(self, topology: Optional[TargetTopology] = None) -> None:
         # Turn on DEMCR.TRCENA before reading the ROM table. Some ROM table entries can
         # come back as garbage if TRCENA is not set.
         try:
@@ -1481,7 +1576,7 @@ class AHB_AP(MEM_AP):
             pass
 
         # Invoke superclass.
-        super().find_components()
+        super().find_components(topology)
 
     def set_cacheable(self) -> None:
         """@brief Set cacheable access.
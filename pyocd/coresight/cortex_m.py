@@ -38,6 +38,7 @@ from .cortex_m_core_registers import (
 from ..debug.breakpoints.manager import BreakpointManager
 from ..debug.breakpoints.software import SoftwareBreakpointProvider
 from .ap import MEM_AP
+from ..probe.debug_probe import DebugProbe
 
 if TYPE_CHECKING:
     from .dwt import Watchpoint
@@ -154,6 +155,11 @@ class CortexM(CoreTarget, CoreSightCoreComponent): # lgtm[py/multiple-calls-to-i
 
     VTOR = 0xE000ED08
     SCR = 0xE000ED10
+
+    # Configuration and Control Register
+    CCR = 0xE000ED14
+    CCR_DC = (1 << 16)
+
     SHPR1 = 0xE000ED18
     SHPR2 = 0xE000ED1C
     SHPR3 = 0xE000ED20
@@ -227,6 +233,9 @@ class CortexM(CoreTarget, CoreSightCoreComponent): # lgtm[py/multiple-calls-to-i
 
     _RESET_RECOVERY_SLEEP_INTERVAL = 0.01 # 10 ms
 
+    ## Number of times the probe repeats a DHCSR read when waiting for a status bit.
+    DHCSR_POLL_RETRIES = 32
+
     @classmethod
     def factory(cls, ap: MemoryInterface, cmpid: CoreSightComponentID, address: int) -> Any:
         assert isinstance(ap, MEM_AP)
@@ -648,6 +657,31 @@ class CortexM(CoreTarget, CoreSightCoreComponent): # lgtm[py/multiple-calls-to-i
         data = self.ap.read_memory_block32(addr, size)
         return self.bp_manager.filter_memory_aligned_32(addr, size, data)
 
+    def read_memory_block32_deferred(self, addr: int, size: int) -> Callable[[], Sequence[int]]:
+        """@brief Start reading an aligned block of 32-bit words."""
+        read_cb = self.ap.read_memory_block32_deferred(addr, size)
+        return lambda: self.bp_manager.filter_memory_aligned_32(addr, size, read_cb())
+
+    def poll_until(self, addr: int, mask: int, value: int, retries: int) -> bool:
+        """@brief Read an aligned 32-bit word until its value under a mask matches.
+
+        Meant for debug and peripheral registers. Unlike the other read methods, software breakpoint
+        instructions are not hidden from the value being compared.
+        """
+        return self.ap.poll_until(addr, mask, value, retries)
+
+    @property
+    def dhcsr_poll_retries(self) -> int:
+        """@brief Retry count to pass to poll_until() when waiting for a DHCSR status bit.
+
+        Zero if the probe can't repeat reads itself, so that each poll is a single read and callers
+        check timeouts and callbacks as often as before.
+        """
+        if DebugProbe.Capability.VALUE_MATCH in self.session.probe.capabilities:
+            return self.DHCSR_POLL_RETRIES
+        else:
+            return 0
+
     def halt(self) -> None:
         """@brief Halt the core
         """
@@ -723,6 +757,7 @@ class CortexM(CoreTarget, CoreSightCoreComponent): # lgtm[py/multiple-calls-to-i
 
         # Get the step timeout. A timeout of 0 means no timeout, so we have to pass None to the Timeout class.
         step_timeout = self.session.options.get('cpu.step.instruction.timeout') or None
+        poll_retries = self.dhcsr_poll_retries
 
         exit_step_loop = False
         while True:
@@ -740,7 +775,7 @@ class CortexM(CoreTarget, CoreSightCoreComponent): # lgtm[py/multiple-calls-to-i
                     if (hook_cb is not None) and hook_cb():
                         exit_step_loop = True
                         break
-                    if (self.read32(CortexM.DHCSR) & CortexM.C_HALT) != 0:
+                    if self.poll_until(CortexM.DHCSR, CortexM.C_HALT, CortexM.C_HALT, poll_retries):
                         break
 
             # Range is empty, 'range step' will degenerate to 'step'
@@ -963,11 +998,15 @@ class CortexM(CoreTarget, CoreSightCoreComponent): # lgtm[py/multiple-calls-to-i
         if recover_timeout == 0:
             return
         with timeout.Timeout(recover_timeout, self._RESET_RECOVERY_SLEEP_INTERVAL) as time_out:
-            dhcsr = None
+            dhcsr_was_read = False
+            poll_retries = self.dhcsr_poll_retries
             while time_out.check():
                 try:
-                    dhcsr = self.read32(CortexM.DHCSR)
-                    if (dhcsr & CortexM.S_RESET_ST) == 0:
+                    # S_RESET_ST is cleared by reading DHCSR, so it only reads as set again if the
+                    # core is still being held in reset.
+                    matched = self.poll_until(CortexM.DHCSR, CortexM.S_RESET_ST, 0, poll_retries)
+                    dhcsr_was_read = True
+                    if matched:
                         break
                 except exceptions.TransferError:
                     # Ignore errors caused by flushing.
@@ -976,8 +1015,7 @@ class CortexM(CoreTarget, CoreSightCoreComponent): # lgtm[py/multiple-calls-to-i
                     except exceptions.TransferError:
                         pass
             else:
-                # If dhcsr is None then we know that we never were able to read the register.
-                if dhcsr is None:
+                if not dhcsr_was_read:
                     LOG.warning("Core %d is not accessible after reset", self.core_number)
                 else:
                     LOG.debug("Core %d did not come out of reset within timeout", self.core_number)
@@ -1161,6 +1199,24 @@ class CortexM(CoreTarget, CoreSightCoreComponent): # lgtm[py/multiple-calls-to-i
             newDhcsr = self.read_memory(CortexM.DHCSR)
             if (newDhcsr & CortexM.S_RESET_ST) and not (newDhcsr & CortexM.S_RETIRE_ST):
                 return Target.State.RESET
+        return self._get_state_from_dhcsr(dhcsr)
+
+    def get_state_deferred(self) -> Callable[[], Target.State]:
+        # Subclasses that change how the state is read can't have the read deferred.
+        if type(self).get_state is not CortexM.get_state:
+            return super().get_state_deferred()
+
+        dhcsr_cb = self.read_memory(CortexM.DHCSR, 32, now=False)
+
+        def get_state_cb() -> Target.State:
+            dhcsr = dhcsr_cb()
+            if dhcsr & CortexM.S_RESET_ST:
+                # Another read is needed to tell whether the core is still held in reset.
+                return self.get_state()
+            return self._get_state_from_dhcsr(dhcsr)
+        return get_state_cb
+
+    def _get_state_from_dhcsr(self, dhcsr: int) -> Target.State:
         if dhcsr & CortexM.S_LOCKUP:
             return Target.State.LOCKUP
         elif dhcsr & CortexM.S_SLEEP:
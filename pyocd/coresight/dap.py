@@ -1006,6 +1006,36 @@ class DebugPort(DelegateHavingMixIn):
         else:
             return read_ap_multiple_cb
 
+    def poll_ap(self, addr: int, mask: int, value: int, retries: int) -> bool:
+        """@brief Read an AP register until its value under a mask matches.
+
+        The probe performs the polling if it is able to, otherwise the register is read from
+        the host.
+
+        @param self
+        @param addr AP register address.
+        @param mask Mask applied to the register value before comparing.
+        @param value Expected value of the masked register.
+        @param retries Number of times the read is repeated after the first read does not match.
+        @return Boolean indicating whether the register matched.
+        """
+        assert isinstance(addr, int)
+        num = self.next_access_number
+        did_lock = False
+
+        try:
+            did_lock = self._select_ap(addr)
+            result = self.probe.poll_ap(addr, mask, value, retries)
+            TRACE.debug("poll_ap:%06d (addr=0x%08x, mask=0x%08x, value=0x%08x, retries=%i) -> %s",
+                    num, addr, mask, value, retries, result)
+            return result
+        except exceptions.TargetError as error:
+            self._handle_error(error, num)
+            raise
+        finally:
+            if did_lock:
+                self.unlock()
+
     def _handle_error(self, error: Exception, num: int) -> None:
         TRACE.debug("error:%06d %s", num, error)
         # Clear sticky error for fault errors.
@@ -1135,7 +1165,10 @@ class APAccessMemoryInterface(memory_interface.MemoryInterface):
 
     def read_memory_block32(self, addr: int, size: int) -> Sequence[int]:
         """@brief Read an aligned block of 32-bit words."""
+        return self.read_memory_block32_deferred(addr, size)()
+
+    def read_memory_block32_deferred(self, addr: int, size: int) -> Callable[[], Sequence[int]]:
+        """@brief Start reading an aligned block of 32-bit words."""
         addr += self._offset
         result_cbs = [self._dp.read_ap(addr + i * 4, now=False) for i in range(size)]
-        result = [cb() for cb in result_cbs]
-        return result
+        return lambda: [cb() for cb in result_cbs]
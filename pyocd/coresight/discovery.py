@@ -20,6 +20,7 @@ from ..core import exceptions
 from .ap import (APv1Address, APv2Address, AccessPort)
 from .dap import (ADIVersion, APAccessMemoryInterface)
 from .rom_table import (CoreSightComponentID, ROMTable)
+from .topology_cache import TargetTopology
 from . import (cortex_m, cortex_m_v8m)
 from ..utility.sequencer import CallSequence
 
@@ -31,6 +32,7 @@ class CoreSightDiscovery(object):
     def __init__(self, target):
         """@brief Constructor."""
         self._target = target
+        self._topology = None
 
     @property
     def target(self):
@@ -172,10 +174,11 @@ class ADIv5Discovery(CoreSightDiscovery):
 
     def _find_components(self):
         """@brief Init task that generates a call sequence to ask each AP to find its components."""
+        self._topology = TargetTopology.for_dp(self.dp)
         seq = CallSequence()
         for ap in [x for x in self.dp.aps.values() if x.has_rom_table]:
             seq.append(
-                ('init_ap.{}'.format(ap.address.apsel), ap.find_components)
+                ('init_ap.{}'.format(ap.address.apsel), lambda ap=ap: ap.find_components(self._topology))
                 )
         return seq
 
@@ -226,7 +229,11 @@ class ADIv6Discovery(CoreSightDiscovery):
 
         if cmpid.is_rom_table:
             self._top_rom_table = ROMTable.create(mem_interface, cmpid)
-            self._top_rom_table.init()
+            self._topology = TargetTopology.for_dp(self.dp)
+            if self._topology is not None:
+                self._topology.init_rom_table(self._top_rom_table, "dp")
+            else:
+                self._top_rom_table.init()
 
             # Create components defined in the DP ROM table.
             self._top_rom_table.for_each(self._create_1_ap,
@@ -277,7 +284,7 @@ class ADIv6Discovery(CoreSightDiscovery):
         seq = CallSequence()
         for ap in [x for x in self.dp.aps.values() if x.has_rom_table]:
             seq.append(
-                ('init_ap.{}'.format(str(ap.address)), ap.find_components)
+                ('init_ap.{}'.format(str(ap.address)), lambda ap=ap: ap.find_components(self._topology))
                 )
         return seq
 
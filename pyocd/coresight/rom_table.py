@@ -117,11 +117,68 @@ class CoreSightComponentID(object):
         self.product_name = None
         self.factory = None
         self.valid = False
+        # Entry value and index in the parent ROM table, if any.
+        self.rom_entry = None
+        self.rom_entry_number = None
 
     def read_id_registers(self):
         """@brief Read Component ID, Peripheral ID, and DEVID/DEVARCH registers."""
         # Read registers as a single block read for performance reasons.
         regs = self.ap.read_memory_block32(self.top_address + self.IDR_READ_START, self.IDR_READ_COUNT)
+        if not self._set_id_registers(regs):
+            return
+
+        # For CoreSight-class components, read additional registers.
+        if self.component_class == self.CORESIGHT_CLASS:
+            self._set_coresight_id_registers(self.ap.read_memory_block32(
+                self.top_address + self.CORESIGHT_IDR_READ_START, self.CORESIGHT_IDR_READ_COUNT))
+
+        self._decode_id_registers()
+
+    @classmethod
+    def read_id_registers_batch(cls, cmpids):
+        """@brief Read the ID registers of several components using deferred reads.
+
+        The reads for all components are queued before any result is examined. A second batch reads
+        the CoreSight-specific registers of CoreSight class components.
+
+        @param cmpids Sequence of CoreSightComponentID objects.
+        @return Set of the components whose registers could not be read due to a transfer error.
+        """
+        failed = set()
+
+        def read_all(cmpids, start, count):
+            pending = []
+            for cmpid in cmpids:
+                try:
+                    pending.append((cmpid,
+                            cmpid.ap.read_memory_block32_deferred(cmpid.top_address + start, count)))
+                except exceptions.TransferError:
+                    failed.add(cmpid)
+            # Every callback is invoked, even after an error, to complete all queued reads.
+            results = []
+            for cmpid, result_cb in pending:
+                try:
+                    results.append((cmpid, result_cb()))
+                except exceptions.TransferError:
+                    failed.add(cmpid)
+            return results
+
+        valid = [cmpid for cmpid, regs in read_all(cmpids, cls.IDR_READ_START, cls.IDR_READ_COUNT)
+                if cmpid._set_id_registers(regs)]
+        coresight = [cmpid for cmpid in valid if cmpid.component_class == cls.CORESIGHT_CLASS]
+        for cmpid, regs in read_all(coresight, cls.CORESIGHT_IDR_READ_START, cls.CORESIGHT_IDR_READ_COUNT):
+            cmpid._set_coresight_id_registers(regs)
+
+        for cmpid in valid:
+            if cmpid not in failed:
+                cmpid._decode_id_registers()
+        return failed
+
+    def _set_id_registers(self, regs):
+        """@brief Set CIDR and PIDR from a block read of the ID registers.
+        @return Boolean indicating whether the CIDR is valid.
+        """
         self.cidr = self._extract_id_register_value(regs, self.CIDR0_OFFSET)
         self.pidr = (self._extract_id_register_value(regs, self.PIDR4_OFFSET) << 32) \
                     | self._extract_id_register_value(regs, self.PIDR0_OFFSET)
@@ -129,8 +186,31 @@ class CoreSightComponentID(object):
         # Check if the component has a valid CIDR value
         if (self.cidr & self.CIDR_PREAMBLE_MASK) != self.CIDR_PREAMBLE_VALUE:
             LOG.warning("Invalid coresight component, cidr=0x%x", self.cidr)
-            return
+            return False
 
+        self.component_class = (self.cidr & self.CIDR_COMPONENT_CLASS_MASK) >> self.CIDR_COMPONENT_CLASS_SHIFT
+        return True
+
+    def _set_coresight_id_registers(self, regs):
+        """@brief Set DEVARCH, DEVID, and DEVTYPE from a block read of CoreSight ID registers."""
+        self.devarch = regs[self.DEVARCH_OFFSET]
+        self.devid = list(regs[1:4])
+        self.devid.reverse()
+        self.devtype = regs[self.DEVTYPE_OFFSET]
+
+    def check_id_registers(self):
+        """@brief Read the CIDR and PIDR and compare them with the values held by this object.
+
+        @return Boolean indicating whether the registers match.
+        """
+        regs = self.ap.read_memory_block32(self.top_address + self.IDR_READ_START, self.IDR_READ_COUNT)
+        cidr = self._extract_id_register_value(regs, self.CIDR0_OFFSET)
+        pidr = (self._extract_id_register_value(regs, self.PIDR4_OFFSET) << 32) \
+                | self._extract_id_register_value(regs, self.PIDR0_OFFSET)
+        return (cidr == self.cidr) and (pidr == self.pidr)
+
+    def _decode_id_registers(self):
+        """@brief Extract fields from the ID register values and identify the component."""
         # Extract class.
         self.component_class = (self.cidr & self.CIDR_COMPONENT_CLASS_MASK) >> self.CIDR_COMPONENT_CLASS_SHIFT
 
@@ -147,20 +227,11 @@ class CoreSightComponentID(object):
             # Class 0x1 ROM table.
             self.is_rom_table = True
         elif self.component_class == self.CORESIGHT_CLASS:
-             coresight_regs = self.ap.read_memory_block32(
-                 self.top_address + self.CORESIGHT_IDR_READ_START, self.CORESIGHT_IDR_READ_COUNT)
-
-            # For CoreSight-class components, extract additional fields.
-             self.devarch = coresight_regs[self.DEVARCH_OFFSET]
-             self.devid = coresight_regs[1:4]
-             self.devid.reverse()
-             self.devtype = coresight_regs[self.DEVTYPE_OFFSET]
-
-             if self.devarch & self.DEVARCH_PRESENT_MASK:
-                 self.archid = self.devarch & self.DEVARCH_ARCHID_MASK
+            if self.devarch & self.DEVARCH_PRESENT_MASK:
+                self.archid = self.devarch & self.DEVARCH_ARCHID_MASK
 
-             # Identify a Class 0x9 ROM table.
-             self.is_rom_table = (self.archid == self.CLASS_0X9_ROM_TABLE_ARCHID)
+            # Identify a Class 0x9 ROM table.
+            self.is_rom_table = (self.archid == self.CLASS_0X9_ROM_TABLE_ARCHID)
 
         # Determine component name.
         if self.is_rom_table:
@@ -182,6 +253,38 @@ class CoreSightComponentID(object):
 
         self.valid = True
 
+    def snapshot(self):
+        """@brief Return a JSON-serialisable dict of the ID register values and ROM table entry.
+
+        The component can be recreated from the dict with from_snapshot() without accessing the target.
+        """
+        return {
+            'address': self.address,
+            'power_id': self.power_id,
+            'entry': self.rom_entry,
+            'number': self.rom_entry_number,
+            'cidr': self.cidr,
+            'pidr': self.pidr,
+            'devarch': self.devarch,
+            'devtype': self.devtype,
+            'devid': list(self.devid),
+            }
+
+    @classmethod
+    def from_snapshot(cls, parent_rom_table, ap, snapshot):
+        """@brief Create a component ID from a dict returned by snapshot()."""
+        cmpid = cls(parent_rom_table, ap, snapshot['address'], snapshot['power_id'])
+        cmpid.rom_entry = snapshot['entry']
+        cmpid.rom_entry_number = snapshot['number']
+        cmpid.cidr = snapshot['cidr']
+        cmpid.pidr = snapshot['pidr']
+        cmpid.devarch = snapshot['devarch']
+        cmpid.devtype = snapshot['devtype']
+        cmpid.devid = list(snapshot['devid'])
+        if (cmpid.cidr & cls.CIDR_PREAMBLE_MASK) == cls.CIDR_PREAMBLE_VALUE:
+            cmpid._decode_id_registers()
+        return cmpid
+
     def _extract_id_register_value(self, regs, offset):
         result = 0
         for i in range(4):
@@ -271,6 +374,7 @@ class ROMTable(CoreSightComponent):
         self._components = []
         self.name = 'ROM'
         self.gpr = None
+        self._is_complete = True
 
     @property
     def depth(self):
@@ -288,6 +392,16 @@ class ROMTable(CoreSightComponent):
         """
         return self._components
 
+    @property
+    def is_complete(self):
+        """@brief Whether every present entry of this table and its child tables was handled.
+
+        False if an entry was skipped because of a transfer error or because its power domain
+        could not be enabled.
+        """
+        return self._is_complete and all(c.is_complete for c in self._components
+                if isinstance(c, ROMTable))
+
     @property
     def depth_indent(self):
         """@brief String of whitespace with a width corresponding to the table's depth.'"""
@@ -300,16 +414,149 @@ class ROMTable(CoreSightComponent):
         created and the ID registers read. These ID objects are added to the _components_ property.
         If any child ROM tables are discovered, they will automatically be created and inited.
         """
-        LOG.info(f"{self.depth_indent}{self.ap.short_description} Class {self.cmpid.component_class:#x} " \
-            f"ROM table #{self.depth} @ {self.address:#08x} (designer={self.cmpid.designer_desc} " \
-            f"part={self.cmpid.part:03x})")
+        self._log_table()
         self._components = []
 
         self._read_table()
 
+    def init_from_snapshot(self, snapshot):
+        """@brief Populate the ROM table from a snapshot instead of reading it.
+
+        The _snapshot_ parameter is a dict previously returned by snapshot() for the same ROM table.
+        Components are recreated from the saved ID register values, so none of the table entries or
+        component ID registers are read. Power domains are still enabled for components that require
+        them.
+        """
+        self._log_table()
+        self._components = []
+
+        for entry_snapshot in snapshot['entries']:
+            number = entry_snapshot['number']
+            entry = entry_snapshot['entry']
+            powerid = entry_snapshot['power_id']
+            try:
+                # Power up the component's domain, skipping it if the attempt fails.
+                if (powerid is not None) and not self._power_component(number, powerid, entry):
+                    self._is_complete = False
+                    continue
+                cmpid = CoreSightComponentID.from_snapshot(self, self.ap, entry_snapshot)
+                self._add_component(cmpid, entry, number, entry_snapshot)
+            except exceptions.TransferError as err:
+                self._is_complete = False
+                LOG.error("Error attempting to restore CoreSight component referenced by "
+                        "ROM table entry #%d: %s", number, err,
+                        exc_info=self.ap.dp.session.get_current().log_tracebacks)
+
+    def snapshot(self):
+        """@brief Return a JSON-serialisable dict describing the ROM table and its child tables.
+
+        The dict contains the ID register values of the ROM table and every component found in it,
+        and can be passed to init_from_snapshot() to recreate the table without reading it.
+        """
+        result = self.cmpid.snapshot()
+        result['entries'] = [c.snapshot() for c in self._components]
+        return result
+
+    def _log_table(self):
+        LOG.info(f"{self.depth_indent}{self.ap.short_description} Class {self.cmpid.component_class:#x} " \
+            f"ROM table #{self.depth} @ {self.address:#08x} (designer={self.cmpid.designer_desc} " \
+            f"part={self.cmpid.part:03x})")
+
     def _read_table(self):
+        """@brief Read the table entries, then identify the components they reference.
+
+        The ID registers of all components that are not in a power domain are read in one batch of
+        deferred reads, so the probe can perform them without a round trip per component. Components in
+        a power domain are read individually once the domain is powered, since that may require a power
+        requestor found earlier in the table.
+        """
+        entries = self._read_entries()
+
+        batch = {}
+        for number, entry in entries:
+            address, powerid = self._decode_entry(entry)
+            if powerid is None:
+                batch[number] = CoreSightComponentID(self, self.ap, address)
+        # Components whose batched read failed are retried individually to report the error.
+        failed = CoreSightComponentID.read_id_registers_batch(list(batch.values()))
+        batch = {number: cmpid for number, cmpid in batch.items() if cmpid not in failed}
+
+        for number, entry in entries:
+            try:
+                self._handle_table_entry(entry, number, batch.get(number))
+            except exceptions.TransferError as err:
+                self._is_complete = False
+                LOG.error("Error attempting to probe CoreSight component referenced by "
+                        "ROM table entry #%d: %s", number, err,
+                        exc_info=self.ap.dp.session.get_current().log_tracebacks)
+
+    def _read_entries(self):
+        """@brief Read the table.
+        @return List of (number, entry) tuples for the present entries.
+        """
         raise NotImplementedError()
 
+    def _decode_entry(self, entry):
+        """@brief Extract the component address and power domain ID from a table entry.
+        @return Bi-tuple of component base address and power ID, or None if the entry has no power ID.
+        """
+        raise NotImplementedError()
+
+    def _handle_table_entry(self, entry, number, cmpid=None):
+        """@brief Parse one ROM table entry.
+
+        @param self
+        @param entry The entry value.
+        @param number Index of the entry in the table.
+        @param cmpid Component ID object with ID registers already read, or None to read them now.
+        """
+        if cmpid is None:
+            address, powerid = self._decode_entry(entry)
+            if powerid is not None:
+                # Attempt to power up this component. Skip this component if we the attempt fails.
+                if not self._power_component(number, powerid, entry):
+                    self._is_complete = False
+                    return
+
+            # Create component instance.
+            cmpid = CoreSightComponentID(self, self.ap, address, powerid)
+            cmpid.read_id_registers()
+
+        self._add_component(cmpid, entry, number)
+
+    def _add_component(self, cmpid, entry, number, snapshot=None):
+        """@brief Add a component referenced by a table entry.
+
+        @param self
+        @param cmpid CoreSightComponentID for the component. Its ID registers must have been read.
+        @param entry The ROM table entry value.
+        @param number Index of the entry in the table.
+        @param snapshot If the component is a ROM table, the snapshot dict to initialize the child
+            table from. If None, a child table is read from the target.
+        """
+        cmpid.rom_entry = entry
+        cmpid.rom_entry_number = number
+
+        # Is this component a power requestor?
+        if cmpid.factory == GPR.factory:
+            # Create the GPR instance and stash it.
+            self.gpr = cmpid.factory(self.ap, cmpid, None)
+            self.gpr.init()
+
+        LOG.info("%s[%d]%s", self.depth_indent, number, str(cmpid))
+
+        # Recurse into child ROM tables.
+        if cmpid.is_rom_table:
+            cmp = ROMTable.create(self.ap, cmpid, cmpid.address, parent_table=self)
+            if snapshot is None:
+                cmp.init()
+            else:
+                cmp.init_from_snapshot(snapshot)
+        else:
+            cmp = cmpid
+
+        self._components.append(cmp)
+
     def for_each(self, action, filter=None):
         """@brief Apply an action to every component defined in the ROM table and child tables.
 
@@ -365,7 +612,8 @@ class Class1ROMTable(ROMTable):
 
     ROM_TABLE_MAX_ENTRIES = 960
 
-    def _read_table(self):
+    def _read_entries(self):
+        entries = []
         entryAddress = self.address
         foundEnd = False
         entriesRead = 0
@@ -373,23 +621,26 @@ class Class1ROMTable(ROMTable):
         while not foundEnd and entriesRead < self.ROM_TABLE_MAX_ENTRIES:
             # Read several entries at a time for performance.
             readCount = min(self.ROM_TABLE_MAX_ENTRIES - entriesRead, self.ROM_TABLE_ENTRY_READ_COUNT)
-            entries = self.ap.read_memory_block32(entryAddress, readCount)
+            data = self.ap.read_memory_block32(entryAddress, readCount)
             entriesRead += readCount
 
-            for entry in entries:
+            for entry in data:
                 # Zero entry indicates the end of the table.
                 if entry == 0:
                     foundEnd = True
                     break
-                try:
-                    self._handle_table_entry(entry, entryNumber)
-                except exceptions.TransferError as err:
-                    LOG.error("Error attempting to probe CoreSight component referenced by "
-                            "ROM table entry #%d: %s", entryNumber, err,
-                            exc_info=self.ap.dp.session.get_current().log_tracebacks)
+                # Nonzero entries can still be disabled, so check the present bit.
+                if (entry & self.ROM_TABLE_ENTRY_PRESENT_MASK) == 0:
+                    LOG.debug("%s[%d]<%08x not present>", self.depth_indent, entryNumber, entry)
+                # Verify the entry format is 32-bit.
+                elif (entry & self.ROM_TABLE_32BIT_FORMAT_MASK) == 0:
+                    LOG.debug("%s[%d]<%08x unsupported 8-bit format>", self.depth_indent, entryNumber, entry)
+                else:
+                    entries.append((entryNumber, entry))
 
                 entryAddress += 4
                 entryNumber += 1
+        return entries
 
     def _power_component(self, number, powerid, entry):
         if self.gpr is None:
@@ -406,16 +657,7 @@ class Class1ROMTable(ROMTable):
             LOG.info("Enabled power to power domain #%d", powerid)
             return True
 
-    def _handle_table_entry(self, entry, number):
-        # Nonzero entries can still be disabled, so check the present bit before handling.
-        if (entry & self.ROM_TABLE_ENTRY_PRESENT_MASK) == 0:
-            LOG.debug("%s[%d]<%08x not present>", self.depth_indent, number, entry)
-            return
-        # Verify the entry format is 32-bit.
-        if (entry & self.ROM_TABLE_32BIT_FORMAT_MASK) == 0:
-            LOG.debug("%s[%d]<%08x unsupported 8-bit format>", self.depth_indent, number, entry)
-            return
-
+    def _decode_entry(self, entry):
         # Get the component's top 4k address.
         offset = entry & self.ROM_TABLE_ADDR_OFFSET_MASK
         if (entry & self.ROM_TABLE_ADDR_OFFSET_NEG_MASK) != 0:
@@ -428,34 +670,10 @@ class Class1ROMTable(ROMTable):
         # Check power ID.
         if (entry & self.ROM_TABLE_POWERIDVALID_MASK) != 0:
             powerid = (entry & self.ROM_TABLE_POWERID_MASK) >> self.ROM_TABLE_POWERID_SHIFT
-
-            # Attempt to power up this component. Skip this component if we the attempt fails.
-            if not self._power_component(number, powerid, entry):
-                return
         else:
             powerid = None
 
-        # Create component instance.
-        cmpid = CoreSightComponentID(self, self.ap, address, powerid)
-        cmpid.read_id_registers()
-
-        # Is this component a power requestor?
-        if cmpid.factory == GPR.factory:
-            # Create the GPR instance and stash it.
-            self.gpr = cmpid.factory(self.ap, cmpid, None)
-            self.gpr.init()
-
-        LOG.info("%s[%d]%s", self.depth_indent, number, str(cmpid))
-
-        # Recurse into child ROM tables.
-        if cmpid.is_rom_table:
-            cmp = ROMTable.create(self.ap, cmpid, address, parent_table=self)
-            cmp.init()
-        else:
-            cmp = cmpid
-
-        if cmp is not None:
-            self.components.append(cmp)
+        return address, powerid
 
 class Class9ROMTable(ROMTable):
     """@brief CoreSight Class 0x9 ROM table component and parser.
@@ -544,14 +762,14 @@ class Class9ROMTable(ROMTable):
         """@brief Whether the ROM table is present in system memory."""
         return self._is_sysmem
 
-    def _read_table(self):
-        """@brief Reads and parses the ROM table."""
+    def _read_entries(self):
         # Compute multipliers for 32- or 64-bit.
         entrySizeMultiplier = self._width // 32
         actualMaxEntries = self.ROM_TABLE_MAX_ENTRIES // entrySizeMultiplier
         # Ensure 64-bit format is read as pairs of 32-bit values.
         entryReadCount = align_down(self.ROM_TABLE_ENTRY_READ_COUNT, entrySizeMultiplier)
 
+        entries = []
         entryAddress = self.address
         foundEnd = False
         entriesRead = 0
@@ -560,14 +778,14 @@ class Class9ROMTable(ROMTable):
         while not foundEnd and entriesRead < actualMaxEntries:
             # Read several entries at a time for performance.
             readCount = min(actualMaxEntries - entriesRead, entryReadCount)
-            entries = self.ap.read_memory_block32(entryAddress, readCount)
+            data = self.ap.read_memory_block32(entryAddress, readCount)
             entriesRead += readCount
 
             # For 64-bit entries, combine pairs of 32-bit values into single 64-bit value.
             if self._width == 64:
-                entries = [(lo | (hi << 32)) for lo, hi in pairwise(entries)]
+                data = [(lo | (hi << 32)) for lo, hi in pairwise(data)]
 
-            for entry in entries:
+            for entry in data:
                 present = entry & self.ROM_TABLE_ENTRY_PRESENT_MASK
 
                 # Zero entry indicates the end of the table.
@@ -575,17 +793,13 @@ class Class9ROMTable(ROMTable):
                     foundEnd = True
                     break
                 elif present == self.ROM_TABLE_ENTRY_PRESENT:
-                    try:
-                        self._handle_table_entry(entry, entryNumber)
-                    except exceptions.TransferError as err:
-                        LOG.error("Error attempting to probe CoreSight component referenced by "
-                                "ROM table entry #%d: %s", entryNumber, err,
-                                exc_info=self.ap.dp.session.get_current().log_tracebacks)
+                    entries.append((entryNumber, entry))
                 else:
                     LOG.debug("%s[%d]<%08x not present>", self.depth_indent, entryNumber, entry)
 
                 entryAddress += 4 * entrySizeMultiplier
                 entryNumber += 1
+        return entries
 
     def _power_component(self, number, powerid, entry):
         """@brief Enable power to a component defined by a ROM table entry."""
@@ -607,8 +821,7 @@ class Class9ROMTable(ROMTable):
             LOG.info("Enabled power to power domain #%d", powerid)
             return True
 
-    def _handle_table_entry(self, entry, number):
-        """@brief Parse one ROM table entry."""
+    def _decode_entry(self, entry):
         # Get the component's top 4k address.
         offset = entry & self.ROM_TABLE_ADDR_OFFSET_MASK[self._width]
         if (entry & self.ROM_TABLE_ADDR_OFFSET_NEG_MASK[self._width]) != 0:
@@ -621,34 +834,10 @@ class Class9ROMTable(ROMTable):
         # Check power ID.
         if (entry & self.ROM_TABLE_ENTRY_POWERIDVALID_MASK) != 0:
             powerid = (entry & self.ROM_TABLE_ENTRY_POWERID_MASK) >> self.ROM_TABLE_ENTRY_POWERID_SHIFT
-
-            # Attempt to power up this component. Skip this component if we the attempt fails.
-            if not self._power_component(number, powerid, entry):
-                return
         else:
             powerid = None
 
-        # Create component instance.
-        cmpid = CoreSightComponentID(self, self.ap, address, powerid)
-        cmpid.read_id_registers()
-
-        # Is this component a power requestor?
-        if cmpid.factory == GPR.factory:
-            # Create the GPR instance and stash it.
-            self.gpr = cmpid.factory(self.ap, cmpid, None)
-            self.gpr.init()
-
-        LOG.info("%s[%d]%s", self.depth_indent, number, str(cmpid))
-
-        # Recurse into child ROM tables.
-        if cmpid.is_rom_table:
-            cmp = ROMTable.create(self.ap, cmpid, address, parent_table=self)
-            cmp.init()
-        else:
-            cmp = cmpid
-
-        if cmp is not None:
-            self._components.append(cmp)
+        return address, powerid
 
     def check_power_request_version(self):
         """@brief Verify the power request functionality version."""
@@ -0,0 +1,247 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import (Any, Dict, Iterator, List, Optional, TYPE_CHECKING)
+
+from ..core import exceptions
+from ..utility.user_files import (is_owned_by_user, make_private_dir, private_temp_dir)
+from .dap import DP_TARGETID
+from .rom_table import CoreSightComponentID
+
+if TYPE_CHECKING:
+    from .dap import DebugPort
+    from .rom_table import ROMTable
+
+LOG = logging.getLogger(__name__)
+
+def default_cache_path() -> str:
+    """@brief Return the default path of the topology cache file for the current user.
+
+    The file is in a directory private to the user, within the shared temporary directory.
+    """
+    return os.path.join(private_temp_dir("pyocd-cache"), "topology.json")
+
+class TopologyCache:
+    """@brief Store of CoreSight ROM table snapshots.
+
+    Snapshots are the dicts returned by ROMTable.snapshot(), keyed by a string that identifies the
+    target and the location of the ROM table. The cache is held in memory and, if a path is given,
+    also in a JSON file so it persists between pyocd invocations. The file is reloaded and merged
+    before each write, so multiple processes can share it.
+    """
+
+    ## Version of the cache file format. Files with a different version are ignored.
+    FORMAT_VERSION = 1
+
+    _instances: Dict[Optional[str], "TopologyCache"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def get_cache(cls, path: Optional[str]) -> "TopologyCache":
+        """@brief Return the shared cache instance for a file path.
+
+        @param path Path of the cache file, or None for a cache that is only held in memory.
+        """
+        with cls._instances_lock:
+            cache = cls._instances.get(path)
+            if cache is None:
+                cache = cls(path)
+                cls._instances[path] = cache
+            return cache
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self._path = path
+        self._entries: Dict[str, Any] = {}
+        self._did_load = False
+        self._lock = threading.RLock()
+
+    @property
+    def path(self) -> Optional[str]:
+        return self._path
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """@brief Return the snapshot stored for a key, or None."""
+        with self._lock:
+            if not self._did_load:
+                self._entries.update(self._read_file())
+                self._did_load = True
+            return self._entries.get(key)
+
+    def put(self, key: str, snapshot: Dict[str, Any]) -> None:
+        """@brief Store a snapshot."""
+        with self._lock:
+            self._entries[key] = snapshot
+            self._write_file({key: snapshot}, [])
+
+    def remove(self, key: str) -> None:
+        """@brief Discard the snapshot for a key, if there is one."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._write_file({}, [key])
+
+    def _read_file(self) -> Dict[str, Any]:
+        if self._path is None or not os.path.exists(self._path):
+            return {}
+        try:
+            with open(self._path, 'r') as f:
+                # Another user could have planted a topology that would be trusted.
+                if not is_owned_by_user(os.fstat(f.fileno())):
+                    LOG.warning("Ignoring topology cache %s that is not owned by the current user",
+                            self._path)
+                    return {}
+                data = json.load(f)
+            if data.get('version') != self.FORMAT_VERSION:
+                LOG.debug("Ignoring topology cache %s with unsupported version", self._path)
+                return {}
+            return data['entries']
+        except (OSError, ValueError, KeyError, AttributeError) as err:
+            LOG.debug("Failed to read topology cache %s: %s", self._path, err)
+            return {}
+
+    def _write_file(self, updates: Dict[str, Any], removals: List[str]) -> None:
+        if self._path is None:
+            return
+        entries = self._read_file()
+        entries.update(updates)
+        for key in removals:
+            entries.pop(key, None)
+        # Write to a new temporary file then rename, so a reader never sees a partial file.
+        try:
+            fd, temp_path = tempfile.mkstemp(suffix=".tmp", prefix=os.path.basename(self._path) + ".",
+                    dir=os.path.dirname(os.path.abspath(self._path)))
+        except OSError as err:
+            LOG.debug("Failed to write topology cache %s: %s", self._path, err)
+            return
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': self.FORMAT_VERSION, 'entries': entries}, f)
+            os.replace(temp_path, self._path)
+        except OSError as err:
+            LOG.debug("Failed to write topology cache %s: %s", self._path, err)
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+class TargetTopology:
+    """@brief Topology cache view for one connected target.
+
+    The target is identified by its DPIDR and, for DPv2 and later, TARGETID. Each ROM table is further
+    identified by its location (for instance the AP and its IDR value) and base address.
+
+    Before a snapshot is used, the ROM table's own ID registers, which have always just been read, are
+    compared with the snapshot. Then the CIDR and PIDR of a few components spread across the snapshot
+    are read back from the target. Only if all match is the table restored from the snapshot.
+    Otherwise the table is read normally and the snapshot replaced.
+    """
+
+    ## Number of components whose ID registers are read to verify a snapshot.
+    SPOT_CHECK_COUNT = 3
+
+    @classmethod
+    def for_dp(cls, dp: "DebugPort") -> Optional["TargetTopology"]:
+        """@brief Return the topology cache view for a DP's target.
+
+        @return A TargetTopology instance, or None if the `cache.topology` option is disabled.
+        """
+        options = dp.session.options
+        if not options.get('cache.topology'):
+            return None
+
+        path = options.get('cache.topology.path')
+        if not path:
+            path = default_cache_path()
+            try:
+                make_private_dir(os.path.dirname(path))
+            except (OSError, RuntimeError) as err:
+                LOG.warning("Topology cache is not saved: %s", err)
+                path = None
+        return cls(TopologyCache.get_cache(path), cls._get_target_key(dp))
+
+    @staticmethod
+    def _get_target_key(dp: "DebugPort") -> str:
+        key = f"dpidr={dp.dpidr.idr:08x}"
+        # TARGETID is only present in DPv2 and later.
+        if dp.dpidr.version >= 2:
+            try:
+                key += f":targetid={dp.read_dp(DP_TARGETID):08x}"
+            except exceptions.Error as err:
+                LOG.debug("Unable to read DP TARGETID: %s", err)
+        return key
+
+    def __init__(self, cache: TopologyCache, target_key: str) -> None:
+        self._cache = cache
+        self._target_key = target_key
+
+    def init_rom_table(self, rom_table: "ROMTable", location: str) -> None:
+        """@brief Initialize a ROM table, restoring it from the cache if possible.
+
+        @param self
+        @param rom_table The ROM table to initialize. Its component ID must have been read from the
+            target.
+        @param location String identifying where the ROM table was found, for instance the AP.
+        """
+        key = f"{self._target_key}:{location}:rom={rom_table.address:08x}"
+        snapshot = self._cache.get(key)
+        if snapshot is not None:
+            if self._verify(rom_table, snapshot):
+                LOG.debug("Restoring ROM table @ %#010x from topology cache", rom_table.address)
+                rom_table.init_from_snapshot(snapshot)
+                return
+            LOG.info("Cached CoreSight topology does not match target; reading ROM table")
+            self._cache.remove(key)
+
+        rom_table.init()
+
+        # Don't save tables that could only be partially read.
+        if rom_table.is_complete:
+            self._cache.put(key, rom_table.snapshot())
+
+    def _verify(self, rom_table: "ROMTable", snapshot: Dict[str, Any]) -> bool:
+        """@brief Check that a snapshot matches the target with a few ID register reads."""
+        cmpid = rom_table.cmpid
+        if (cmpid.cidr, cmpid.pidr, cmpid.devarch) != (snapshot['cidr'], snapshot['pidr'], snapshot['devarch']):
+            return False
+
+        # Components in power domains may not be powered yet, so they can't be checked.
+        candidates = [s for s in self._iter_components(snapshot) if s['power_id'] is None]
+        count = min(len(candidates), self.SPOT_CHECK_COUNT)
+        if count == 1:
+            indices = [0]
+        else:
+            indices = sorted({round(i * (len(candidates) - 1) / (count - 1)) for i in range(count)})
+
+        try:
+            for i in indices:
+                check = CoreSightComponentID.from_snapshot(None, rom_table.ap, candidates[i])
+                if not check.check_id_registers():
+                    return False
+        except exceptions.TransferError as err:
+            LOG.debug("Error verifying cached topology: %s", err)
+            return False
+        return True
+
+    @classmethod
+    def _iter_components(cls, snapshot: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        for entry in snapshot['entries']:
+            yield entry
+            if 'entries' in entry:
+                yield from cls._iter_components(entry)
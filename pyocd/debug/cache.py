@@ -53,6 +53,30 @@ class CachingDebugContext(DebugContext):
     def write_core_registers_raw(self, reg_list, data_list):
         return self._regcache.write_core_registers_raw(reg_list, data_list)
 
+    def set_halted(self) -> bool:
+        """@brief Check once whether the core is halted, and if so let the caches rely on it.
+
+        Until the core next runs, cached accesses skip reading the core state, which otherwise
+        costs a target access for every read.
+
+        @return Whether the core is halted.
+        """
+        if not self.core.is_halted():
+            return False
+        if self._enable_register:
+            self._regcache.set_halted()
+        if self._enable_memory:
+            self._memcache.set_halted()
+        return True
+
+    def prefetch_memory(self, ranges) -> None:
+        """@brief Read memory ranges into the memory cache ahead of their use.
+
+        See MemoryCache.prefetch(). Nothing is read if the memory cache is disabled.
+        """
+        if self._enable_memory:
+            self._memcache.prefetch(ranges)
+
     def invalidate(self):
         if self._enable_register:
             self._regcache.invalidate()
@@ -80,6 +80,9 @@ class DebugContext(MemoryInterface):
     def read_memory_block32(self, addr, size):
         return self._parent.read_memory_block32(addr, size)
 
+    def read_memory_block32_deferred(self, addr, size):
+        return self._parent.read_memory_block32_deferred(addr, size)
+
     def read_core_register(self, reg):
         """@brief Read one core register.
 
@@ -15,6 +15,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from binascii import crc32
 from elftools.elf.elffile import ELFFile
 from elftools.elf.constants import SH_FLAGS
 
@@ -120,6 +121,7 @@ class ELFBinaryFile(object):
 
         self._symbol_decoder = None
         self._address_decoder = None
+        self._crc = None
 
         self._extract_sections()
         self._compute_regions()
@@ -225,6 +227,25 @@ class ELFBinaryFile(object):
         """
         return self._unused
 
+    @property
+    def crc(self):
+        """@brief CRC-32 of the contents of the ELF file.
+
+        The file is read only the first time this property is accessed.
+        """
+        if self._crc is None:
+            position = self._file.tell()
+            self._file.seek(0)
+            crc = 0
+            while True:
+                data = self._file.read(64 * 1024)
+                if not data:
+                    break
+                crc = crc32(data, crc)
+            self._file.seek(position)
+            self._crc = crc
+        return self._crc
+
     @property
     def symbol_decoder(self):
         if self._symbol_decoder is None:
@@ -22,13 +22,19 @@
 # limitations under the License.
 
 from abc import ABC, abstractmethod
+from binascii import crc32
+from collections import deque
 from ctypes import Structure, c_char, c_int32, c_uint32, sizeof
+import logging
 import struct
-from typing import Optional, Sequence
+from typing import Dict, Optional, Sequence, Tuple
 
 from ..core.memory_map import MemoryMap, MemoryRegion, MemoryType
 from ..core.soc_target import SoCTarget
 from ..core import exceptions
+from ..utility.mask import (align_down, align_up)
+
+LOG = logging.getLogger(__name__)
 
 
 class SEGGER_RTT_BUFFER_UP(Structure):
@@ -73,8 +79,12 @@ class RTTUpChannel(ABC):
     size: int
 
     @abstractmethod
-    def read(self) -> bytes:
-        """@brief Read all available data from RTT channel. """
+    def read(self, max_size: Optional[int] = None) -> bytes:
+        """@brief Read available data from RTT channel.
+
+        @param max_size Maximum number of bytes to read. If None, all available data is read. Data
+            that is not read remains in the target's buffer.
+        """
 
 
 class RTTDownChannel(ABC):
@@ -214,8 +224,12 @@ class GenericRTTUpChannel(RTTUpChannel):
         else:
             return (self.size - read_off) + write_off
 
-    def read(self) -> bytes:
-        """@brief Read all available data from RTT channel. """
+    def read(self, max_size: Optional[int] = None) -> bytes:
+        """@brief Read available data from RTT channel.
+
+        @param max_size Maximum number of bytes to read. If None, all available data is read. Data
+            that is not read remains in the target's buffer.
+        """
         if (self.size == 0) or (self._buffer_address == 0):
             # descriptor is not yet populated
             self._read_descriptor()
@@ -228,7 +242,7 @@ class GenericRTTUpChannel(RTTUpChannel):
 
         if (write_off >= self.size) or (read_off >= self.size):
             raise exceptions.RTTError("Invalid up buffer")
-        elif write_off == read_off:
+        elif (write_off == read_off) or (max_size == 0):
             # empty
             return b''
         elif write_off > read_off:
@@ -236,6 +250,8 @@ class GenericRTTUpChannel(RTTUpChannel):
             |oooooo|xxxxxxxxxxxx|oooooo|
             0    rdOff        WrOff    SizeOfBuffer
             """
+            if max_size is not None:
+                write_off = min(write_off, read_off + max_size)
             data = self._target.read_memory_block8(self._buffer_address + read_off,
                                                    write_off - read_off)
         else:
@@ -243,9 +259,16 @@ class GenericRTTUpChannel(RTTUpChannel):
             |xxxxxx|oooooooooooo|xxxxxx|
             0    WrOff        RdOff    SizeOfBuffer
             """
-            data = self._target.read_memory_block8(self._buffer_address + read_off,
-                                                   self.size - read_off)
-            data += self._target.read_memory_block8(self._buffer_address, write_off)
+            if (max_size is not None) and (max_size <= self.size - read_off):
+                # Only the top of the buffer is read.
+                data = self._target.read_memory_block8(self._buffer_address + read_off, max_size)
+                write_off = (read_off + max_size) % self.size
+            else:
+                if max_size is not None:
+                    write_off = min(write_off, max_size - (self.size - read_off))
+                data = self._target.read_memory_block8(self._buffer_address + read_off,
+                                                       self.size - read_off)
+                data += self._target.read_memory_block8(self._buffer_address, write_off)
 
         # Update read offset
         self._target.write32(self._offsets_addr + 4, write_off)
@@ -393,6 +416,21 @@ class GenericRTTControlBlock(RTTControlBlock):
     _cb_search_size: int
     _control_block_id: bytes
 
+    ## Size of each block read while searching for the control block.
+    _SEARCH_CHUNK_SIZE = 0x4000
+
+    ## Number of block reads queued ahead of the one being searched.
+    _SEARCH_READ_AHEAD = 4
+
+    ## Number of bytes at the start of boot memory used to identify the firmware.
+    _FIRMWARE_ID_SIZE = 64
+
+    ## Maximum number of up or down buffers of a plausible control block.
+    _MAX_BUFFERS = 32
+
+    ## Control block addresses found by previous searches, keyed by target, firmware, and search parameters.
+    _address_cache: Dict[Tuple, int] = {}
+
     def __init__(self, target: SoCTarget, address: int = None,
                  size: int = None, control_block_id: bytes = b'SEGGER RTT'):
         """
@@ -427,26 +465,146 @@ class GenericRTTControlBlock(RTTControlBlock):
         self._control_block_id = control_block_id
 
     def _find_control_block(self) -> Optional[int]:
+        """@brief Locate the control block.
+
+        The address of the _SEGGER_RTT symbol from the target's ELF file is checked first. Failing
+        that, the address found by the last search for the same target and firmware is used if it
+        still holds a plausible control block. Only if neither is found is the search range scanned.
+        """
+        symbol_address = self._get_symbol_address()
+        if (symbol_address is not None) and self._is_control_block_at(symbol_address):
+            LOG.debug("RTT control block found at %#010x from ELF symbol", symbol_address)
+            return symbol_address
+
+        cache_key = self._get_cache_key()
+        cb_addr = self._address_cache.get(cache_key)
+        if (cb_addr is not None) and self._is_control_block_at(cb_addr) \
+                and self._are_buffers_in_range(cb_addr):
+            LOG.debug("RTT control block found at %#010x from cached address", cb_addr)
+            return cb_addr
+
+        cb_addr = self._search_control_block()
+        if cb_addr is not None:
+            self._address_cache[cache_key] = cb_addr
+        return cb_addr
+
+    def _get_cache_key(self) -> Tuple:
+        """@brief Return the address cache key for this target, firmware, and search."""
+        # Identify the firmware by the CRC of the ELF file if there is one. Otherwise use the CRC of the
+        # start of boot memory, normally the vector table.
+        firmware_id = None
+        elf = getattr(self.target, 'elf', None)
+        if elf is not None:
+            firmware_id = ('elf', elf.crc)
+        else:
+            boot_memory = self.target.get_memory_map().get_boot_memory()
+            if boot_memory is not None:
+                try:
+                    firmware_id = crc32(bytes(self.target.read_memory_block8(boot_memory.start,
+                            self._FIRMWARE_ID_SIZE)))
+                except exceptions.TransferError:
+                    pass
+        return (self.target.session.target.part_number, self.target.node_name, firmware_id,
+                self._control_block_id, self._cb_search_address, self._cb_search_size)
+
+    def _get_symbol_address(self) -> Optional[int]:
+        """@brief Return the address of the _SEGGER_RTT symbol if the target has an ELF file."""
+        elf = getattr(self.target, 'elf', None)
+        if elf is None:
+            return None
+        symbol_info = elf.symbol_decoder.get_symbol_for_name('_SEGGER_RTT')
+        return symbol_info.address if symbol_info else None
+
+    def _is_control_block_at(self, addr: int) -> bool:
+        """@brief Check whether the control block ID is at an address within the search range."""
+        id_size = len(self._control_block_id)
+        search_end = self._cb_search_address + max(self._cb_search_size, id_size)
+        if not (self._cb_search_address <= addr <= search_end - id_size):
+            return False
+        try:
+            return bytes(self.target.read_memory_block8(addr, id_size)) == self._control_block_id
+        except exceptions.TransferError:
+            return False
+
+    def _are_buffers_in_range(self, addr: int) -> bool:
+        """@brief Check that the buffers of a control block are within the search range.
+
+        Different firmware may leave a stale control block ID at a cached address, or have identical
+        boot memory. The buffer pointers of a valid control block are within the search range, unless
+        the range is only the control block's exact address.
+        """
+        if self._cb_search_size == 0:
+            return True
+        try:
+            num_up, num_down = struct.unpack("<ii", bytes(self.target.read_memory_block8(
+                    addr + SEGGER_RTT_CB.MaxNumUpBuffers.offset, 8)))
+            if not ((0 <= num_up <= self._MAX_BUFFERS) and (0 <= num_down <= self._MAX_BUFFERS)):
+                return False
+            desc_size = sizeof(SEGGER_RTT_BUFFER_UP)
+            data = bytes(self.target.read_memory_block8(addr + sizeof(SEGGER_RTT_CB),
+                    (num_up + num_down) * desc_size))
+        except exceptions.TransferError:
+            return False
+
+        search_end = self._cb_search_address + self._cb_search_size
+        for offset in range(0, len(data), desc_size):
+            descriptor = SEGGER_RTT_BUFFER_UP.from_buffer_copy(data, offset)
+            if (descriptor.pBuffer == 0) or (descriptor.SizeOfBuffer == 0):
+                continue
+            if not (self._cb_search_address <= descriptor.pBuffer
+                    and descriptor.pBuffer + descriptor.SizeOfBuffer <= search_end):
+                return False
+        return True
+
+    def _search_control_block(self) -> Optional[int]:
+        """@brief Scan the search range for the control block ID.
+
+        The range is read as word aligned blocks. Several block reads are queued ahead of the one
+        being searched so the probe is kept busy.
+        """
         id_bytes: bytes = self._control_block_id
         id_size: int = len(id_bytes)
-        addr: int = self._cb_search_address
-        search_size: int  = max(self._cb_search_size, id_size)
-        carry_over_size: int = (1 - id_size) // 4 * 4 # it's negative!
-        chunk_size: int = 1024
-
-        data: bytes = b''
-        while search_size:
-            read_size: int = min(search_size, chunk_size)
-            prev: bytes = data[carry_over_size:]
-            data = bytes(self.target.read_memory_block8(addr, read_size))
-            idx: int = (prev + data).find(id_bytes)
-            if idx >= 0:
-                return addr - len(prev) + idx
-
-            addr += read_size
-            search_size -= read_size
-
-        return None
+        start: int = self._cb_search_address
+        end: int = start + max(self._cb_search_size, id_size)
+
+        # Queue of (address, callback) for pending block reads.
+        pending = deque()
+        next_addr: int = align_down(start, 4)
+        aligned_end: int = align_up(end, 4)
+
+        def queue_reads():
+            nonlocal next_addr
+            while (len(pending) <= self._SEARCH_READ_AHEAD) and (next_addr < aligned_end):
+                read_size = min(aligned_end - next_addr, self._SEARCH_CHUNK_SIZE)
+                pending.append((next_addr,
+                        self.target.read_memory_block32_deferred(next_addr, read_size // 4)))
+                next_addr += read_size
+
+        found = None
+        prev: bytes = b''
+        try:
+            queue_reads()
+            while pending:
+                addr, read_cb = pending.popleft()
+                words = read_cb()
+                data = struct.pack(f"<{len(words)}I", *words)
+                queue_reads()
+
+                # Search the new data plus the end of the previous block, in case the ID spans blocks.
+                idx: int = (prev + data).find(id_bytes, max(start - (addr - len(prev)), 0))
+                if (idx >= 0) and (addr - len(prev) + idx + id_size <= end):
+                    found = addr - len(prev) + idx
+                    break
+                prev = data[-(id_size - 1):] if id_size > 1 else b''
+        finally:
+            # Complete the reads that were queued after the control block was found.
+            for _, read_cb in pending:
+                try:
+                    read_cb()
+                except exceptions.TransferError:
+                    pass
+
+        return found
 
     def start(self):
         """@brief Find the RTT control block on the target.
@@ -18,19 +18,25 @@
 
 import logging
 import abc
-from dataclasses import dataclass
+from dataclasses import (dataclass, field)
 from time import time
 from binascii import crc32
-from typing import (Any, List, Optional, Union)
+from collections import deque
+from typing import (Any, Dict, List, Optional, Union)
 
 from ..core.target import Target
-from ..core.exceptions import (FlashFailure, FlashProgramFailure)
+from ..core.exceptions import (FlashFailure, FlashProgramFailure, FlashVerifyFailure)
 from ..core.memory_map import MemoryRegion
 from ..utility.mask import same
+from .timing import OperationTiming
 
 # Number of bytes in a page to read to quickly determine if the page has the same data
 PAGE_ESTIMATE_SIZE = 32
+# Size of the ranges whose CRC is computed by the analyzer when verifying
+VERIFY_CHUNK_SIZE = 4096
 DATA_TRANSFER_B_PER_S = 40 * 1000 # ~40KB/s, depends on clock speed, theoretical limit for HID is 56,000 B/s
+# Weight of calling a flash algo function: setting registers, resuming, and waiting for the halt
+ALGO_CALL_WEIGHT = 0.005
 
 LOG = logging.getLogger(__name__)
 
@@ -62,6 +68,7 @@ class ProgrammingInfo:
     erase_sector_count: int = 0
     skipped_byte_count: int = 0
     skipped_page_count: int = 0
+    operation_timings: Dict[str, OperationTiming] = field(default_factory=dict) # Observed flash algo operation durations
 
 class MemoryBuilder(abc.ABC):
     """@brief Abstract class for memory builders."""
@@ -96,6 +103,11 @@ class MemoryBuilder(abc.ABC):
         """@brief Commit the buffered data to the destination memory region."""
         ...
 
+    @abc.abstractmethod
+    def verify(self, method: str = "crc") -> None:
+        """@brief Check that the destination memory region contains the buffered data."""
+        ...
+
 def _stub_progress(percent):
     pass
 
@@ -519,6 +531,9 @@ class FlashBuilder(MemoryBuilder):
         chip_erase_count, chip_erase_program_time = self._compute_chip_erase_pages_and_weight()
         sector_erase_min_program_time = self._compute_sector_erase_pages_weight_min()
 
+        # A sector erase may be turned into a chip erase only if the erase type wasn't specified.
+        allow_erase_all = chip_erase is None
+
         # If chip_erase hasn't been specified determine if chip erase is faster
         # than page erase regardless of contents
         if chip_erase is None:
@@ -533,7 +548,7 @@ class FlashBuilder(MemoryBuilder):
         if chip_erase:
             self._chip_erase(progress_cb)
         else:
-            self._erase_sectors(progress_cb)
+            self._erase_sectors(progress_cb, allow_erase_all)
 
         progress_cb(1.0)
 
@@ -543,6 +558,7 @@ class FlashBuilder(MemoryBuilder):
 
         self.last_erase_was_chip = chip_erase
         self.perf.erase_time = erase_finish - erase_start
+        self.perf.operation_timings = self.flash.timing.timings
 
         # Send notification that we're done erasing flash.
         self.flash.target.session.notify(Target.Event.POST_FLASH_ERASE, self)
@@ -599,7 +615,10 @@ class FlashBuilder(MemoryBuilder):
 
         self.algo_inited_for_read = False
 
-        if self.flash.is_double_buffering_supported and self.enable_double_buffering:
+        if self.flash.is_resident_loop_enabled:
+            LOG.debug("Using resident loop program")
+            self._program_resident_loop(progress_cb)
+        elif self.flash.is_double_buffering_supported and self.enable_double_buffering:
             LOG.debug("Using double buffer program")
             self._program_double_buffer(progress_cb)
         else:
@@ -612,6 +631,7 @@ class FlashBuilder(MemoryBuilder):
         self.flash.cleanup()
 
         self.perf.program_time = program_finish - program_start
+        self.perf.operation_timings = self.flash.timing.timings
         self.perf.program_type = FlashBuilder.FLASH_CHIP_ERASE if self.last_erase_was_chip else FlashBuilder.FLASH_SECTOR_ERASE
 
         erase_byte_count = 0
@@ -663,6 +683,50 @@ class FlashBuilder(MemoryBuilder):
     def get_performance(self):
         return self.perf
 
+    def verify(self, method="crc"):
+        """@brief Check that flash contains the data added with add_data().
+
+        With the "crc" method, the CRC32 analyzer computes the CRC of each chunk of data on the
+        target, and only chunks whose CRC does not match are read back to locate the difference. If
+        the analyzer is not supported, or with the "read" method, all data is read back.
+
+        @param self
+        @param method Either "crc" or "read".
+
+        @exception FlashVerifyFailure
+        """
+        if method not in ("crc", "read"):
+            raise ValueError("invalid verify method '{}'".format(method))
+        if not self.flash.region.is_readable:
+            LOG.warning("Flash region '%s' is not readable; skipping verify", self.flash.region.name)
+            return
+
+        # Split the data into chunks.
+        chunks = [
+            (op.addr + offset, bytearray(op.data[offset:offset + VERIFY_CHUNK_SIZE]))
+            for op in self.flash_operation_list
+            for offset in range(0, len(op.data), VERIFY_CHUNK_SIZE)
+        ]
+
+        verify_start = time()
+        self._enable_read_access()
+        try:
+            if method == "crc" and self.flash.get_flash_info().crc_supported:
+                crcs = self.flash.compute_crcs([(addr, len(data)) for addr, data in chunks])
+                chunks = [(addr, data) for (addr, data), crc in zip(chunks, crcs) if crc != crc32(data)]
+                LOG.debug("%d chunks with mismatched CRC", len(chunks))
+
+            for addr, data in chunks:
+                actual = bytearray(self.flash.target.read_memory_block8(addr, len(data)))
+                if actual != data:
+                    offset = next(i for i in range(len(data)) if actual[i] != data[i])
+                    raise FlashVerifyFailure("flash verify failed at {:#010x}: {:#04x} (memory) != {:#04x} (expected)"
+                            .format(addr + offset, actual[offset], data[offset]), address=addr + offset)
+        finally:
+            self.flash.cleanup()
+            self.algo_inited_for_read = False
+        LOG.debug("Verify time: %f", time() - verify_start)
+
     def _mark_all_pages_for_programming(self):
         for sector in self.sector_list:
             sector.erased = False
@@ -787,7 +851,7 @@ class FlashBuilder(MemoryBuilder):
                     pass
 
             if sector.are_any_pages_not_same():
-                sector_erase_weight += sector.erase_weight
+                sector_erase_weight += self._get_sector_erase_weight(sector)
 
         self.sector_erase_count = sector_erase_count
         self.sector_erase_weight = sector_erase_weight
@@ -854,26 +918,29 @@ class FlashBuilder(MemoryBuilder):
         self.flash.erase_all()
         self.flash.uninit()
 
-    def _erase_sectors(self, progress_cb=_stub_progress):
-        """@brief Perform sector erase on sectors that need it."""
-        progress = 0
-        erase_weight = sum(
-            sector.erase_weight
+    def _erase_sectors(self, progress_cb=_stub_progress, allow_erase_all=False):
+        """@brief Perform sector erase on sectors that need it.
+
+        All sectors are erased as one batch by Flash.erase_sectors().
+        """
+        addrs = [
+            addr
             for sector in self.sector_list if sector.are_any_pages_not_same()
-        )
+            for addr in sector.addrs
+        ]
 
         self.flash.init(self.flash.Operation.ERASE)
-        for sector in self.sector_list:
-            if sector.are_any_pages_not_same():
-                if self.region.is_erasable:
-                    # Erase the sector
-                    for addr in sector.addrs:
-                        self.flash.erase_sector(addr)
-                    progress += sector.erase_weight
-                    if erase_weight > 0:
-                        progress_cb(float(progress) / float(erase_weight))
+        if self.region.is_erasable:
+            self.flash.erase_sectors(addrs, progress_cb, allow_erase_all)
         self.flash.uninit()
 
+    def _get_sector_erase_weight(self, sector):
+        """@brief Erase weight of a sector, accounting for erases queued to the resident loop."""
+        if self.flash.is_resident_loop_enabled:
+            # Queued erases don't pay for halting, setting registers, and resuming per sector.
+            return max(sector.erase_weight - ALGO_CALL_WEIGHT, 0.0)
+        return sector.erase_weight
+
     def _next_nonsame_page(self, i):
         if i >= len(self.page_list):
             return None, i
@@ -886,7 +953,12 @@ class FlashBuilder(MemoryBuilder):
         return page, i + 1
 
     def _program_double_buffer(self, progress_cb=_stub_progress):
-        """@brief Double-buffered program."""
+        """@brief Program using a ring of page buffers.
+
+        While the algo programs one page, following pages are loaded into the other page buffers. With
+        more than two buffers, loading continues as long as a buffer is free and the algo is still
+        busy, so up to one less than the number of buffers pages are queued in target RAM.
+        """
         progress = 0
         program_timeout = self.flash.target.session.options.get('flash.timeout.program')
         program_weight = sum(
@@ -896,8 +968,9 @@ class FlashBuilder(MemoryBuilder):
         )
 
         # Set up page and buffer info.
-        current_buf = 0
-        next_buf = 1
+        buffer_count = self.flash.page_buffer_count
+        next_buf = 0
+        loaded = deque() # Pages loaded into buffers and not yet started, with buffer numbers.
         page, i = self._next_nonsame_page(0)
 
         # Make sure there are actually pages to program differently from current flash contents.
@@ -905,38 +978,79 @@ class FlashBuilder(MemoryBuilder):
             self.flash.init(self.flash.Operation.PROGRAM)
 
             # Load first page buffer
-            self.flash.load_page_buffer(current_buf, page.addr, page.data)
+            self.flash.load_page_buffer(next_buf, page.addr, page.data)
+            loaded.append((page, next_buf))
+            next_buf = (next_buf + 1) % buffer_count
+            page, i = self._next_nonsame_page(i)
 
-            while page is not None:
-                assert page.same is not None
+            while loaded:
+                current_page, current_buf = loaded.popleft()
+                assert current_page.same is not None
 
                 # Kick off this page program.
-                current_addr = page.addr
-                current_weight = page.get_program_weight()
+                current_addr = current_page.addr
+                current_weight = current_page.get_program_weight()
 
                 self.flash.start_program_page_with_buffer(current_buf, current_addr)
 
-                # Get next page and load it.
-                page, i = self._next_nonsame_page(i)
-                if page is not None:
+                # Load following pages into free buffers. The buffer being programmed is in use.
+                while (page is not None) and (len(loaded) < buffer_count - 1):
                     self.flash.load_page_buffer(next_buf, page.addr, page.data)
+                    loaded.append((page, next_buf))
+                    next_buf = (next_buf + 1) % buffer_count
+                    page, i = self._next_nonsame_page(i)
+
+                    # Stop queuing once the algo is done with the current page, so it isn't left idle.
+                    if (page is not None) and (len(loaded) < buffer_count - 1) \
+                            and (self.flash.target.get_state() != Target.State.RUNNING):
+                        break
 
                 # Wait for the program to complete.
-                result = self.flash.wait_for_completion(timeout=program_timeout)
+                result = self.flash.wait_for_completion(timeout=program_timeout, operation='program_page')
                 if result == self.flash.TIMEOUT_ERROR:
                     raise FlashProgramFailure('flash program page timeout', address=current_addr, result_code=result)
                 elif result != 0:
                     raise FlashProgramFailure('flash program page failure', address=current_addr, result_code=result)
 
-                # Swap buffers.
-                current_buf, next_buf = next_buf, current_buf
-
                 # Update progress
                 progress += current_weight
                 if program_weight > 0:
                     progress_cb(float(progress) / float(program_weight))
             self.flash.uninit()
 
+    def _program_resident_loop(self, progress_cb=_stub_progress):
+        """@brief Program by queuing pages to the resident loop running on the target."""
+        program_weight = sum(
+            page.get_program_weight()
+            for sector in self.sector_list if sector.are_any_pages_not_same()
+            for page in sector.page_list
+        )
+
+        page, i = self._next_nonsame_page(0)
+
+        # Make sure there are actually pages to program differently from current flash contents.
+        if page is not None:
+            # Program weights of queued pages that have not completed, to convert the loop's
+            # completed count to progress.
+            pending_weights = deque()
+            completed_weight = 0.0
+            completed_count = 0
+            self.flash.init(self.flash.Operation.PROGRAM)
+            loop = self.flash.get_resident_loop()
+            loop.start()
+            while page is not None:
+                assert page.same is not None
+                loop.program_page(page.addr, page.data)
+                pending_weights.append(page.get_program_weight())
+                while completed_count < loop.completed_count:
+                    completed_weight += pending_weights.popleft()
+                    completed_count += 1
+                if program_weight > 0:
+                    progress_cb(completed_weight / float(program_weight))
+                page, i = self._next_nonsame_page(i)
+            loop.finish()
+            self.flash.uninit()
+
     def _program_pages(self, progress_cb=_stub_progress):
         """@brief Program pages that need programming."""
         progress = 0
@@ -106,8 +106,9 @@ class FlashEraser(object):
                 LOG.info("Chip erase complete")
 
     def _sector_erase(self, addresses):
-        flash = None
-        currentRegion = None
+        # Sector addresses to erase for each flash region. All sectors of a region are erased as one
+        # batch by Flash.erase_sectors().
+        region_sectors = {}
 
         for spec in addresses:
             # Convert the spec into a start and end address.
@@ -124,16 +125,7 @@ class FlashEraser(object):
                     LOG.warning("address 0x%08x is not in flash", sector_addr)
                     break
 
-                # Handle switching regions.
-                if region is not currentRegion:
-                    # Clean up previous flash.
-                    if flash is not None:
-                        flash.cleanup()
-
-                    currentRegion = region
-                    flash = region.flash
-                    flash.init(flash.Operation.ERASE)
-
+                flash = region.flash
                 assert flash is not None
 
                 # Get sector info for the current address.
@@ -147,13 +139,15 @@ class FlashEraser(object):
                     LOG.warning("sector address 0x%08x is unaligned", sector_addr)
                     sector_addr -= delta
 
-                # Erase this page.
                 LOG.info("Erasing sector 0x%08x (%d bytes)", sector_addr, sector_info.size)
-                flash.erase_sector(sector_addr)
+                region_sectors.setdefault(region, []).append(sector_addr)
 
                 sector_addr += sector_info.size
 
-        if flash is not None:
+        for region, sector_addrs in region_sectors.items():
+            flash = region.flash
+            flash.init(flash.Operation.ERASE)
+            flash.erase_sectors(sector_addrs)
             flash.cleanup()
 
     def _convert_spec(self, spec):
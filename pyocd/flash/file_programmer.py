@@ -63,7 +63,8 @@ class FileProgrammer(object):
             smart_flash: Optional[bool] = None,
             trust_crc: Optional[bool] = None,
             keep_unwritten: Optional[bool] = None,
-            no_reset: Optional[bool] = None
+            no_reset: Optional[bool] = None,
+            verify: Optional[str] = None
         ):
         """@brief Constructor.
 
@@ -85,11 +86,14 @@ class FileProgrammer(object):
             data. This parameter sets whether the existing contents of those unwritten ranges will
             be read from memory and restored while programming.
         @param no_reset Deprecated and ignored. Will be removed in a future release.
+        @param verify Sets whether and how programmed data is verified. The value must be one of
+            "off", "crc", or "read".
         """
         self._session = session
         if no_reset is not None:
             LOG.warning("FileProgrammer no_reset parameter is deprecated and ignored; this option will be removed in a future release")
-        self._loader = FlashLoader(session, progress, chip_erase, smart_flash, trust_crc, keep_unwritten)
+        self._loader = FlashLoader(session, progress, chip_erase, smart_flash, trust_crc, keep_unwritten,
+                verify=verify)
 
         self._format_handlers: Dict[str, Callable[..., None]] = {
             'axf': self._program_elf,
@@ -258,3 +262,20 @@ class FileProgrammer(object):
             else:
                 LOG.debug("Skipping segment LMA:0x%08x, VMA:0x%08x, size %d", addr,
                           segment['p_vaddr'], segment.header.p_filesz)
+
+    def verify(self, file_or_path: Union[str, IO[bytes]], file_format: Optional[str] = None,
+            method: str = 'crc', **kwargs: Any) -> None:
+        """@brief Check that memory contains the contents of a file, without programming it.
+
+        @param self
+        @param file_or_path Either a string that is a path to a file, or a file-like object.
+        @param file_format Optional file format name. See add_file().
+        @param method Either "crc" or "read". "crc" compares CRC32s computed on the target, and reads
+            back only data whose CRC does not match. "read" reads back all data.
+        @param kwargs Optional keyword arguments for format-specific parameters. See add_file().
+
+        @exception FlashVerifyFailure Flash does not contain the file's data.
+        @exception TargetError RAM does not contain the file's data.
+        """
+        self.add_file(file_or_path, file_format, **kwargs)
+        self._loader.verify(method)
@@ -19,35 +19,74 @@
 from dataclasses import dataclass
 import logging
 from enum import IntEnum
+from time import (sleep, time)
 
 from ..core import exceptions
 from ..core.target import Target
 from ..coresight.cortex_m import CortexM
 from ..core.exceptions import (FlashFailure, FlashEraseFailure, FlashProgramFailure)
-from ..utility.mask import (align_down, msb)
+from ..utility.mask import align_down
 from ..utility.timeout import Timeout
 from .builder import FlashBuilder
+from .resident import ResidentLoop
+from .timing import FlashTimingModel
 
 LOG = logging.getLogger(__name__)
 TRACE = LOG.getChild("trace")
 TRACE.setLevel(logging.CRITICAL)
 
-# Program to compute the CRC of sectors.  This works on cortex-m processors.
-# Code is relocatable and only needs to be on a 4 byte boundary.
-# 200 bytes of executable data below + 1024 byte crc table = 1224 bytes
+# Program to compute the CRC32 of memory ranges. This works on all Cortex-M processors.
+# Code is relocatable and only needs to be on a 4 byte boundary. It is followed by the 1024 byte CRC
+# table, which is computed by the host, for a total of 1080 bytes.
 # Usage requirements:
 # -In memory reserve 0x600 for code & table
-# -Make sure data buffer is big enough to hold 4 bytes for each page that could be checked (ie.  >= num pages * 4)
+# -Call with r0 = array of (address, length) word pairs, r1 = number of pairs, r2 = CRC table address.
+#  The address of each pair is replaced by the CRC32 of the range. Ranges may have any address and length.
+#
+#           push    {r4-r7, lr}
+#           lsls    r1, r1, #3
+#           adds    r1, r0, r1          ; r1 = end of range array
+#   next:   cmp     r0, r1
+#           beq     exit
+#           ldr     r3, [r0, #0]        ; r3 = address
+#           ldr     r4, [r0, #4]
+#           adds    r4, r3, r4          ; r4 = end address
+#           movs    r5, #0
+#           mvns    r5, r5              ; crc = 0xffffffff
+#   byte:   cmp     r3, r4
+#           beq     store
+#           ldrb    r6, [r3]
+#           adds    r3, #1
+#           eors    r6, r5
+#           lsls    r6, r6, #24
+#           lsrs    r6, r6, #22         ; r6 = ((crc ^ byte) & 0xff) * 4
+#           ldr     r6, [r2, r6]
+#           lsrs    r5, r5, #8
+#           eors    r5, r6              ; crc = (crc >> 8) ^ table[r6]
+#           b       byte
+#   store:  mvns    r5, r5
+#           str     r5, [r0, #0]
+#           adds    r0, #8
+#           b       next
+#   exit:   movs    r0, #0
+#           pop     {r4-r7, pc}
 _ANALYZER_CODE = (
-    0x2780b5f0, 0x25004684, 0x4e2b2401, 0x447e4a2b, 0x0023007f, 0x425b402b, 0x40130868, 0x08584043,
-    0x425b4023, 0x40584013, 0x40200843, 0x40104240, 0x08434058, 0x42404020, 0x40584010, 0x40200843,
-    0x40104240, 0x08434058, 0x42404020, 0x40584010, 0x40200843, 0x40104240, 0x08584043, 0x425b4023,
-    0x40434013, 0xc6083501, 0xd1d242bd, 0xd01f2900, 0x46602301, 0x469c25ff, 0x00894e11, 0x447e1841,
-    0x88034667, 0x409f8844, 0x2f00409c, 0x2201d012, 0x4252193f, 0x34017823, 0x402b4053, 0x599b009b,
-    0x405a0a12, 0xd1f542bc, 0xc00443d2, 0xd1e74281, 0xbdf02000, 0xe7f82200, 0x000000b2, 0xedb88320,
-    0x00000042,
+    0x00c9b5f0, 0x42881841, 0x6803d013, 0x191c6844, 0x43ed2500, 0xd00842a3, 0x3301781e, 0x0636406e,
+    0x59960db6, 0x40750a2d, 0x43ede7f4, 0x30086005, 0x2000e7e9, 0xbf00bdf0,
     )
 
+def _make_crc32_table():
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ (0xedb88320 if (crc & 1) else 0)
+        table.append(crc)
+    return tuple(table)
+
+## Table for the reflected CRC32 polynomial used by the analyzer, same as zlib's crc32().
+_CRC32_TABLE = _make_crc32_table()
+
 @dataclass
 class SectorInfo:
     """@brief Info about an erase sector."""
@@ -106,6 +145,9 @@ class Flash:
     - `analyzer_supported`: Whether the CRC32-based analyzer is supported.
     - `analyzer_address`: RAM base address where the analyzer code will be placed. There must be at
         least 0x600 free bytes after this address.
+    - `resident_address`: RAM base address where the resident programming loop will be placed. There
+        must be at least 0x100 free bytes after this address. Optional. If not provided, the analyzer's
+        RAM is used when the analyzer is supported, since the two are never used at the same time.
 
     All of the "pc_" entry point key values must have bit 0 set to indicate a Thumb function.
     """
@@ -134,6 +176,10 @@ class Flash:
         self._region = None
         self._did_prepare_target = False
         self._active_operation = None
+        self._timing = None
+        self._operation_start = 0.0
+        # Cached data cache state of the core, read when first needed. Reset by cleanup().
+        self._is_data_cache_enabled = None
         if flash_algo is not None:
             self.is_valid = True
             self.use_analyzer = flash_algo['analyzer_supported']
@@ -143,6 +189,9 @@ class Flash:
             self.page_buffers = flash_algo['page_buffers']
             self.min_program_length = flash_algo.get('min_program_length', 0)
             self.end_stack = flash_algo.get('end_stack')
+            self.resident_address = flash_algo.get('resident_address')
+            if self.resident_address is None and self.use_analyzer:
+                self.resident_address = flash_algo['analyzer_address']
 
             # Validate required APIs.
             assert self._is_api_valid('pc_erase_sector')
@@ -158,6 +207,8 @@ class Flash:
             self.begin_stack = None
             self.static_base = None
             self.min_program_length = 0
+            self.end_stack = None
+            self.resident_address = None
             self.page_buffers = []
             self.double_buffer_supported = False
 
@@ -183,6 +234,35 @@ class Flash:
     def is_double_buffering_supported(self):
         return self.double_buffer_supported
 
+    @property
+    def is_resident_loop_supported(self):
+        return self.resident_address is not None
+
+    @property
+    def is_resident_loop_enabled(self):
+        """@brief Whether the resident loop is supported and enabled with the `flash.resident_loop` option.
+
+        The loop is not used if the core's data cache is enabled. The loop polls its control block in
+        RAM without cache maintenance, so it might never see descriptors written by the debugger.
+        """
+        if not (self.is_resident_loop_supported and self.target.session.options.get('flash.resident_loop')):
+            return False
+        if self._is_data_cache_enabled is None:
+            self._is_data_cache_enabled = self._read_data_cache_enabled()
+            if self._is_data_cache_enabled:
+                LOG.debug("not using the resident flash loop because the data cache is enabled")
+        return not self._is_data_cache_enabled
+
+    def _read_data_cache_enabled(self):
+        """@brief Read whether the data cache of a Cortex-M core is enabled."""
+        if not isinstance(self.target.selected_core, CortexM):
+            return False
+        try:
+            return (self.target.read32(CortexM.CCR) & CortexM.CCR_DC) != 0
+        except exceptions.TransferError:
+            # Don't risk using the loop if the cache state is unknown.
+            return True
+
     @property
     def region(self):
         return self._region
@@ -191,6 +271,16 @@ class Flash:
     def region(self, flashRegion):
         assert flashRegion.is_flash
         self._region = flashRegion
+        self._timing = None
+
+    @property
+    def timing(self):
+        """@brief The FlashTimingModel for this target type and flash region."""
+        if self._timing is None:
+            target_name = getattr(self.target, 'part_number', self.target.__class__.__name__)
+            region_name = self.region.name if self.region is not None else ""
+            self._timing = FlashTimingModel.get_model(target_name, region_name)
+        return self._timing
 
     def init(self, operation, address=None, clock=0, reset=False):
         """@brief Prepare the flash algorithm for performing operations.
@@ -267,6 +357,7 @@ class Flash:
         self.uninit()
         self.restore_target()
         self._did_prepare_target = False
+        self._is_data_cache_enabled = None
 
     def uninit(self):
         """@brief Uninitialize the flash algo.
@@ -305,35 +396,39 @@ class Flash:
         pass
 
     def compute_crcs(self, sectors):
-        assert self.use_analyzer
-
-        data = []
-
-        # Load analyzer code into target RAM.
-        self.target.write_memory_block32(self.flash_algo['analyzer_address'], _ANALYZER_CODE)
-
-        # Convert address, size pairs into commands
-        # for the crc computation algorithm to preform
-        for addr, size in sectors:
-            size_val = msb(size)
-            addr_val = addr // size
-            # Size must be a power of 2
-            assert (1 << size_val) == size
-            # Address must be a multiple of size
-            assert (addr % size) == 0
-            val = (size_val << 0) | (addr_val << 16)
-            data.append(val)
+        """@brief Compute the CRC32 of memory ranges with the analyzer running on the target.
 
-        self.target.write_memory_block32(self.page_buffers[0], data)
+        @param self
+        @param sectors List of (address, size) tuples. Ranges may have any address and size.
+        @return List of the CRC32 of each range, as computed by zlib's crc32().
+        """
+        assert self.use_analyzer
 
-        # update core register to execute the subroutine
-        TRACE.debug("call compute crc(%x, %x)", self.page_buffers[0], len(data))
-        self._call_function_and_wait(self.flash_algo['analyzer_address'], self.page_buffers[0], len(data),
-                timeout=self.target.session.options.get('flash.timeout.analyzer'))
+        # Load analyzer code and CRC table into target RAM.
+        analyzer_address = self.flash_algo['analyzer_address']
+        table_address = analyzer_address + len(_ANALYZER_CODE) * 4
+        self.target.write_memory_block32(analyzer_address, _ANALYZER_CODE + _CRC32_TABLE)
+
+        # Ranges are passed to the analyzer as (address, size) pairs in the first page buffer, so
+        # the number of ranges per call is limited by the page size.
+        batch_size = max(self.region.page_size // 8, 1)
+        crcs = []
+        for i in range(0, len(sectors), batch_size):
+            batch = sectors[i:i + batch_size]
+            data = [value for addr, size in batch for value in (addr, size)]
+            self.target.write_memory_block32(self.page_buffers[0], data)
+
+            # update core register to execute the subroutine
+            TRACE.debug("call compute crc(%x, %x)", self.page_buffers[0], len(batch))
+            result = self._call_function_and_wait(analyzer_address, self.page_buffers[0], len(batch),
+                    table_address, timeout=self.target.session.options.get('flash.timeout.analyzer'))
+            if result == self.TIMEOUT_ERROR:
+                raise FlashFailure('flash CRC analyzer timed out')
 
-        # Read back the CRCs for each section
-        data = self.target.read_memory_block32(self.page_buffers[0], len(data))
-        return data
+            # Read back the CRCs for each range
+            data = self.target.read_memory_block32(self.page_buffers[0], len(data))
+            crcs.extend(data[0::2])
+        return crcs
 
     def erase_all(self):
         """@brief Erase all the flash.
@@ -346,7 +441,7 @@ class Flash:
         # update core register to execute the erase_all subroutine
         TRACE.debug("call erase_all")
         result = self._call_function_and_wait(self.flash_algo['pc_eraseAll'],
-                timeout=self.target.session.options.get('flash.timeout.erase_all'))
+                timeout=self.target.session.options.get('flash.timeout.erase_all'), operation='erase_all')
 
         # check the return code
         TRACE.debug("erase_all result = %d", result)
@@ -365,7 +460,7 @@ class Flash:
         # update core register to execute the erase_sector subroutine
         TRACE.debug("call erase_sector(%x)", address)
         result = self._call_function_and_wait(self.flash_algo['pc_erase_sector'], address,
-                timeout=self.target.session.options.get('flash.timeout.erase_sector'))
+                timeout=self.target.session.options.get('flash.timeout.erase_sector'), operation='erase_sector')
 
         # check the return code
         TRACE.debug("erase_sector result = %d", result)
@@ -374,6 +469,65 @@ class Flash:
         elif result != 0:
             raise FlashEraseFailure('flash erase sector failure', address=address, result_code=result)
 
+    def erase_sectors(self, addresses, progress_cb=None, allow_erase_all=False):
+        """@brief Erase a set of sectors as one batch.
+
+        The sectors are merged into runs of contiguous sectors. If _allow_erase_all_ is True, the algo
+        supports EraseChip(), and a single run covers the whole region, then erase_all() is called
+        instead. Otherwise, if the resident loop is enabled, all sector erases are queued to it so the
+        core is not halted between sectors. Failing both, the sectors are erased one at a time.
+
+        @param self
+        @param addresses Iterable of sector base addresses.
+        @param progress_cb Optional callable that accepts the fraction of sectors erased.
+        @param allow_erase_all Whether erase_all() may be used in place of sector erases. Some algos
+            erase more than this region with EraseChip(), so this should only be set if the caller
+            permits a chip erase.
+
+        @exception FlashEraseFailure
+        """
+        assert self._active_operation == self.Operation.ERASE
+
+        addresses = sorted(set(addresses))
+        if not addresses:
+            return
+        if progress_cb is None:
+            progress_cb = lambda fraction: None
+
+        runs = self._merge_sector_runs(addresses)
+        LOG.debug("erasing %d sectors in %d runs: %s", len(addresses), len(runs),
+                ", ".join("[%#010x-%#010x]" % (start, end - 1) for start, end in runs))
+
+        if allow_erase_all and self.is_erase_all_supported \
+                and runs == [(self.region.start, self.region.end + 1)]:
+            LOG.debug("erased sectors cover region %s; using erase all", self.region.name)
+            self.erase_all()
+        elif self.is_resident_loop_enabled:
+            loop = self.get_resident_loop()
+            loop.start()
+            for addr in addresses:
+                loop.erase_sector(addr)
+                progress_cb(loop.completed_count / len(addresses))
+            loop.finish()
+        else:
+            for count, addr in enumerate(addresses, start=1):
+                self.erase_sector(addr)
+                progress_cb(count / len(addresses))
+        progress_cb(1.0)
+
+    def _merge_sector_runs(self, addresses):
+        """@brief Merge sorted sector addresses into a list of contiguous (start, end) ranges."""
+        runs = []
+        for addr in addresses:
+            info = self.get_sector_info(addr)
+            assert info is not None, "sector address %#010x is not within region" % addr
+            end = info.base_addr + info.size
+            if runs and runs[-1][1] == info.base_addr:
+                runs[-1] = (runs[-1][0], end)
+            else:
+                runs.append((info.base_addr, end))
+        return runs
+
     def program_page(self, address, bytes):
         """@brief Flash one or more pages.
 
@@ -390,7 +544,7 @@ class Flash:
         # update core register to execute the program_page subroutine
         TRACE.debug("call program_page(addr=%x, len=%x, data=%x)", address, len(bytes), self.page_buffers[0])
         result = self._call_function_and_wait(self.flash_algo['pc_program_page'], address, len(bytes), self.page_buffers[0],
-                timeout=self.target.session.options.get('flash.timeout.program'))
+                timeout=self.target.session.options.get('flash.timeout.program'), operation='program_page')
 
         # check the return code
         TRACE.debug("program_page result = %d", result)
@@ -427,6 +581,15 @@ class Flash:
         # transfer the buffer to device RAM
         self.target.write_memory_block8(self.page_buffers[buffer_number], bytes)
 
+    def get_resident_loop(self):
+        """@brief Create a resident programming loop.
+
+        The returned @ref pyocd.flash.resident.ResidentLoop "ResidentLoop" must be started after the
+        algo is inited for the operation to perform, and finished before the algo is uninited.
+        """
+        assert self.is_resident_loop_supported
+        return ResidentLoop(self, self.resident_address)
+
     def program_phrase(self, address, bytes):
         """@brief Flash a portion of a page.
 
@@ -454,7 +617,7 @@ class Flash:
         # update core register to execute the program_page subroutine
         TRACE.debug("call program_phrase(addr=%x, len=%x, data=%x)", address, len(bytes), self.page_buffers[0])
         result = self._call_function_and_wait(self.flash_algo['pc_program_page'], address, len(bytes), self.page_buffers[0],
-                timeout=self.target.session.options.get('flash.timeout.program'))
+                timeout=self.target.session.options.get('flash.timeout.program'), operation='program_phrase')
 
         # check the return code
         if result == self.TIMEOUT_ERROR:
@@ -571,6 +734,7 @@ class Flash:
 
         # resume target
         self.target.resume()
+        self._operation_start = time()
 
     def _flash_algo_debug_setup(self):
         # Save vector catch state for use in wait_for_completion()
@@ -622,9 +786,15 @@ class Flash:
         assert not error
         self.target.set_vector_catch(self._saved_vector_catch)
 
-    def wait_for_completion(self, timeout=None):
+    def wait_for_completion(self, timeout=None, operation=None):
         """@brief Wait until the breakpoint is hit.
 
+        The core state is polled once immediately, so operations that finish quickly don't wait. If
+        _operation_ names the type of operation that is running, the timing model is then used to sleep
+        for most of its expected duration before polling continues, and the observed duration is
+        recorded. Polling backs off from FlashTimingModel.MIN_POLL_INTERVAL to MAX_POLL_INTERVAL, so the
+        probe isn't saturated with core state reads while the algo runs.
+
         Checks for:
         - Timeout, using the _timeout_ parameter.
         - The target is halted after executing the flash operation.
@@ -636,8 +806,20 @@ class Flash:
         # below. Otoh, lgtm sees it as unnecessary! So we disable the lgtm warning.
         state = Target.State.RUNNING # lgtm[py/multiple-definition]
         with Timeout(timeout) as time_out:
+            # Time already spent since the operation was started counts towards the sleep.
+            sleep_time = self.timing.get_sleep_time(operation) - (time() - self._operation_start)
+            if timeout is not None:
+                sleep_time = min(sleep_time, timeout)
+
+            # Let the probe wait for the core to halt, if it can, before reading the state.
+            core = self.target.selected_core
+            poll_retries = core.dhcsr_poll_retries if isinstance(core, CortexM) else 0
+
+            poll_interval = FlashTimingModel.MIN_POLL_INTERVAL
             while time_out.check():
                 try:
+                    if poll_retries:
+                        self.target.poll_until(CortexM.DHCSR, CortexM.S_HALT, CortexM.S_HALT, poll_retries)
                     state = self.target.get_state()
                     if state != Target.State.RUNNING:
                         break
@@ -645,6 +827,13 @@ class Flash:
                     LOG.debug("target.get_state probe timeout")
                 except exceptions.TransferFaultError:
                     LOG.debug("target.get_state probe fault")
+                if sleep_time > 0:
+                    # The first poll is immediate, then sleep for most of the expected duration.
+                    sleep(sleep_time)
+                    sleep_time = 0
+                else:
+                    sleep(poll_interval)
+                    poll_interval = min(poll_interval * 2, FlashTimingModel.MAX_POLL_INTERVAL)
             else:
                 # Operation timed out.
                 self.target.halt()
@@ -652,6 +841,9 @@ class Flash:
                 LOG.debug("flash operation timed out; IPSR=%d", ipsr)
                 return self.TIMEOUT_ERROR
 
+        if operation is not None:
+            self.timing.record(operation, time() - self._operation_start)
+
         if self.flash_algo_debug:
             self._flash_algo_debug_check()
 
@@ -669,9 +861,10 @@ class Flash:
 
         return self.target.read_core_register('r0')
 
-    def _call_function_and_wait(self, pc, r0=None, r1=None, r2=None, r3=None, init=False, timeout=None):
+    def _call_function_and_wait(self, pc, r0=None, r1=None, r2=None, r3=None, init=False, timeout=None,
+            operation=None):
         self._call_function(pc, r0, r1, r2, r3, init)
-        return self.wait_for_completion(timeout=timeout)
+        return self.wait_for_completion(timeout=timeout, operation=operation)
 
     def set_flash_algo_debug(self, enable):
         """@brief Turn on extra flash algorithm checking
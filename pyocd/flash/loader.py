@@ -17,10 +17,11 @@
 
 from __future__ import annotations
 
+from concurrent.futures import (Future, ThreadPoolExecutor)
 import logging
 from dataclasses import dataclass
 from time import time
-from typing import (TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union, cast)
+from typing import (TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union, cast)
 
 from ..core import exceptions
 from ..core.memory_map import RamRegion
@@ -106,6 +107,15 @@ class RamBuilder(MemoryBuilder):
             program_byte_count=self.buffered_data_size,
             )
 
+    def verify(self, method: str = "crc") -> None:
+        target = self._session.target
+        for chunk in self._chunks:
+            actual = bytearray(target.read_memory_block8(chunk.addr, len(chunk.data)))
+            if actual != chunk.data:
+                offset = next(i for i in range(len(chunk.data)) if actual[i] != chunk.data[i])
+                raise exceptions.TargetError(f"memory verify failed at {chunk.addr + offset:#010x}: "
+                        f"{actual[offset]:#04x} (memory) != {chunk.data[offset]:#04x} (expected)")
+
     @property
     def region(self) -> "MemoryRegion":
         return self._region
@@ -144,6 +154,10 @@ class MemoryLoader:
     _smart_flash: Optional[bool]
     _trust_crc: Optional[bool]
     _keep_unwritten: Optional[bool]
+    _verify: str
+
+    ## Valid values for the _verify_ parameter and the 'load.verify' option.
+    VERIFY_METHODS = ('off', 'crc', 'read')
 
     def __init__(self,
             session: "Session",
@@ -152,7 +166,8 @@ class MemoryLoader:
             smart_flash: Optional[bool] = None,
             trust_crc: Optional[bool] = None,
             keep_unwritten: Optional[bool] = None,
-            no_reset: Optional[bool] = None
+            no_reset: Optional[bool] = None,
+            verify: Optional[str] = None
         ):
         """@brief Constructor.
 
@@ -174,6 +189,12 @@ class MemoryLoader:
             data. This parameter sets whether the existing contents of those unwritten ranges will
             be read from memory and restored while programming.
         @param no_reset Deprecated and ignored. Will be removed in a future release.
+        @param verify Sets whether and how programmed data is verified. The value must be one of
+            "off", "crc", or "read". "crc" compares CRC32s computed on the target, and reads back only
+            data whose CRC does not match. "read" reads back all programmed data.
+
+        @exception ValueError The verify method, or the 'load.verify' option if _verify_ is not
+            set, is invalid.
         """
         self._session = session
         assert session.board
@@ -199,6 +220,11 @@ class MemoryLoader:
                             else self._session.options.get('fast_program')
         self._keep_unwritten = keep_unwritten if (keep_unwritten is not None) \
                             else self._session.options.get('keep_unwritten')
+        self._verify = verify if (verify is not None) \
+                            else self._session.options.get('load.verify')
+        if self._verify not in self.VERIFY_METHODS:
+            raise ValueError(f"invalid verify method '{self._verify}'; must be one of "
+                    f"{', '.join(self.VERIFY_METHODS)}")
         if no_reset is not None:
             LOG.warning("MemoryLoader no_reset parameter is deprecated and ignored; this option will be removed in a future release")
 
@@ -241,23 +267,7 @@ class MemoryLoader:
             # Create the builder for this region if we don't already have one. This also verifies
             # that the region is of a type we can write to.
             if region_builder is None:
-                if region.is_flash:
-                    if region.flash is None:
-                        raise exceptions.TargetSupportError(f"flash memory region at address {address:#010x} has no flash instance")
-                    region_builder = region.flash.get_flash_builder()
-                    region_builder.log_performance = False
-                    # Disable double buffering for non-internal targets
-                    if self._disable_double_buffering:
-                        region_builder.enable_double_buffer(False)
-                elif region.is_writable:
-                    # Casting to a RamRegion is technically not quite right, since we're only checking
-                    # that the region is writable
-                    region_builder = RamBuilder(self._session, cast(RamRegion, region))
-                else:
-                    raise ValueError(f"memory region at address {address:#010x} is not writable")
-
-                # Save the new builder.
-                assert region_builder is not None
+                region_builder = self._create_builder(region, address)
                 self._builders[region] = region_builder
 
             # Take as much data as is contained by this region.
@@ -274,6 +284,28 @@ class MemoryLoader:
 
         return self
 
+    def _create_builder(self, region: "MemoryRegion", address: int) -> MemoryBuilder:
+        """@brief Create a builder for a memory region.
+
+        @exception ValueError The region is not writable.
+        @exception TargetSupportError The flash region has no Flash instance.
+        """
+        if region.is_flash:
+            if region.flash is None:
+                raise exceptions.TargetSupportError(f"flash memory region at address {address:#010x} has no flash instance")
+            builder = region.flash.get_flash_builder()
+            builder.log_performance = False
+            # Disable double buffering for non-internal targets
+            if self._disable_double_buffering:
+                builder.enable_double_buffer(False)
+            return builder
+        elif region.is_writable:
+            # Casting to a RamRegion is technically not quite right, since we're only checking
+            # that the region is writable
+            return RamBuilder(self._session, cast(RamRegion, region))
+        else:
+            raise ValueError(f"memory region at address {address:#010x} is not writable")
+
     def commit(self):
         """@brief Write all collected data to memory.
 
@@ -287,8 +319,26 @@ class MemoryLoader:
 
         After calling this method, the loader instance can be reused to program more data.
         """
-        perfList = []
         sorted_builders = sorted(self._builders.values(), key=lambda v: v.region.start)
+        perfList = self._erase_and_program(sorted_builders)
+
+        # Verify the data.
+        if self._verify != 'off':
+            LOG.info("Verifying...")
+            for builder in sorted_builders:
+                builder.verify(method=self._verify)
+
+        # Report programming statistics.
+        self._log_performance(perfList)
+
+        # Clear state to allow reuse.
+        self._reset_state()
+
+    def _erase_and_program(self, sorted_builders: List[MemoryBuilder]) -> List[ProgrammingInfo]:
+        """@brief Erase and then program the data of each builder, reporting combined progress.
+        @return List of the ProgrammingInfo returned by each builder.
+        """
+        perfList = []
 
         LOG.info("Erasing...")
         self._progress_offset = 0.0
@@ -324,13 +374,24 @@ class MemoryLoader:
         if self._delegate is not None and self._delegate.has_sequence_with_name('FlashProgramDone'):
             self._delegate.run_sequence('FlashProgramDone')
 
-        #TODO: Verify code
+        return perfList
 
-        # Report programming statistics.
-        self._log_performance(perfList)
+    def verify(self, method: str = 'crc') -> None:
+        """@brief Check that memory contains all collected data, without programming it.
 
-        # Clear state to allow reuse.
-        self._reset_state()
+        After calling this method, the loader instance can be reused.
+
+        @param self
+        @param method Either "crc" or "read". See the constructor's _verify_ parameter.
+
+        @exception FlashVerifyFailure Flash does not contain the data.
+        @exception TargetError RAM does not contain the data.
+        """
+        try:
+            for builder in sorted(self._builders.values(), key=lambda v: v.region.start):
+                builder.verify(method=method)
+        finally:
+            self._reset_state()
 
     def _log_performance(self, perf_list):
         """@brief Log a report of programming performance numbers."""
@@ -384,5 +445,258 @@ class MemoryLoader:
         mgr.add_data(address, data)
         mgr.commit()
 
+class StreamingMemoryLoader(MemoryLoader):
+    """@brief Memory loader that programs flash while later data is still being added.
+
+    Data is expected to be added in increasing address order, as gdb does for its 'load'
+    command. Once data has been added beyond the end of a flash sector, no more data can arrive
+    for that sector, so it is queued to be erased and programmed by a worker thread. Transfer of
+    the rest of the data from the host thus overlaps with flash operations on the target.
+
+    Data for RAM regions, and flash data that arrives for a sector that was already queued, is
+    buffered and written by commit() in the same way as MemoryLoader. The commit() method also
+    waits for the worker to finish and raises any error it encountered.
+
+    Streaming always uses sector erase. If chip erase is selected, or the target defines the
+    FlashEraseDone or FlashProgramDone debug sequences that must run after all erase or all program
+    operations, streaming is disabled and this class behaves exactly like MemoryLoader.
+
+    Flash is accessed from the worker thread while data is being added, so the caller must not
+    access the target between the first add_data() and the end of commit(), other than after
+    calling wait().
+    """
+
+    ## Minimum number of bytes of complete sectors programmed together. Each batch initialises the
+    # flash algorithm once, so very small batches would add overhead.
+    MIN_BATCH_SIZE = 0x8000
+
+    def __init__(self, session: "Session", *args: Any, **kwargs: Any) -> None:
+        """@brief Constructor.
+
+        The parameters are the same as for MemoryLoader.
+        """
+        super().__init__(session, *args, **kwargs)
+        self._streaming = (self._chip_erase == 'sector') and not (self._delegate is not None
+                and (self._delegate.has_sequence_with_name('FlashEraseDone')
+                    or self._delegate.has_sequence_with_name('FlashProgramDone')))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._reset_streaming_state()
+
+    def _reset_streaming_state(self) -> None:
+        ## Flash data that has not been queued yet, per region.
+        self._pending: Dict["MemoryRegion", List[DataChunk]] = {}
+        ## Data that has been queued, per region.
+        self._queued: Dict["MemoryRegion", List[DataChunk]] = {}
+        ## End address (exclusive) of the last queued sector, per region.
+        self._queued_end: Dict["MemoryRegion", int] = {}
+        ## Highest end address (exclusive) of data added, per region.
+        self._data_end: Dict["MemoryRegion", int] = {}
+        ## Flash data that arrived for sectors that were already queued, with its region.
+        self._late: List[Tuple["MemoryRegion", DataChunk]] = []
+        ## Builder and result of each queued batch.
+        self._batches: List[Tuple[MemoryBuilder, Future]] = []
+        self._streamed_size = 0
+        self._programmed_size = 0
+
+    def add_data(self, address, data):
+        """@brief Add a chunk of data to be programmed.
+
+        Flash sectors are queued for programming as soon as all of their data has been added.
+
+        @exception ValueError Raised when the address is not within a writable memory region.
+        @exception TargetSupportError Raised if the flash memory region does not have a valid Flash
+            instance associated with it.
+        """
+        if not self._streaming:
+            return super().add_data(address, data)
+
+        while len(data):
+            region = self._map.get_region_for_address(address, self._session.target.selected_core.node_name)
+            if region is None:
+                raise ValueError("no memory region defined for address 0x%08x" % address)
+            length = min(len(data), region.end - address + 1)
+
+            if not region.is_flash:
+                super().add_data(address, data[:length])
+            else:
+                if region.flash is None:
+                    raise exceptions.TargetSupportError(f"flash memory region at address {address:#010x} has no flash instance")
+                chunk = DataChunk(address, data[:length])
+                if address < self._queued_end.get(region, region.start):
+                    self._late.append((region, chunk))
+                else:
+                    self._pending.setdefault(region, []).append(chunk)
+                    self._data_end[region] = max(self._data_end.get(region, 0), address + length)
+
+                    # Data for earlier flash regions is complete.
+                    for other in list(self._pending):
+                        if other.end < address:
+                            self._queue_sectors(other, other.end + 1)
+                    self._queue_sectors(region, self._get_complete_end(region), self.MIN_BATCH_SIZE)
+
+            data = data[length:]
+            address += length
+
+        return self
+
+    def _get_unit_range(self, region: "MemoryRegion", address: int) -> Tuple[int, int]:
+        """@brief Return the smallest unit of flash that is programmed independently.
+
+        This is the sector containing the address, or the page if pages span multiple sectors. The
+        sector and page info are used rather than aligning the address, since sectors may have
+        different sizes.
+
+        @return Tuple of the start address and end address (exclusive) of the unit.
+        """
+        sector_info = region.flash.get_sector_info(address)
+        page_info = region.flash.get_page_info(address)
+        if sector_info is None or page_info is None:
+            raise exceptions.FlashFailure("attempt to program invalid flash address", address=address)
+        return (min(sector_info.base_addr, page_info.base_addr),
+                max(sector_info.base_addr + sector_info.size, page_info.base_addr + page_info.size))
+
+    def _get_complete_end(self, region: "MemoryRegion") -> int:
+        """@brief Return the end address of complete sectors in the region's pending data."""
+        end = self._data_end[region]
+        if end > region.end:
+            return region.end + 1
+        return self._get_unit_range(region, end)[0]
+
+    def _queue_sectors(self, region: "MemoryRegion", end: int, min_size: int = 0) -> None:
+        """@brief Queue pending data below an address to be programmed by the worker.
+        @param self
+        @param region The flash region.
+        @param end Address below which all sectors are complete. Must be sector aligned.
+        @param min_size Nothing is queued unless at least this many bytes are complete.
+        """
+        pending = self._pending.get(region)
+        if not pending:
+            return
+        pending.sort(key=lambda c: c.addr)
+        batch = []
+        remaining = []
+        for chunk in pending:
+            if chunk.addr + len(chunk.data) <= end:
+                batch.append(chunk)
+            elif chunk.addr < end:
+                split = end - chunk.addr
+                batch.append(DataChunk(chunk.addr, chunk.data[:split]))
+                remaining.append(DataChunk(end, chunk.data[split:]))
+            else:
+                remaining.append(chunk)
+        batch_size = sum(len(c.data) for c in batch)
+        if not batch or batch_size < min_size:
+            return
+
+        if remaining:
+            self._pending[region] = remaining
+        else:
+            del self._pending[region]
+        self._queued.setdefault(region, []).extend(batch)
+        self._queued_end[region] = max(self._queued_end.get(region, region.start), end)
+        self._streamed_size += batch_size
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="flash loader")
+            if self._progress is not None:
+                self._progress(0.0)
+        builder = self._create_builder(region, batch[0].addr)
+        for chunk in batch:
+            builder.add_data(chunk.addr, chunk.data)
+        self._batches.append((builder, self._executor.submit(self._program_batch, builder)))
+
+    def _program_batch(self, builder: MemoryBuilder) -> ProgrammingInfo:
+        """@brief Erase and program one batch. Runs on the worker thread."""
+        # Skip remaining batches once one has failed. Its error is raised by commit().
+        if any(f.done() and f.exception() is not None for _, f in self._batches):
+            raise exceptions.FlashFailure("not programmed due to an earlier error")
+        builder.erase(chip_erase='sector',
+                      smart_flash=self._smart_flash,
+                      fast_verify=self._trust_crc,
+                      keep_unwritten=self._keep_unwritten)
+        perf = builder.program(smart_flash=self._smart_flash,
+                               fast_verify=self._trust_crc,
+                               keep_unwritten=self._keep_unwritten)
+        self._programmed_size += builder.buffered_data_size
+        # The total size is not known until commit(), so progress stops short of completion.
+        if self._progress is not None:
+            self._progress(min(0.99, self._programmed_size / self._streamed_size))
+        return perf
+
+    def wait(self) -> None:
+        """@brief Wait until the worker has finished programming all queued sectors.
+
+        Errors are not raised by this method. They are raised by commit().
+        """
+        for _, future in self._batches:
+            try:
+                future.result()
+            except Exception:
+                pass
+
+    def commit(self):
+        """@brief Write all remaining data and wait for programming to finish.
+
+        @exception Any error raised while programming a queued batch of sectors.
+        """
+        if not self._streaming:
+            return super().commit()
+
+        try:
+            for region in sorted(self._pending, key=lambda r: r.start):
+                self._queue_sectors(region, region.end + 1)
+            perf_list = [future.result() for _, future in self._batches]
+            if self._progress is not None and self._batches:
+                self._progress(1.0)
+
+            # Rewrite sectors that received data after they were queued, along with the data
+            # already programmed in them.
+            rewritten = set()
+            for region, chunk in self._late:
+                start = self._get_unit_range(region, chunk.addr)[0]
+                end = self._get_unit_range(region, chunk.addr + len(chunk.data) - 1)[1]
+                for queued in self._queued.get(region, []):
+                    if (queued.addr < end and queued.addr + len(queued.data) > start
+                            and id(queued) not in rewritten):
+                        rewritten.add(id(queued))
+                        super().add_data(queued.addr, queued.data)
+                super().add_data(chunk.addr, chunk.data)
+
+            sorted_builders = sorted(self._builders.values(), key=lambda v: v.region.start)
+            if sorted_builders:
+                perf_list += self._erase_and_program(sorted_builders)
+
+            if self._verify != 'off':
+                LOG.info("Verifying...")
+                for builder, _ in self._batches:
+                    builder.verify(method=self._verify)
+                for builder in sorted_builders:
+                    builder.verify(method=self._verify)
+
+            self._log_performance(perf_list)
+        finally:
+            self._shutdown()
+            self._reset_state()
+            self._reset_streaming_state()
+
+    def abort(self) -> None:
+        """@brief Discard all data and stop programming.
+
+        Queued batches that have not started are cancelled. This waits for a batch that is being
+        programmed to finish, then stops the worker. After calling this method, the loader instance
+        can be reused.
+        """
+        for _, future in self._batches:
+            future.cancel()
+        self._shutdown()
+        self._reset_state()
+        self._reset_streaming_state()
+
+    def _shutdown(self) -> None:
+        """@brief Stop the worker after it finishes any queued batches."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
 # Define deprecated class name.
 FlashLoader = MemoryLoader
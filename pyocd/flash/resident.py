@@ -0,0 +1,293 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from time import (sleep, time)
+from typing import (Dict, List, Sequence, Tuple, TYPE_CHECKING)
+
+from ..core import exceptions
+from ..core.exceptions import (FlashEraseFailure, FlashFailure, FlashProgramFailure)
+from ..utility.timeout import Timeout
+from .timing import FlashTimingModel
+
+if TYPE_CHECKING:
+    from .flash import Flash
+
+LOG = logging.getLogger(__name__)
+TRACE = LOG.getChild("trace")
+TRACE.setLevel(logging.CRITICAL)
+
+# Resident flash programming loop. Thumb-1 code, so it runs on any Cortex-M. Called with r0 set to the
+# address of the control block. It returns when a descriptor with a size of 0xffffffff is consumed, or
+# when an algo function fails, in which case the result code is also stored in the status word.
+#
+#           push    {r4-r7, lr}
+#           mov     r4, r0              ; r4 = control block
+#           movs    r5, #0              ; r5 = number of completed descriptors
+#           mov     r6, r4
+#           adds    r6, #24             ; r6 = current descriptor
+#           ldr     r7, [r4, #12]       ; r7 = end of descriptor ring
+#   loop:   ldr     r0, [r4, #0]        ; wait for head to move past the completed count
+#           cmp     r0, r5
+#           beq     loop
+#           ldr     r0, [r6, #0]        ; address
+#           ldr     r1, [r6, #4]        ; size
+#           ldr     r2, [r6, #8]        ; buffer
+#           adds    r3, r1, #1
+#           beq     done                ; size 0xffffffff: stop
+#           cmp     r1, #0
+#           beq     erase               ; size 0: EraseSector(address)
+#           ldr     r3, [r4, #16]       ; else ProgramPage(address, size, buffer)
+#           b       call
+#   erase:  ldr     r3, [r4, #20]
+#   call:   blx     r3
+#           cmp     r0, #0
+#           bne     fail
+#           adds    r5, #1
+#           str     r5, [r4, #4]        ; update tail
+#           adds    r6, #12
+#           cmp     r6, r7
+#           bne     loop
+#           mov     r6, r4              ; wrap to the first descriptor
+#           adds    r6, #24
+#           b       loop
+#   fail:   str     r0, [r4, #8]
+#   done:   ldr     r0, [r4, #8]
+#           pop     {r4-r7, pc}
+_RESIDENT_LOOP_CODE = (
+    0x4604b5f0, 0x46262500, 0x68e73618, 0x42a86820, 0x6830d0fc, 0x68b26871, 0xd0101c4b, 0xd0012900,
+    0xe0006923, 0x47986963, 0xd1072800, 0x60653501, 0x42be360c, 0x4626d1ea, 0xe7e73618, 0x68a060a0,
+    0xbf00bdf0,
+    )
+
+class ResidentLoop:
+    """@brief Host side of the resident flash programming loop.
+
+    A small loop is loaded into target RAM alongside the flash algo. It consumes a ring of operation
+    descriptors, calling the algo's ProgramPage() or EraseSector() for each one without returning to
+    the debugger. Meanwhile the host fills page buffers, appends descriptors, and polls the control
+    block for progress, so there is no halt, register write, and resume between pages.
+
+    Control block layout, as 32-bit words:
+    - 0: head, the number of descriptors written by the host.
+    - 1: tail, the number of descriptors completed by the loop.
+    - 2: status, the nonzero result code of a failed operation.
+    - 3: end address of the descriptor ring.
+    - 4: ProgramPage() address.
+    - 5: EraseSector() address.
+
+    The descriptor ring follows. Each descriptor has three words: the flash address, the size (0 for a
+    sector erase), and the page buffer address.
+
+    The flash algo must already have been inited for the operation to perform. The loop has no cache
+    maintenance, so it is not supported on cores with the data cache enabled; see
+    Flash.is_resident_loop_enabled.
+    """
+
+    ## Number of descriptors in the ring.
+    DESCRIPTOR_COUNT = 8
+
+    ## Bytes of RAM needed for the code, control block, and descriptor ring.
+    SIZE = 0x100
+
+    _CODE_SIZE = len(_RESIDENT_LOOP_CODE) * 4
+    _CONTROL_SIZE = 24
+    _DESCRIPTOR_SIZE = 12
+
+    _HEAD_OFFSET = 0
+    _TAIL_OFFSET = 4
+
+    ## Descriptor size value that stops the loop.
+    _STOP = 0xffffffff
+
+    def __init__(self, flash: "Flash", address: int) -> None:
+        assert (self._CODE_SIZE + self._CONTROL_SIZE + self.DESCRIPTOR_COUNT * self._DESCRIPTOR_SIZE) <= self.SIZE
+        self._flash = flash
+        self._target = flash.target
+        self._address = address
+        self._control = address + self._CODE_SIZE
+        self._ring = self._control + self._CONTROL_SIZE
+        self._submitted = 0
+        self._completed = 0
+        self._next_buffer = 0
+        # Sequence number of the last operation to use each page buffer.
+        self._buffer_seq: List[int] = [-1] * len(flash.page_buffers)
+        # Address and erase flag of operations that have not completed, by sequence number.
+        self._pending: Dict[int, Tuple[int, bool]] = {}
+        # Time at which the oldest pending operation started running.
+        self._oldest_start = 0.0
+        self._is_running = False
+
+        options = self._target.session.options
+        self._program_timeout = options.get('flash.timeout.program')
+        self._erase_timeout = options.get('flash.timeout.erase_sector')
+        self._init_timeout = options.get('flash.timeout.init')
+
+    @property
+    def completed_count(self) -> int:
+        """@brief Number of operations that have finished."""
+        return self._completed
+
+    def start(self) -> None:
+        """@brief Load the loop and start it running."""
+        assert not self._is_running
+        TRACE.debug("start resident loop at %#010x", self._address)
+        self._target.write_memory_block32(self._address, list(_RESIDENT_LOOP_CODE) + [
+                0, # head
+                0, # tail
+                0, # status
+                self._ring + self.DESCRIPTOR_COUNT * self._DESCRIPTOR_SIZE,
+                self._flash.flash_algo['pc_program_page'],
+                self._flash.flash_algo['pc_erase_sector'],
+                ])
+        self._flash._call_function(self._address, self._control, init=True)
+        self._is_running = True
+
+    def erase_sector(self, address: int) -> None:
+        """@brief Queue a sector erase.
+
+        @exception FlashEraseFailure A previously queued operation failed.
+        """
+        TRACE.debug("queue erase_sector(%x)", address)
+        self._submit(address, 0, 0, True)
+
+    def program_page(self, address: int, data: Sequence[int]) -> None:
+        """@brief Queue programming of a page.
+
+        Waits for a page buffer to become free, then loads the data into it.
+
+        @exception FlashProgramFailure A previously queued operation failed.
+        """
+        buffer_number = self._next_buffer
+        self._next_buffer = (self._next_buffer + 1) % len(self._buffer_seq)
+
+        # The buffer can be overwritten once the operation that last used it has completed.
+        self._wait_for(self._buffer_seq[buffer_number] + 1)
+        self._flash.load_page_buffer(buffer_number, address, data)
+        self._buffer_seq[buffer_number] = self._submitted
+
+        TRACE.debug("queue program_page(addr=%x, len=%x, data=%x)", address, len(data),
+                self._flash.page_buffers[buffer_number])
+        self._submit(address, len(data), self._flash.page_buffers[buffer_number], False)
+
+    def finish(self) -> None:
+        """@brief Wait for all queued operations to complete, then stop the loop.
+
+        @exception FlashProgramFailure
+        @exception FlashEraseFailure
+        """
+        assert self._is_running
+        self._wait_for(self._submitted)
+        self._write_descriptor(0, self._STOP, 0)
+
+        # The loop returns to the algo's breakpoint, so wait for the target to halt.
+        self._is_running = False
+        result = self._flash.wait_for_completion(timeout=self._init_timeout)
+        if result == self._flash.TIMEOUT_ERROR:
+            raise FlashFailure('flash resident loop did not stop')
+        elif result != 0:
+            raise FlashFailure('flash resident loop failure', result_code=result)
+
+    def _submit(self, address: int, size: int, buffer: int, is_erase: bool) -> None:
+        assert self._is_running
+
+        # Wait until the descriptor slot is no longer in use.
+        self._wait_for(self._submitted - self.DESCRIPTOR_COUNT + 1)
+        if self._completed == self._submitted:
+            # The loop is idle, so the operation starts now.
+            self._oldest_start = time()
+        self._pending[self._submitted] = (address, is_erase)
+        self._write_descriptor(address, size, buffer)
+
+    def _write_descriptor(self, address: int, size: int, buffer: int) -> None:
+        slot = self._submitted % self.DESCRIPTOR_COUNT
+        self._target.write_memory_block32(self._ring + slot * self._DESCRIPTOR_SIZE, [address, size, buffer])
+        # Writing head last hands the descriptor to the loop.
+        self._submitted += 1
+        self._target.write32(self._control + self._HEAD_OFFSET, self._submitted)
+
+    def _wait_for(self, count: int) -> None:
+        """@brief Poll the control block until at least _count_ operations have completed."""
+        while self._completed < count:
+            self._wait_for_progress()
+
+    def _wait_for_progress(self) -> None:
+        """@brief Poll the control block until at least one more operation has completed.
+
+        The control block is read once immediately. Then, as in Flash.wait_for_completion(), the
+        flash timing model is used to sleep for most of the expected duration of the oldest pending
+        operation, after which polling backs off from FlashTimingModel.MIN_POLL_INTERVAL to
+        MAX_POLL_INTERVAL. Observed durations are recorded in the timing model.
+        """
+        _, is_erase = self._pending[self._completed]
+        operation = 'erase_sector' if is_erase else 'program_page'
+        sleep_time = self._flash.timing.get_sleep_time(operation) - (time() - self._oldest_start)
+        poll_interval = FlashTimingModel.MIN_POLL_INTERVAL
+        with Timeout(self._oldest_pending_timeout()) as time_out:
+            while time_out.check():
+                try:
+                    tail, status = self._target.read_memory_block32(self._control + self._TAIL_OFFSET, 2)
+                except exceptions.TransferTimeoutError:
+                    LOG.debug("resident loop status read probe timeout")
+                except exceptions.TransferFaultError:
+                    LOG.debug("resident loop status read probe fault")
+                else:
+                    completed = tail - self._completed
+                    for seq in range(self._completed, tail):
+                        del self._pending[seq]
+                    self._completed = tail
+
+                    if status != 0:
+                        self._handle_failure(status)
+                    if completed:
+                        now = time()
+                        # Only a single completed operation has a known duration.
+                        if completed == 1:
+                            self._flash.timing.record(operation, now - self._oldest_start)
+                        # The next operation started when the last one completed.
+                        self._oldest_start = now
+                        return
+
+                if sleep_time > 0:
+                    sleep(sleep_time)
+                    sleep_time = 0
+                else:
+                    sleep(poll_interval)
+                    poll_interval = min(poll_interval * 2, FlashTimingModel.MAX_POLL_INTERVAL)
+            else:
+                self._target.halt()
+                self._is_running = False
+                address, is_erase = self._pending[self._completed]
+                if is_erase:
+                    raise FlashEraseFailure('flash erase sector timed out', address=address,
+                            result_code=self._flash.TIMEOUT_ERROR)
+                else:
+                    raise FlashProgramFailure('flash program page timed out', address=address,
+                            result_code=self._flash.TIMEOUT_ERROR)
+
+    def _oldest_pending_timeout(self) -> float:
+        _, is_erase = self._pending[self._completed]
+        return self._erase_timeout if is_erase else self._program_timeout
+
+    def _handle_failure(self, status: int) -> None:
+        # The loop has returned to the breakpoint after storing the status.
+        self._is_running = False
+        self._flash.wait_for_completion(timeout=self._init_timeout)
+        address, is_erase = self._pending[self._completed]
+        if is_erase:
+            raise FlashEraseFailure('flash erase sector failure', address=address, result_code=status)
+        else:
+            raise FlashProgramFailure('flash program page failure', address=address, result_code=status)
@@ -0,0 +1,93 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+import threading
+from typing import (Dict, Optional, Tuple)
+
+@dataclass
+class OperationTiming:
+    """@brief Observed durations of one type of flash algo operation, in seconds."""
+    count: int = 0
+    average: float = 0.0    # Exponentially weighted moving average
+    minimum: float = 0.0
+    maximum: float = 0.0
+    total: float = 0.0
+
+class FlashTimingModel:
+    """@brief Learned durations of flash algo operations for a target and flash region.
+
+    Flash.wait_for_completion() uses the model to decide how long to sleep before it starts polling
+    the core's state. To avoid oversleeping when an operation's duration varies, for instance erasing
+    a sector that is already blank, the sleep is based on the shortest duration observed so far.
+
+    Models are shared by all Flash instances for the same target type and region, so timings learned
+    in one session are used by later sessions in the same process.
+    """
+
+    ## Weight of a new observation in the moving average.
+    SMOOTHING = 0.25
+
+    ## Fraction of the shortest observed duration to sleep before polling.
+    SLEEP_FRACTION = 0.8
+
+    ## Initial and maximum delay between polls, in seconds.
+    MIN_POLL_INTERVAL = 0.0005
+    MAX_POLL_INTERVAL = 0.01
+
+    _models: Dict[Tuple[str, str], "FlashTimingModel"] = {}
+    _models_lock = threading.Lock()
+
+    @classmethod
+    def get_model(cls, target_name: str, region_name: str) -> "FlashTimingModel":
+        """@brief Return the shared model for a target type and flash region name."""
+        with cls._models_lock:
+            model = cls._models.get((target_name, region_name))
+            if model is None:
+                model = cls()
+                cls._models[(target_name, region_name)] = model
+            return model
+
+    def __init__(self) -> None:
+        self._timings: Dict[str, OperationTiming] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def timings(self) -> Dict[str, OperationTiming]:
+        """@brief Copy of the timings for each operation that has been observed."""
+        with self._lock:
+            return {op: OperationTiming(**vars(t)) for op, t in self._timings.items()}
+
+    def get_sleep_time(self, operation: Optional[str]) -> float:
+        """@brief Time to wait after starting an operation before polling for its completion."""
+        with self._lock:
+            timing = self._timings.get(operation) if operation else None
+            if timing is None:
+                return 0.0
+            return timing.minimum * self.SLEEP_FRACTION
+
+    def record(self, operation: str, duration: float) -> None:
+        """@brief Add an observed duration for an operation."""
+        with self._lock:
+            timing = self._timings.get(operation)
+            if timing is None:
+                self._timings[operation] = OperationTiming(1, duration, duration, duration, duration)
+                return
+            timing.count += 1
+            timing.average += (duration - timing.average) * self.SMOOTHING
+            timing.minimum = min(timing.minimum, duration)
+            timing.maximum = max(timing.maximum, duration)
+            timing.total += duration
@@ -20,7 +20,7 @@ from xml.etree import ElementTree
 from itertools import groupby
 
 from ..utility import conversion
-from ..utility.mask import (align_up, round_up_div)
+from ..utility.mask import round_up_div
 from ..core import exceptions
 from ..core.target import Target
 from ..core.memory_map import MemoryType
@@ -78,16 +78,27 @@ class GDBDebugContextFacade(object):
         ## List of internal register numbers corresponding to gdb registers.
         self._full_reg_num_list = [reg.index for reg in self._register_list]
 
+        ## List of the bit widths of gdb registers, in the same order.
+        self._full_reg_width_list = [reg.bitsize for reg in self._register_list]
+
         ## Map of gdb regnum to register info.
         self._gdb_regnum_map = {reg.gdb_regnum: reg for reg in self._register_list}
 
         ## String of XML target description for gdb.
         self._target_xml = self._build_target_xml()
 
+        ## String of XML memory map for gdb, built on first use.
+        self._memory_map_xml = None
+
     @property
     def context(self):
         return self._context
 
+    @property
+    def register_indices(self):
+        """@brief Indices of the core registers read by the 'g' command, in order."""
+        return self._full_reg_num_list
+
     def set_context(self, new_context):
         self._context = new_context
 
@@ -97,21 +108,18 @@ class GDBDebugContextFacade(object):
         @exception CoreRegisterAccessError
         """
         LOG.debug("GDB getting register context")
-        resp = b''
         try:
             vals = self._context.read_core_registers_raw(self._full_reg_num_list)
         except exceptions.CoreRegisterAccessError:
             vals = [None] * len(self._full_reg_num_list)
 
-        for reg, reg_value in zip(self._register_list, vals):
-            # Return x's to indicate unavailable register value.
-            if reg_value is None:
-                r = b"xx" * round_up_div(reg.bitsize, 8)
-            else:
-                r = conversion.uint_to_hex_le(reg_value, reg.bitsize).encode()
-            resp += r
-            LOG.debug("GDB get_reg_context: %s = %s -> %s", reg.name,
-                    "None" if (reg_value is None) else ("0x%08X" % reg_value), r)
+        # Unavailable register values are returned as x's.
+        resp = conversion.uint_list_to_hex_le(vals, self._full_reg_width_list)
+
+        if LOG.isEnabledFor(logging.DEBUG):
+            for reg, reg_value in zip(self._register_list, vals):
+                LOG.debug("GDB get_reg_context: %s = %s", reg.name,
+                        "None" if (reg_value is None) else ("0x%08X" % reg_value))
 
         return resp
 
@@ -121,19 +129,11 @@ class GDBDebugContextFacade(object):
         @exception CoreRegisterAccessError
         """
         LOG.debug("GDB setting register context")
-        reg_num_list = []
-        reg_data_list = []
-        offset = 0
-        for reg in self._register_list:
-            if offset >= len(data):
-                break
-            hex_byte_count = align_up(reg.bitsize // 4, 2)
-            reg_data = data[offset:(offset + hex_byte_count)]
-            reg_value = conversion.hex_le_to_uint(reg_data, reg.bitsize)
-            offset += hex_byte_count
-            reg_num_list.append(reg.index)
-            reg_data_list.append(reg_value)
-            LOG.debug("GDB reg: %s = 0x%X", reg.name, reg_value)
+        reg_data_list = conversion.hex_le_to_uint_list(data, self._full_reg_width_list)
+        reg_num_list = self._full_reg_num_list[:len(reg_data_list)]
+        if LOG.isEnabledFor(logging.DEBUG):
+            for reg, reg_value in zip(self._register_list, reg_data_list):
+                LOG.debug("GDB reg: %s = 0x%X", reg.name, reg_value)
         self._context.write_core_registers_raw(reg_num_list, reg_data_list)
 
     def set_register(self, gdb_regnum, data):
@@ -218,22 +218,31 @@ class GDBDebugContextFacade(object):
         for the T response string.  NN is the index of the
         register to follow MMMMMMMM is the value of the register.
         """
-        result = b''
         try:
             reg_values = self._context.read_core_registers_raw(reg_list)
         except exceptions.CoreRegisterAccessError:
             # If we cannot read registers, return an empty string. We mustn't return 'x's like the other
             # register read methods do, because gdb terribly dislikes 'x's in a T response.
-            return result
+            return b''
 
+        pairs = []
         for reg_name, reg_value in zip(reg_list, reg_values):
             reg = self._context.core.core_registers.by_name[reg_name]
             assert reg_value is not None
             encoded_reg = conversion.uint_to_hex_le(reg_value, reg.bitsize)
-            result += (conversion.byte_to_hex2(reg.gdb_regnum) + ':' + encoded_reg + ';').encode()
-        return result
+            pairs.append("%02x:%s;" % (reg.gdb_regnum, encoded_reg))
+        return ''.join(pairs).encode()
 
     def get_memory_map_xml(self):
+        """@brief Return GDB memory map XML.
+
+        The memory map does not change while gdb is connected, so the XML is generated once.
+        """
+        if self._memory_map_xml is None:
+            self._memory_map_xml = self._build_memory_map_xml()
+        return self._memory_map_xml
+
+    def _build_memory_map_xml(self):
         """@brief Generate GDB memory map XML.
         """
         root = ElementTree.Element('memory-map')
@@ -25,7 +25,8 @@ from typing import (Dict, List, Optional, Tuple)
 
 from ..core import exceptions
 from ..core.target import Target
-from ..flash.loader import FlashLoader
+from ..debug.cache import CachingDebugContext
+from ..flash.loader import (FlashLoader, StreamingMemoryLoader)
 from ..utility.cmdline import convert_vector_catch
 from ..utility.conversion import (hex_to_byte_list, hex_encode, hex_decode, hex8_to_u32le)
 from ..utility.compatibility import (to_bytes_safe, to_str_safe)
@@ -37,6 +38,7 @@ from ..utility.stdio import StdioHandler
 from .syscall import GDBSyscallIOHandler
 from ..debug import semihost
 from .context_facade import GDBDebugContextFacade
+from .scheduler import TransactionScheduler
 from .symbols import GDBSymbolProvider
 from ..rtos import RTOS
 from . import signals
@@ -91,22 +93,25 @@ def unescape(data: bytes) -> List[int]:
     @param data Bytes-like object with possibly escaped values.
     @return List of integers in the range 0-255, with all escaped bytes de-escaped.
     """
-    data_idx = 0
-
-    # unpack the data into binary array
-    result = list(data)
-
-    # check for escaped characters
-    while data_idx < len(result):
-        if result[data_idx] == 0x7d:
-            result.pop(data_idx)
-            result[data_idx] = result[data_idx] ^ 0x20
-        data_idx += 1
-
-    return result
-
-## Tuple of int values of characters that must be escaped.
-_GDB_ESCAPED_CHARS = tuple(b'#$}*')
+    data = bytes(data)
+    if b'}' not in data:
+        return list(data)
+
+    # Copy the runs of data between escape characters in one go.
+    result = bytearray()
+    start = 0
+    while True:
+        idx = data.find(b'}', start)
+        if (idx < 0) or (idx + 1 >= len(data)):
+            break
+        result += data[start:idx]
+        result.append(data[idx + 1] ^ 0x20)
+        start = idx + 2
+    result += data[start:]
+    return list(result)
+
+## Tuple of int values of characters that must be escaped. The escape character itself is first.
+_GDB_ESCAPED_CHARS = tuple(b'}#$*')
 
 def escape(data):
     """@brief Escape binary data to be sent to Gdb.
@@ -114,14 +119,12 @@ def escape(data):
     @param data Bytes-like object containing raw binary.
     @return Bytes object with the characters in '#$}*' escaped as required by Gdb.
     """
-    result: List[int] = []
-    for c in data:
-        if c in _GDB_ESCAPED_CHARS:
-            # Escape by prefixing with '}' and xor'ing the char with 0x20.
-            result += [0x7d, c ^ 0x20]
-        else:
-            result.append(c)
-    return bytes(result)
+    # Escape by prefixing with '}' and xor'ing the char with 0x20. The '}' escape character itself
+    # must be replaced first.
+    result = bytes(data)
+    for c in _GDB_ESCAPED_CHARS:
+        result = result.replace(bytes((c,)), bytes((0x7d, c ^ 0x20)))
+    return result
 
 class GDBClientSession(threading.Thread):
     """@brief GDB client session thread.
@@ -143,6 +146,9 @@ class GDBClientSession(threading.Thread):
         self.is_socket_connected: bool = True
         self.gdb_features = []
         self.target_facade = GDBDebugContextFacade(server.target_context)
+        ## Threads XML sent to this client, as a (generation, document) tuple. gdb reads the
+        # document in chunks, so it is only regenerated when the generation changes.
+        self.threads_xml: Optional[Tuple[Tuple[int, int], bytes]] = None
         self.shutdown_event = threading.Event()
 
 
@@ -289,6 +295,10 @@ class GDBServer(threading.Thread):
     ## Timer delay for sending the notification that the server is listening.
     START_LISTENING_NOTIFY_DELAY = 0.03 # 30 ms
 
+    ## Seconds to wait for the transaction scheduler to report the state of the running target
+    # before reading the state directly.
+    SCHEDULER_STATE_TIMEOUT = 0.5
+
     def __init__(self, session, core=None):
         super().__init__(daemon=True)
         self.session = session
@@ -347,6 +357,9 @@ class GDBServer(threading.Thread):
         self.thread_provider = None
         self.did_init_thread_providers = False
         self.first_run_after_reset_or_flash = True
+        self._prefetch_run_token = None
+        self._threads_generation = 0
+        self.scheduler = TransactionScheduler.for_session(session)
 
         # Listening socket - same port for all clients
         self.listen_socket = ListenerSocket(self.port, self.packet_size)
@@ -360,7 +373,7 @@ class GDBServer(threading.Thread):
         # Coarse grain lock to synchronize SWO with other activity
         self.lock = threading.RLock()
 
-        self.session.subscribe(self.event_handler, Target.Event.POST_RESET)
+        self.session.subscribe(self.event_handler, (Target.Event.POST_RESET, Target.Event.PRE_RUN))
 
         # Init semihosting and stdio.
         if self.semihost_use_syscalls:
@@ -477,6 +490,7 @@ class GDBServer(threading.Thread):
     def _cleanup(self):
         LOG.debug("GDB server on port %d cleaning up", self.port)
         self._cleanup_client_sessions()
+        self._abort_flash_load()
         if self.semihost:
             self.semihost.cleanup()
             self.semihost = None
@@ -490,6 +504,7 @@ class GDBServer(threading.Thread):
             self.rtt_server.stop()
             self.rtt_server = None
         self.listen_socket.close()
+        self.scheduler.dump_metrics()
 
     def run(self):
         LOG.info("GDB server listening on port %d (core %d)", self.port, self.core)
@@ -583,8 +598,11 @@ class GDBServer(threading.Thread):
 
             # Resume target if no client is attached to program
             if not any(c.is_attached_to_target for c in self.client_sessions):
+                # Stop a load that gdb didn't finish before the target is resumed.
+                self._abort_flash_load()
                 self.thread_provider = None
                 self.did_init_thread_providers = False
+                self.invalidate_threads()
                 self.first_run_after_reset_or_flash = True
 
                 # Resume target when no clients are connected
@@ -601,6 +619,31 @@ class GDBServer(threading.Thread):
             if not self.client_sessions and not self.persist:
                 self.shutdown_event.set()
 
+    def _abort_flash_load(self) -> None:
+        """@brief Discard a flash load that was not completed with vFlashDone."""
+        if self.flash_loader is not None:
+            LOG.warning("Flash load was not completed; discarding unprogrammed data")
+            if isinstance(self.flash_loader, StreamingMemoryLoader):
+                self.flash_loader.abort()
+            self.flash_loader = None
+        self._set_rtt_paused(False)
+
+    def _set_rtt_paused(self, paused: bool) -> None:
+        """@brief Pause or resume RTT polling around a flash load.
+
+        The streaming loader runs the flash algo from a worker thread while gdb sends the rest of
+        the image, and the lock is released between packets. The flash algo may occupy the RAM of
+        the RTT control block and buffers, so the RTT poller must not access it until the load is
+        finished.
+        """
+        poller = self.rtt_server.poller if (self.rtt_server is not None) else None
+        if poller is None:
+            return
+        if paused:
+            poller.pause()
+        else:
+            poller.resume()
+
     def handle_message(self, client, msg):
         try:
             assert msg[0:1] == b'$', "invalid first char of message != $"
@@ -611,7 +654,13 @@ class GDBServer(threading.Thread):
                 LOG.error("Unknown RSP command (%s)", to_str_safe(msg[1:2]))
                 return self.create_rsp_packet(b"")
 
-            with self.lock:
+            with self.lock, self.scheduler.interactive(self.core):
+                # Flash may still be programmed in the background during a load. Let it finish
+                # before any other command accesses the target.
+                if isinstance(self.flash_loader, StreamingMemoryLoader) \
+                        and not msg.startswith(b'$vFlash'):
+                    self.flash_loader.wait()
+
                 if msgStart == 0:
                     reply = handler(client)
                 else:
@@ -806,22 +855,43 @@ class GDBServer(threading.Thread):
 
         self.target.resume()
         LOG.debug("Target resumed")
+        self.scheduler.watch(self.target, self.core)
 
         if self.first_run_after_reset_or_flash:
             self.first_run_after_reset_or_flash = False
             if self.thread_provider is not None:
                 self.thread_provider.read_from_target = True
-
-        val = b''
+                self.invalidate_threads()
 
         # Timeout used only if the target starts returning faults. The is_running property of this timeout
         # also serves as a flag that a fault occurred and we're attempting to retry.
         fault_retry_timeout = Timeout(self.session.options.get('debug.status_fault_retry_timeout'))
 
+        try:
+            val = self._wait_for_stop(client, fault_retry_timeout)
+        finally:
+            self.scheduler.unwatch(self.target)
+
+        # Check if waiting ended due to a timeout after a fault.
+        if fault_retry_timeout.did_time_out:
+            LOG.error("Timeout re-establishing target control.")
+            val = ('S%02x' % signals.SIGSEGV).encode()
+
+        return self.create_rsp_packet(val)
+
+    def _wait_for_stop(self, client, fault_retry_timeout: Timeout) -> bytes:
+        """@brief Wait for the resumed target to stop or for gdb to interrupt it.
+
+        The target's state is read by the transaction scheduler, which polls all running cores of the
+        session together. If the scheduler doesn't report the state in time, it is read directly.
+
+        @return Stop reply for gdb, without packet framing.
+        """
+        val = b''
         while fault_retry_timeout.check():
             if self.shutdown_event.is_set():
                 client.interrupt_clear()
-                return self.create_rsp_packet(val)
+                return val
 
             self.lock.release()
 
@@ -847,10 +917,11 @@ class GDBServer(threading.Thread):
             self.lock.acquire()
 
             try:
-                state = self.target.get_state()
-
-                if self.rtt_server:
-                    self.rtt_server.poll()
+                try:
+                    state = self.scheduler.get_state(self.target, self.SCHEDULER_STATE_TIMEOUT)
+                except exceptions.TimeoutError:
+                    LOG.debug("No state from transaction scheduler; reading target state directly")
+                    state = self.target.get_state()
 
                 # If we were able to successfully read the target state after previously receiving a fault,
                 # then clear the timeout.
@@ -871,8 +942,10 @@ class GDBServer(threading.Thread):
 
                         if was_semihost:
                             self.target.resume()
+                            self.scheduler.watch(self.target, self.core)
                             continue
 
+                    self._prefetch_stop_state(client)
                     pc = self.target_context.read_core_register('pc')
                     LOG.debug("Target halted at pc=0x%08x", pc)
                     val = self.get_t_response(client)
@@ -895,12 +968,7 @@ class GDBServer(threading.Thread):
                 val = ('S%02x' % client.target_facade.get_signal_value()).encode()
                 break
 
-        # Check if we exited the above loop due to a timeout after a fault.
-        if fault_retry_timeout.did_time_out:
-            LOG.error("Timeout re-establishing target control.")
-            val = ('S%02x' % signals.SIGSEGV).encode()
-
-        return self.create_rsp_packet(val)
+        return val
 
     def step(self, client, data, start=0, end=0):
         if data and data[0:1] in (b's', b'S'):
@@ -1041,6 +1109,7 @@ class GDBServer(threading.Thread):
 
         if ops == b'FlashErase':
             LOG.debug("Command: Flash erase")
+            self._set_rtt_paused(True)
             return self.create_rsp_packet(b"OK")
 
         elif ops == b'FlashWrite':
@@ -1054,9 +1123,14 @@ class GDBServer(threading.Thread):
                     second_colon += 1
                 idx_begin += 1
 
-            # Get flash loader if there isn't one already
+            # Get flash loader if there isn't one already. The streaming loader starts
+            # programming completed sectors while gdb sends the rest of the image.
             if self.flash_loader is None:
-                self.flash_loader = FlashLoader(self.session)
+                self._set_rtt_paused(True)
+                if self.session.options.get('streaming_load'):
+                    self.flash_loader = StreamingMemoryLoader(self.session)
+                else:
+                    self.flash_loader = FlashLoader(self.session)
 
             # Add data to flash loader
             self.flash_loader.add_data(write_addr, unescape(data[idx_begin:len(data) - 3]))
@@ -1066,19 +1140,23 @@ class GDBServer(threading.Thread):
         # we need to flash everything
         elif b'FlashDone' in ops :
             LOG.debug("Command: Flash done")
-            # Only program if we received data.
-            if self.flash_loader is not None:
-                try:
-                    # Write all buffered flash contents.
-                    self.flash_loader.commit()
-                finally:
-                    # Set flash loader to None so that on the next flash command a new
-                    # object is used.
-                    self.flash_loader = None
+            try:
+                # Only program if we received data.
+                if self.flash_loader is not None:
+                    try:
+                        # Write all buffered flash contents.
+                        self.flash_loader.commit()
+                    finally:
+                        # Set flash loader to None so that on the next flash command a new
+                        # object is used.
+                        self.flash_loader = None
+            finally:
+                self._set_rtt_paused(False)
 
             self.first_run_after_reset_or_flash = True
             if self.thread_provider is not None:
                 self.thread_provider.read_from_target = False
+                self.invalidate_threads()
 
             return self.create_rsp_packet(b"OK")
 
@@ -1096,7 +1174,7 @@ class GDBServer(threading.Thread):
             mem = self.target_context.read_memory_block8(addr, length)
             # Flush so an exception is thrown now if invalid memory was accesses
             self.target_context.flush()
-            val = hex_encode(bytearray(mem))
+            val = hex_encode(bytes(mem))
         except exceptions.TransferError as e:
             LOG.debug("Command: Read memory (addr=0x%08x, len=%d): Error = %s", addr, length, str(e))
             val = b'E01' #EPERM
@@ -1261,6 +1339,7 @@ class GDBServer(threading.Thread):
                 if rtos.init(symbol_provider):
                     LOG.info("Loaded %s RTOS plugin", rtos_name)
                     self.thread_provider = rtos
+                    self.invalidate_threads()
                     break
                 elif forced_rtos_name is not None:
                     LOG.error("Specified RTOS '%s' failed to load", rtos_name)
@@ -1336,6 +1415,9 @@ class GDBServer(threading.Thread):
             LOG.error("Command: Remote (cmd=%s): Unexpected error = %s", cmd, err,
                     exc_info=self.session.log_tracebacks)
 
+        # The command may have run or reset the core by writing debug registers directly.
+        self._invalidate_caches()
+
         # Convert back to bytes, hex encode, then return the response packet.
         output = stream.getvalue()
         if not output:
@@ -1386,7 +1468,7 @@ class GDBServer(threading.Thread):
             if annex != b'':
                 LOG.debug("Command: Query Xfer:threads:read (annex=%s, offset=%d, size=%d): Annex not empty", to_str_safe(annex), offset, size)
                 return b"E00"
-            xml = self.get_threads_xml()
+            xml = self._get_client_threads_xml(client)
         else:
             # Unrecognised query object, so return empty packet.
             LOG.debug("Command: Query Xfer:%s:read (annex=%s, offset=%d, size=%d): Unsupported XML query", to_str_safe(query), to_str_safe(annex), offset,size)
@@ -1463,7 +1545,37 @@ class GDBServer(threading.Thread):
 
         return -1, 0
 
+    def _prefetch_stop_state(self, client):
+        """@brief Fill the debug caches with the state gdb reads after the target stops.
+
+        The core state is read once, after which the caches assume the core stays halted until it
+        runs again. Then the registers of the 'g' packet are read in one batch, followed by windows of
+        stack memory at SP and code memory around PC. The requests gdb sends after a stop are thus
+        mostly served from the caches. Only done once per stop, and only if the 'prefetch.enable'
+        option is set.
+        """
+        context = self.target_context
+        options = self.session.options
+        if not options.get('prefetch.enable') or not isinstance(context, CachingDebugContext) \
+                or self._prefetch_run_token == context.core.run_token:
+            return
+        try:
+            if not context.set_halted():
+                return
+            self._prefetch_run_token = context.core.run_token
+            context.read_core_registers_raw(client.target_facade.register_indices)
+            sp = context.read_core_register('sp')
+            pc = context.read_core_register('pc')
+            code_size = options.get('prefetch.code_size')
+            context.prefetch_memory([
+                    (sp, options.get('prefetch.stack_size')),
+                    (max(0, pc - code_size // 2), code_size),
+                    ])
+        except exceptions.Error as e:
+            LOG.debug("Error prefetching stop state: %s", e)
+
     def get_t_response(self, client, forceSignal=None):
+        self._prefetch_stop_state(client)
         if self.is_threading_enabled():
             currentThread = self.thread_provider.current_thread
             currentThreadId = currentThread.unique_id
@@ -1481,6 +1593,25 @@ class GDBServer(threading.Thread):
         LOG.debug("Stop reply: %s", to_str_safe(response))
         return response
 
+    def invalidate_threads(self) -> None:
+        """@brief Discard the threads XML cached for all clients.
+
+        Must be called whenever the thread list may change other than by the target running, for
+        instance when an RTOS plugin is loaded or the thread provider starts reading from the target.
+        """
+        self._threads_generation += 1
+
+    def _get_client_threads_xml(self, client) -> bytes:
+        """@brief Return the threads XML for a client, generating it only if it may have changed.
+
+        The document is reused until the target runs or invalidate_threads() is called, so each
+        chunk that gdb requests is a slice of the same bytes.
+        """
+        generation = (self._threads_generation, self.target.run_token)
+        if client.threads_xml is None or client.threads_xml[0] != generation:
+            client.threads_xml = (generation, self.get_threads_xml())
+        return client.threads_xml[1]
+
     def get_threads_xml(self):
         root = Element('threads')
 
@@ -1518,12 +1649,22 @@ class GDBServer(threading.Thread):
             return None
 
     def event_handler(self, notification):
+        # Any core resetting or running, including from another gdbserver or the commander, can
+        # change the state of this core without changing its run token.
+        self._invalidate_caches()
         if notification.event == Target.Event.POST_RESET:
             # Invalidate threads list if flash is reprogrammed.
             LOG.debug("POST_RESET event received")
             self.first_run_after_reset_or_flash = True
             if self.thread_provider is not None:
                 self.thread_provider.read_from_target = False
+            self.invalidate_threads()
+
+    def _invalidate_caches(self):
+        """@brief Stop the debug caches from assuming that the core is still halted."""
+        if isinstance(self.target_context, CachingDebugContext):
+            self.target_context.invalidate()
+        self._prefetch_run_token = None
 
     def _option_did_change(self, notification):
         """@brief Handle an option changing at runtime.
@@ -1542,5 +1683,6 @@ class GDBServer(threading.Thread):
             LOG.info("Semihosting %s", ("enabled" if self.enable_semihosting else "disabled"))
         elif notification.event == 'report_core_number':
             self.report_core = notification.data.new_value
+            self.invalidate_threads()
         elif notification.event == 'soft_bkpt_as_hard':
             self.soft_bkpt_as_hard = notification.data.new_value
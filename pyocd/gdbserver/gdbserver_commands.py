@@ -50,6 +50,9 @@ class ThreadsCommand(CommandBase):
             self.context.write("Threads are unavailable")
             return
 
+        if self.action != 'status':
+            gdbserver.invalidate_threads()
+
         if self.action == 'flush':
             gdbserver.thread_provider.invalidate()
             self.context.write("Threads flushed")
@@ -127,6 +130,28 @@ class GdbserverMonitorExitCommand(CommandBase):
         for server in self.context.session.gdbservers.values():
             server.stop(wait=False)
 
+class GdbserverLatencyCommand(CommandBase):
+    """@brief Show the probe access latency metrics kept by the gdbserver transaction scheduler."""
+    INFO = {
+            'names': ['latency'],
+            'group': 'gdbserver',
+            'category': 'gdbserver',
+            'nargs': 0,
+            'usage': "",
+            'help': "Show probe access latency for each gdbserver.",
+            'extra_help': "Requests are gdb commands handled while the core is stopped. Polls are reads "
+                            "of the state of running cores, which are shared by all cores.",
+            }
+
+    def execute(self):
+        for core_number, server in sorted(self.context.session.gdbservers.items()):
+            metrics = server.scheduler.get_metrics(core_number)
+            self.context.writef("Core {}: {} requests (mean {:.2f} ms, max {:.2f} ms), "
+                    "{} polls (mean {:.2f} ms, max {:.2f} ms), {} deferred polls",
+                    core_number, metrics.requests, metrics.mean_request_time * 1000,
+                    metrics.max_request_time * 1000, metrics.polls, metrics.mean_poll_time * 1000,
+                    metrics.max_poll_time * 1000, metrics.deferred_polls)
+
 class RTTCommand(CommandBase):
     INFO = {
             'names': ['rtt'],
@@ -217,6 +242,8 @@ class RTTCommand(CommandBase):
                 gdbserver.rtt_server.start()
             except exceptions.RTTError as e:
                 raise exceptions.CommandError(str(e)) from e
+            if gdbserver.rtt_server.poller is None:
+                gdbserver.rtt_server.start_poller(gdbserver.lock)
 
             self.context.write(f"Found RTT control block.")
         elif self.action == "stop":
@@ -0,0 +1,271 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextlib import contextmanager
+import logging
+import threading
+from time import perf_counter
+from typing import (Callable, Dict, Generator, List, Optional, Tuple, TYPE_CHECKING, Union)
+
+from ..core import exceptions
+from ..core.target import Target
+
+if TYPE_CHECKING:
+    from ..core.session import Session
+
+LOG = logging.getLogger(__name__)
+
+class CoreLatencyMetrics:
+    """@brief Probe access latency metrics for one core, as seen by its gdbserver."""
+
+    def __init__(self) -> None:
+        ## Number of gdb requests handled while the core was stopped.
+        self.requests = 0
+        ## Total and maximum time to handle those requests, in seconds.
+        self.request_time = 0.0
+        self.max_request_time = 0.0
+        ## Number of status polls that included this core.
+        self.polls = 0
+        ## Total and maximum duration of the polls that included this core, in seconds.
+        self.poll_time = 0.0
+        self.max_poll_time = 0.0
+        ## Number of times a poll was postponed to let a request for this core go first.
+        self.deferred_polls = 0
+
+    @property
+    def mean_request_time(self) -> float:
+        return (self.request_time / self.requests) if self.requests else 0.0
+
+    @property
+    def mean_poll_time(self) -> float:
+        return (self.poll_time / self.polls) if self.polls else 0.0
+
+class _Watch:
+    """@brief Polling state for one running core."""
+
+    def __init__(self, core_number: int) -> None:
+        self.core_number = core_number
+        ## Result of the latest poll started after the core was watched, either a state or the
+        # exception raised while reading it.
+        self.result: Optional[Union[Target.State, Exception]] = None
+
+class TransactionScheduler:
+    """@brief Coordinates probe access between the gdbservers of a session.
+
+    Each gdbserver serves one core, but all of them share the session's debug probe. Instead of
+    every gdbserver polling the state of its running core on its own, the scheduler's thread reads
+    the state of all running cores with a single batch of transfers once per poll interval.
+
+    Requests from gdb for a stopped core are interactive, and take priority over polling. A poll is
+    postponed, up to a limit, while any such request is being handled.
+
+    One scheduler is shared by all gdbservers of a session. Use for_session() to get it.
+    """
+
+    ## Seconds between polls of the running cores.
+    POLL_INTERVAL = 0.01
+
+    ## Maximum number of consecutive poll intervals a poll is postponed for interactive requests.
+    MAX_DEFERRED_POLLS = 10
+
+    @classmethod
+    def for_session(cls, session: "Session") -> "TransactionScheduler":
+        """@brief Return the scheduler for a session, creating it if needed."""
+        state = session.context_state
+        with _SCHEDULER_CREATE_LOCK:
+            scheduler = getattr(state, 'gdbserver_scheduler', None)
+            if scheduler is None:
+                scheduler = cls(session)
+                state.gdbserver_scheduler = scheduler
+            return scheduler
+
+    def __init__(self, session: "Session") -> None:
+        self._session = session
+        self._condition = threading.Condition()
+        self._watches: Dict[Target, _Watch] = {}
+        self._interactive: Dict[int, int] = {}
+        self._resume_counts: Dict[int, int] = {}
+        self._metrics: Dict[int, CoreLatencyMetrics] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def get_metrics(self, core_number: int) -> CoreLatencyMetrics:
+        """@brief Return the latency metrics for a core."""
+        with self._condition:
+            return self._get_metrics(core_number)
+
+    def _get_metrics(self, core_number: int) -> CoreLatencyMetrics:
+        try:
+            return self._metrics[core_number]
+        except KeyError:
+            metrics = self._metrics[core_number] = CoreLatencyMetrics()
+            return metrics
+
+    @contextmanager
+    def interactive(self, core_number: int) -> Generator[None, None, None]:
+        """@brief Context manager for handling a request from gdb.
+
+        While a request for a core that is not being polled is handled, polls are postponed. The
+        time to handle requests for stopped cores is recorded in the core's metrics.
+        """
+        with self._condition:
+            self._interactive[core_number] = self._interactive.get(core_number, 0) + 1
+            resume_count = self._resume_counts.get(core_number, 0)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            with self._condition:
+                self._interactive[core_number] -= 1
+                # Requests that resumed the core include the whole time it ran, so they are not
+                # counted.
+                if self._resume_counts.get(core_number, 0) == resume_count:
+                    metrics = self._get_metrics(core_number)
+                    metrics.requests += 1
+                    metrics.request_time += elapsed
+                    metrics.max_request_time = max(metrics.max_request_time, elapsed)
+                self._condition.notify_all()
+
+    def watch(self, core: Target, core_number: int) -> None:
+        """@brief Start polling the state of a core that has been resumed."""
+        with self._condition:
+            self._watches[core] = _Watch(core_number)
+            self._resume_counts[core_number] = self._resume_counts.get(core_number, 0) + 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="gdbserver-scheduler", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def unwatch(self, core: Target) -> None:
+        """@brief Stop polling the state of a core."""
+        with self._condition:
+            self._watches.pop(core, None)
+            self._condition.notify_all()
+
+    def get_state(self, core: Target, timeout: Optional[float] = None) -> Target.State:
+        """@brief Return the state of a watched core from the most recent poll.
+
+        If the core has not been polled since watch() was called, this waits for the next poll. An
+        exception raised while reading the state is raised here once; the next call then waits for
+        another poll.
+
+        @exception TimeoutError The core was not polled within the timeout.
+        """
+        with self._condition:
+            watch = self._watches[core]
+            if not self._condition.wait_for(lambda: watch.result is not None, timeout):
+                raise exceptions.TimeoutError("timeout waiting for core %d status" % watch.core_number)
+            result = watch.result
+            if isinstance(result, Exception):
+                watch.result = None
+                raise result
+            assert result is not None
+            return result
+
+    def _should_defer(self, deferred: int) -> bool:
+        """@brief Whether to postpone the next poll for an interactive request."""
+        if deferred >= self.MAX_DEFERRED_POLLS:
+            return False
+        polled = {w.core_number for w in self._watches.values()}
+        return any(count and (n not in polled) for n, count in self._interactive.items())
+
+    def _run(self) -> None:
+        try:
+            self._poll_loop()
+        except Exception as e:
+            LOG.error("gdbserver transaction scheduler stopped: %s", e, exc_info=True)
+        finally:
+            # Let watch() start a new thread if this one ended unexpectedly.
+            with self._condition:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def _poll_loop(self) -> None:
+        deferred = 0
+        while True:
+            with self._condition:
+                if not self._watches:
+                    self._thread = None
+                    return
+                if self._should_defer(deferred):
+                    deferred += 1
+                    for metrics in {self._get_metrics(n) for n, c in self._interactive.items() if c}:
+                        metrics.deferred_polls += 1
+                    self._condition.wait(self.POLL_INTERVAL)
+                    continue
+                deferred = 0
+                watches = list(self._watches.items())
+
+            start = perf_counter()
+            try:
+                results = self._poll([core for core, _ in watches])
+            except Exception as e:
+                # Report the error to the gdbservers instead of ending the thread.
+                LOG.debug("Error polling core states: %s", e)
+                results = [e] * len(watches)
+            elapsed = perf_counter() - start
+
+            with self._condition:
+                for (core, watch), result in zip(watches, results):
+                    watch.result = result
+                    metrics = self._get_metrics(watch.core_number)
+                    metrics.polls += 1
+                    metrics.poll_time += elapsed
+                    metrics.max_poll_time = max(metrics.max_poll_time, elapsed)
+                self._condition.notify_all()
+                self._condition.wait(max(0.0, self.POLL_INTERVAL - elapsed))
+
+    def _poll(self, cores: List[Target]) -> List[Union[Target.State, Exception]]:
+        """@brief Read the states of several cores with one batch of transfers."""
+        probe = self._session.probe
+        assert probe is not None
+        results: List[Union[Target.State, Exception]] = []
+        probe.lock()
+        try:
+            pending: List[Tuple[Target, Optional[Callable[[], Target.State]]]] = []
+            for core in cores:
+                try:
+                    pending.append((core, core.get_state_deferred()))
+                except exceptions.Error:
+                    pending.append((core, None))
+            for core, state_cb in pending:
+                try:
+                    if state_cb is not None:
+                        results.append(state_cb())
+                        continue
+                except exceptions.Error:
+                    pass
+                # An error from a batch is reported for every read in it, so read this core's state
+                # on its own to find out whether it was the one that failed.
+                try:
+                    results.append(core.get_state())
+                except exceptions.Error as e:
+                    results.append(e)
+        finally:
+            probe.unlock()
+        return results
+
+    def dump_metrics(self) -> None:
+        """@brief Log the latency metrics of all cores."""
+        with self._condition:
+            for core_number, metrics in sorted(self._metrics.items()):
+                LOG.debug("core %d: %d requests (mean %.2f ms, max %.2f ms), %d polls (mean %.2f ms, "
+                        "max %.2f ms), %d deferred polls", core_number, metrics.requests,
+                        metrics.mean_request_time * 1000, metrics.max_request_time * 1000, metrics.polls,
+                        metrics.mean_poll_time * 1000, metrics.max_poll_time * 1000,
+                        metrics.deferred_polls)
+
+_SCHEDULER_CREATE_LOCK = threading.Lock()
@@ -15,12 +15,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from concurrent.futures import ThreadPoolExecutor
+
 from ..core import exceptions
-from ..core.plugin import load_plugin_classes_of_type
+from ..core.plugin import PluginClassDict
 from .debug_probe import DebugProbe
+from .usb_devices import ENUMERATOR
 
-## @brief Dictionary of loaded probe plugins indexed by name.
-PROBE_CLASSES = {}
+## @brief Dictionary of probe plugins indexed by name.
+#
+# Plugins are loaded on demand, so that a probe type's dependencies are only imported when the type
+# is used or probes are enumerated.
+PROBE_CLASSES = PluginClassDict('pyocd.probe', DebugProbe)
 
 class DebugProbeAggregator(object):
     """@brief Simple class to enable collecting probes of all supported probe types."""
@@ -38,13 +44,46 @@ class DebugProbeAggregator(object):
         if probe_type is None:
             klasses = PROBE_CLASSES.values()
         else:
-            # Perform a case-insensitive match.
-            klasses = [PROBE_CLASSES[k] for k in PROBE_CLASSES if k.lower() == probe_type]
-            if not klasses:
+            # Perform a case-insensitive match, loading only the selected plugin.
+            klass = PROBE_CLASSES.find(probe_type)
+            if klass is None:
                 raise exceptions.Error("unknown debug probe type '{}'".format(probe_type))
+            klasses = [klass]
 
         return klasses, unique_id, (probe_type is not None)
 
+    @staticmethod
+    def _query_classes(klasses, fn):
+        """@brief Call a function for each probe class concurrently.
+
+        Probe classes are queried from a thread pool so that slow backends (for instance, ones
+        that open each device to read descriptors) don't serialize the scan. All libusb based
+        backends share a single USB enumeration for the duration of the query.
+
+        @return List of the function's return values, in the same order as _klasses_. If any call
+            raises, the exception from the first such class in order is re-raised.
+        """
+        klasses = list(klasses)
+        with ENUMERATOR.scan():
+            if len(klasses) <= 1:
+                return [fn(cls) for cls in klasses]
+            with ThreadPoolExecutor(max_workers=len(klasses), thread_name_prefix="probe scan") as executor:
+                return list(executor.map(fn, klasses))
+
+    @staticmethod
+    def _find_probe_with_id(klasses, unique_id, is_explicit):
+        """@brief Ask probe classes in order for a probe with the ID, stopping at the first match.
+
+        Classes are queried one at a time, since a class may open the probe it finds. The classes
+        still share a single USB enumeration.
+        """
+        with ENUMERATOR.scan():
+            for cls in klasses:
+                probe = cls.get_probe_with_id(unique_id, is_explicit)
+                if probe is not None:
+                    return probe
+        return None
+
     @staticmethod
     def get_all_connected_probes(unique_id=None):
         klasses, unique_id, is_explicit = DebugProbeAggregator._get_probe_classes(unique_id)
@@ -53,14 +92,14 @@ class DebugProbeAggregator(object):
 
         # First look for a match against the full ID, as this can be more efficient for certain probes.
         if unique_id is not None:
-            for cls in klasses:
-                probe = cls.get_probe_with_id(unique_id, is_explicit)
-                if probe is not None:
-                    return [probe]
+            probe = DebugProbeAggregator._find_probe_with_id(klasses, unique_id, is_explicit)
+            if probe is not None:
+                return [probe]
 
         # No full match, so ask probe classes for probes.
-        for cls in klasses:
-            probes += cls.get_all_connected_probes(unique_id, is_explicit)
+        for class_probes in DebugProbeAggregator._query_classes(klasses,
+                lambda cls: cls.get_all_connected_probes(unique_id, is_explicit)):
+            probes += class_probes
 
         # Filter by unique ID.
         if unique_id is not None:
@@ -72,12 +111,4 @@ class DebugProbeAggregator(object):
     @classmethod
     def get_probe_with_id(cls, unique_id):
         klasses, unique_id, is_explicit = DebugProbeAggregator._get_probe_classes(unique_id)
-
-        for cls in klasses:
-            probe = cls.get_probe_with_id(unique_id, is_explicit)
-            if probe is not None:
-                return probe
-        return None
-
-# Load plugins when this module is loaded.
-load_plugin_classes_of_type('pyocd.probe', PROBE_CLASSES, DebugProbe)
+        return DebugProbeAggregator._find_probe_with_id(klasses, unique_id, is_explicit)
@@ -308,6 +308,7 @@ class CMSISDAPProbe(DebugProbe):
                 self.Capability.APv2_ADDRESSES,
                 self.Capability.JTAG_SEQUENCE,
                 self.Capability.PIN_ACCESS,
+                self.Capability.VALUE_MATCH,
                 }
             if self._link.has_swd_sequence:
                 self._caps.add(self.Capability.SWD_SEQUENCE)
@@ -398,9 +399,7 @@ class CMSISDAPProbe(DebugProbe):
         TRACE.debug("trace: reset")
 
         try:
-            self._link.assert_reset(True)
-            sleep(self.session.options.get('reset.hold_time'))
-            self._link.assert_reset(False)
+            self._link.reset(self.session.options.get('reset.hold_time'))
             sleep(self.session.options.get('reset.post_delay'))
         except DAPAccess.Error as exc:
             raise self._convert_exception(exc) from exc
@@ -684,6 +683,27 @@ class CMSISDAPProbe(DebugProbe):
                     ", ".join(["%#010x" % v for v in values]), exc)
             raise self._convert_exception(exc) from exc
 
+    def poll_ap(self, addr: int, mask: int, value: int, retries: int) -> bool:
+        assert isinstance(addr, int)
+        ap_reg = self.REG_ADDR_TO_ID_MAP[self.AP, (addr & self.A32)]
+
+        try:
+            # The probe repeats value match reads itself. Retry counts beyond what fits in
+            # DAP_TransferConfigure are split over several commands.
+            while True:
+                count = min(retries, DAPAccess.MAX_MATCH_RETRY)
+                matched = self._link.poll_until(ap_reg, mask, value, count)
+                retries -= count + 1
+                if matched or retries < 0:
+                    break
+            TRACE.debug("trace: poll_ap(addr=%#010x, mask=%#010x, value=%#010x) -> %s",
+                    addr, mask, value, matched)
+            return matched
+        except DAPAccess.Error as exc:
+            TRACE.debug("trace: poll_ap(addr=%#010x, mask=%#010x, value=%#010x) -> error(%s)",
+                    addr, mask, value, exc)
+            raise self._convert_exception(exc) from exc
+
     # ------------------------------------------- #
     #          SWO functions
     # ------------------------------------------- #
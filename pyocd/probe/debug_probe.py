@@ -138,6 +138,11 @@ class DebugProbe:
         ## @brief Pin access via the read_pins()/write_pins() APIs.
         PIN_ACCESS = 8
 
+        ## @brief Whether the probe repeats poll_ap() reads itself.
+        #
+        # Without this capability, poll_ap() reads the register from the host once per retry.
+        VALUE_MATCH = 9
+
     @classmethod
     def get_all_connected_probes(
                 cls,
@@ -505,6 +510,25 @@ class DebugProbe:
         """@brief Write one AP register multiple times."""
         raise NotImplementedError()
 
+    def poll_ap(self, addr: int, mask: int, value: int, retries: int) -> bool:
+        """@brief Read an AP register until its value under a mask matches.
+
+        The default implementation reads the register from the host. Probes able to repeat the read
+        themselves, such as CMSIS-DAP with value match reads, override this method so that polling
+        takes a single round trip, and report the VALUE_MATCH capability.
+
+        @param self
+        @param addr AP register address.
+        @param mask Mask applied to the register value before comparing.
+        @param value Expected value of the masked register.
+        @param retries Number of times the read is repeated after the first read does not match.
+        @return Boolean indicating whether the register matched.
+        """
+        for _ in range(retries + 1):
+            if (self.read_ap(addr) & mask) == value:
+                return True
+        return False
+
     def get_memory_interface_for_ap(self, ap_address: APAddressBase) -> Optional[MemoryInterface]:
         """@brief Returns a @ref pyocd.core.memory_interface.MemoryInterface "MemoryInterface" for
             the specified AP.
@@ -19,10 +19,6 @@ from array import array
 
 from time import sleep
 from usb import core, util
-try:
-    from libusb_package import find as usb_find
-except ImportError:
-    from usb.core import find as usb_find
 
 import platform
 import errno
@@ -31,6 +27,7 @@ from typing import List
 
 from .debug_probe import DebugProbe
 from .common import show_no_libusb_warning
+from .usb_devices import find_usb_devices
 from ..core import exceptions
 from ..core.options import OptionInfo
 from ..core.plugin import Plugin
@@ -111,7 +108,7 @@ class PicoLink(object):
         """@brief Find and return all Picoprobes """
         try:
             # Use a custom matcher to make sure the probe is a Picoprobe and accessible.
-            return [PicoLink(probe) for probe in usb_find(find_all=True, custom_match=FindPicoprobe(uid))]
+            return [PicoLink(probe) for probe in find_usb_devices(FindPicoprobe(uid))]
         except core.NoBackendError:
             show_no_libusb_warning()
             return []
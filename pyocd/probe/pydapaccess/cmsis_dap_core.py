@@ -17,7 +17,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import (Set, Tuple)
+from typing import (Callable, List, Optional, Set, Tuple)
 
 from .dap_access_api import DAPAccessIntf
 
@@ -149,7 +149,7 @@ class DAPTransferResponse:
     """Responses to DAP_Transfer and DAP_TransferBlock"""
     ACK_MASK = 0x07 # Bits [2:0]
     PROTOCOL_ERROR_MASK = 0x08 # Bit [3]
-    VALUE_MISMATCH_MASK = 0x08 # Bit [4]
+    VALUE_MISMATCH_MASK = 0x10 # Bit [4]
 
     # Values for ACK bitfield.
     ACK_OK = 1
@@ -158,11 +158,41 @@ class DAPTransferResponse:
     ACK_NO_ACK = 7
 
 class CMSISDAPProtocol(object):
-    """@brief This class implements the CMSIS-DAP wire protocol."""
+    """@brief This class implements the CMSIS-DAP wire protocol.
+
+    Commands whose response is just the command ID and a status byte can be posted instead of sent.
+    While the `post_command` attribute is set, such commands are passed to it and return None. The
+    owner of the posting callable is then responsible for sending the commands and checking their
+    responses.
+    """
 
     def __init__(self, interface):
         self.interface = interface
 
+        ## Callable invoked with the encoded command, the command name, and whether the status byte
+        # must be DAP_OK, for each posted command. None if commands are sent immediately.
+        self.post_command: Optional[Callable[[List[int], str, bool], None]] = None
+
+    def _status_command(self, cmd, name, check_status=True):
+        """@brief Send or post a command whose response is the command ID and a status byte.
+        @return The status byte, or None if the command was posted.
+        """
+        if self.post_command is not None:
+            self.post_command(cmd, name, check_status)
+            return None
+
+        self.interface.write(cmd)
+
+        resp = self.interface.read()
+        if resp[0] != cmd[0]:
+            # Response is to a different command
+            raise DAPAccessIntf.DeviceError("expected %s" % name)
+
+        if check_status and resp[1] != DAP_OK:
+            raise DAPAccessIntf.CommandError("%s failed" % name)
+
+        return resp[1]
+
     def dap_info(self, id_):
         """@brief Sends the DAP_Info command to read info from the CMSIS-DAP probe.
         @param self This object.
@@ -212,18 +242,7 @@ class CMSISDAPProtocol(object):
         cmd.append(Command.DAP_LED)
         cmd.append(type)
         cmd.append(int(enabled))
-        self.interface.write(cmd)
-
-        resp = self.interface.read()
-        if resp[0] != Command.DAP_LED:
-            # Response is to a different command
-            raise DAPAccessIntf.DeviceError("expected DAP_LED")
-
-        if resp[1] != 0:
-            # Second response byte must be 0
-            raise DAPAccessIntf.CommandError("DAP_LED failed")
-
-        return resp[1]
+        return self._status_command(cmd, "DAP_LED")
 
     def connect(self, mode=DAP_DEFAULT_PORT):
         cmd = []
@@ -245,18 +264,7 @@ class CMSISDAPProtocol(object):
     def disconnect(self):
         cmd = []
         cmd.append(Command.DAP_DISCONNECT)
-        self.interface.write(cmd)
-
-        resp = self.interface.read()
-        if resp[0] != Command.DAP_DISCONNECT:
-            # Response is to a different command
-            raise DAPAccessIntf.DeviceError("expected DAP_DISCONNECT")
-
-        if resp[1] != DAP_OK:
-            # DAP Disconnect failed
-            raise DAPAccessIntf.CommandError("DAP_DISCONNECT failed")
-
-        return resp[1]
+        return self._status_command(cmd, "DAP_DISCONNECT")
 
     def write_abort(self, data, dap_index=0):
         cmd = []
@@ -295,6 +303,14 @@ class CMSISDAPProtocol(object):
 
         return resp[1]
 
+    def delay(self, delay_us):
+        assert 0 <= delay_us <= 0xffff
+        cmd = []
+        cmd.append(Command.DAP_DELAY)
+        cmd.append(delay_us & 0xff)
+        cmd.append(delay_us >> 8)
+        return self._status_command(cmd, "DAP_DELAY")
+
     def transfer_configure(self, idle_cycles=2, wait_retry=150, match_retry=0):
         cmd = []
         cmd.append(Command.DAP_TRANSFER_CONFIGURE)
@@ -303,18 +319,7 @@ class CMSISDAPProtocol(object):
         cmd.append(wait_retry >> 8)
         cmd.append(match_retry & 0xff)
         cmd.append(match_retry >> 8)
-        self.interface.write(cmd)
-
-        resp = self.interface.read()
-        if resp[0] != Command.DAP_TRANSFER_CONFIGURE:
-            # Response is to a different command
-            raise DAPAccessIntf.DeviceError("expected DAP_TRANSFER_CONFIGURE")
-
-        if resp[1] != DAP_OK:
-            # DAP Transfer Configure failed
-            raise DAPAccessIntf.CommandError("DAP_TRANSFER_CONFIGURE failed")
-
-        return resp[1]
+        return self._status_command(cmd, "DAP_TRANSFER_CONFIGURE")
 
 
     def set_swj_clock(self, clock=1000000):
@@ -324,18 +329,7 @@ class CMSISDAPProtocol(object):
         cmd.append((clock >> 8) & 0xff)
         cmd.append((clock >> 16) & 0xff)
         cmd.append((clock >> 24) & 0xff)
-        self.interface.write(cmd)
-
-        resp = self.interface.read()
-        if resp[0] != Command.DAP_SWJ_CLOCK:
-            # Response is to a different command
-            raise DAPAccessIntf.DeviceError("expected DAP_SWJ_CLOCK")
-
-        if resp[1] != DAP_OK:
-            # DAP SWJ Clock failed
-            raise DAPAccessIntf.CommandError("DAP_SWJ_CLOCK failed")
-
-        return resp[1]
+        return self._status_command(cmd, "DAP_SWJ_CLOCK")
 
     def set_swj_pins(self, output, pins, wait=0):
         cmd = []
@@ -346,14 +340,7 @@ class CMSISDAPProtocol(object):
         cmd.append((wait >> 8) & 0xff)
         cmd.append((wait >> 16) & 0xff)
         cmd.append((wait >> 24) & 0xff)
-        self.interface.write(cmd)
-
-        resp = self.interface.read()
-        if resp[0] != Command.DAP_SWJ_PINS:
-            # Response is to a different command
-            raise DAPAccessIntf.DeviceError("expected DAP_SWJ_PINS")
-
-        return resp[1]
+        return self._status_command(cmd, "DAP_SWJ_PINS", check_status=False)
 
     def swd_configure(self, turnaround=1, always_send_data_phase=False):
         assert 1 <= turnaround <= 4
@@ -362,18 +349,7 @@ class CMSISDAPProtocol(object):
         cmd = []
         cmd.append(Command.DAP_SWD_CONFIGURE)
         cmd.append(conf)
-        self.interface.write(cmd)
-
-        resp = self.interface.read()
-        if resp[0] != Command.DAP_SWD_CONFIGURE:
-            # Response is to a different command
-            raise DAPAccessIntf.DeviceError("expected DAP_SWD_CONFIGURE")
-
-        if resp[1] != DAP_OK:
-            # DAP SWD Configure failed
-            raise DAPAccessIntf.CommandError("DAP_SWD_CONFIGURE failed")
-
-        return resp[1]
+        return self._status_command(cmd, "DAP_SWD_CONFIGURE")
 
     def swd_sequence(self, sequences):
         """@brief Send the DAP_SWD_Sequence command.
@@ -448,18 +424,7 @@ class CMSISDAPProtocol(object):
         for i in range((length + 7) // 8):
             cmd.append(bits & 0xff)
             bits >>= 8
-        self.interface.write(cmd)
-
-        resp = self.interface.read()
-        if resp[0] != Command.DAP_SWJ_SEQUENCE:
-            # Response is to a different command
-            raise DAPAccessIntf.DeviceError("expected DAP_SWJ_SEQUENCE")
-
-        if resp[1] != DAP_OK:
-            # DAP SWJ Sequence failed
-            raise DAPAccessIntf.CommandError("DAP_SWJ_SEQUENCE failed")
-
-        return resp[1]
+        return self._status_command(cmd, "DAP_SWJ_SEQUENCE")
 
     def jtag_sequence(self, cycles, tms, read_tdo, tdi):
         assert 0 <= cycles <= 64
@@ -275,8 +275,8 @@ class DAPAccessIntf(object):
         """@brief Return the current port type - SWD or JTAG"""
         raise NotImplementedError()
 
-    def reset(self):
-        """@brief Reset the target"""
+    def reset(self, hold_time=0.1):
+        """@brief Reset the target by asserting the reset line for _hold_time_ seconds"""
         raise NotImplementedError()
 
     def assert_reset(self, asserted):
@@ -342,6 +342,14 @@ class DAPAccessIntf(object):
         """@brief Read a single word to a DP or AP register"""
         raise NotImplementedError()
 
+    def poll_until(self, reg_id, mask, value, retries, dap_index=0):
+        """@brief Read a DP or AP register until its value under a mask matches
+
+        The probe repeats the read without returning to the host. Returns True if the register
+        matched within _retries_ additional reads, or False if it did not.
+        """
+        raise NotImplementedError()
+
     def reg_write_repeat(self, num_repeats, reg_id, data_array, dap_index=0):
         """@brief Write one or more words to the same DP or AP register"""
         raise NotImplementedError()
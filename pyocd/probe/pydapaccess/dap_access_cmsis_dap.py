@@ -19,7 +19,9 @@
 import re
 import logging
 import collections
+from contextlib import contextmanager
 import threading
+from time import sleep
 from typing import (Any, Dict, Optional, Tuple, Union)
 
 from .dap_settings import DAPSettings
@@ -36,6 +38,7 @@ from .cmsis_dap_core import (
     DAPSWOControl,
     DAPTransferResponse,
     CMSISDAPVersion,
+    DAP_OK,
     )
 from ...core import session
 from ...utility.concurrency import locked
@@ -158,7 +161,7 @@ class _Transfer(object):
                 self.daplink._read_packet()
             else:
                 assert not self.daplink._crnt_cmd.get_empty()
-                self.daplink.flush()
+                self.daplink._send_packet()
 
         if self._error is not None:
             # Pylint is confused and thinks self._error is None
@@ -197,6 +200,8 @@ class _Command(object):
         self._data = []
         self._dap_index = self._UNSET_DAP_INDEX
         self._data_encoded = False
+        ## Identifiers of the threads that queued transfers in this command.
+        self.owners = set()
         TRACE.debug("[cmd:%d] New _Command", self._id)
 
     @property
@@ -287,6 +292,11 @@ class _Command(object):
         """
         return len(self._data) == 0
 
+    def get_response_size(self):
+        """@brief Return the size of the response to this command, in bytes."""
+        header_size = 4 if self._block_allowed else 3
+        return header_size + 4 * self._read_count
+
     def add(self, count, request, data, dap_index):
         """@brief Add a single or block register transfer operation to this command
         """
@@ -345,14 +355,14 @@ class _Command(object):
                     write_pos += 1
         return buf[:pos]
 
-    def _check_response(self, response):
+    @staticmethod
+    def _check_response(response):
         """@brief Check the response status byte from CMSIS-DAP transfer commands.
 
         The ACK bits [2:0] and the protocol error bit are checked. If any error is indicated,
         the appropriate exception is raised. An exception is also raised for unrecognised ACK
         values.
 
-        @param self
         @param response The "Transfer Response" byte from a DAP_Transfer or DAP_TransferBlock
             command.
 
@@ -486,6 +496,109 @@ class _Command(object):
             data = self._decode_transfer_data(data)
         return data
 
+class _PostedCommands(object):
+    """@brief A packet of commands sent without waiting for their responses.
+
+    Posted commands are those whose response is only the command ID and a status byte, such as
+    DAP_SWJ_Sequence or DAP_SWJ_Clock. If the probe supports atomic commands, consecutive posted
+    commands are packed into a single DAP_ExecuteCommands packet. Otherwise the packet holds one
+    command.
+
+    A transfer _Command that fits in the remaining space may be attached after the posted
+    commands, so it is executed in the same packet. Instances are queued for reading alongside
+    _Command objects; the decode_data() method checks the status of each posted command and then
+    returns the decoded response of the attached transfer command, if any.
+    """
+
+    def __init__(self, size, can_pack):
+        self._id = _Command._command_counter
+        _Command._command_counter += 1
+        self._size = size
+        self._can_pack = can_pack
+        self._commands = []
+        self._transfer = None
+        self._transfer_data = None
+        # Size of the DAP_ExecuteCommands header.
+        self._length = 2
+        ## Identifiers of the threads that posted commands or queued transfers in this packet.
+        self.owners = set()
+        TRACE.debug("[cmd:%d] New _PostedCommands", self._id)
+
+    @property
+    def uid(self) -> int:
+        return self._id
+
+    def get_empty(self):
+        return len(self._commands) == 0
+
+    def can_add(self, cmd):
+        """@brief Whether the command fits in this packet."""
+        if not self._commands:
+            return True
+        return (self._can_pack
+                and len(self._commands) < 255
+                and self._length + len(cmd) <= self._size
+                and 2 * (len(self._commands) + 1) + 2 <= self._size)
+
+    def add(self, cmd, name, check_status):
+        assert self.can_add(cmd) and self._transfer is None
+        self._commands.append((cmd, name, check_status))
+        self._length += len(cmd)
+
+    def attach_transfer(self, cmd, data):
+        """@brief Attach an encoded transfer command to be executed after the posted commands.
+        @return Boolean indicating whether the command fit in this packet.
+        """
+        assert self._transfer is None
+        response_size = 2 + 2 * len(self._commands) + cmd.get_response_size()
+        if (not self._can_pack
+                or len(self._commands) >= 255
+                or self._length + len(data) > self._size
+                or response_size > self._size):
+            return False
+        self._transfer = cmd
+        self._transfer_data = data
+        self.owners |= cmd.owners
+        return True
+
+    @property
+    def _is_packed(self):
+        return len(self._commands) > 1 or self._transfer is not None
+
+    def encode_data(self):
+        assert self.get_empty() is False
+        if not self._is_packed:
+            return bytearray(self._commands[0][0])
+        count = len(self._commands) + (1 if self._transfer is not None else 0)
+        data = bytearray([Command.DAP_EXECUTE_COMMANDS, count])
+        for cmd, _, _ in self._commands:
+            data.extend(cmd)
+        if self._transfer is not None:
+            data.extend(self._transfer_data)
+        return data
+
+    def decode_data(self, data):
+        assert self.get_empty() is False
+        if not self._is_packed:
+            offset = 0
+        else:
+            count = len(self._commands) + (1 if self._transfer is not None else 0)
+            if data[0] != Command.DAP_EXECUTE_COMMANDS:
+                raise DAPAccessIntf.DeviceError("expected DAP_EXECUTE_COMMANDS")
+            if data[1] != count:
+                raise DAPAccessIntf.DeviceError("DAP_EXECUTE_COMMANDS executed %d of %d commands"
+                        % (data[1], count))
+            offset = 2
+        for cmd, name, check_status in self._commands:
+            if data[offset] != cmd[0]:
+                raise DAPAccessIntf.DeviceError("expected %s" % name)
+            if check_status and data[offset + 1] != DAP_OK:
+                raise DAPAccessIntf.CommandError("%s failed" % name)
+            offset += 2
+        if self._transfer is not None:
+            return self._transfer.decode_data(data[offset:])
+        return bytearray()
+
 class DAPAccessCMSISDAP(DAPAccessIntf):
     """@brief An implementation of the DAPAccessIntf layer for DAPLink boards
 
@@ -494,6 +607,12 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
     prior to using methods of that object. Otherwise the command responses may be processed out of order.
     """
 
+    ## Largest match retry count accepted by DAP_TransferConfigure.
+    MAX_MATCH_RETRY = 0xffff
+
+    ## Longest reset pulse, in seconds, that is timed by the probe with DAP_Delay commands.
+    MAX_PROBE_TIMED_RESET = 1.0
+
     # ------------------------------------------- #
     #          Static Functions
     # ------------------------------------------- #
@@ -591,8 +710,12 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
         self._transfer_list = collections.deque()
         self._crnt_cmd = _Command(0)
         self._packet_size = None
+        self._match_retry = 0
+        self._posted = None
+        self._supports_atomic_commands = False
         self._commands_to_read = collections.deque()
         self._command_response_buf = bytearray()
+        self._thread_errors: Dict[int, Exception] = {}
         self._swo_status = None
         self._cmsis_dap_version: VersionTuple = CMSISDAPVersion.V1_0_0
         self._fw_version: Optional[str] = None
@@ -796,6 +919,7 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
         self._capabilities = self.identify(self.ID.CAPABILITIES)
         assert isinstance(self._capabilities, int)
         self._has_swo_uart = (self._capabilities & Capabilities.SWO_UART) != 0
+        self._supports_atomic_commands = (self._capabilities & Capabilities.ATOMIC_COMMANDS) != 0
         if self._has_swo_uart:
             swo_buffer_size_value = self.identify(self.ID.SWO_BUFFER_SIZE)
             if isinstance(swo_buffer_size_value, int) and swo_buffer_size_value > 0:
@@ -818,7 +942,7 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
         assert self._interface is not None
         if not self._is_open:
             return
-        self.flush()
+        self._flush_all()
         self._interface.close()
         self._is_open = False
         self._crnt_cmd = _Command(0)
@@ -828,12 +952,31 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
 
     @locked
     def pin_access(self, mask: int, value: int) -> int:
-        self.flush()
+        self._flush_all()
         return self._protocol.set_swj_pins(value, mask)
 
+    @locked
+    def reset(self, hold_time=0.1):
+        if not (self._supports_atomic_commands and self._deferred_transfer) \
+                or hold_time > self.MAX_PROBE_TIMED_RESET:
+            self.assert_reset(True)
+            sleep(hold_time)
+            self.assert_reset(False)
+            return
+
+        # Let the probe time the reset pulse so the whole pulse is a single DAP_ExecuteCommands.
+        delay_us = int(hold_time * 1000000)
+        with self._posting():
+            self._protocol.set_swj_pins(0, Pin.nRESET)
+            while delay_us > 0:
+                self._protocol.delay(min(delay_us, 0xffff))
+                delay_us -= 0xffff
+            self._protocol.set_swj_pins(Pin.nRESET, Pin.nRESET)
+        self._flush_all()
+
     @locked
     def assert_reset(self, asserted):
-        self.flush()
+        self._flush_all()
         if asserted:
             self._protocol.set_swj_pins(0, Pin.nRESET)
         else:
@@ -841,14 +984,14 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
 
     @locked
     def is_reset_asserted(self):
-        self.flush()
+        self._flush_all()
         pins = self._protocol.set_swj_pins(0, Pin.NONE)
         return (pins & Pin.nRESET) == 0
 
     @locked
     def set_clock(self, frequency):
-        self.flush()
-        self._protocol.set_swj_clock(int(frequency))
+        with self._posting():
+            self._protocol.set_swj_clock(int(frequency))
         self._frequency = frequency
 
     def get_swj_mode(self):
@@ -868,11 +1011,41 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
         that previous writes are complete call the flush() function.
         """
         if self._deferred_transfer and not enable:
-            self.flush()
+            self._flush_all()
         self._deferred_transfer = enable
 
     @locked
     def flush(self):
+        """@brief Complete the transfers queued by the calling thread.
+
+        Transfers from all threads share the same packets, in the order they were queued. Only
+        packets holding transfers or posted commands from the calling thread are sent and read, so
+        a flush from one thread doesn't force out transfers that other threads are still batching.
+
+        An error from a packet is raised in the thread that reads it. Other threads that had
+        transfers in the aborted packets get the error from their next flush.
+        """
+        self._raise_thread_error()
+        owner = threading.get_ident()
+        posted = self._posted
+        if (owner in self._crnt_cmd.owners) or (posted is not None and owner in posted.owners):
+            TRACE.debug("flush: sending cmd:%d", self._crnt_cmd.uid)
+            self._send_packet()
+
+        # Read up to and including the last packet holding transfers from this thread.
+        count = 0
+        for index, cmd in enumerate(self._commands_to_read):
+            if owner in cmd.owners:
+                count = index + 1
+        if count:
+            TRACE.debug("flush: reading %d of %d outstanding", count, len(self._commands_to_read))
+        for _ in range(count):
+            self._read_packet()
+
+    @locked
+    def _flush_all(self):
+        """@brief Send and read all queued transfers and posted commands, from every thread."""
+        self._raise_thread_error()
         if TRACE.isEnabledFor(logging.DEBUG):
             if self._crnt_cmd.get_empty() and len(self._commands_to_read):
                 TRACE.debug("flush: reading %d outstanding (cmd:%d is empty)",
@@ -896,8 +1069,8 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
 
         # Check if buffers are inited before calling flush, so identify() can be called from open(), before
         # the initing the deferred buffers.
-        if not self._crnt_cmd.get_empty() or len(self._commands_to_read):
-            self.flush()
+        if not self._crnt_cmd.get_empty() or len(self._commands_to_read) or self._posted is not None:
+            self._flush_all()
         value = self._protocol.dap_info(item)
         self._cached_info[item] = value
         return value
@@ -906,7 +1079,7 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
     def vendor(self, index, data=None):
         if data is None:
             data = []
-        self.flush()
+        self._flush_all()
         return self._protocol.vendor(index, data)
 
     # ------------------------------------------- #
@@ -915,60 +1088,64 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
     @locked
     def connect(self, port=DAPAccessIntf.PORT.DEFAULT):
         assert isinstance(port, DAPAccessIntf.PORT)
+        self._flush_all()
         actual_port = self._protocol.connect(port.value)
         self._dap_port = DAPAccessIntf.PORT(actual_port)
-        # set clock frequency
-        self._protocol.set_swj_clock(self._frequency)
-        # configure transfer
-        self._protocol.transfer_configure()
-
-        # configure the selected protocol with defaults.
-        if self._dap_port == DAPAccessIntf.PORT.SWD:
-            self.configure_swd()
-        elif self._dap_port == DAPAccessIntf.PORT.JTAG:
-            self.configure_jtag()
-
-        self._protocol.set_led(DAP_LED.DAP_DEBUGGER_CONNECTED, 1)
-        self._protocol.set_led(DAP_LED.DAP_TARGET_RUNNING, 0)
+        with self._posting():
+            # set clock frequency
+            self._protocol.set_swj_clock(self._frequency)
+            # configure transfer
+            self._protocol.transfer_configure()
+            self._match_retry = 0
+
+            # configure the selected protocol with defaults.
+            if self._dap_port == DAPAccessIntf.PORT.SWD:
+                self.configure_swd()
+            elif self._dap_port == DAPAccessIntf.PORT.JTAG:
+                self.configure_jtag()
+
+            self._protocol.set_led(DAP_LED.DAP_DEBUGGER_CONNECTED, 1)
+            self._protocol.set_led(DAP_LED.DAP_TARGET_RUNNING, 0)
 
     @locked
     def configure_swd(self, turnaround=1, always_send_data_phase=False):
-        self.flush()
-        self._protocol.swd_configure(turnaround, always_send_data_phase)
+        with self._posting():
+            self._protocol.swd_configure(turnaround, always_send_data_phase)
 
     @locked
     def configure_jtag(self, devices_irlen=None):
-        self.flush()
+        self._flush_all()
         self._protocol.jtag_configure(devices_irlen)
 
     @locked
     def swj_sequence(self, length, bits):
-        self.flush()
-        self._protocol.swj_sequence(length, bits)
+        with self._posting():
+            self._protocol.swj_sequence(length, bits)
 
     @locked
     def swd_sequence(self, sequences):
-        self.flush()
+        self._flush_all()
         return self._protocol.swd_sequence(sequences)
 
     @locked
     def jtag_sequence(self, cycles, tms, read_tdo, tdi):
-        self.flush()
+        self._flush_all()
         return self._protocol.jtag_sequence(cycles, tms, read_tdo, tdi)
 
     @locked
     def disconnect(self):
-        self.flush()
-        self._protocol.set_led(DAP_LED.DAP_DEBUGGER_CONNECTED, 0)
-        self._protocol.set_led(DAP_LED.DAP_TARGET_RUNNING, 0)
-        self._protocol.disconnect()
+        with self._posting():
+            self._protocol.set_led(DAP_LED.DAP_DEBUGGER_CONNECTED, 0)
+            self._protocol.set_led(DAP_LED.DAP_TARGET_RUNNING, 0)
+            self._protocol.disconnect()
+        self._flush_all()
 
     def has_swo(self):
         return self._has_swo_uart
 
     @locked
     def swo_configure(self, enabled, rate):
-        self.flush()
+        self._flush_all()
 
         # Don't send any commands if the SWO commands aren't supported.
         if not self._has_swo_uart:
@@ -1015,7 +1192,7 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
 
     @locked
     def swo_control(self, start):
-        self.flush()
+        self._flush_all()
 
         # Don't send any commands if the SWO commands aren't supported.
         if not self._has_swo_uart:
@@ -1035,6 +1212,7 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
 
     @locked
     def get_swo_status(self):
+        self._drain()
         return self._protocol.swo_status()
 
     def swo_read(self, count=None):
@@ -1044,10 +1222,10 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
         else:
             if count is None:
                 count = self._packet_size
-            # Must lock and flush the command queue since we're using the SWO read command that shares
-            # the command EP.
+            # Must lock and read outstanding responses since we're using the SWO read command that
+            # shares the command EP. Transfers that other threads are batching can stay queued.
             with self._lock:
-                self.flush()
+                self._drain()
                 status, count, data = self._protocol.swo_data(count)
                 return bytearray(data)
 
@@ -1089,6 +1267,38 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
         else:
             return read_reg_cb
 
+    @locked
+    def poll_until(self, reg_id, mask, value, retries, dap_index=0):
+        assert reg_id in self.REG
+        assert isinstance(dap_index, int)
+        assert 0 <= retries <= self.MAX_MATCH_RETRY
+
+        # Any queued transfers must complete before the match retry count can be changed, and the
+        # value match read is issued immediately.
+        self._flush_all()
+        if retries != self._match_retry:
+            self._protocol.transfer_configure(match_retry=retries)
+            self._match_retry = retries
+
+        request = READ | VALUE_MATCH
+        if reg_id.value < 4:
+            request |= DP_ACC
+        else:
+            request |= AP_ACC
+        request |= (reg_id.value % 4) << 2
+
+        # Write the match mask, then read the register until it matches or the retries run out.
+        cmd = [Command.DAP_TRANSFER, dap_index, 2, MATCH_MASK]
+        cmd.extend(mask.to_bytes(4, 'little'))
+        cmd.append(request)
+        cmd.extend(value.to_bytes(4, 'little'))
+        self._interface.write(cmd)
+        response = self._interface.read()
+        if response[0] != Command.DAP_TRANSFER:
+            raise DAPAccessIntf.DeviceError("expected DAP_TRANSFER")
+        _Command._check_response(response[2])
+        return (response[2] & DAPTransferResponse.VALUE_MISMATCH_MASK) == 0
+
     def reg_write_repeat(self, num_repeats, reg_id, data_array, dap_index=0):
         assert isinstance(num_repeats, int)
         assert num_repeats == len(data_array)
@@ -1145,12 +1355,30 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
         # The current packet - this can contain multiple
         # different transfers
         self._crnt_cmd = _Command(self._packet_size)
+        # Posted commands waiting to be sent
+        self._posted = None
         # Packets that have been sent but not read
         self._commands_to_read.clear()
         # Buffer for data returned for completed commands.
         # This data will be added to transfers
         self._command_response_buf = bytearray()
 
+    def _raise_thread_error(self):
+        """@brief Raise the error from an aborted packet that held transfers from this thread."""
+        error = self._thread_errors.pop(threading.get_ident(), None)
+        if error is not None:
+            raise error
+
+    @locked
+    def _drain(self):
+        """@brief Read all outstanding packets, so a command can be sent directly.
+
+        Posted commands are sent first. Transfers in the current packet stay queued.
+        """
+        self._send_posted()
+        for _ in range(len(self._commands_to_read)):
+            self._read_packet()
+
     @locked
     def _read_packet(self):
         """@brief Reads and decodes a single packet
@@ -1168,7 +1396,7 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
             decoded_data = cmd.decode_data(raw_data)
         except Exception as exception:
             TRACE.debug("[cmd:%d] _read_packet: got exception %r; aborting all transfers!", cmd.uid, exception)
-            self._abort_all_transfers(exception)
+            self._abort_all_transfers(exception, cmd)
             raise
 
         decoded_data = bytearray(decoded_data)
@@ -1207,22 +1435,83 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
         """
         cmd = self._crnt_cmd
         if cmd.get_empty():
+            self._send_posted()
             return
 
+        # Posted commands were issued before any transfers in the current packet, so they are
+        # either sent first or packed into the same DAP_ExecuteCommands ahead of the transfers.
+        data = cmd.encode_data()
+        posted = self._posted
+        if posted is not None and posted.attach_transfer(cmd, data):
+            self._posted = None
+            self._write_packet(posted)
+        else:
+            self._send_posted()
+            self._write_packet(cmd, data)
+        self._crnt_cmd = _Command(self._packet_size)
+
+    def _send_posted(self):
+        """@brief Send the packet of posted commands, if there is one."""
+        posted = self._posted
+        if posted is None:
+            return
+        self._posted = None
+        self._write_packet(posted)
+
+    def _write_packet(self, cmd, data=None):
+        """@brief Write a _Command or _PostedCommands packet and queue it for reading.
+        @param self
+        @param cmd The command object.
+        @param data Optional data already encoded from the command.
+        """
         max_packets = self._interface.get_packet_count()
         if len(self._commands_to_read) >= max_packets:
             TRACE.debug("[cmd:%d] _send_packet: reading packet; outstanding=%d >= max=%d",
                     cmd.uid, len(self._commands_to_read), max_packets)
             self._read_packet()
         TRACE.debug("[cmd:%d] _send_packet: sending", cmd.uid)
-        data = cmd.encode_data()
+        if data is None:
+            data = cmd.encode_data()
         try:
             self._interface.write(list(data))
         except Exception as exception:
-            self._abort_all_transfers(exception)
+            self._abort_all_transfers(exception, cmd)
             raise
         self._commands_to_read.append(cmd)
-        self._crnt_cmd = _Command(self._packet_size)
+
+    def _post_command(self, cmd, name, check_status):
+        """@brief Add a command to the packet of posted commands.
+
+        Installed as the protocol's `post_command` handler by _posting().
+        """
+        # Keep the command ordered after transfers that are already queued.
+        if not self._crnt_cmd.get_empty():
+            self._send_packet()
+        if self._posted is not None and not self._posted.can_add(cmd):
+            self._send_posted()
+        if self._posted is None:
+            self._posted = _PostedCommands(self._packet_size, self._supports_atomic_commands)
+        self._posted.add(cmd, name, check_status)
+        self._posted.owners.add(threading.get_ident())
+
+    @contextmanager
+    def _posting(self):
+        """@brief Context manager that posts status-only protocol commands.
+
+        Posted commands are sent along with the next transfer packet or flush, and any error they
+        report is raised from there, in the same way as deferred transfers. If deferred transfers
+        are disabled, queued transfers are flushed and commands are sent immediately.
+        """
+        if not self._deferred_transfer:
+            self._flush_all()
+            yield
+            return
+        previous = self._protocol.post_command
+        self._protocol.post_command = self._post_command
+        try:
+            yield
+        finally:
+            self._protocol.post_command = previous
 
     @locked
     def _write(self, dap_index, transfer_count,
@@ -1242,6 +1531,7 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
             self._transfer_list.append(transfer)
 
         # Build physical packet by adding it to command
+        owner = threading.get_ident()
         cmd = self._crnt_cmd
         size_to_transfer = transfer_count
         trans_data_pos = 0
@@ -1262,6 +1552,7 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
             else:
                 data = transfer_data[trans_data_pos:trans_data_pos + size]
             cmd.add(size, transfer_request, data, dap_index)
+            cmd.owners.add(owner)
             size_to_transfer -= size
             trans_data_pos += size
 
@@ -1272,24 +1563,36 @@ class DAPAccessCMSISDAP(DAPAccessIntf):
                 cmd = self._crnt_cmd
 
         if not self._deferred_transfer:
-            self.flush()
+            self._flush_all()
 
         return transfer
 
     @locked
-    def _abort_all_transfers(self, exception):
+    def _abort_all_transfers(self, exception, failed_cmd=None):
         """@brief Abort any ongoing transfers and clear all buffers
+
+        The exception is raised by the caller. Other threads with transfers in the aborted packets
+        have it raised from their next flush.
         """
         pending_reads = len(self._commands_to_read)
         TRACE.debug("aborting %d pending reads after exception %r", pending_reads, exception)
+        aborted = list(self._commands_to_read) + [self._crnt_cmd]
+        if failed_cmd is not None:
+            aborted.append(failed_cmd)
+        if self._posted is not None:
+            aborted.append(self._posted)
+        current = threading.get_ident()
+        for owner in set().union(*(cmd.owners for cmd in aborted)):
+            if owner != current:
+                self._thread_errors[owner] = exception
         # invalidate _transfer_list
         for transfer in self._transfer_list:
             transfer.add_error(exception)
         # clear all deferred buffers
         self._init_deferred_buffers()
         # finish all pending reads and ignore the data
-        # Only do this if the error is a transfer error.
-        # Otherwise this could cause another exception
-        if isinstance(exception, DAPAccessIntf.TransferError):
+        # Only do this if the error is a command or transfer error, for which the failing
+        # response was read successfully. Otherwise this could cause another exception
+        if isinstance(exception, DAPAccessIntf.CommandError):
             for _ in range(pending_reads):
                 self._interface.read()
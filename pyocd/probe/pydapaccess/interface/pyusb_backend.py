@@ -34,6 +34,7 @@ from .common import (
     generate_device_unique_id,
     )
 from ..dap_access_api import DAPAccessIntf
+from ...usb_devices import (find_usb_devices, skip_match_cache)
 from ....utility.timeout import Timeout
 
 LOG = logging.getLogger(__name__)
@@ -184,7 +185,7 @@ class PyUSB(Interface):
         """
         # find all cmsis-dap devices
         try:
-            all_devices = usb_find(find_all=True, custom_match=FindDap())
+            all_devices = find_usb_devices(FindDap(), cache_key=FindDap)
         except usb.core.NoBackendError:
             if not PyUSB.did_show_no_libusb_warning:
                 LOG.warning("CMSIS-DAPv1 probes may not be detected because no libusb library was found.")
@@ -369,6 +370,8 @@ class FindDap:
             matcher = MatchCmsisDapv1Interface(hid_interface_count)
             cmsis_dap_interface = usb.util.find_descriptor(config, custom_match=matcher)
         except usb.core.USBError as error:
+            # The device may match once it can be accessed.
+            skip_match_cache()
             if error.errno == errno.EACCES and platform.system() == "Linux":
                 msg = ("%s while trying to interrogate a USB device "
                    "(VID=%04x PID=%04x). This can probably be remedied with a udev rule. "
@@ -34,6 +34,7 @@ from .common import (
     )
 from ..dap_access_api import DAPAccessIntf
 from ... import common
+from ...usb_devices import (find_usb_devices, skip_match_cache)
 from ....utility.timeout import Timeout
 
 LOG = logging.getLogger(__name__)
@@ -209,7 +210,7 @@ class PyUSBv2(Interface):
         """@brief Returns all the connected devices with a CMSIS-DAPv2 interface."""
         # find all cmsis-dap devices
         try:
-            all_devices = usb_find(find_all=True, custom_match=HasCmsisDapv2Interface())
+            all_devices = find_usb_devices(HasCmsisDapv2Interface(), cache_key=HasCmsisDapv2Interface)
         except usb.core.NoBackendError:
             common.show_no_libusb_warning()
             return []
@@ -361,6 +362,8 @@ class HasCmsisDapv2Interface:
             config = dev.get_active_configuration()
             cmsis_dap_interface = usb.util.find_descriptor(config, custom_match=_match_cmsis_dap_v2_interface)
         except usb.core.USBError as error:
+            # The device may match once it can be accessed.
+            skip_match_cache()
             # Produce a more helpful error message if we get a permissions error on Linux.
             if error.errno == errno.EACCES and platform.system() == "Linux" \
                 and common.should_show_libusb_device_error((dev.idVendor, dev.idProduct)):
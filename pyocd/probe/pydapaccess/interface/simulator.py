@@ -0,0 +1,695 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import deque
+import logging
+import struct
+import threading
+from time import (perf_counter, sleep)
+from typing import (Callable, Deque, Dict, List, Optional, Sequence, Tuple)
+
+from .interface import Interface
+from ..cmsis_dap_core import (Capabilities, Command, Pin)
+from ..dap_access_api import DAPAccessIntf
+
+LOG = logging.getLogger(__name__)
+
+# DAP_Transfer request bits.
+_APnDP = 1 << 0
+_RnW = 1 << 1
+_VALUE_MATCH = 1 << 4
+_MATCH_MASK = 1 << 5
+_TIMESTAMP = 1 << 7
+
+# DAP_Transfer response values.
+_ACK_OK = 0x1
+_ACK_FAULT = 0x4
+_VALUE_MISMATCH = 0x10
+
+# DP CTRL/STAT bits.
+_CSYSPWRUPACK = 1 << 31
+_CSYSPWRUPREQ = 1 << 30
+_CDBGPWRUPACK = 1 << 29
+_CDBGPWRUPREQ = 1 << 28
+_CDBGRSTACK = 1 << 27
+_CDBGRSTREQ = 1 << 26
+_STICKYERR = 1 << 5
+_STICKYCMP = 1 << 4
+_STICKYORUN = 1 << 1
+_CTRL_STAT_WRITE_MASK = 0xf0000f01
+
+# DP ABORT bits.
+_STKCMPCLR = 1 << 1
+_STKERRCLR = 1 << 2
+_ORUNERRCLR = 1 << 4
+
+# MEM-AP CSW fields. Only byte, halfword and word sizes and single address increment are
+# implemented, so other values of these fields read back as unsupported.
+_CSW_SIZE_MASK = 0x7
+_CSW_ADDRINC_MASK = 0x30
+_CSW_ADDRINC_SINGLE = 0x10
+_CSW_DEVICEEN = 0x40
+_CSW_WRITE_MASK = 0xff000000
+
+## TAR auto-increment wraps at 4 kB boundaries, like the Cortex-M4 AHB-AP.
+_TAR_INCREMENT_MASK = 0xfff
+
+# Cortex-M System Control Space registers.
+_SCS_BASE = 0xE000E000
+_ROM_TABLE_BASE = 0xE00FF000
+_CPUID = 0xE000ED00
+_AIRCR = 0xE000ED0C
+_DFSR = 0xE000ED30
+_DHCSR = 0xE000EDF0
+_DCRSR = 0xE000EDF4
+_DCRDR = 0xE000EDF8
+_DEMCR = 0xE000EDFC
+
+_DBGKEY = 0xA05F0000
+_C_DEBUGEN = 1 << 0
+_C_HALT = 1 << 1
+_C_STEP = 1 << 2
+_S_REGRDY = 1 << 16
+_S_HALT = 1 << 17
+_S_RETIRE_ST = 1 << 24
+_S_RESET_ST = 1 << 25
+_DFSR_HALTED = 1 << 0
+_VC_CORERESET = 1 << 0
+_VECTKEY = 0x05FA0000
+_VECTRESET = 1 << 0
+_SYSRESETREQ = 1 << 2
+_REGWnR = 1 << 16
+
+def _id_registers(pidr: int, cidr: int) -> Dict[int, int]:
+    """@brief Return the CoreSight ID registers for a component, keyed by offset."""
+    regs = {0xfd0: (pidr >> 32) & 0xff}
+    for i in range(4):
+        regs[0xfe0 + i * 4] = (pidr >> (i * 8)) & 0xff
+        regs[0xff0 + i * 4] = (cidr >> (i * 8)) & 0xff
+    return regs
+
+class BusFault(Exception):
+    """@brief A simulated bus access to an address that is not mapped or not writable."""
+    pass
+
+class SimulatedMemory:
+    """@brief Backing array for a range of simulated target memory."""
+
+    def __init__(self, start: int, length: int, is_writable: bool = True, name: str = "") -> None:
+        self.start = start
+        self.end = start + length - 1
+        self.data = bytearray(length)
+        self.is_writable = is_writable
+        self.name = name
+
+    def contains_address(self, addr: int) -> bool:
+        return self.start <= addr <= self.end
+
+class SimulatedCortexM:
+    """@brief Minimal Cortex-M debug logic behind a simulated MEM-AP.
+
+    Provides a ROM table and the System Control Space registers that pyOCD uses to discover
+    and control a core: CPUID, DHCSR, DCRSR/DCRDR, DEMCR, DFSR and AIRCR. The core never
+    executes instructions. While "running" it simply holds its registers, and a step advances
+    the PC by one halfword.
+
+    Other SCS registers read back the last value written. There is no FPB, DWT or ITM.
+    """
+
+    ## Cortex-M4 r0p1 without an FPU.
+    CPUID_VALUE = 0x410FC241
+
+    def __init__(self, read_word: Callable[[int], int]) -> None:
+        self._read_word = read_word
+        self._scs: Dict[int, int] = {}
+        self._dhcsr = 0
+        self._reset_st = False
+        self._halted = False
+        self._core_regs: Dict[int, int] = {}
+
+        # ROM table with a single SCS entry and the SYSMEM bit set.
+        self._rom_table = _id_registers(0x4000bb4c4, 0xb105100d)
+        self._rom_table[0x000] = ((_SCS_BASE - _ROM_TABLE_BASE) & 0xfffff000) | 0x3
+        self._rom_table[0xfcc] = 0x1
+        self._scs.update({_SCS_BASE + k: v for k, v in _id_registers(0x4000bb00c, 0xb105e00d).items()})
+        self._scs[_CPUID] = self.CPUID_VALUE
+        self.reset()
+
+    @property
+    def is_halted(self) -> bool:
+        return self._halted
+
+    @property
+    def core_registers(self) -> Dict[int, int]:
+        """@brief Core register values keyed by DCRSR register selector."""
+        return self._core_regs
+
+    def contains_address(self, addr: int) -> bool:
+        return (_SCS_BASE <= addr < _SCS_BASE + 0x1000) or (_ROM_TABLE_BASE <= addr < _ROM_TABLE_BASE + 0x1000)
+
+    def reset(self) -> None:
+        """@brief Perform a system reset of the simulated core."""
+        self._core_regs = {i: 0 for i in range(21)}
+        try:
+            self._core_regs[13] = self._read_word(0)
+            self._core_regs[15] = self._read_word(4) & ~1
+        except BusFault:
+            pass
+        self._core_regs[16] = 0x01000000 # xPSR with the Thumb bit set
+        self._reset_st = True
+        self._halted = bool((self._dhcsr & _C_DEBUGEN) and (self._scs.get(_DEMCR, 0) & _VC_CORERESET))
+        if self._halted:
+            self._dhcsr |= _C_HALT
+            self._scs[_DFSR] = self._scs.get(_DFSR, 0) | _DFSR_HALTED
+
+    def read32(self, addr: int) -> int:
+        if addr >= _ROM_TABLE_BASE:
+            return self._rom_table.get(addr - _ROM_TABLE_BASE, 0)
+        if addr == _DHCSR:
+            value = (self._dhcsr & 0xffff) | _S_REGRDY
+            if self._halted:
+                value |= _S_HALT
+            else:
+                value |= _S_RETIRE_ST
+            if self._reset_st:
+                value |= _S_RESET_ST
+                self._reset_st = False
+            return value
+        if addr == _AIRCR:
+            return 0xFA050000 | (self._scs.get(addr, 0) & 0x700)
+        return self._scs.get(addr, 0)
+
+    def write32(self, addr: int, value: int) -> None:
+        if addr >= _ROM_TABLE_BASE or addr == _CPUID:
+            return
+        if addr == _DHCSR:
+            if (value & 0xffff0000) != _DBGKEY:
+                return
+            self._dhcsr = value & 0xffff
+            if not (value & _C_DEBUGEN):
+                self._halted = False
+            elif value & _C_HALT:
+                if not self._halted:
+                    self._scs[_DFSR] = self._scs.get(_DFSR, 0) | _DFSR_HALTED
+                self._halted = True
+            elif self._halted and (value & _C_STEP):
+                # C_HALT reads as set once the step completes.
+                self._core_regs[15] = (self._core_regs[15] + 2) & 0xffffffff
+                self._dhcsr |= _C_HALT
+                self._scs[_DFSR] = self._scs.get(_DFSR, 0) | _DFSR_HALTED
+            else:
+                self._halted = False
+        elif addr == _DCRSR:
+            regsel = value & 0x7f
+            if value & _REGWnR:
+                self._core_regs[regsel] = self._scs.get(_DCRDR, 0)
+            else:
+                self._scs[_DCRDR] = self._core_regs.get(regsel, 0)
+        elif addr == _DFSR:
+            self._scs[addr] = self._scs.get(addr, 0) & ~value
+        elif addr == _AIRCR:
+            if (value & 0xffff0000) != _VECTKEY:
+                return
+            self._scs[addr] = value & 0x700
+            if value & (_SYSRESETREQ | _VECTRESET):
+                self.reset()
+        else:
+            self._scs[addr] = value
+
+class SimulatedCMSISDAP(Interface):
+    """@brief CMSIS-DAP interface backed by a simulated probe and target instead of USB.
+
+    Commands written to the interface are executed immediately against an emulated SW-DP with a
+    single AHB-AP. The MEM-AP accesses RAM and flash backing arrays, plus the debug registers of
+    a SimulatedCortexM. Flash is read-only on the bus, like real flash, so it can only be
+    changed through the `flash` backing array.
+
+    Each response becomes available to read() `latency` seconds after its command was written.
+    Up to `packet_count` commands may be outstanding, so the latency of pipelined commands
+    overlaps just like it does with a real USB probe. This makes the simulator suitable for
+    measuring how well host code hides USB round trips.
+    """
+
+    isAvailable = True
+
+    ## DPIDR of an ADIv5 DPv1 SW-DP.
+    DPIDR = 0x2BA01477
+
+    ## IDR of a Cortex-M4 AHB-AP.
+    AP_IDR = 0x24770011
+
+    def __init__(
+                self,
+                serial_number: str = "sim",
+                latency: float = 0.0,
+                packet_size: int = 64,
+                packet_count: int = 4,
+                flash: Tuple[int, int] = (0x00000000, 0x80000),
+                ram: Tuple[int, int] = (0x20000000, 0x20000),
+            ) -> None:
+        """@brief Constructor.
+        @param self
+        @param serial_number Serial number reported by the simulated probe.
+        @param latency Time in seconds from writing a command until its response is ready.
+        @param packet_size Maximum command and response packet size in bytes.
+        @param packet_count Maximum number of commands that may be outstanding.
+        @param flash Pair of start address and size of the simulated flash.
+        @param ram Pair of start address and size of the simulated RAM.
+        """
+        super().__init__()
+        self.vendor_name = "pyOCD"
+        self.product_name = "Simulated CMSIS-DAP"
+        self.serial_number = serial_number
+        self.latency = latency
+        self.max_packet_size = packet_size
+        self.max_packet_count = packet_count
+        self.packet_size = packet_size
+        self.packet_count = packet_count
+
+        self.flash = SimulatedMemory(flash[0], flash[1], is_writable=False, name="flash")
+        self.ram = SimulatedMemory(ram[0], ram[1], name="ram")
+        self.memory: List[SimulatedMemory] = [self.flash, self.ram]
+        self.core = SimulatedCortexM(self._read_word)
+
+        self._is_open = False
+        self._lock = threading.Lock()
+        self._responses: Deque[Tuple[float, bytes]] = deque()
+        self._queued_commands: List[bytes] = []
+
+        ## Number of command packets received, for use by tests and benchmarks.
+        self.command_count = 0
+
+        # Transfer configuration.
+        self._match_retry = 0
+        self._match_mask = 0xffffffff
+
+        # DP and AP state.
+        self._ctrl_stat = 0
+        self._select = 0
+        self._rdbuff = 0
+        self._csw = _CSW_DEVICEEN | 0x2
+        self._tar = 0
+        self._pins = Pin.SWCLK_TCK | Pin.SWDIO_TMS | Pin.nRESET
+
+        self._handlers: Dict[int, Callable[[bytes], Tuple[bytes, int]]] = {
+            Command.DAP_INFO: self._dap_info,
+            Command.DAP_LED: lambda req: (bytes([req[0], 0]), 3),
+            Command.DAP_CONNECT: self._dap_connect,
+            Command.DAP_DISCONNECT: lambda req: (bytes([req[0], 0]), 1),
+            Command.DAP_TRANSFER_CONFIGURE: self._dap_transfer_configure,
+            Command.DAP_TRANSFER: self._dap_transfer,
+            Command.DAP_TRANSFER_BLOCK: self._dap_transfer_block,
+            Command.DAP_WRITE_ABORT: self._dap_write_abort,
+            Command.DAP_DELAY: self._dap_delay,
+            Command.DAP_RESET_TARGET: self._dap_reset_target,
+            Command.DAP_SWJ_PINS: self._dap_swj_pins,
+            Command.DAP_SWJ_CLOCK: lambda req: (bytes([req[0], 0]), 5),
+            Command.DAP_SWJ_SEQUENCE: self._dap_swj_sequence,
+            Command.DAP_SWD_CONFIGURE: lambda req: (bytes([req[0], 0]), 2),
+            Command.DAP_SWD_SEQUENCE: self._dap_swd_sequence,
+            Command.DAP_EXECUTE_COMMANDS: self._dap_execute_commands,
+            }
+
+    @staticmethod
+    def get_all_connected_interfaces() -> List["SimulatedCMSISDAP"]:
+        # Simulated probes are only created on request.
+        return []
+
+    @property
+    def is_bulk(self) -> bool:
+        return True
+
+    def open(self) -> None:
+        self._is_open = True
+
+    def close(self) -> None:
+        self._is_open = False
+        self._responses.clear()
+        self._queued_commands.clear()
+
+    def write(self, data: Sequence[int]) -> None:
+        if not self._is_open:
+            raise DAPAccessIntf.DeviceError("simulated probe is not open")
+        if len(data) > self.max_packet_size:
+            raise DAPAccessIntf.DeviceError("command of %d bytes exceeds the packet size of %d bytes"
+                    % (len(data), self.max_packet_size))
+        if len(self._responses) >= self.max_packet_count:
+            raise DAPAccessIntf.DeviceError("too many outstanding commands")
+        self.command_count += 1
+        request = bytes(data)
+        ready_time = perf_counter() + self.latency
+
+        # Queued commands are executed when the next command that is not queued is received.
+        if request[0] == Command.DAP_QUEUE_COMMANDS:
+            self._queued_commands.append(bytes([Command.DAP_EXECUTE_COMMANDS]) + request[1:])
+            return
+
+        with self._lock:
+            for queued in self._queued_commands:
+                self._responses.append((ready_time, self._execute(queued)[0]))
+            self._queued_commands.clear()
+            self._responses.append((ready_time, self._execute(request)[0]))
+
+    def read(self) -> bytes:
+        if not self._responses:
+            raise DAPAccessIntf.DeviceError("read with no outstanding command")
+        ready_time, response = self._responses.popleft()
+        delay = ready_time - perf_counter()
+        if delay > 0:
+            sleep(delay)
+        return response
+
+    def read_memory(self, addr: int, size: int) -> bytes:
+        """@brief Read simulated memory directly, without going through the DAP."""
+        region = self._find_region(addr)
+        offset = addr - region.start
+        return bytes(region.data[offset:offset + size])
+
+    def write_memory(self, addr: int, data: bytes) -> None:
+        """@brief Write simulated memory directly, bypassing bus write permissions."""
+        region = self._find_region(addr)
+        offset = addr - region.start
+        region.data[offset:offset + len(data)] = data
+
+    def _find_region(self, addr: int) -> SimulatedMemory:
+        for region in self.memory:
+            if region.contains_address(addr):
+                return region
+        raise BusFault()
+
+    def _read_word(self, addr: int) -> int:
+        region = self._find_region(addr)
+        offset = (addr & ~3) - region.start
+        return struct.unpack_from("<I", region.data, offset)[0]
+
+    def _execute(self, request: bytes) -> Tuple[bytes, int]:
+        """@brief Execute one command.
+        @return Pair of the response and the length of the command in bytes.
+        """
+        handler = self._handlers.get(request[0])
+        if handler is None:
+            return bytes([0xff]), 1
+        return handler(request)
+
+    # ------------------------------------------- #
+    #          General commands
+    # ------------------------------------------- #
+    def _dap_info(self, request: bytes) -> Tuple[bytes, int]:
+        id_ = request[1]
+        value: bytes
+        if id_ == DAPAccessIntf.ID.VENDOR.value:
+            value = self.vendor_name.encode() + b'\0'
+        elif id_ == DAPAccessIntf.ID.PRODUCT.value:
+            value = self.product_name.encode() + b'\0'
+        elif id_ == DAPAccessIntf.ID.SER_NUM.value:
+            value = self.serial_number.encode() + b'\0'
+        elif id_ == DAPAccessIntf.ID.CMSIS_DAP_PROTOCOL_VERSION.value:
+            value = b'2.1.0\0'
+        elif id_ == DAPAccessIntf.ID.PRODUCT_FW_VERSION.value:
+            value = b'1.0.0\0'
+        elif id_ == DAPAccessIntf.ID.CAPABILITIES.value:
+            value = bytes([Capabilities.SWD | Capabilities.ATOMIC_COMMANDS | Capabilities.DAP_SWD_SEQUENCE])
+        elif id_ == DAPAccessIntf.ID.MAX_PACKET_COUNT.value:
+            value = bytes([self.max_packet_count])
+        elif id_ == DAPAccessIntf.ID.MAX_PACKET_SIZE.value:
+            value = struct.pack("<H", self.max_packet_size)
+        else:
+            value = b''
+        return bytes([request[0], len(value)]) + value, 2
+
+    def _dap_connect(self, request: bytes) -> Tuple[bytes, int]:
+        # Only SWD is supported. 0 selects the default port.
+        port = 1 if request[1] in (0, 1) else 0
+        return bytes([request[0], port]), 2
+
+    def _dap_transfer_configure(self, request: bytes) -> Tuple[bytes, int]:
+        self._match_retry = struct.unpack_from("<H", request, 4)[0]
+        return bytes([request[0], 0]), 6
+
+    def _dap_write_abort(self, request: bytes) -> Tuple[bytes, int]:
+        self._write_dp(0x0, struct.unpack_from("<I", request, 2)[0])
+        return bytes([request[0], 0]), 6
+
+    def _dap_delay(self, request: bytes) -> Tuple[bytes, int]:
+        return bytes([request[0], 0]), 3
+
+    def _dap_reset_target(self, request: bytes) -> Tuple[bytes, int]:
+        self.core.reset()
+        return bytes([request[0], 0, 1]), 1
+
+    def _dap_swj_pins(self, request: bytes) -> Tuple[bytes, int]:
+        output, select = request[1], request[2]
+        was_reset = not (self._pins & Pin.nRESET)
+        self._pins = (self._pins & ~select) | (output & select)
+        if was_reset and (self._pins & Pin.nRESET):
+            self.core.reset()
+        return bytes([request[0], self._pins]), 7
+
+    def _dap_swj_sequence(self, request: bytes) -> Tuple[bytes, int]:
+        bit_count = request[1] or 256
+        return bytes([request[0], 0]), 2 + (bit_count + 7) // 8
+
+    def _dap_swd_sequence(self, request: bytes) -> Tuple[bytes, int]:
+        response = bytearray([request[0], 0])
+        pos = 2
+        for _ in range(request[1]):
+            info = request[pos]
+            bit_count = (info & 0x3f) or 64
+            byte_count = (bit_count + 7) // 8
+            pos += 1
+            if info & 0x80:
+                response += bytes(byte_count)
+            else:
+                pos += byte_count
+        return bytes(response), pos
+
+    def _dap_execute_commands(self, request: bytes) -> Tuple[bytes, int]:
+        response = bytearray([request[0], request[1]])
+        pos = 2
+        for _ in range(request[1]):
+            command_response, length = self._execute(request[pos:])
+            response += command_response
+            pos += length
+        return bytes(response), pos
+
+    # ------------------------------------------- #
+    #          Transfer commands
+    # ------------------------------------------- #
+    def _dap_transfer(self, request: bytes) -> Tuple[bytes, int]:
+        count = request[2]
+        data = bytearray()
+        pos = 3
+        done = 0
+        status = _ACK_OK
+        for _ in range(count):
+            transfer_request = request[pos]
+            pos += 1
+            if transfer_request & _TIMESTAMP:
+                status = _ACK_FAULT
+                break
+            if not (transfer_request & _RnW):
+                value = struct.unpack_from("<I", request, pos)[0]
+                pos += 4
+                if transfer_request & _MATCH_MASK:
+                    self._match_mask = value
+                else:
+                    status = self._write_register(transfer_request, value)
+            elif transfer_request & _VALUE_MATCH:
+                match_value = struct.unpack_from("<I", request, pos)[0]
+                pos += 4
+                for _ in range(self._match_retry + 1):
+                    status, value = self._read_register(transfer_request)
+                    if status != _ACK_OK or (value & self._match_mask) == match_value:
+                        break
+                else:
+                    status |= _VALUE_MISMATCH
+            else:
+                status, value = self._read_register(transfer_request)
+                if status == _ACK_OK:
+                    data += struct.pack("<I", value)
+            if status != _ACK_OK:
+                break
+            done += 1
+
+        # Skip the remaining transfers to compute the length of the command.
+        for _ in range(count - done - (status != _ACK_OK)):
+            transfer_request = request[pos]
+            pos += 1
+            if not (transfer_request & _RnW) or (transfer_request & _VALUE_MATCH):
+                pos += 4
+        return bytes([request[0], done, status]) + data, pos
+
+    def _dap_transfer_block(self, request: bytes) -> Tuple[bytes, int]:
+        count = struct.unpack_from("<H", request, 2)[0]
+        transfer_request = request[4]
+        is_read = bool(transfer_request & _RnW)
+        data = bytearray()
+        pos = 5
+        done = 0
+        status = _ACK_OK
+        for _ in range(count):
+            if is_read:
+                status, value = self._read_register(transfer_request)
+                if status == _ACK_OK:
+                    data += struct.pack("<I", value)
+            else:
+                status = self._write_register(transfer_request, struct.unpack_from("<I", request, pos)[0])
+                pos += 4
+            if status != _ACK_OK:
+                break
+            done += 1
+        if not is_read:
+            pos = 5 + count * 4
+        return bytes([request[0], done & 0xff, done >> 8, status]) + data, pos
+
+    def _read_register(self, transfer_request: int) -> Tuple[int, int]:
+        addr = transfer_request & 0xc
+        if not (transfer_request & _APnDP):
+            return _ACK_OK, self._read_dp(addr)
+        if self._ctrl_stat & _STICKYERR:
+            return _ACK_FAULT, 0
+        try:
+            self._rdbuff = self._read_ap((self._select & 0xf0) | addr)
+        except BusFault:
+            self._ctrl_stat |= _STICKYERR
+            return _ACK_FAULT, 0
+        return _ACK_OK, self._rdbuff
+
+    def _write_register(self, transfer_request: int, value: int) -> int:
+        addr = transfer_request & 0xc
+        if not (transfer_request & _APnDP):
+            self._write_dp(addr, value)
+            return _ACK_OK
+        if self._ctrl_stat & _STICKYERR:
+            return _ACK_FAULT
+        try:
+            self._write_ap((self._select & 0xf0) | addr, value)
+        except BusFault:
+            self._ctrl_stat |= _STICKYERR
+            return _ACK_FAULT
+        return _ACK_OK
+
+    # ------------------------------------------- #
+    #          DP and AP registers
+    # ------------------------------------------- #
+    def _read_dp(self, addr: int) -> int:
+        if addr == 0x0:
+            return self.DPIDR
+        elif addr == 0x4:
+            if self._select & 0xf:
+                return 0
+            value = self._ctrl_stat
+            # Power-up and reset requests are acknowledged immediately.
+            if value & _CSYSPWRUPREQ:
+                value |= _CSYSPWRUPACK
+            if value & _CDBGPWRUPREQ:
+                value |= _CDBGPWRUPACK
+            if value & _CDBGRSTREQ:
+                value |= _CDBGRSTACK
+            return value
+        elif addr == 0x8:
+            return 0
+        else:
+            return self._rdbuff
+
+    def _write_dp(self, addr: int, value: int) -> None:
+        if addr == 0x0:
+            if value & _STKERRCLR:
+                self._ctrl_stat &= ~_STICKYERR
+            if value & _STKCMPCLR:
+                self._ctrl_stat &= ~_STICKYCMP
+            if value & _ORUNERRCLR:
+                self._ctrl_stat &= ~_STICKYORUN
+        elif addr == 0x4:
+            if not (self._select & 0xf):
+                self._ctrl_stat = (self._ctrl_stat & ~_CTRL_STAT_WRITE_MASK) | (value & _CTRL_STAT_WRITE_MASK)
+        elif addr == 0x8:
+            self._select = value
+
+    def _read_ap(self, addr: int) -> int:
+        # Only APSEL 0 is implemented. Reads of other APs return an IDR of zero.
+        if self._select >> 24:
+            return 0
+        if addr == 0x00:
+            return self._csw
+        elif addr == 0x04:
+            return self._tar
+        elif addr == 0x0c:
+            value = self._read_bus(self._tar)
+            self._increment_tar()
+            return value
+        elif 0x10 <= addr <= 0x1c:
+            return self._read_bus((self._tar & ~0xf) | (addr & 0xc), 2)
+        elif addr == 0xf8:
+            return _ROM_TABLE_BASE | 0x3
+        elif addr == 0xfc:
+            return self.AP_IDR
+        return 0
+
+    def _write_ap(self, addr: int, value: int) -> None:
+        if self._select >> 24:
+            return
+        if addr == 0x00:
+            size = value & _CSW_SIZE_MASK
+            if size > 2:
+                size = 2
+            addr_inc = value & _CSW_ADDRINC_MASK
+            if addr_inc != _CSW_ADDRINC_SINGLE:
+                addr_inc = 0
+            self._csw = (value & _CSW_WRITE_MASK) | _CSW_DEVICEEN | addr_inc | size
+        elif addr == 0x04:
+            self._tar = value
+        elif addr == 0x0c:
+            self._write_bus(self._tar, value)
+            self._increment_tar()
+        elif 0x10 <= addr <= 0x1c:
+            self._write_bus((self._tar & ~0xf) | (addr & 0xc), value, 2)
+
+    def _increment_tar(self) -> None:
+        if self._csw & _CSW_ADDRINC_MASK:
+            increment = 1 << (self._csw & _CSW_SIZE_MASK)
+            self._tar = (self._tar & ~_TAR_INCREMENT_MASK) | ((self._tar + increment) & _TAR_INCREMENT_MASK)
+
+    def _read_bus(self, addr: int, size: Optional[int] = None) -> int:
+        """@brief Perform a bus read, returning the data in its byte lanes."""
+        if size is None:
+            size = self._csw & _CSW_SIZE_MASK
+        if addr & ((1 << size) - 1):
+            raise BusFault()
+        if self.core.contains_address(addr):
+            return self.core.read32(addr & ~3)
+        word = self._read_word(addr)
+        lane_mask = ((1 << (8 << size)) - 1) << ((addr & 3) * 8)
+        return word & lane_mask
+
+    def _write_bus(self, addr: int, value: int, size: Optional[int] = None) -> None:
+        """@brief Perform a bus write of the data in the byte lanes for the address."""
+        if size is None:
+            size = self._csw & _CSW_SIZE_MASK
+        if addr & ((1 << size) - 1):
+            raise BusFault()
+        if self.core.contains_address(addr):
+            if size != 2:
+                raise BusFault()
+            self.core.write32(addr, value)
+            return
+        region = self._find_region(addr)
+        if not region.is_writable:
+            raise BusFault()
+        offset = addr - region.start
+        byte_count = 1 << size
+        value = (value >> ((addr & 3) * 8)) & ((1 << (byte_count * 8)) - 1)
+        region.data[offset:offset + byte_count] = value.to_bytes(byte_count, 'little')
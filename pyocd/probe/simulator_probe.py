@@ -0,0 +1,94 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import (Optional, Sequence)
+
+from .aggregator import PROBE_CLASSES
+from .cmsis_dap_probe import CMSISDAPProbe
+from .debug_probe import DebugProbe
+from .pydapaccess import DAPAccess
+from .pydapaccess.interface.simulator import SimulatedCMSISDAP
+from ..core.options import OptionInfo
+from ..core.plugin import Plugin
+
+class SimulatedCMSISDAPProbe(CMSISDAPProbe):
+    """@brief CMSIS-DAP probe connected to a simulated target instead of real hardware.
+
+    The probe is only created when explicitly selected with a unique ID of the form "sim:" or
+    "sim:<serial>". USB latency and packet geometry are set from the `simulator.*` session
+    options when the probe is opened.
+    """
+
+    @classmethod
+    def get_all_connected_probes(
+                cls,
+                unique_id: Optional[str] = None,
+                is_explicit: bool = False
+            ) -> Sequence[DebugProbe]:
+        if is_explicit:
+            return [cls(SimulatedCMSISDAP(unique_id or "sim"))]
+        else:
+            return []
+
+    @classmethod
+    def get_probe_with_id(cls, unique_id: str, is_explicit: bool = False) -> Optional[DebugProbe]:
+        return cls(SimulatedCMSISDAP(unique_id or "sim")) if is_explicit else None
+
+    def __init__(self, interface: SimulatedCMSISDAP) -> None:
+        super().__init__(DAPAccess(None, interface=interface))
+        self._interface = interface
+
+    @property
+    def interface(self) -> SimulatedCMSISDAP:
+        """@brief The simulated interface, for direct access to target memory and core state."""
+        return self._interface
+
+    def open(self) -> None:
+        if not self.is_open:
+            assert self.session
+            # Load the CMSIS-DAP plugin so the cmsis_dap.* options it registers apply to this probe.
+            PROBE_CLASSES['cmsisdap']
+            options = self.session.options
+            self._interface.latency = options.get('simulator.latency')
+            self._interface.max_packet_size = options.get('simulator.packet_size')
+            self._interface.max_packet_count = options.get('simulator.packet_count')
+        super().open()
+
+class SimulatedCMSISDAPProbePlugin(Plugin):
+    """@brief Plugin class for SimulatedCMSISDAPProbe."""
+
+    def load(self):
+        return SimulatedCMSISDAPProbe
+
+    @property
+    def name(self):
+        return "sim"
+
+    @property
+    def description(self):
+        return "Simulated CMSIS-DAP probe and target"
+
+    @property
+    def options(self):
+        """@brief Returns simulated probe options."""
+        return [
+            OptionInfo('simulator.latency', float, 0.0,
+                "Delay in seconds before the simulated probe responds to each command."),
+            OptionInfo('simulator.packet_count', int, 4,
+                "Number of commands the simulated probe accepts before a response must be read."),
+            OptionInfo('simulator.packet_size', int, 64,
+                "Maximum command and response size of the simulated probe, in bytes."),
+            ]
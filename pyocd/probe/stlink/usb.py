@@ -15,10 +15,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-try:
-    from libusb_package import find as usb_find
-except ImportError:
-    from usb.core import find as usb_find
 import usb.core
 import usb.util
 import logging
@@ -29,6 +25,7 @@ from binascii import hexlify
 
 from ...core import exceptions
 from .. import common
+from ..usb_devices import (find_usb_devices, skip_match_cache)
 
 LOG = logging.getLogger(__name__)
 
@@ -88,6 +85,8 @@ class STLinkUSBInterface:
 
             return isSTLink
         except usb.core.USBError as error:
+            # The device may match once it can be accessed.
+            skip_match_cache()
             if error.errno == errno.EACCES and platform.system() == "Linux" \
                 and common.should_show_libusb_device_error((dev.idVendor, dev.idProduct)):
                 # We've already checked that this is an STLink device by VID/PID, so we
@@ -104,7 +103,7 @@ class STLinkUSBInterface:
     @classmethod
     def get_all_connected_devices(cls):
         try:
-            devices = usb_find(find_all=True, custom_match=cls._usb_match)
+            devices = find_usb_devices(cls._usb_match, cache_key=cls)
         except usb.core.NoBackendError:
             common.show_no_libusb_warning()
             return []
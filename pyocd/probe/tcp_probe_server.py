@@ -484,8 +484,13 @@ class DebugProbeRequestHandler(StreamRequestHandler):
             raise exceptions.Error("invalid handle received from remote memory access")
         self._ap_memif_handles[handle].write_memory_block8(addr, data)
 
+    ## Capabilities that are not made available to remote clients. VALUE_MATCH is left out because
+    # poll_ap() is not part of the remote protocol, so the client polls with individual reads.
+    _LOCAL_CAPABILITIES = {DebugProbe.Capability.VALUE_MATCH}
+
     _PROPERTY_CONVERTERS = {
-            'capabilities':                 lambda value: [v.name for v in value],
+            'capabilities':                 lambda value: [v.name for v in value
+                                                    if v not in DebugProbeRequestHandler._LOCAL_CAPABILITIES],
             'supported_wire_protocols':     lambda value: [v.name for v in value],
             'wire_protocol':                lambda value: value.name if (value is not None) else None,
         }
@@ -0,0 +1,202 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import (Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple)
+
+LOG = logging.getLogger(__name__)
+
+try:
+    from usb.core import NoBackendError
+    try:
+        from libusb_package import find as usb_find
+    except ImportError:
+        from usb.core import find as usb_find
+except ImportError:
+    IS_AVAILABLE = False
+
+    class NoBackendError(Exception): # type: ignore
+        """@brief Stands in for usb.core.NoBackendError when pyusb is not installed."""
+
+    def usb_find(*args: Any, **kwargs: Any) -> Any:
+        raise NoBackendError("pyusb is not installed")
+else:
+    IS_AVAILABLE = True
+
+## Key identifying a USB device at a particular bus location.
+#
+# The tuple is (bus, address, port numbers, VID, PID). Because the host assigns a new bus address
+# each time a device is attached, a key is naturally retired when a device is unplugged and
+# replugged, even into the same port.
+DeviceKey = Tuple[int, int, Tuple[int, ...], int, int]
+
+## Private string descriptor attributes of usb.core.Device that are carried between enumerations.
+#
+# pyusb lazily reads and caches these strings the first time the corresponding property is
+# accessed, which requires opening the device.
+_CACHED_STRING_ATTRS = ('_manufacturer', '_product', '_serial_number')
+
+class USBDeviceEnumerator:
+    """@brief Shares libusb device enumeration and descriptor reads between probe backends.
+
+    Each libusb based probe backend used to call `usb.core.find()` itself, enumerating the bus and
+    opening every device to read descriptors. This class provides a single point of enumeration.
+
+    - Within a scan() context, all backends share the device list from one enumeration, so the
+      backends can be scanned concurrently without each enumerating the bus.
+    - String descriptors read from a device are remembered and pre-filled into the device object
+      returned from later enumerations, so the device does not have to be opened again.
+    - Results of match functions are cached per device when the caller provides a cache key. A
+      match function calls skip_match_cache() if its result is not definitive, for instance
+      because the device could not be opened.
+
+    Cached data for a device is discarded as soon as an enumeration no longer reports the device's
+    key, which makes the caches hotplug aware. invalidate() discards all cached data.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._scan_depth = 0
+        self._scan_devices: Optional[List[Any]] = None
+        self._strings: Dict[DeviceKey, Dict[str, str]] = {}
+        self._matches: Dict[Tuple[DeviceKey, Hashable], bool] = {}
+        self._match_state = threading.local()
+
+    @staticmethod
+    def device_key(dev: Any) -> DeviceKey:
+        """@brief Return the key for a usb.core.Device."""
+        try:
+            ports = tuple(dev.port_numbers or ())
+        except (NotImplementedError, AttributeError):
+            ports = ()
+        return (dev.bus, dev.address, ports, dev.idVendor, dev.idProduct)
+
+    @contextmanager
+    def scan(self) -> Iterator[None]:
+        """@brief Context manager during which all find() calls share a single enumeration.
+
+        Scans may be nested. The shared device list is released when the outermost scan exits.
+        """
+        with self._lock:
+            self._scan_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._scan_depth -= 1
+                if self._scan_depth == 0 and self._scan_devices is not None:
+                    self._save_strings(self._scan_devices)
+                    self._scan_devices = None
+
+    def invalidate(self) -> None:
+        """@brief Discard all cached descriptor strings and match results."""
+        with self._lock:
+            self._strings.clear()
+            self._matches.clear()
+
+    def find(
+            self,
+            custom_match: Callable[[Any], bool],
+            cache_key: Optional[Hashable] = None,
+            ) -> List[Any]:
+        """@brief Return all connected USB devices accepted by a match function.
+
+        @param self
+        @param custom_match Callable passed a usb.core.Device and returning a bool, with the same
+            semantics as the `custom_match` parameter of `usb.core.find()`.
+        @param cache_key If not None, the result of _custom_match_ for each device is cached under
+            this key until the device is detached. The match function must not depend on
+            anything other than the device and must not have side effects that later users of the
+            device rely on.
+        @exception usb.core.NoBackendError No libusb library is available, or pyusb is not installed.
+        """
+        devices = self._get_devices()
+        result = [dev for dev in devices if self._match(dev, custom_match, cache_key)]
+        if self._scan_devices is not devices:
+            self._save_strings(devices)
+        return result
+
+    def _get_devices(self) -> List[Any]:
+        with self._lock:
+            if self._scan_devices is not None:
+                return self._scan_devices
+
+            devices = list(usb_find(find_all=True))
+
+            # Forget everything about devices that are no longer attached, and prefill strings
+            # for devices we've seen before.
+            keys = set()
+            for dev in devices:
+                key = self.device_key(dev)
+                keys.add(key)
+                for attr, value in self._strings.get(key, {}).items():
+                    setattr(dev, attr, value)
+            for key in [k for k in self._strings if k not in keys]:
+                del self._strings[key]
+            for match_key in [k for k in self._matches if k[0] not in keys]:
+                del self._matches[match_key]
+
+            if self._scan_depth > 0:
+                self._scan_devices = devices
+            return devices
+
+    def _match(self, dev: Any, custom_match: Callable[[Any], bool], cache_key: Optional[Hashable]) -> bool:
+        if cache_key is None:
+            return custom_match(dev)
+        match_key = (self.device_key(dev), cache_key)
+        with self._lock:
+            cached = self._matches.get(match_key)
+        if cached is not None:
+            return cached
+        self._match_state.skip_cache = False
+        result = bool(custom_match(dev))
+        if not self._match_state.skip_cache:
+            with self._lock:
+                self._matches[match_key] = result
+        return result
+
+    def skip_match_cache(self) -> None:
+        """@brief Prevent the result of the match function being run by this thread from being cached.
+
+        Match functions call this when they can't tell whether a device matches, for instance
+        because of a USB error caused by missing permissions or the device being busy. The match
+        function is then run again for the device on the next enumeration.
+        """
+        self._match_state.skip_cache = True
+
+    def _save_strings(self, devices: List[Any]) -> None:
+        with self._lock:
+            for dev in devices:
+                strings = {attr: getattr(dev, attr) for attr in _CACHED_STRING_ATTRS
+                        if getattr(dev, attr, None) is not None}
+                if strings:
+                    self._strings.setdefault(self.device_key(dev), {}).update(strings)
+
+## @brief Shared enumerator instance used by all probe backends.
+ENUMERATOR = USBDeviceEnumerator()
+
+def find_usb_devices(custom_match: Callable[[Any], bool], cache_key: Optional[Hashable] = None) -> List[Any]:
+    """@brief Return connected USB devices accepted by a match function, using the shared enumerator."""
+    return ENUMERATOR.find(custom_match, cache_key)
+
+def skip_match_cache() -> None:
+    """@brief Prevent the current match result from being cached by the shared enumerator.
+
+    See USBDeviceEnumerator.skip_match_cache().
+    """
+    ENUMERATOR.skip_match_cache()
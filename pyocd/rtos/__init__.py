@@ -16,14 +16,9 @@
 # limitations under the License.
 
 from .provider import ThreadProvider
-from .argon import ArgonThreadProvider
-from .freertos import FreeRTOSThreadProvider
-from .zephyr import ZephyrThreadProvider
-from .rtx5 import RTX5ThreadProvider
-from ..core.plugin import load_plugin_classes_of_type
+from ..core.plugin import PluginClassDict
 
-## @brief Dictionary of loaded RTOS plugins, indexed by name.
-RTOS = {}
-
-# Load RTOS plugins when this module is loaded.
-load_plugin_classes_of_type('pyocd.rtos', RTOS, ThreadProvider)
+## @brief Dictionary of RTOS plugins, indexed by name.
+#
+# Plugins are loaded the first time the dictionary is accessed.
+RTOS = PluginClassDict('pyocd.rtos', ThreadProvider)
@@ -16,12 +16,30 @@
 # limitations under the License.
 
 import argparse
+import importlib
 import logging
 import prettytable
-from typing import (Any, Dict, List, Optional, Type)
+from typing import (Any, Dict, List, NamedTuple, Optional, Sequence, Type, Union)
 
 from ..utility.cmdline import convert_frequency
 
+class LazySubcommand(NamedTuple):
+    """@brief Description of a subcommand whose module is only imported when the subcommand is used.
+
+    The names and help must match the `NAMES` and `HELP` attributes of the subcommand class.
+    """
+    ## Name of the module relative to the pyocd.subcommands package.
+    module: str
+    ## Name of the SubcommandBase subclass within the module.
+    class_name: str
+    names: List[str]
+    help: str
+
+    def load(self) -> Type["SubcommandBase"]:
+        """@brief Import the module and return the subcommand class."""
+        module = importlib.import_module(f"{__package__}.{self.module}")
+        return getattr(module, self.class_name)
+
 class SubcommandBase:
     """@brief Base class for pyocd command line subcommand."""
 
@@ -30,7 +48,10 @@ class SubcommandBase:
     HELP: str = ""
     EPILOG: Optional[str] = None
     DEFAULT_LOG_LEVEL = logging.INFO
-    SUBCOMMANDS: List[Type["SubcommandBase"]] = []
+    SUBCOMMANDS: Sequence[Union[Type["SubcommandBase"], LazySubcommand]] = []
+
+    ## Whether the subcommand may be forwarded to a running `pyocd daemon`.
+    DAEMON_CAPABLE: bool = False
 
     ## Class attribute to store the built subcommand argument parser.
     parser: Optional[argparse.ArgumentParser] = None
@@ -96,11 +117,26 @@ class SubcommandBase:
             help="Select connect mode from one of (halt, pre-reset, under-reset, attach).")
 
     @classmethod
-    def add_subcommands(cls, parser: argparse.ArgumentParser) -> None:
-        """@brief Add declared subcommands to the given parser."""
+    def add_subcommands(cls, parser: argparse.ArgumentParser, selected: Optional[str] = None) -> None:
+        """@brief Add declared subcommands to the given parser.
+
+        @param cls
+        @param parser The parser to which subcommands are added.
+        @param selected Name of the subcommand present on the command line, if any. A lazy subcommand
+            is only imported and given its full set of arguments if it is selected; otherwise it gets a
+            placeholder subparser that just provides the help text.
+        """
         if cls.SUBCOMMANDS:
             subparsers = parser.add_subparsers(title="subcommands", metavar="", dest='cmd')
-            for subcmd_class in cls.SUBCOMMANDS:
+            for subcmd in cls.SUBCOMMANDS:
+                if isinstance(subcmd, LazySubcommand):
+                    if selected not in subcmd.names:
+                        subparsers.add_parser(subcmd.names[0], aliases=subcmd.names[1:], help=subcmd.help)
+                        continue
+                    subcmd_class = subcmd.load()
+                else:
+                    subcmd_class = subcmd
+
                 parsers = subcmd_class.get_args()
                 subcmd_class.parser = parsers[-1]
 
@@ -0,0 +1,75 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+from typing import List
+import logging
+
+from .base import SubcommandBase
+from ..core import exceptions
+from ..utility.daemon import (
+    SOCKET_ENV_VAR,
+    PyOCDDaemon,
+    default_socket_path,
+    forward_shutdown,
+    is_daemon_supported,
+    )
+
+LOG = logging.getLogger(__name__)
+
+class DaemonSubcommand(SubcommandBase):
+    """@brief `pyocd daemon` subcommand."""
+
+    NAMES = ['daemon']
+    HELP = "Run a daemon that keeps debug sessions open between pyocd invocations."
+    EPILOG = (f"While the daemon is running, set the {SOCKET_ENV_VAR} environment variable to the "
+            "daemon's socket path to have the load, erase, reset, and list subcommands run in the daemon. "
+            "Sessions are reused by later commands with the same probe and connection options.")
+
+    @classmethod
+    def get_args(cls) -> List[argparse.ArgumentParser]:
+        """@brief Add this subcommand to the subparsers object."""
+        daemon_parser = argparse.ArgumentParser(description='daemon', add_help=False)
+
+        daemon_options = daemon_parser.add_argument_group('daemon')
+        daemon_options.add_argument("-s", "--socket", metavar="PATH", default=None,
+            help=f"Path of the daemon's Unix domain socket. Default is {default_socket_path()}.")
+        daemon_options.add_argument("--stop", action="store_true",
+            help="Stop a running daemon.")
+
+        return [cls.CommonOptions.LOGGING, daemon_parser]
+
+    def invoke(self) -> int:
+        """@brief Handle 'daemon' subcommand."""
+        if not is_daemon_supported():
+            raise exceptions.CommandError("the pyocd daemon requires Unix domain socket support")
+
+        socket_path = self._args.socket or default_socket_path()
+
+        if self._args.stop:
+            if not forward_shutdown(socket_path):
+                LOG.error("No pyocd daemon is listening on %s", socket_path)
+                return 1
+            return 0
+
+        daemon = PyOCDDaemon(socket_path)
+        LOG.info("pyocd daemon listening on %s", socket_path)
+        LOG.info("Set %s=%s to forward commands to the daemon", SOCKET_ENV_VAR, socket_path)
+        try:
+            daemon.serve()
+        except RuntimeError as err:
+            raise exceptions.CommandError(str(err)) from err
+        return 0
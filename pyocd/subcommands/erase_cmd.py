@@ -34,6 +34,7 @@ class EraseSubcommand(SubcommandBase):
 
     NAMES = ['erase']
     HELP = "Erase entire device flash or specified sectors."
+    DAEMON_CAPABLE = True
     EPILOG = ("If no position arguments are listed, then no action will be taken unless the --chip or "
             "--mass-erase options are provided. Otherwise, the positional arguments should be the addresses of flash "
             "sectors or address ranges. The end address of a range is exclusive, meaning that it will not be "
@@ -33,6 +33,7 @@ class ListSubcommand(SubcommandBase):
 
     NAMES = ['list']
     HELP = "List information about probes, targets, or boards."
+    DAEMON_CAPABLE = True
     DEFAULT_LOG_LEVEL = logging.ERROR
 
     ## @brief Map to convert plugin groups to user friendly names.
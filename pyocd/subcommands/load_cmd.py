@@ -38,6 +38,7 @@ class LoadSubcommand(SubcommandBase):
 
     NAMES = ['load', 'flash']
     HELP = "Load one or more images into target device memory."
+    DAEMON_CAPABLE = True
     EPILOG = "Supported file formats are: binary, Intel hex, and ELF32."
     DEFAULT_LOG_LEVEL = logging.WARNING
 
@@ -61,6 +62,12 @@ class LoadSubcommand(SubcommandBase):
                  "Only allowed if a single binary file is being loaded.")
         parser_options.add_argument("--trust-crc", action="store_true",
             help="Use only the CRC of each page to determine if it already has the same data.")
+        verify_group = parser_options.add_mutually_exclusive_group()
+        verify_group.add_argument("--verify", action="store_const", const="crc",
+            help="Verify memory contents after programming by comparing CRCs computed on the target. Only "
+                 "mismatched data is read back.")
+        verify_group.add_argument("--verify-read", dest="verify", action="store_const", const="read",
+            help="Verify memory contents after programming by reading back all data.")
         parser_options.add_argument("--format", choices=("bin", "hex", "elf"),
             help="File format. Default is to use the file's extension. If multiple files are provided, then "
                  "all must be of this type.")
@@ -109,7 +116,8 @@ class LoadSubcommand(SubcommandBase):
         with session:
             programmer = FileProgrammer(session,
                             chip_erase=self._args.erase,
-                            trust_crc=self._args.trust_crc)
+                            trust_crc=self._args.trust_crc,
+                            verify=self._args.verify)
 
             # Get a list of all secondary cores.
             secondary_cores = [c for c in session.target.cores.values() if c != session.target.primary_core]
@@ -39,6 +39,7 @@ class ResetSubcommand(SubcommandBase):
 
     NAMES = ['reset']
     HELP = "Reset a target device."
+    DAEMON_CAPABLE = True
     DEFAULT_LOG_LEVEL = logging.WARNING
 
     @classmethod
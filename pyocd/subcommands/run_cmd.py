@@ -230,6 +230,7 @@ class RunServer(threading.Thread):
             self._rtt_server = rtt_manager.start_server()
             if self._rtt_server is not None:
                 rtt_manager.configure_channels(stdio_handler=self._stdio_handler)
+                rtt_manager.start_poller(self._lock)
         except RuntimeError as e:
             LOG.debug("RTT configuration failed for core %d: %s", self.core, e)
 
@@ -284,11 +285,8 @@ class RunServer(threading.Thread):
             self._lock.acquire()
 
             try:
-                if self._rtt_server:
-                    self._rtt_server.poll()
-
                 # Check target state and handle semihosting every 10ms (every 10 loop iterations)
-                # to avoid slowing down RTT polling
+                # to avoid holding the lock needed by the RTT poller and SWV reader
                 if state_check_interval_counter == 10:
                     state_check_interval_counter = 0
 
@@ -0,0 +1,116 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import logging
+import sys
+from typing import (List, TextIO)
+
+from .base import SubcommandBase
+from ..core import exceptions
+from ..trace.capture import SWOCaptureFile
+from ..trace.swo import SWOParser
+from ..trace.writer import TraceEventWriter
+
+LOG = logging.getLogger(__name__)
+
+class SWODecodeSubcommand(SubcommandBase):
+    """@brief `pyocd swo decode` subcommand."""
+
+    NAMES = ['decode']
+    HELP = "Decode captured SWO data to trace events."
+
+    ## Number of bytes of SWO data read and parsed at a time.
+    CHUNK_SIZE = 1024 * 1024
+
+    @classmethod
+    def get_args(cls) -> List[argparse.ArgumentParser]:
+        """@brief Add this subcommand to the subparsers object."""
+        parser = argparse.ArgumentParser(description=cls.HELP, add_help=False)
+
+        parser.add_argument("file", metavar="PATH",
+            help="SWO capture file written by the swv_capture_file option, or a file of raw SWO data.")
+        parser.add_argument("--format", choices=TraceEventWriter.FORMATS, default='text',
+            help="Output format. Default is text.")
+        parser.add_argument("-o", "--output", metavar="PATH",
+            help="Write the trace events to this file instead of stdout.")
+
+        return [cls.CommonOptions.LOGGING, parser]
+
+    def invoke(self) -> int:
+        """@brief Handle 'decode' subcommand."""
+        if self._args.output:
+            with open(self._args.output, 'w', newline='') as output:
+                self._decode(output)
+        else:
+            self._decode(sys.stdout)
+        return 0
+
+    def _decode(self, output: TextIO) -> None:
+        parser = SWOParser(None, TraceEventWriter(output, self._args.format))
+        self._parse_file(parser)
+        parser.flush()
+        LOG.info("Decoded %d bytes of SWO data", parser.bytes_parsed)
+
+    def _parse_file(self, parser: SWOParser) -> None:
+        """@brief Pass the SWO data in the input file to the parser, in chunks."""
+        path = self._args.file
+        try:
+            is_capture = SWOCaptureFile.is_capture_file(path)
+        except OSError as err:
+            raise exceptions.CommandError(f"cannot read {path}: {err}") from err
+
+        if not is_capture:
+            with open(path, 'rb') as f:
+                while True:
+                    data = f.read(self.CHUNK_SIZE)
+                    if not data:
+                        return
+                    parser.parse(data)
+
+        try:
+            capture = SWOCaptureFile.open(path)
+        except exceptions.Error as err:
+            raise exceptions.CommandError(str(err)) from err
+        with capture:
+            position = capture.oldest_position
+            if position:
+                LOG.info("Capture ring wrapped; the oldest %d bytes of SWO data were overwritten", position)
+            while True:
+                data, position, lost = capture.read(position, self.CHUNK_SIZE)
+                if lost:
+                    # The capture is still being written.
+                    LOG.warning("%d bytes of SWO data were overwritten while decoding", lost)
+                    parser.reset()
+                if not data:
+                    return
+                parser.parse(data)
+
+class SWOSubcommand(SubcommandBase):
+    """@brief `pyocd swo` subcommand."""
+
+    NAMES = ['swo']
+    HELP = "Process captured SWO trace data."
+    SUBCOMMANDS = [
+        SWODecodeSubcommand,
+        ]
+
+    @classmethod
+    def get_args(cls) -> List[argparse.ArgumentParser]:
+        """@brief Add this subcommand to the subparsers object."""
+        swo_parser = argparse.ArgumentParser(description=cls.HELP, add_help=False)
+        cls.add_subcommands(swo_parser)
+        return [cls.CommonOptions.LOGGING, swo_parser]
@@ -22,6 +22,7 @@ import itertools
 from typing import (TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union, IO)
 
 from ...debug.elf.elf import ELFBinaryFile
+from ...flash.resident import ResidentLoop
 from ...utility.compatibility import to_str_safe
 from ...core.memory_map import MemoryRange
 from ...core import exceptions
@@ -88,6 +89,12 @@ class PackFlashAlgo:
     _MIN_STACK_SIZE = 64
     # Minimum stack size, to support two buffers.
     _MIN_TWO_BUF_STACK_SIZE = 512
+    # Minimum stack size that must remain when adding a third or further buffer.
+    _MIN_MULTI_BUF_STACK_SIZE = 4096
+    # Maximum number of page buffers to allocate.
+    _MAX_PAGE_BUFFERS = 4
+    ## @brief Bytes of RAM reserved for the CRC analyzer code and table.
+    _ANALYZER_SIZE = 0x600
 
     # Alignment for page buffers.
     _PAGE_BUFFER_ALIGN = 16
@@ -142,24 +149,33 @@ class PackFlashAlgo:
 
             yield MemoryRange(start, end), sector_size
 
-    def get_pyocd_flash_algo(self, blocksize: int, ram_region: "RamRegion") -> Dict[str, Any]:
+    def get_pyocd_flash_algo(self, blocksize: int, ram_region: "RamRegion",
+            analyzer: bool = False) -> Dict[str, Any]:
         """@brief Return a dictionary representing a pyOCD flash algorithm, or None.
 
         The most interesting operation this method performs is dynamically allocating memory
         for the flash algo from a given RAM region. Note that the .data and .bss sections are
         concatenated with .text. That's why there isn't a specific allocation for those sections.
 
-        Double buffering is supported as long as there is enough RAM.
+        Double buffering is supported as long as there is enough RAM. If there is plenty of RAM, up to
+        _MAX_PAGE_BUFFERS buffers are allocated so that several pages can be queued in target RAM.
 
         Memory layout:
         ```
-        [<--stack] [buf2] [buf1] [code]
-        ^ ram start                   ^ ram end
+        [resident] [analyzer] [<--stack] [bufN]... [buf2] [buf1] [code]
+        ^ ram start                                                   ^ ram end
         ```
 
+        The resident programming loop and CRC analyzer areas are each only allocated if the stack
+        would still be large enough for double buffering without them. The analyzer area is only
+        allocated if _analyzer_ is True.
+
         @param self
         @param blocksize The size to use for page buffers, normally the erase block size.
         @param ram_region A RamRegion object where the flash algo will be allocated.
+        @param analyzer Whether to reserve RAM for the CRC analyzer and enable it. The analyzer
+            computes CRCs by reading flash directly, so it must only be enabled if the flash is
+            memory mapped while the algo is initialised.
         @return A pyOCD-style flash algo dictionary. If None is returned, the flash algo did
             not fit into the provided ram_region.
 
@@ -221,18 +237,36 @@ class PackFlashAlgo:
                 ram_start, ram_length
             )
         else:
-            stack_size = stack_size_two_bufs
-            addr_stack = addr_data2
             page_buffers = [addr_data, addr_data2]
 
-            LOG.debug("flash algo: [stack=%#x; %#x b] [b2=%#x,+%#x] [b1=%#x,+%#x] [code=%#x,+%#x,%#x b] (ram=%#010x, %#x b)",
+            # Add more buffers to the ring while a comfortable stack size remains.
+            while len(page_buffers) < self._MAX_PAGE_BUFFERS:
+                addr_next = align_down(page_buffers[-1] - blocksize, self._PAGE_BUFFER_ALIGN)
+                if addr_next - ram_start < self._MIN_MULTI_BUF_STACK_SIZE:
+                    break
+                page_buffers.append(addr_next)
+
+            addr_stack = page_buffers[-1]
+            stack_size = addr_stack - ram_start
+
+            LOG.debug("flash algo: [stack=%#x; %#x b] %s [code=%#x,+%#x,%#x b] (ram=%#010x, %#x b)",
                 addr_stack, stack_size,
-                addr_data, addr_data - ram_start,
-                addr_data2, addr_data2 - ram_start,
+                " ".join("[b%d=%#x,+%#x]" % (n, b, b - ram_start)
+                        for n, b in reversed(list(enumerate(page_buffers, start=1)))),
                 addr_load, addr_load - ram_start, len(instructions) * 4,
                 ram_start, ram_length
             )
-        # TODO - analyzer support
+        # Resident programming loop, taken from the bottom of the stack if there is room.
+        addr_resident = None
+        if stack_size - ResidentLoop.SIZE >= self._MIN_TWO_BUF_STACK_SIZE:
+            addr_resident = ram_start
+            stack_size -= ResidentLoop.SIZE
+
+        # CRC analyzer, also taken from the bottom of the stack.
+        addr_analyzer = None
+        if analyzer and (stack_size - self._ANALYZER_SIZE >= self._MIN_TWO_BUF_STACK_SIZE):
+            addr_analyzer = addr_stack - stack_size
+            stack_size -= self._ANALYZER_SIZE
 
         # Start of actual code (after the flash blob header) when loaded into RAM.
         code_start = addr_load + self._FLASH_BLOB_HEADER_SIZE
@@ -254,8 +288,12 @@ class PackFlashAlgo:
             "end_stack": addr_stack - stack_size,
             "static_base": code_start + self.rw_start,
             "min_program_length": self.page_size,
-            "analyzer_supported": False
+            "analyzer_supported": addr_analyzer is not None,
         }
+        if addr_resident is not None:
+            flash_algo["resident_address"] = addr_resident
+        if addr_analyzer is not None:
+            flash_algo["analyzer_address"] = addr_analyzer
         return flash_algo
 
     def _extract_symbols(self, symbols: Set[str], required: bool = False) -> Dict[str, int]:
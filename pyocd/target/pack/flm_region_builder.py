@@ -88,7 +88,8 @@ class FlmFlashRegionBuilder:
                     return False
 
                 # Create the algo dict from the FLM.
-                algo = pack_algo.get_pyocd_flash_algo(page_size, ram_for_algo)
+                algo = pack_algo.get_pyocd_flash_algo(page_size, ram_for_algo,
+                        analyzer=self._session.options.get('flash.pack_analyzer'))
 
                 # If we got a valid algo from the FLM, set it on the region.
                 if algo is not None:
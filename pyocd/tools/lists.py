@@ -22,6 +22,7 @@ from .. import __version__
 from ..core.session import Session
 from ..core.helpers import ConnectHelper
 from ..core import options
+from ..core.plugin import load_all_plugins
 from ..target import TARGET
 from ..target.builtin import BUILTIN_TARGETS
 from ..board.board_ids import BOARD_ID_TO_INFO
@@ -281,7 +282,8 @@ class ListGenerator(object):
         plugins = ListGenerator.list_plugins()
         plugins_list.extend(plugins['plugins'])
 
-        # Add options
+        # Add options, including those of all plugins.
+        load_all_plugins()
         for option_name in options.OPTIONS_INFO.keys():
             info = options.OPTIONS_INFO[option_name]
             option_dict = {
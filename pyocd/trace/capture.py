@@ -0,0 +1,188 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mmap
+import struct
+from typing import (Optional, Tuple)
+
+from ..core import exceptions
+
+class SWOCaptureFile:
+    """@brief Raw SWO data captured into a memory-mapped ring buffer file.
+
+    The file is preallocated when it is created, and consists of a fixed size header followed by
+    the ring buffer. The header holds the capacity of the ring, the SWO clock the data was
+    captured at, and the total number of bytes ever written. Once more than the capacity has been
+    written, the oldest data is overwritten.
+
+    There is a single writer. Readers, either in the same process or in another process that has
+    opened the file, keep their own position as an offset into the total stream. Because the total
+    is only updated after the data is copied into the ring, a reader never sees partially written
+    data, and it can tell how many bytes were overwritten before it read them.
+    """
+
+    MAGIC = b"PYOCDSWO"
+    VERSION = 1
+
+    ## Magic, version, SWO clock, capacity, total bytes written.
+    HEADER = struct.Struct("<8sIIQQ")
+    TOTAL_OFFSET = 24
+    TOTAL = struct.Struct("<Q")
+
+    ## Offset of the ring buffer in the file.
+    HEADER_SIZE = 64
+
+    @classmethod
+    def create(cls, path: str, capacity: int, swo_clock: int = 0) -> "SWOCaptureFile":
+        """@brief Create a new capture file, replacing any existing file.
+        @param path Path of the capture file.
+        @param capacity Size of the ring buffer in bytes.
+        @param swo_clock The SWO clock frequency in Hertz, recorded for information.
+        """
+        if capacity <= 0:
+            raise ValueError("SWO capture size must be positive")
+        with open(path, 'w+b') as f:
+            f.truncate(cls.HEADER_SIZE + capacity)
+            buffer = mmap.mmap(f.fileno(), cls.HEADER_SIZE + capacity)
+        cls.HEADER.pack_into(buffer, 0, cls.MAGIC, cls.VERSION, swo_clock, capacity, 0)
+        return cls(buffer, writable=True)
+
+    @classmethod
+    def open(cls, path: str) -> "SWOCaptureFile":
+        """@brief Open an existing capture file for reading.
+        @exception Error The file is not a SWO capture file.
+        """
+        with open(path, 'rb') as f:
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as err:
+                # Raised for an empty file.
+                raise exceptions.Error(f"{path} is not a SWO capture file") from err
+        if not cls._is_capture(buffer):
+            buffer.close()
+            raise exceptions.Error(f"{path} is not a SWO capture file")
+        return cls(buffer, writable=False)
+
+    @classmethod
+    def is_capture_file(cls, path: str) -> bool:
+        """@brief Whether a file starts with a SWO capture file header."""
+        with open(path, 'rb') as f:
+            return f.read(len(cls.MAGIC)) == cls.MAGIC
+
+    @classmethod
+    def _is_capture(cls, buffer: mmap.mmap) -> bool:
+        if len(buffer) < cls.HEADER_SIZE:
+            return False
+        magic, version, _, capacity, _ = cls.HEADER.unpack_from(buffer, 0)
+        return (magic == cls.MAGIC) and (version == cls.VERSION) \
+                and (len(buffer) >= cls.HEADER_SIZE + capacity)
+
+    def __init__(self, buffer: mmap.mmap, writable: bool) -> None:
+        self._buffer = buffer
+        self._writable = writable
+        _, _, self._swo_clock, self._capacity, self._total = self.HEADER.unpack_from(buffer, 0)
+
+    @property
+    def capacity(self) -> int:
+        """@brief Size of the ring buffer in bytes."""
+        return self._capacity
+
+    @property
+    def swo_clock(self) -> int:
+        """@brief SWO clock frequency in Hertz the data was captured at, or 0 if unknown."""
+        return self._swo_clock
+
+    @property
+    def total_written(self) -> int:
+        """@brief Total number of bytes written to the capture since it was created."""
+        if self._writable:
+            return self._total
+        return self.TOTAL.unpack_from(self._buffer, self.TOTAL_OFFSET)[0]
+
+    @property
+    def oldest_position(self) -> int:
+        """@brief Stream position of the oldest data still held in the ring."""
+        return max(0, self.total_written - self._capacity)
+
+    def write(self, data: bytes) -> None:
+        """@brief Append data to the ring, overwriting the oldest data if it is full."""
+        assert self._writable
+        size = len(data)
+        if size == 0:
+            return
+        total = self._total
+        view = memoryview(data)
+        # Only the last capacity bytes of an oversized write can be kept.
+        if size > self._capacity:
+            total += size - self._capacity
+            view = view[size - self._capacity:]
+            size = self._capacity
+        offset = total % self._capacity
+        first = min(size, self._capacity - offset)
+        base = self.HEADER_SIZE
+        self._buffer[base + offset:base + offset + first] = view[:first]
+        if first < size:
+            self._buffer[base:base + size - first] = view[first:]
+        self._total = total + size
+        self.TOTAL.pack_into(self._buffer, self.TOTAL_OFFSET, self._total)
+
+    def read(self, position: int, max_size: Optional[int] = None) -> Tuple[bytes, int, int]:
+        """@brief Read data from the ring starting at a stream position.
+
+        @param position Stream position to read from, normally the position returned by the
+            previous read. Pass 0 or oldest_position to start from the oldest retained data.
+        @param max_size Optional limit on the number of bytes returned.
+        @return Tuple of the data, the stream position following the data, and the number of bytes
+            that were overwritten before they could be read.
+        """
+        total = self.total_written
+        lost = 0
+        if total - position > self._capacity:
+            lost = total - self._capacity - position
+            position += lost
+        size = total - position
+        if max_size is not None:
+            size = min(size, max_size)
+        if size <= 0:
+            return b"", position, lost
+
+        offset = position % self._capacity
+        first = min(size, self._capacity - offset)
+        base = self.HEADER_SIZE
+        data = self._buffer[base + offset:base + offset + first]
+        if first < size:
+            data += self._buffer[base:base + size - first]
+
+        # The writer may have overwritten the start of the data while it was being copied.
+        overwritten = self.total_written - self._capacity - position
+        if overwritten > 0:
+            overwritten = min(overwritten, size)
+            data = data[overwritten:]
+            lost += overwritten
+            position += overwritten
+        return data, position + len(data), lost
+
+    def close(self) -> None:
+        """@brief Unmap the file."""
+        if self._writable:
+            self._buffer.flush()
+        self._buffer.close()
+
+    def __enter__(self) -> "SWOCaptureFile":
+        return self
+
+    def __exit__(self, exc_type, value, traceback) -> None:
+        self.close()
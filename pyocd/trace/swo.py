@@ -33,8 +33,11 @@ class SWOParser:
 
     A SWOParser instance can be reused for multiple SWO sessions. If a break in SWO data streaming
     occurs, the reset() method should be called before passing further data to parse().
+
+    The core is only used to look up exception names. It may be None when decoding offline, in
+    which case exception events have no name.
     """
-    def __init__(self, core: "CoreTarget", sink: Optional["TraceEventSink"] = None) -> None:
+    def __init__(self, core: Optional["CoreTarget"], sink: Optional["TraceEventSink"] = None) -> None:
         self.reset()
         self._core = core
         self._sink = sink
@@ -74,6 +77,17 @@ class SWOParser:
             self._parser.send(value)
             self._bytes_parsed += 1
 
+    def flush(self) -> None:
+        """@brief Send all pending events to the event sink.
+
+        Events are normally held until the following timestamp or overflow packet. Call this at the
+        end of the SWO data to receive the remaining events.
+        """
+        if self._pending_data_trace is not None:
+            self._pending_events.append(self._pending_data_trace)
+            self._pending_data_trace = None
+        self._flush_events()
+
     def _flush_events(self) -> None:
         """@brief Send all pending events to event sink."""
         if self._sink is not None:
@@ -248,7 +262,8 @@ class SWOParser:
                 elif a == 1:
                     exception_number = payload & 0x1ff
                     # TODO remove exception name and dependency on core
-                    exception_name = self._core.exception_number_to_name(exception_number)
+                    exception_name = self._core.exception_number_to_name(exception_number) \
+                            if (self._core is not None) else None
                     fn = (payload >> 12) & 0x3
                     if 1 <= fn <= 3:
                         self._send_event(events.TraceExceptionEvent(
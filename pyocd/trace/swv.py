@@ -21,6 +21,7 @@ import threading
 from time import sleep
 from typing import (Optional, TextIO, TYPE_CHECKING)
 
+from .capture import SWOCaptureFile
 from .sink import TraceEventSink
 from .events import (TraceEvent, TraceITMEvent)
 from .swo import SWOParser
@@ -73,7 +74,17 @@ class SWVEventSink(TraceEventSink):
         self._console.write(data)
 
 class SWVReader(threading.Thread):
-    """@brief Sets up SWV and processes data in a background thread."""
+    """@brief Sets up SWV and processes data in a background thread.
+
+    Normally SWO data is decoded by the reader thread as it is read. If the `swv_capture_file`
+    option is set, the reader thread instead only copies SWO data into a SWOCaptureFile ring
+    buffer, and a separate decoder thread decodes it from there. Decoding then can't slow down
+    reading SWO data from the probe, and the raw data remains available for offline decoding with
+    `pyocd swo decode`.
+    """
+
+    ## Seconds the decoder thread waits for more data when the capture file has been fully decoded.
+    DECODE_INTERVAL = 0.01
 
     def __init__(self, session: "Session", core_number: int = 0, lock: Optional[threading.Lock] = None) -> None:
         """@brief Constructor.
@@ -87,6 +98,8 @@ class SWVReader(threading.Thread):
         self._shutdown_event = threading.Event()
         self._swo_clock = 0
         self._lock = lock
+        self._capture: Optional[SWOCaptureFile] = None
+        self._decoder: Optional[threading.Thread] = None
 
         target = self._session.target
         assert target
@@ -145,8 +158,18 @@ class SWVReader(threading.Thread):
         self._sink = SWVEventSink(console)
         self._parser.connect(self._sink)
 
+        capture_path = self._session.options.get('swv_capture_file')
+        if capture_path:
+            self._capture = SWOCaptureFile.create(capture_path,
+                    self._session.options.get('swv_capture_size'), swo_clock)
+            LOG.info("Capturing SWO data to %s", capture_path)
+
         self.start()
 
+        if self._capture is not None:
+            self._decoder = threading.Thread(target=self._decode, name="SWVDecoder", daemon=True)
+            self._decoder.start()
+
         return True
 
     def stop(self) -> None:
@@ -163,6 +186,11 @@ class SWVReader(threading.Thread):
         self._shutdown_event.set()
         self.join()
 
+        if self._decoder is not None:
+            self._decoder.join()
+        if self._capture is not None:
+            self._capture.close()
+
         # init() should never have started the SWV thread unless the target has ITM and TPIU.
         itm = self._target.get_first_child_of_type(ITM)
         assert itm
@@ -176,6 +204,10 @@ class SWVReader(threading.Thread):
         Starts the probe receiving SWO data by calling DebugProbe.swo_start(). For as long as the
         thread runs, it reads SWO data from the probe and passes it to the SWO parser created in
         init(). When the thread is signaled to stop, it calls DebugProbe.swo_stop() before exiting.
+
+        In capture mode, the data is written to the capture file instead of being parsed, and the
+        probe is read again without delay while data is arriving. The lock is not held while
+        capturing, since the capture file is not shared with the gdbserver.
         """
         assert self._session.probe
 
@@ -196,20 +228,31 @@ class SWVReader(threading.Thread):
             pass
         self._session.probe.swo_start(self._swo_clock)
 
+        loop_lock = self._lock if (self._capture is None) else None
+        if self._lock and not loop_lock:
+            self._lock.release()
+
         while not self._shutdown_event.is_set():
             data = self._session.probe.swo_read()
             if data:
                 if swv_raw_server:
                     swv_raw_server.write(data)
-                self._parser.parse(data)
+                if self._capture is not None:
+                    self._capture.write(data)
+                else:
+                    self._parser.parse(data)
+
+            if loop_lock:
+                loop_lock.release()
 
-            if self._lock:
-                self._lock.release()
+            if not (data and self._capture is not None):
+                sleep(0.001)
 
-            sleep(0.001)
+            if loop_lock:
+                loop_lock.acquire()
 
-            if self._lock:
-                self._lock.acquire()
+        if self._lock and not loop_lock:
+            self._lock.acquire()
 
         self._session.probe.swo_stop()
 
@@ -219,6 +262,31 @@ class SWVReader(threading.Thread):
         if self._lock:
             self._lock.release()
 
+    def _decode(self) -> None:
+        """@brief SWV decoder thread routine, used in capture mode.
+
+        Parses data from the capture file as the reader thread writes it. If the decoder falls so
+        far behind that data is overwritten before it is parsed, a warning is logged and the parser
+        is reset. Once the reader thread has finished, the remaining data is parsed and the thread
+        exits.
+        """
+        assert self._capture
+        position = 0
+        while True:
+            # Check before reading so data written before the reader finished is always parsed.
+            finished = not self.is_alive()
+            data, position, lost = self._capture.read(position)
+            if lost:
+                LOG.warning("SWV decoding fell behind; %d bytes of SWO data were lost", lost)
+                self._parser.reset()
+            if data:
+                self._parser.parse(data)
+            elif finished:
+                break
+            else:
+                self.join(self.DECODE_INTERVAL)
+        self._parser.flush()
+
     def _reset_handler(self, notification: "Notification") -> None:
         """@brief Reset notification handler.
 
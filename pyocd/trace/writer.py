@@ -0,0 +1,93 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import json
+from typing import (Any, Dict, TextIO)
+
+from . import events
+from .sink import TraceEventSink
+
+class TraceEventWriter(TraceEventSink):
+    """@brief Trace event sink that writes events to a text stream.
+
+    Three formats are supported:
+    - `text`: one line per event, as produced by the event's `str()`.
+    - `json`: one JSON object per line.
+    - `csv`: a header row followed by one row per event, with the columns in CSV_FIELDS.
+
+    The JSON objects and CSV rows have a `type` and a `timestamp` field, and the fields specific to
+    the event type. Fields that don't apply to an event are omitted from JSON objects and left
+    empty in CSV rows.
+    """
+
+    FORMATS = ('text', 'json', 'csv')
+
+    CSV_FIELDS = ['timestamp', 'type', 'port', 'data', 'width', 'exception', 'action', 'pc',
+            'address', 'value', 'access', 'size', 'comparator', 'counters']
+
+    def __init__(self, output: TextIO, format: str = 'text') -> None:
+        """@brief Constructor.
+        @param self
+        @param output File-like object to which events are written.
+        @param format One of the names in FORMATS.
+        """
+        if format not in self.FORMATS:
+            raise ValueError(f"unknown trace event format '{format}'")
+        self._output = output
+        self._format = format
+        self._csv_writer = None
+        if format == 'csv':
+            self._csv_writer = csv.DictWriter(output, fieldnames=self.CSV_FIELDS)
+            self._csv_writer.writeheader()
+
+    def receive(self, event: events.TraceEvent) -> None:
+        if self._format == 'text':
+            self._output.write(str(event) + "\n")
+        elif self._csv_writer is not None:
+            self._csv_writer.writerow(self.get_event_fields(event))
+        else:
+            self._output.write(json.dumps(self.get_event_fields(event)) + "\n")
+
+    @staticmethod
+    def get_event_fields(event: events.TraceEvent) -> Dict[str, Any]:
+        """@brief Return a dict describing a trace event."""
+        fields: Dict[str, Any] = {'timestamp': event.timestamp}
+        if isinstance(event, events.TraceITMEvent):
+            fields.update(type='itm', port=event.port, data=event.data, width=event.width)
+        elif isinstance(event, events.TraceEventCounter):
+            fields.update(type='counter', counters=event.counter_mask)
+        elif isinstance(event, events.TraceExceptionEvent):
+            action = events.TraceExceptionEvent.ACTION_DESC.get(event.action, str(event.action))
+            fields.update(type='exception', exception=event.exception_number, action=action.lower())
+        elif isinstance(event, events.TracePeriodicPC):
+            fields.update(type='pc', pc=event.pc)
+        elif isinstance(event, events.TraceDataTraceEvent):
+            fields.update(type='data-trace', comparator=event.comparator)
+            if event.pc is not None:
+                fields['pc'] = event.pc
+            if event.address is not None:
+                fields['address'] = event.address
+            if event.value is not None:
+                fields.update(value=event.value, access=('read' if event.is_read else 'write'),
+                        size=event.transfer_size)
+        elif isinstance(event, events.TraceOverflow):
+            fields['type'] = 'overflow'
+        elif isinstance(event, events.TraceTimestamp):
+            fields['type'] = 'timestamp'
+        else:
+            fields.update(type='other', data=str(event))
+        return fields
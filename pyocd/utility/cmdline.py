@@ -22,6 +22,7 @@ import yaml
 
 from ..core.target import Target
 from ..core.options import OPTIONS_INFO
+from ..core.plugin import load_all_plugins
 from ..utility.compatibility import to_str_safe
 
 LOG = logging.getLogger(__name__)
@@ -166,7 +167,10 @@ def convert_one_session_option(name: str, value: Optional[str]) -> Tuple[str, An
     else:
         had_no_prefix = False
 
-    # Look up this option.
+    # Look up this option. Plugins are loaded on demand, so the option may belong to a plugin that
+    # isn't loaded yet.
+    if name not in OPTIONS_INFO:
+        load_all_plugins()
     try:
         info = OPTIONS_INFO[name]
     except KeyError:
@@ -17,7 +17,7 @@
 
 import struct
 import binascii
-from typing import (Any, Iterator, List, Sequence, Tuple, cast)
+from typing import (Any, Iterator, List, Optional, Sequence, Tuple, Union, cast)
 
 from .mask import align_up
 
@@ -59,12 +59,8 @@ def byte_list_to_u32le_list(data: Sequence[int], pad: int = 0x00) -> List[int]:
     If the length of the data list is not a multiple of 4, then the pad value is used
     for the additional required bytes.
     """
-    res = []
-    for i in range(len(data) // 4):
-        res.append(data[i * 4 + 0] |
-                   data[i * 4 + 1] << 8 |
-                   data[i * 4 + 2] << 16 |
-                   data[i * 4 + 3] << 24)
+    count = len(data) // 4
+    res = list(struct.unpack_from("<%dI" % count, bytes(data[:count * 4])))
     remainder = (len(data) % 4)
     if remainder != 0:
         pad_count = 4 - remainder
@@ -73,13 +69,11 @@ def byte_list_to_u32le_list(data: Sequence[int], pad: int = 0x00) -> List[int]:
 
 def u32le_list_to_byte_list(data: Sequence[int]) -> List[int]:
     """@brief Convert a word array into a byte array"""
-    res = []
-    for x in data:
-        res.append((x >> 0) & 0xff)
-        res.append((x >> 8) & 0xff)
-        res.append((x >> 16) & 0xff)
-        res.append((x >> 24) & 0xff)
-    return res
+    try:
+        return list(struct.pack("<%dI" % len(data), *data))
+    except struct.error:
+        # Values outside the 32-bit range are truncated.
+        return list(struct.pack("<%dI" % len(data), *(x & 0xffffffff for x in data)))
 
 def u16le_list_to_byte_list(data: Sequence[int]) -> List[int]:
     """@brief Convert a halfword array into a byte array"""
@@ -125,6 +119,57 @@ def uint_to_hex_le(value: int, width: int) -> str:
     """
     return ''.join("%02x" % ((value >> b) & 0xff) for b in range(0, align_up(width, 8), 8))
 
+def uint_list_to_hex_le(values: Sequence[Optional[int]], widths: Sequence[int]) -> bytes:
+    """@brief Create a hexadecimal byte string from a sequence of integer values of varying widths.
+
+    This is the equivalent of concatenating the result of uint_to_hex_le() for each value, but the
+    values are packed into a single binary buffer that is converted to hex in one pass. It is
+    intended for encoding whole register files.
+
+    @param values Integer values to format. A value of None produces "xx" for each of its hex
+        bytes, as used by gdb for an unavailable register.
+    @param widths The width in bits of each value.
+    @return Bytes with, for each value, the number of hex bytes required to fit its width. The
+        bytes of each value are in little-endian order.
+    """
+    buffer = bytearray()
+    unavailable = []
+    for value, width in zip(values, widths):
+        size = (width + 7) // 8
+        if value is None:
+            unavailable.append((len(buffer), size))
+            buffer += bytes(size)
+        else:
+            buffer += (value & ((1 << (size * 8)) - 1)).to_bytes(size, 'little')
+    if not unavailable:
+        return binascii.hexlify(buffer)
+    result = bytearray(binascii.hexlify(buffer))
+    for offset, size in unavailable:
+        result[offset * 2:(offset + size) * 2] = b"xx" * size
+    return bytes(result)
+
+def hex_le_to_uint_list(data: Union[str, bytes], widths: Sequence[int]) -> List[int]:
+    """@brief Create a list of integer values from a hexadecimal string of varying width values.
+
+    The inverse of uint_list_to_hex_le(). The whole string is converted to binary in one pass.
+
+    @param data String consisting of pairs of hex digits with no intervening whitespace. The
+        bytes of each value are in little-endian order.
+    @param widths The width in bits of each value.
+    @return List of the values that are completely contained in `data`. If `data` is shorter
+        than required for all the widths, the list is shorter than `widths`.
+    """
+    buffer = binascii.unhexlify(data[:len(data) & ~1])
+    result = []
+    offset = 0
+    for width in widths:
+        size = (width + 7) // 8
+        if offset + size > len(buffer):
+            break
+        result.append(int.from_bytes(buffer[offset:offset + size], 'little'))
+        offset += size
+    return result
+
 def hex_le_to_uint(value: str, width: int) -> int:
     """@brief Create an an integer value from an n-digit hexadecimal string.
     @param value String consisting of pairs of hex digits with no intervening whitespace. Must have at least
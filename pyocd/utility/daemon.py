@@ -0,0 +1,268 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""@brief Persistent pyocd daemon and the client used to forward commands to it.
+
+The protocol is a sequence of newline-terminated JSON objects over a Unix domain socket. The client
+sends a single request object, then reads reply objects until one with a "status" key is received.
+
+Request keys:
+- "argv": List of command line arguments, not including the program name.
+- "cwd": Working directory of the client.
+- "isatty": Whether the client's stdout and stderr are both ttys.
+- "shutdown": If true, the daemon exits after replying. "argv" is ignored.
+
+Reply objects have either "stream" ("stdout" or "stderr") and "data" keys for output, or a
+"status" key with the command's exit status.
+"""
+
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import sys
+from typing import (Any, Dict, List, Optional, Sequence)
+
+from .user_files import (make_private_dir, private_temp_dir)
+
+LOG = logging.getLogger(__name__)
+
+## @brief Environment variable holding the path of the daemon socket to forward commands to.
+SOCKET_ENV_VAR = "PYOCD_DAEMON_SOCKET"
+
+def default_socket_path() -> str:
+    """@brief Return the default path of the daemon's socket for the current user.
+
+    The socket is in a directory private to the user, within the shared temporary directory.
+    """
+    return os.path.join(private_temp_dir("pyocd-daemon"), "daemon.sock")
+
+def is_daemon_supported() -> bool:
+    """@brief Whether the platform supports Unix domain sockets."""
+    return hasattr(socket, 'AF_UNIX')
+
+def _send(wfile: Any, message: Dict[str, Any]) -> None:
+    wfile.write(json.dumps(message).encode() + b'\n')
+    wfile.flush()
+
+class _ForwardingStream(io.TextIOBase):
+    """@brief Text stream that forwards writes to the daemon client."""
+
+    def __init__(self, wfile: Any, name: str, isatty: bool) -> None:
+        super().__init__()
+        self._wfile = wfile
+        self._name = name
+        self._isatty = isatty
+
+    @property
+    def encoding(self) -> str:
+        return 'utf-8'
+
+    def isatty(self) -> bool:
+        return self._isatty
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: str) -> int:
+        if data:
+            _send(self._wfile, {'stream': self._name, 'data': data})
+        return len(data)
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """@brief Handles a single client connection."""
+
+    server: "_DaemonSocketServer"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            # Client only checked whether the daemon is running.
+            return
+        try:
+            request = json.loads(line)
+        except ValueError:
+            LOG.warning("Invalid request received by pyocd daemon")
+            return
+
+        if request.get('shutdown'):
+            LOG.info("Shutdown requested")
+            self.server.daemon.stop()
+            _send(self.wfile, {'status': 0})
+            return
+
+        status = self.server.daemon.run_command(request.get('argv', []), request.get('cwd'),
+                self.wfile, request.get('isatty', False))
+        _send(self.wfile, {'status': status})
+
+class _DaemonSocketServer(socketserver.UnixStreamServer):
+    def __init__(self, path: str, daemon: "PyOCDDaemon") -> None:
+        self.daemon = daemon
+        super().__init__(path, _DaemonRequestHandler)
+
+class PyOCDDaemon:
+    """@brief Server that runs pyocd subcommands on behalf of clients.
+
+    Commands are executed one at a time in the daemon's process, with output sent back to the client.
+    A SessionPool is active while the daemon runs, so the probes and connected targets from one
+    command are reused by later commands with the same connection options.
+    """
+
+    def __init__(self, socket_path: str) -> None:
+        # Imported here so forwarding commands to the daemon doesn't import the session machinery.
+        from ..core.session_pool import SessionPool
+
+        self._socket_path = socket_path
+        self._pool = SessionPool()
+        self._is_running = False
+
+    @property
+    def socket_path(self) -> str:
+        return self._socket_path
+
+    def stop(self) -> None:
+        """@brief Request the daemon to exit after the current request."""
+        self._is_running = False
+
+    def serve(self) -> None:
+        """@brief Handle requests until stopped.
+
+        The socket is created with permissions for only the current user. If the socket is at the
+        default path, its directory is created if needed and checked to be private.
+
+        @exception RuntimeError Another daemon is listening on the socket, or the default socket
+            directory is not private.
+        """
+        if self._socket_path == default_socket_path():
+            make_private_dir(os.path.dirname(self._socket_path))
+
+        if os.path.exists(self._socket_path):
+            # Refuse to replace the socket of a live daemon.
+            if forward_shutdown(self._socket_path, check_only=True):
+                raise RuntimeError(f"a pyocd daemon is already listening on {self._socket_path}")
+            os.unlink(self._socket_path)
+
+        # Don't let commands run in the daemon forward themselves back to the daemon.
+        os.environ.pop(SOCKET_ENV_VAR, None)
+
+        # Create the socket without group or other permissions, so there is no window in which
+        # other users could connect.
+        saved_umask = os.umask(0o177)
+        try:
+            server = _DaemonSocketServer(self._socket_path, self)
+        finally:
+            os.umask(saved_umask)
+        server.timeout = 0.5
+        self._pool.activate()
+        self._is_running = True
+        try:
+            while self._is_running:
+                server.handle_request()
+        finally:
+            self._pool.deactivate()
+            server.server_close()
+            try:
+                os.unlink(self._socket_path)
+            except OSError:
+                pass
+
+    def run_command(self, argv: List[str], cwd: Optional[str], wfile: Any, isatty: bool) -> int:
+        """@brief Run a pyocd command line with output forwarded to the client."""
+        # Imported here to avoid a circular import, as the tool imports all subcommands.
+        from ..__main__ import PyOCDTool
+
+        LOG.debug("Running command: %s", argv)
+        saved_cwd = os.getcwd()
+        saved_streams = (sys.stdin, sys.stdout, sys.stderr)
+        root_logger = logging.getLogger()
+        saved_handlers = list(root_logger.handlers)
+        saved_level = root_logger.level
+        try:
+            if cwd is not None:
+                os.chdir(cwd)
+            # Prompts can't be answered, so give commands an empty stdin.
+            sys.stdin = io.StringIO()
+            sys.stdout = _ForwardingStream(wfile, 'stdout', isatty)
+            sys.stderr = _ForwardingStream(wfile, 'stderr', isatty)
+            try:
+                return PyOCDTool().run(argv)
+            except SystemExit as err:
+                return err.code if isinstance(err.code, int) else (0 if err.code is None else 1)
+        except OSError as err:
+            # The client most likely disconnected.
+            LOG.debug("Error running command for client: %s", err)
+            return 1
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = saved_streams
+            for handler in list(root_logger.handlers):
+                if handler not in saved_handlers:
+                    root_logger.removeHandler(handler)
+            root_logger.setLevel(saved_level)
+            os.chdir(saved_cwd)
+
+def _connect(socket_path: str) -> Optional[socket.socket]:
+    if not is_daemon_supported():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError as err:
+        LOG.debug("Unable to connect to pyocd daemon at %s: %s", socket_path, err)
+        sock.close()
+        return None
+    return sock
+
+def forward_command(socket_path: str, argv: Sequence[str]) -> Optional[int]:
+    """@brief Run a command line in the daemon listening on the given socket.
+
+    Output from the command is written to this process's stdout and stderr.
+
+    @return The command's exit status, or None if the daemon could not be reached.
+    """
+    sock = _connect(socket_path)
+    if sock is None:
+        return None
+    with sock, sock.makefile('rb') as rfile, sock.makefile('wb') as wfile:
+        isatty = sys.stdout.isatty() and sys.stderr.isatty()
+        _send(wfile, {'argv': list(argv), 'cwd': os.getcwd(), 'isatty': isatty})
+        for line in rfile:
+            message = json.loads(line)
+            if 'status' in message:
+                return message['status']
+            stream = sys.stdout if message.get('stream') == 'stdout' else sys.stderr
+            stream.write(message.get('data', ''))
+            stream.flush()
+    LOG.error("Connection to pyocd daemon was closed unexpectedly")
+    return 1
+
+def forward_shutdown(socket_path: str, check_only: bool = False) -> bool:
+    """@brief Ask the daemon listening on the given socket to exit.
+
+    @param socket_path Path of the daemon's socket.
+    @param check_only If True, only check whether a daemon is listening.
+    @return Whether a daemon was listening on the socket.
+    """
+    sock = _connect(socket_path)
+    if sock is None:
+        return False
+    with sock:
+        if not check_only:
+            with sock.makefile('rb') as rfile, sock.makefile('wb') as wfile:
+                _send(wfile, {'shutdown': True})
+                rfile.readline()
+    return True
@@ -0,0 +1,111 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+from typing import (Callable, Iterator, Optional, Sequence, Tuple, TYPE_CHECKING)
+
+from ..core import exceptions
+from .mask import (align_down, align_up)
+
+if TYPE_CHECKING:
+    from ..core.memory_interface import MemoryInterface
+
+## Default number of bytes in each chunk. Must be a multiple of 4.
+DEFAULT_CHUNK_SIZE = 32 * 1024
+
+## Size of the blocks compared at once by find_first_difference().
+_COMPARE_BLOCK_SIZE = 256
+
+def read_memory_chunks(
+            memif: "MemoryInterface",
+            addr: int,
+            length: int,
+            chunk_size: int = DEFAULT_CHUNK_SIZE
+        ) -> Iterator[Tuple[int, bytes]]:
+    """@brief Generator that reads a range of memory in chunks.
+
+    The word-aligned part of the range is read with read_memory_block32_deferred(). The read of the
+    next chunk is started before a chunk is yielded, so it is in progress while the caller
+    processes the chunk. Unaligned bytes at either end of the range are read with
+    read_memory_block8() and joined to the first and last chunks.
+
+    If the caller stops iterating early, the read that is in progress is completed when the
+    generator is closed.
+
+    @param memif The memory interface to read from.
+    @param addr Start address of the range.
+    @param length Number of bytes to read.
+    @param chunk_size Maximum number of bytes in each chunk. Must be a multiple of 4.
+    @return Yields tuples of the address of a chunk and its data.
+    """
+    assert (chunk_size % 4) == 0
+    end = addr + length
+    word_start = min(align_up(addr, 4), end)
+    word_end = max(align_down(end, 4), word_start)
+
+    head = bytes(memif.read_memory_block8(addr, word_start - addr)) if (word_start > addr) else b""
+    chunk_addr = addr
+    pending: Optional[Callable[[], Sequence[int]]] = None
+    try:
+        for read_addr in range(word_start, word_end, chunk_size):
+            previous = pending
+            pending = memif.read_memory_block32_deferred(read_addr, min(chunk_size, word_end - read_addr) // 4)
+            if previous is not None:
+                data = head + _words_to_bytes(previous())
+                head = b""
+                yield chunk_addr, data
+                chunk_addr += len(data)
+
+        data = head
+        if pending is not None:
+            previous, pending = pending, None
+            data += _words_to_bytes(previous())
+        if word_end < end:
+            data += bytes(memif.read_memory_block8(word_end, end - word_end))
+        if data:
+            yield chunk_addr, data
+    finally:
+        # Complete a read that the caller didn't wait for, so it doesn't stay queued.
+        if pending is not None:
+            try:
+                pending()
+            except exceptions.Error:
+                pass
+
+def _words_to_bytes(words: Sequence[int]) -> bytes:
+    return struct.pack("<%dI" % len(words), *words)
+
+def find_first_difference(a: bytes, b: bytes) -> int:
+    """@brief Return the offset of the first byte that differs between two buffers.
+
+    Blocks of bytes are compared at a time, and only the first block that differs is compared
+    byte by byte.
+
+    @return The offset of the first differing byte, or -1 if the buffers are equal. If one buffer
+        is a prefix of the other, the length of the shorter buffer is returned.
+    """
+    if a == b:
+        return -1
+    view_a = memoryview(a)
+    view_b = memoryview(b)
+    length = min(len(a), len(b))
+    for offset in range(0, length, _COMPARE_BLOCK_SIZE):
+        block_end = min(offset + _COMPARE_BLOCK_SIZE, length)
+        if view_a[offset:block_end] != view_b[offset:block_end]:
+            for i in range(offset, block_end):
+                if a[i] != b[i]:
+                    return i
+    return length
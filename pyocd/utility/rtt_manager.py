@@ -17,6 +17,7 @@
 from typing import Optional, Tuple, List
 import os
 import logging
+import threading
 from pathlib import Path
 from dataclasses import dataclass
 
@@ -24,7 +25,7 @@ from ..core import exceptions
 from ..core.session import Session
 from ..debug.elf.elf import ELFBinaryFile
 from .stdio import StdioHandler
-from .rtt_server import RTTServer, RTTChanStdioWorker, RTTChanTCPWorker, RTTChanSysViewFileWorker, RTTChanSysViewTCPWorker
+from .rtt_server import RTTServer, RTTPoller, RTTChanStdioWorker, RTTChanTCPWorker, RTTChanSysViewFileWorker, RTTChanSysViewTCPWorker
 from .systemview import SystemViewConfig
 
 LOG = logging.getLogger(__name__)
@@ -171,6 +172,11 @@ class RTTManager:
 
         try:
             server = RTTServer(self._target, address, size, b'SEGGER RTT')
+        except exceptions.RTTError as e:
+            # Invalid RTT options.
+            LOG.error("RTT for core %d: %s", self._core, e)
+            return None
+        try:
             server.start()
             LOG.debug("RTT started for core %d", self._core)
             return server
@@ -261,6 +267,18 @@ class RTTManager:
             LOG.warning("RTT for core %d: failed to find RTT control block with _SEGGER_RTT symbol address 0x%X", self._core, address)
             return None
 
+    def start_poller(self, lock: Optional[threading.RLock] = None) -> Optional[RTTPoller]:
+        """@brief Start polling the RTT server in a background thread.
+
+        The poller is stopped by the RTT server's stop() method.
+
+        @param lock Lock shared with other users of the probe.
+        """
+        if self._rtt_server is None:
+            LOG.warning("RTT for core %d: RTT not started; cannot start polling", self._core)
+            return None
+        return self._rtt_server.start_poller(lock)
+
     def configure_channels(self, stdio_handler: Optional[StdioHandler] = None):
         """@brief Configure RTT channels."""
 
@@ -18,11 +18,14 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import Enum
 import selectors
 import socket
-from typing import Optional, Sequence, Callable, IO
+from typing import Optional, Sequence, Callable, IO, Union
 import os
-from time import sleep
+import threading
+from time import (sleep, time)
 from pathlib import Path
 import logging
 
@@ -33,6 +36,116 @@ from ..utility.stdio import StdioHandler
 
 LOG = logging.getLogger(__name__)
 
+class RTTOverflowPolicy(Enum):
+    """@brief What to do with channel data when the host side buffer is full."""
+    ## Stop reading from the source, so an up channel's RdOff is not advanced and the target's own
+    # buffer mode applies.
+    BLOCK = "block"
+    ## Discard the oldest buffered data to make room for new data.
+    DROP_OLDEST = "drop-oldest"
+    ## Discard new data that does not fit.
+    DROP_NEWEST = "drop-newest"
+
+@dataclass
+class RTTChannelStats:
+    """@brief Counters for data passing through an RTT channel buffer."""
+    bytes_in: int = 0
+    bytes_out: int = 0
+    bytes_dropped: int = 0
+
+class RTTChannelBuffer:
+    """@brief Fixed capacity ring buffer holding RTT channel data between its source and sink.
+
+    Data is stored in a preallocated bytearray. The sink is passed memoryviews of the buffered data,
+    so it is not copied again on the way out.
+    """
+
+    def __init__(self, capacity: int, policy: RTTOverflowPolicy = RTTOverflowPolicy.BLOCK) -> None:
+        """
+        @param capacity Maximum number of bytes to buffer.
+        @param policy What to do with data that does not fit.
+        """
+        assert capacity > 0
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._capacity = capacity
+        self._read_offset = 0
+        self._length = 0
+        self.policy = policy
+        self.stats = RTTChannelStats()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def free(self) -> int:
+        """@brief Number of bytes that can be added without overflowing."""
+        return self._capacity - self._length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def put(self, data: Union[bytes, bytearray, memoryview]) -> int:
+        """@brief Add data to the buffer, applying the overflow policy.
+
+        With the BLOCK policy the caller is expected to add no more than free bytes. Any excess is
+        dropped, the same as with DROP_NEWEST.
+
+        @return The number of bytes stored.
+        """
+        size = len(data)
+        self.stats.bytes_in += size
+        if size > self.free:
+            if self.policy == RTTOverflowPolicy.DROP_OLDEST:
+                if size > self._capacity:
+                    # Only the newest data fits.
+                    self._drop(size - self._capacity)
+                    data = data[size - self._capacity:]
+                    size = self._capacity
+                self._discard(size - self.free)
+            else:
+                self._drop(size - self.free)
+                data = data[:self.free]
+                size = len(data)
+
+        # Copy in at most two pieces, for the top and bottom of the buffer.
+        write_offset = (self._read_offset + self._length) % self._capacity
+        first = min(size, self._capacity - write_offset)
+        self._view[write_offset:write_offset + first] = data[:first]
+        self._view[:size - first] = data[first:]
+        self._length += size
+        return size
+
+    def drain(self, sink: Callable[[memoryview], Optional[int]]) -> int:
+        """@brief Pass buffered data to a sink until it is empty or the sink stops accepting data.
+
+        @param sink Callable that is passed a memoryview of contiguous buffered data and returns
+            the number of bytes it consumed.
+        @return The number of bytes consumed.
+        """
+        total = 0
+        while self._length:
+            size = min(self._length, self._capacity - self._read_offset)
+            count = sink(self._view[self._read_offset:self._read_offset + size]) or 0
+            self._consume(count)
+            self.stats.bytes_out += count
+            total += count
+            if count < size:
+                break
+        return total
+
+    def _consume(self, count: int) -> None:
+        self._read_offset = (self._read_offset + count) % self._capacity
+        self._length -= count
+
+    def _discard(self, count: int) -> None:
+        self._consume(count)
+        self._drop(count)
+
+    def _drop(self, count: int) -> None:
+        self.stats.bytes_dropped += count
+
 class RTTChanWorker(ABC):
     """@brief Source and sink for data to be transferred over RTT. """
 
@@ -333,11 +446,15 @@ class RTTServer:
               sources and sinks of data for each channel. """
     control_block: RTTControlBlock
     workers: Optional[Sequence[Optional[RTTChanWorker]]]
-    up_buffers: Optional[Sequence[bytes]]
-    down_buffers: Optional[Sequence[bytes]]
+    up_buffers: Optional[Sequence[RTTChannelBuffer]]
+    down_buffers: Optional[Sequence[RTTChannelBuffer]]
+
+    ## Maximum number of bytes returned by one call to a worker's get_down_data().
+    _MAX_DOWN_DATA_SIZE = 4096
 
     def __init__(self, target: SoCTarget, address: int, size: int,
-                 control_block_id: bytes):
+                 control_block_id: bytes, buffer_size: Optional[int] = None,
+                 overflow_policy: Optional[RTTOverflowPolicy] = None):
         """
         @param target The target with which RTT communication is desired.
         @param address Base address for control block search range.
@@ -346,7 +463,32 @@ class RTTServer:
         @param control_block_id The control block ID string to search for. Must
                                 be at most 16 bytes long.  Will be padded with
                                 zeroes if less than 16 bytes.
+        @param buffer_size Capacity of the host side buffer for each channel and
+                           direction. Defaults to the 'rtt.buffer_size' option.
+        @param overflow_policy What to do when a host side buffer is full.
+                               Defaults to the 'rtt.overflow' option.
+
+        @exception RTTError The buffer size or overflow policy is invalid, or the control block
+                            could not be set up.
         """
+        options = self._options = target.session.options
+        self._buffer_size = buffer_size if (buffer_size is not None) \
+                            else options.get('rtt.buffer_size')
+        # A down channel worker can return this much data at once, which must fit in the buffer.
+        if self._buffer_size < self._MAX_DOWN_DATA_SIZE:
+            raise exceptions.RTTError(f"RTT buffer size must be at least {self._MAX_DOWN_DATA_SIZE} "
+                                      f"bytes (rtt.buffer_size is {self._buffer_size})")
+        if overflow_policy is not None:
+            self._overflow_policy = overflow_policy
+        else:
+            try:
+                self._overflow_policy = RTTOverflowPolicy(options.get('rtt.overflow'))
+            except ValueError:
+                valid = ", ".join(f"'{p.value}'" for p in RTTOverflowPolicy)
+                raise exceptions.RTTError(f"invalid rtt.overflow value '{options.get('rtt.overflow')}'; "
+                                          f"must be one of {valid}") from None
+        self._poller: Optional[RTTPoller] = None
+
         self.control_block = RTTControlBlock.from_target(target, address = address,
                                     size = size, control_block_id = control_block_id)
 
@@ -356,41 +498,77 @@ class RTTServer:
 
     def _channel_handler(self, ch_idx: int, worker: RTTChanWorker):
         if ch_idx < len(self.control_block.up_channels):
+            up_buffer = self.up_buffers[ch_idx]
             try:
-                # Read from up channel
-                self.up_buffers[ch_idx] += self.control_block.up_channels[ch_idx].read()
+                # Read from up channel. When blocking, data that doesn't fit is left on the target.
+                if up_buffer.policy != RTTOverflowPolicy.BLOCK:
+                    up_buffer.put(self.control_block.up_channels[ch_idx].read())
+                elif up_buffer.free:
+                    up_buffer.put(self.control_block.up_channels[ch_idx].read(up_buffer.free))
             except (exceptions.TransferError, exceptions.RTTError) as e:
                 LOG.error("Error reading RTT up channel %d: %s", ch_idx, e)
             try:
-                # Write to worker
-                bytes_written = worker.write_up_data(self.up_buffers[ch_idx])
-                self.up_buffers[ch_idx] = self.up_buffers[ch_idx][bytes_written:]
+                # Write to worker. Workers take bytes, so the buffered data is copied out of the view.
+                up_buffer.drain(lambda data: worker.write_up_data(bytes(data)))
             except Exception as e:
                 LOG.error("Error writing to RTT channel worker %d: %s", ch_idx, e)
 
         if ch_idx < len(self.control_block.down_channels):
+            down_buffer = self.down_buffers[ch_idx]
             try:
-                # Read from worker
-                self.down_buffers[ch_idx] += worker.get_down_data()
+                # Read from worker. When blocking, the worker isn't read until its data will fit.
+                if (down_buffer.policy != RTTOverflowPolicy.BLOCK) \
+                        or (down_buffer.free >= self._MAX_DOWN_DATA_SIZE):
+                    down_buffer.put(worker.get_down_data())
             except Exception as e:
                 LOG.error("Error reading from RTT channel worker %d: %s", ch_idx, e)
             try:
                 # Write to down channel
-                bytes_out = self.control_block.down_channels[ch_idx].write(self.down_buffers[ch_idx])
-                self.down_buffers[ch_idx] = self.down_buffers[ch_idx][bytes_out:]
+                down_channel = self.control_block.down_channels[ch_idx]
+                down_buffer.drain(lambda data: down_channel.write(bytes(data)))
             except (exceptions.TransferError, exceptions.RTTError) as e:
                 LOG.error("Error writing RTT down channel %d: %s", ch_idx, e)
 
-    def poll(self):
-        """@brief Reads from and writes to active RTT channels. """
+    def get_channel_stats(self, channel: int) -> Optional[Sequence[RTTChannelStats]]:
+        """@brief Return the (up, down) buffer counters for a channel, or None if not started."""
+        if not self.is_channel_idx_valid(channel):
+            return None
+        return (self.up_buffers[channel].stats, self.down_buffers[channel].stats)
+
+    def poll(self) -> int:
+        """@brief Reads from and writes to active RTT channels.
+
+        @return The number of bytes read from up channels plus the number written to down channels.
+        """
         if not self.running:
             # not yet started
-            return
+            return 0
 
+        count = 0
         for i, worker in enumerate(self.workers):
             if worker is None:
                 continue
+            up_stats, down_stats = self.up_buffers[i].stats, self.down_buffers[i].stats
+            start_count = up_stats.bytes_in + down_stats.bytes_out
             self._channel_handler(i, worker)
+            count += up_stats.bytes_in + down_stats.bytes_out - start_count
+        return count
+
+    @property
+    def poller(self) -> Optional[RTTPoller]:
+        """@brief The thread polling this server, if started with start_poller()."""
+        return self._poller
+
+    def start_poller(self, lock: Optional[threading.RLock] = None) -> RTTPoller:
+        """@brief Start a thread that polls the RTT channels until stop() is called.
+
+        @param lock Lock held while the poller accesses the target, shared with other users of the probe.
+        """
+        assert self.running and self._poller is None
+        self._poller = RTTPoller(self, lock, self._options.get('rtt.poll_interval'),
+                                 self._options.get('rtt.idle_poll_interval'))
+        self._poller.start()
+        return self._poller
 
     def start(self):
         """@brief Find and parse RTT control block. """
@@ -401,11 +579,17 @@ class RTTServer:
         num_chans: int = max(num_up_chans, num_down_chans)
 
         self.workers = [None] * num_chans
-        self.up_buffers = [bytes()] * num_chans
-        self.down_buffers = [bytes()] * num_chans
+        self.up_buffers = [RTTChannelBuffer(self._buffer_size, self._overflow_policy)
+                           for _ in range(num_chans)]
+        self.down_buffers = [RTTChannelBuffer(self._buffer_size, self._overflow_policy)
+                             for _ in range(num_chans)]
 
     def stop(self):
-        """@brief Close all RTT workers. """
+        """@brief Stop the poller and close all RTT workers. """
+        if self._poller is not None:
+            self._poller.stop()
+            self._poller = None
+
         if not self.running:
             return
 
@@ -476,3 +660,120 @@ class RTTServer:
                 if worker.port == port:
                     worker.close()
                     self.workers[i] = None
+
+class RTTPoller(threading.Thread):
+    """@brief Polls an RTTServer in a background thread.
+
+    The poll rate adapts to the traffic. While data is flowing the server is polled every
+    'rtt.poll_interval' seconds. Each poll that transfers no data doubles the interval, up to
+    'rtt.idle_poll_interval' seconds.
+
+    The lock shared with other users of the probe, such as the gdbserver and SWV reader, is only held
+    while polling, and the poller never waits on it for longer than the current interval, so it can
+    be stopped by a thread that holds the lock.
+    """
+
+    ## Period in seconds over which the transfer rate is measured.
+    RATE_PERIOD = 1.0
+
+    def __init__(self, server: RTTServer, lock: Optional[threading.RLock], interval: float,
+            idle_interval: float) -> None:
+        """
+        @param server The RTT server to poll.
+        @param lock Lock shared with other users of the probe. If None, a private lock is used.
+        @param interval Poll interval in seconds while data is flowing.
+        @param idle_interval Maximum poll interval in seconds when idle.
+        """
+        super().__init__(name="RTTPoller", daemon=True)
+        self._server = server
+        self._lock = lock if (lock is not None) else threading.RLock()
+        self._shutdown_event = threading.Event()
+        self._is_paused = False
+
+        self._min_interval = interval
+        self._max_interval = max(idle_interval, interval)
+        self._interval = self._min_interval
+
+        self._total_bytes = 0
+        self._start_time = 0.0
+        self._period_start = 0.0
+        self._period_bytes = 0
+        self._rate = 0.0
+
+    @property
+    def total_bytes(self) -> int:
+        """@brief Number of bytes transferred in both directions."""
+        return self._total_bytes
+
+    @property
+    def rate(self) -> float:
+        """@brief Transfer rate in bytes per second, measured over the last RATE_PERIOD."""
+        return self._rate
+
+    @property
+    def interval(self) -> float:
+        """@brief Current poll interval in seconds."""
+        return self._interval
+
+    @property
+    def is_paused(self) -> bool:
+        """@brief Whether polling is paused by pause()."""
+        return self._is_paused
+
+    def pause(self) -> None:
+        """@brief Stop polling until resume() is called.
+
+        Takes the lock, so no poll is in progress when this method returns.
+        """
+        with self._lock:
+            self._is_paused = True
+
+    def resume(self) -> None:
+        """@brief Resume polling after pause()."""
+        self._is_paused = False
+
+    def stop(self) -> None:
+        """@brief Stop polling and wait for the thread to exit."""
+        if not self.is_alive():
+            return
+        self._shutdown_event.set()
+        self.join()
+
+        elapsed = time() - self._start_time
+        LOG.info("RTT transferred %d bytes (%.1f KB/s average)", self._total_bytes,
+                (self._total_bytes / 1024 / elapsed) if elapsed else 0.0)
+
+    def poll_once(self) -> int:
+        """@brief Poll the server, then update the interval and transfer rate."""
+        try:
+            count = self._server.poll()
+        except exceptions.Error as e:
+            LOG.debug("RTT poll failed: %s", e)
+            count = 0
+
+        if count:
+            self._interval = self._min_interval
+        else:
+            self._interval = min(self._interval * 2, self._max_interval)
+
+        now = time()
+        self._total_bytes += count
+        self._period_bytes += count
+        if now - self._period_start >= self.RATE_PERIOD:
+            self._rate = self._period_bytes / (now - self._period_start)
+            if self._period_bytes:
+                LOG.debug("RTT rate: %.1f KB/s", self._rate / 1024)
+            self._period_start = now
+            self._period_bytes = 0
+        return count
+
+    def run(self) -> None:
+        self._start_time = self._period_start = time()
+        while not self._shutdown_event.is_set():
+            if self._lock.acquire(timeout=self._interval):
+                try:
+                    if not self._is_paused:
+                        self.poll_once()
+                finally:
+                    self._lock.release()
+            self._shutdown_event.wait(self._interval)
@@ -89,6 +89,9 @@ class ListenerSocket(object):
         if not rlist:
             return None
         sock, _addr = self.listener.accept()
+        # Replies are small and each is waited for by the client, so don't let Nagle's algorithm
+        # hold them back until the client's delayed ACK.
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         return ConnectedSocket(sock, self.packet_size)
 
     def close(self):
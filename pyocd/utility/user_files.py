@@ -0,0 +1,57 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""@brief Files and directories private to the current user."""
+
+import os
+import stat
+import tempfile
+
+def user_name() -> str:
+    """@brief Return an identifier of the current user for use in file names."""
+    return str(os.getuid()) if hasattr(os, 'getuid') else os.environ.get('USERNAME', 'user')
+
+def private_temp_dir(name: str) -> str:
+    """@brief Return the path of a directory private to the current user, within the temporary directory.
+
+    The directory is not created. Pass the path to make_private_dir() before using it.
+
+    @param name Base name of the directory. The user's identifier is appended.
+    """
+    return os.path.join(tempfile.gettempdir(), f"{name}-{user_name()}")
+
+def is_owned_by_user(info: os.stat_result) -> bool:
+    """@brief Whether a file's stat result shows it is owned by the current user.
+
+    Always true on platforms without user IDs.
+    """
+    return (not hasattr(os, 'getuid')) or (info.st_uid == os.getuid())
+
+def make_private_dir(path: str) -> None:
+    """@brief Create a directory accessible only by the current user, or check an existing one.
+
+    @exception RuntimeError The directory exists but is owned by another user or accessible by
+        other users.
+    """
+    try:
+        os.mkdir(path, 0o700)
+        return
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or not is_owned_by_user(info) \
+            or (stat.S_IMODE(info.st_mode) & 0o077):
+        raise RuntimeError(f"{path} is not a directory private to the current user")
@@ -0,0 +1,311 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""@brief Benchmark definitions.
+
+None of the benchmarks require hardware. Target access goes through the simulated CMSIS-DAP probe,
+so the results measure pyOCD's host-side overhead plus the configured simulated USB latency.
+"""
+
+from pathlib import Path
+from random import Random
+import socket
+import subprocess
+import sys
+from unittest import mock
+
+from pyocd.core.memory_map import FlashRegion
+from pyocd.core.session import Session
+from pyocd.debug.svd.loader import SVDFile
+from pyocd.flash.builder import FlashBuilder
+from pyocd.flash.flash import Flash
+from pyocd.gdbserver.gdbserver import (GDBServer, escape, unescape)
+from pyocd.gdbserver.packet_io import checksum
+from pyocd.probe.aggregator import PROBE_CLASSES
+from pyocd.probe.pydapaccess.dap_access_cmsis_dap import (_Command, AP_ACC, READ, WRITE)
+from pyocd.probe.pydapaccess.interface.simulator import SimulatedCMSISDAP
+from pyocd.target.pack.cmsis_pack import (CmsisPack, CmsisPackDescription)
+from pyocd.trace.sink import TraceEventSink
+from pyocd.trace.swo import SWOParser
+
+from harness import benchmark
+
+PACKS_DIR = Path(__file__).resolve().parents[1] / "data" / "packs"
+
+RAM_BASE = 0x20000000
+TRANSFER_SIZE = 0x10000
+PACKET_SIZE = 512
+DRW_READ = READ | AP_ACC | 0xc
+DRW_WRITE = WRITE | AP_ACC | 0xc
+WORDS_PER_PACKET = (PACKET_SIZE - 5) // 4
+
+def _random_bytes(size: int, seed: int = 0) -> bytes:
+    return bytes(Random(seed).getrandbits(8) for _ in range(size))
+
+def _create_session(context):
+    """@brief Open a session on a simulated Cortex-M target."""
+    probe_class = PROBE_CLASSES['sim']
+    probe = probe_class(SimulatedCMSISDAP(flash=(0x00000000, 0x100000), ram=(RAM_BASE, 0x40000)))
+    session = Session(probe, no_config=True, target_override='cortex_m', connect_mode='halt',
+            options={
+                'simulator.latency': context.latency,
+                'simulator.packet_size': PACKET_SIZE,
+                'simulator.packet_count': 4,
+                'gdbserver_port': 0,
+                })
+    session.open()
+    context.cleanup.callback(session.close)
+    return session
+
+def _get_target(context):
+    return context.get_resource('session', _create_session).target
+
+# ------------------------------------------- #
+#          CMSIS-DAP packets
+# ------------------------------------------- #
+@benchmark("dap.encode_block_write", size=WORDS_PER_PACKET * 4)
+def bench_dap_encode_block_write(context):
+    """Encode a full DAP_TransferBlock write packet and decode its response."""
+    data = list(range(WORDS_PER_PACKET))
+    response = bytes([6, WORDS_PER_PACKET & 0xff, WORDS_PER_PACKET >> 8, 1])
+    def run():
+        cmd = _Command(PACKET_SIZE)
+        cmd.add(cmd.get_request_space(len(data), DRW_WRITE, 0), DRW_WRITE, data, 0)
+        cmd.encode_data()
+        cmd.decode_data(response)
+    return run
+
+@benchmark("dap.decode_block_read", size=WORDS_PER_PACKET * 4)
+def bench_dap_decode_block_read(context):
+    """Encode a full DAP_TransferBlock read packet and decode its response."""
+    count = (PACKET_SIZE - 4) // 4
+    response = bytes([6, count & 0xff, count >> 8, 1]) + _random_bytes(count * 4)
+    def run():
+        cmd = _Command(PACKET_SIZE)
+        cmd.add(cmd.get_request_space(count, DRW_READ, 0), DRW_READ, None, 0)
+        cmd.encode_data()
+        cmd.decode_data(response)
+    return run
+
+@benchmark("dap.encode_mixed")
+def bench_dap_encode_mixed(context):
+    """Encode and decode a DAP_Transfer packet of alternating register writes and reads."""
+    def run():
+        cmd = _Command(PACKET_SIZE)
+        reads = 0
+        while True:
+            if cmd.get_request_space(1, DRW_WRITE, 0) == 0:
+                break
+            cmd.add(1, DRW_WRITE, [0x12345678], 0)
+            if cmd.get_request_space(1, DRW_READ, 0) == 0:
+                break
+            cmd.add(1, DRW_READ, None, 0)
+            reads += 1
+        encoded = cmd.encode_data()
+        cmd.decode_data(bytes([5, encoded[2], 1]) + bytes(reads * 4))
+    return run
+
+# ------------------------------------------- #
+#          MEM-AP transfers
+# ------------------------------------------- #
+@benchmark("memap.read_block32", size=TRANSFER_SIZE)
+def bench_memap_read_block32(context):
+    """Read 64 kB of RAM as words from the simulated target."""
+    target = _get_target(context)
+    return lambda: target.read_memory_block32(RAM_BASE, TRANSFER_SIZE // 4)
+
+@benchmark("memap.write_block32", size=TRANSFER_SIZE)
+def bench_memap_write_block32(context):
+    """Write 64 kB of RAM as words to the simulated target."""
+    target = _get_target(context)
+    data = list(range(TRANSFER_SIZE // 4))
+    def run():
+        target.write_memory_block32(RAM_BASE, data)
+        target.flush()
+    return run
+
+@benchmark("memap.read_block8", size=TRANSFER_SIZE)
+def bench_memap_read_block8(context):
+    """Read 64 kB of RAM from an unaligned address as bytes from the simulated target."""
+    target = _get_target(context)
+    return lambda: target.read_memory_block8(RAM_BASE + 1, TRANSFER_SIZE)
+
+@benchmark("memap.write_block8", size=TRANSFER_SIZE)
+def bench_memap_write_block8(context):
+    """Write 64 kB of RAM to an unaligned address as bytes to the simulated target."""
+    target = _get_target(context)
+    data = list(_random_bytes(TRANSFER_SIZE))
+    def run():
+        target.write_memory_block8(RAM_BASE + 1, data)
+        target.flush()
+    return run
+
+@benchmark("memap.read32_single")
+def bench_memap_read32_single(context):
+    """Read one word from the simulated target, measuring a single round trip."""
+    target = _get_target(context)
+    return lambda: target.read32(RAM_BASE)
+
+# ------------------------------------------- #
+#          Flash programming planning
+# ------------------------------------------- #
+@benchmark("flash.build_pages", size=0x100000)
+def bench_flash_build_pages(context):
+    """Plan the pages and sectors for programming a 1 MB image with gaps, without a target."""
+    flash = Flash(mock.Mock(), None)
+    flash.region = FlashRegion(start=0, length=0x200000, blocksize=0x1000, page_size=0x400, name='flash')
+    image = _random_bytes(0x100000)
+    # Leave a gap of unwritten data in every other 32 kB.
+    chunks = [(addr, image[addr:addr + 0x6000]) for addr in range(0, len(image), 0x8000)]
+    def run():
+        builder = FlashBuilder(flash)
+        for addr, data in chunks:
+            builder.add_data(addr, data)
+        builder._build_sectors_and_pages(keep_unwritten=False)
+        builder._compute_chip_erase_pages_and_weight()
+    return run
+
+# ------------------------------------------- #
+#          GDB remote protocol
+# ------------------------------------------- #
+@benchmark("gdb.packet_framing", size=0x1000)
+def bench_gdb_packet_framing(context):
+    """Escape, checksum and unescape a 4 kB binary packet payload."""
+    data = bytes(range(256)) * 16
+    def run():
+        escaped = escape(data)
+        checksum(escaped)
+        unescape(escaped)
+    return run
+
+class _RSPClient:
+    """@brief Minimal GDB remote protocol client.
+
+    Like gdb, the client switches to no-ack mode once connected.
+    """
+
+    def __init__(self, port):
+        self._socket = socket.create_connection(('localhost', port))
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._buffer = b''
+        self._send_acks = True
+        if self.transact(b'QStartNoAckMode') == b'OK':
+            self._send_acks = False
+
+    def transact(self, command: bytes) -> bytes:
+        self._socket.sendall(b'$' + command + b'#' + checksum(command))
+        while True:
+            start = self._buffer.find(b'$')
+            end = self._buffer.find(b'#', start)
+            if start >= 0 and end >= 0 and len(self._buffer) >= end + 3:
+                packet = self._buffer[start + 1:end]
+                self._buffer = self._buffer[end + 3:]
+                if self._send_acks:
+                    self._socket.sendall(b'+')
+                return packet
+            data = self._socket.recv(65536)
+            if not data:
+                raise ConnectionError("gdbserver closed the connection")
+            self._buffer += data
+
+    def close(self):
+        self._socket.close()
+
+def _create_gdb_client(context):
+    session = context.get_resource('session', _create_session)
+    server = GDBServer(session, core=0)
+    server.start()
+    context.cleanup.callback(server.stop)
+    client = _RSPClient(server.port)
+    context.cleanup.callback(client.close)
+    return client
+
+@benchmark("gdb.read_memory", size=TRANSFER_SIZE)
+def bench_gdb_read_memory(context):
+    """Read 64 kB of RAM through gdbserver with 1 kB 'm' packets over TCP."""
+    client = context.get_resource('gdb', _create_gdb_client)
+    commands = [b'm%x,400' % addr for addr in range(RAM_BASE, RAM_BASE + TRANSFER_SIZE, 0x400)]
+    def run():
+        for command in commands:
+            client.transact(command)
+    return run
+
+@benchmark("gdb.read_registers")
+def bench_gdb_read_registers(context):
+    """Read all core registers through gdbserver with a 'g' packet over TCP."""
+    client = context.get_resource('gdb', _create_gdb_client)
+    return lambda: client.transact(b'g')
+
+# ------------------------------------------- #
+#          SWO
+# ------------------------------------------- #
+class _NullSink(TraceEventSink):
+    def receive(self, event):
+        pass
+
+@benchmark("swo.parse", size=0x10000)
+def bench_swo_parse(context):
+    """Parse 64 kB of SWO data containing ITM stimulus and local timestamp packets."""
+    # Each 8 byte record is a 32-bit write to stimulus port 1, a 2-byte local timestamp and a
+    # 1-byte write to stimulus port 0.
+    record = bytes([0x0b, 0x41, 0x42, 0x43, 0x44, 0xc0, 0x05, 0x01])
+    data = bytearray(record * (0x10000 // len(record)))
+    parser = SWOParser(mock.Mock(), _NullSink())
+    def run():
+        parser.reset()
+        parser.parse(data)
+    return run
+
+# ------------------------------------------- #
+#          SVD and packs
+# ------------------------------------------- #
+@benchmark("svd.load", max_iterations=5)
+def bench_svd_load(context):
+    """Parse a builtin SVD file."""
+    def run():
+        SVDFile.from_builtin('Musca_B1.svd').load()
+    return run
+
+@benchmark("pack.parse_pdsc", max_iterations=5)
+def bench_pack_parse_pdsc(context):
+    """Parse a large pdsc and build the memory map of every device in it."""
+    path = PACKS_DIR / "NordicSemiconductor.nRF_DeviceFamilyPack.8.38.0.pdsc"
+    def run():
+        pdsc = CmsisPackDescription(None, path)
+        for device in pdsc.devices:
+            device.memory_map
+    return run
+
+@benchmark("pack.open_pack", max_iterations=5)
+def bench_pack_open_pack(context):
+    """Open a pack archive and list its devices."""
+    path = PACKS_DIR / "NXP.MK64F12_DFP.11.0.0.pack"
+    return lambda: CmsisPack(path).devices
+
+# ------------------------------------------- #
+#          Command line
+# ------------------------------------------- #
+@benchmark("cli.import", max_iterations=5)
+def bench_cli_import(context):
+    """Start a new Python interpreter and import the pyocd command line tool."""
+    args = [sys.executable, "-c", "import pyocd.__main__"]
+    return lambda: subprocess.run(args, check=True)
+
+@benchmark("cli.help", max_iterations=5)
+def bench_cli_help(context):
+    """Run 'pyocd --help' in a new Python interpreter."""
+    args = [sys.executable, "-m", "pyocd", "--help"]
+    return lambda: subprocess.run(args, check=True, stdout=subprocess.DEVNULL)
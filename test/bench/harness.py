@@ -0,0 +1,189 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import (datetime, timezone)
+from fnmatch import fnmatchcase
+import platform
+import statistics
+import sys
+from time import perf_counter
+from typing import (Any, Callable, Dict, List, Optional, Sequence, Tuple)
+
+import pyocd
+
+## Version of the JSON report format. Increment when the format changes incompatibly.
+REPORT_VERSION = 1
+
+## A benchmark setup function performs any setup, registering cleanup with the context, and
+# returns the operation to be timed.
+SetupFunction = Callable[["BenchmarkContext"], Callable[[], Any]]
+
+class Benchmark:
+    """@brief A named, timed operation."""
+
+    def __init__(
+                self,
+                name: str,
+                setup: SetupFunction,
+                size: Optional[int] = None,
+                max_iterations: Optional[int] = None,
+            ) -> None:
+        """@brief Constructor.
+        @param self
+        @param name Dotted name of the benchmark. The first component is the group.
+        @param setup The setup function.
+        @param size Number of bytes processed by each iteration, used to compute throughput.
+        @param max_iterations Upper limit on the iteration count, for slow benchmarks.
+        """
+        self.name = name
+        self.setup = setup
+        self.size = size
+        self.max_iterations = max_iterations
+        self.description = (setup.__doc__ or "").strip()
+
+    @property
+    def group(self) -> str:
+        return self.name.split('.')[0]
+
+## All registered benchmarks, in registration order.
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+def benchmark(name: str, size: Optional[int] = None, max_iterations: Optional[int] = None) \
+        -> Callable[[SetupFunction], SetupFunction]:
+    """@brief Decorator to register a benchmark setup function."""
+    def _register(fn: SetupFunction) -> SetupFunction:
+        assert name not in BENCHMARKS, f"duplicate benchmark {name}"
+        BENCHMARKS[name] = Benchmark(name, fn, size, max_iterations)
+        return fn
+    return _register
+
+class BenchmarkContext:
+    """@brief Settings and shared resources for a benchmark run.
+
+    Resources such as sessions are created on first use by the benchmarks that need them and
+    shared by later benchmarks. Everything registered with `cleanup` is released by close().
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        ## Simulated USB latency in seconds for benchmarks that use a simulated probe.
+        self.latency = latency
+        self.cleanup = ExitStack()
+        self._resources: Dict[str, Any] = {}
+
+    def get_resource(self, name: str, factory: Callable[["BenchmarkContext"], Any]) -> Any:
+        """@brief Return the named shared resource, creating it with the factory if needed."""
+        if name not in self._resources:
+            self._resources[name] = factory(self)
+        return self._resources[name]
+
+    def close(self) -> None:
+        self.cleanup.close()
+        self._resources.clear()
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    times: List[float]
+    size: Optional[int] = None
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            'iterations': len(self.times),
+            'min': min(self.times),
+            'max': max(self.times),
+            'mean': statistics.mean(self.times),
+            'median': self.median,
+            'stdev': statistics.stdev(self.times) if len(self.times) > 1 else 0.0,
+            }
+        if self.size:
+            result['size'] = self.size
+            result['throughput'] = self.size / self.median if self.median else 0.0
+        return result
+
+def select_benchmarks(patterns: Sequence[str]) -> List[Benchmark]:
+    """@brief Return benchmarks whose name matches any of the glob patterns, or all if none given."""
+    if not patterns:
+        return list(BENCHMARKS.values())
+    return [b for b in BENCHMARKS.values() if any(fnmatchcase(b.name, p) for p in patterns)]
+
+def run_benchmark(bench: Benchmark, context: BenchmarkContext, iterations: int, warmup: int = 1) \
+        -> BenchmarkResult:
+    """@brief Set up and time a benchmark.
+
+    The operation is run `warmup` times untimed, then timed for each iteration.
+    """
+    if bench.max_iterations is not None:
+        iterations = min(iterations, bench.max_iterations)
+        warmup = min(warmup, bench.max_iterations)
+    operation = bench.setup(context)
+    for _ in range(warmup):
+        operation()
+    times = []
+    for _ in range(iterations):
+        start = perf_counter()
+        operation()
+        times.append(perf_counter() - start)
+    return BenchmarkResult(bench.name, times, bench.size)
+
+def make_report(results: Sequence[BenchmarkResult], settings: Dict[str, Any]) -> Dict[str, Any]:
+    """@brief Build the JSON report for a benchmark run."""
+    return {
+        'version': REPORT_VERSION,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'pyocd_version': pyocd.__version__,
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': settings,
+        'results': {r.name: r.to_dict() for r in results},
+        }
+
+def compare_reports(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) \
+        -> List[Tuple[str, float, float, float, bool]]:
+    """@brief Compare median times of the benchmarks present in both reports.
+    @return List of tuples of benchmark name, baseline median, new median, ratio of new to
+        baseline, and whether the ratio exceeds 1 + `threshold`.
+    """
+    comparison = []
+    for name, result in report['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if base is None or not base['median']:
+            continue
+        ratio = result['median'] / base['median']
+        comparison.append((name, base['median'], result['median'], ratio, ratio > 1.0 + threshold))
+    return comparison
+
+def format_time(seconds: float) -> str:
+    if seconds >= 1.0:
+        return f"{seconds:.3f} s"
+    elif seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    else:
+        return f"{seconds * 1e6:.1f} us"
+
+def print_results(results: Sequence[BenchmarkResult], file=sys.stdout) -> None:
+    format_str = "{:<32}{:>12}{:>12}{:>12}{:>14}"
+    print(format_str.format("Benchmark", "Median", "Min", "Stdev", "Throughput"), file=file)
+    for result in results:
+        info = result.to_dict()
+        throughput = f"{info['throughput'] / 1000:.1f} KB/s" if 'throughput' in info else ""
+        print(format_str.format(result.name, format_time(info['median']), format_time(info['min']),
+                format_time(info['stdev']), throughput), file=file)
@@ -0,0 +1,99 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import json
+import logging
+import sys
+
+from harness import (
+    BenchmarkContext,
+    compare_reports,
+    format_time,
+    make_report,
+    print_results,
+    run_benchmark,
+    select_benchmarks,
+    )
+import benchmarks # noqa: F401 (registers the benchmarks)
+
+def main():
+    parser = argparse.ArgumentParser(description="pyOCD performance benchmarks")
+    parser.add_argument("-k", "--filter", action="append", default=[], metavar="PATTERN",
+        help="Run only benchmarks whose name matches the glob pattern. May be repeated.")
+    parser.add_argument("-n", "--iterations", type=int, default=10,
+        help="Number of timed iterations of each benchmark (default 10).")
+    parser.add_argument("-w", "--warmup", type=int, default=1,
+        help="Number of untimed iterations run before timing (default 1).")
+    parser.add_argument("--latency", type=float, default=0.0,
+        help="Simulated USB latency in seconds for target access benchmarks (default 0).")
+    parser.add_argument("-o", "--output", metavar="PATH",
+        help="Write the JSON results to this file.")
+    parser.add_argument("-c", "--compare", metavar="PATH",
+        help="Compare results against a baseline JSON results file.")
+    parser.add_argument("-t", "--threshold", type=float, default=0.1,
+        help="Fractional increase of median time over the baseline reported as a regression "
+            "(default 0.1).")
+    parser.add_argument("-l", "--list", action="store_true",
+        help="List the benchmarks and exit.")
+    parser.add_argument("-v", "--verbose", action="store_true",
+        help="Enable pyOCD logging.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+
+    selected = select_benchmarks(args.filter)
+    if args.list:
+        for bench in selected:
+            print(f"{bench.name:<32}{bench.description}")
+        return 0
+    if not selected:
+        print("No benchmarks match the filter", file=sys.stderr)
+        return 1
+
+    context = BenchmarkContext(latency=args.latency)
+    results = []
+    try:
+        for bench in selected:
+            print(f"Running {bench.name}...", file=sys.stderr)
+            results.append(run_benchmark(bench, context, args.iterations, args.warmup))
+    finally:
+        context.close()
+
+    print_results(results)
+    report = make_report(results, {
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+            'latency': args.latency,
+            })
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    status = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nComparison with {args.compare} (threshold {args.threshold:.0%}):")
+        for name, base, new, ratio, regressed in compare_reports(report, baseline, args.threshold):
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{name:<32}{format_time(base):>12}{format_time(new):>12}{ratio:>9.2f}x{flag}")
+            if regressed:
+                status = 1
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,6 +28,8 @@ from pyocd.utility.conversion import (
     float32_to_u32,
     uint_to_hex_le,
     hex_le_to_uint,
+    uint_list_to_hex_le,
+    hex_le_to_uint_list,
     u32_to_hex8le,
     u64_to_hex16le,
     hex8_to_u32be,
@@ -199,6 +201,24 @@ class TestConversionUtilities(object):
     def test_hex_le_to_uint_odd_width(self):
         assert hex_le_to_uint("0102ABCD0d", 36) == 0x0dCDAB0201
 
+    def test_uint_list_to_hex_le(self):
+        values = [0x0102ABCD, 0xd0102ABCD, 0x0102ABCD171819EF, 0x5]
+        widths = [32, 36, 64, 8]
+        assert uint_list_to_hex_le(values, widths) == \
+            ''.join(uint_to_hex_le(v, w) for v, w in zip(values, widths)).encode()
+
+    def test_uint_list_to_hex_le_unavailable(self):
+        assert uint_list_to_hex_le([1, None, 2], [8, 32, 16]) == b"01xxxxxxxx0200"
+
+    def test_hex_le_to_uint_list(self):
+        assert hex_le_to_uint_list(b"cdab0201ef191817cdab020105", [32, 64, 8]) == \
+            [0x0102ABCD, 0x0102ABCD171819EF, 0x5]
+        # Values that aren't completely present are dropped.
+        assert hex_le_to_uint_list("cdab0201ef1918", [32, 64]) == [0x0102ABCD]
+
+    def test_u32le_list_to_byte_list_truncates(self):
+        assert u32le_list_to_byte_list([0x1ffffffff, 0x01020304]) == [0xff] * 4 + [4, 3, 2, 1]
+
     def test_byteToHex2(self):
         assert byte_to_hex2(0xC3) == "c3"
 
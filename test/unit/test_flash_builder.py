@@ -0,0 +1,289 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from binascii import crc32
+import pytest
+import time
+from unittest import mock
+
+from pyocd.core.exceptions import FlashVerifyFailure
+from pyocd.core.memory_map import FlashRegion
+from pyocd.core.target import Target
+from pyocd.flash.builder import (FlashBuilder, VERIFY_CHUNK_SIZE, _FlashPage, _FlashSector)
+from pyocd.flash.flash import (Flash, PageInfo, SectorInfo)
+from pyocd.flash.timing import FlashTimingModel
+
+PAGE_SIZE = 0x100
+
+class BufferRingFlash:
+    """@brief Fake Flash that checks page buffers are not overwritten while in use."""
+    Operation = Flash.Operation
+    TIMEOUT_ERROR = Flash.TIMEOUT_ERROR
+
+    def __init__(self, buffer_count, busy_polls=100):
+        self.region = mock.Mock(start=0)
+        self.target = mock.Mock()
+        self.target.session.options = {'flash.timeout.program': 1.0}
+        self.target.get_state.side_effect = self._get_state
+        self.page_buffer_count = buffer_count
+        self.busy_polls = busy_polls
+        self.polls = 0
+        self.buffers = [None] * buffer_count
+        self.busy_buf = None
+        self.programmed = []
+        self.max_queued = 0
+
+    def init(self, operation):
+        pass
+
+    def uninit(self):
+        pass
+
+    def _get_state(self):
+        self.polls += 1
+        return Target.State.RUNNING if self.polls < self.busy_polls else Target.State.HALTED
+
+    def load_page_buffer(self, buffer_number, address, data):
+        assert buffer_number != self.busy_buf
+        assert self.buffers[buffer_number] is None
+        self.buffers[buffer_number] = (address, data)
+        self.max_queued = max(self.max_queued, sum(b is not None for b in self.buffers))
+
+    def start_program_page_with_buffer(self, buffer_number, address):
+        assert self.buffers[buffer_number][0] == address
+        self.busy_buf = buffer_number
+        self.polls = 0
+
+    def wait_for_completion(self, timeout=None, operation=None):
+        self.programmed.append(self.buffers[self.busy_buf])
+        self.buffers[self.busy_buf] = None
+        self.busy_buf = None
+        return 0
+
+def make_builder(flash, page_count):
+    builder = FlashBuilder(flash)
+    sector = _FlashSector(SectorInfo(base_addr=0, erase_weight=0.1, size=PAGE_SIZE * page_count))
+    for i in range(page_count):
+        page = _FlashPage(PageInfo(base_addr=i * PAGE_SIZE, program_weight=0.01, size=PAGE_SIZE))
+        page.data = [i & 0xff] * PAGE_SIZE
+        page.same = False
+        sector.add_page(page)
+        builder.page_list.append(page)
+    builder.sector_list.append(sector)
+    return builder
+
+class TestPageBufferRing:
+    @pytest.mark.parametrize("buffer_count", [2, 3, 4])
+    def test_program_order(self, buffer_count):
+        flash = BufferRingFlash(buffer_count)
+        builder = make_builder(flash, 9)
+        builder._program_double_buffer()
+        assert flash.programmed == [(page.addr, page.data) for page in builder.page_list]
+        assert flash.max_queued == buffer_count
+
+    def test_stop_queuing_when_idle(self):
+        # The algo finishes each page immediately, so only one page is loaded ahead.
+        flash = BufferRingFlash(4, busy_polls=0)
+        builder = make_builder(flash, 6)
+        builder._program_double_buffer()
+        assert flash.programmed == [(page.addr, page.data) for page in builder.page_list]
+        assert flash.max_queued == 2
+
+class TestFlashTimingModel:
+    def test_record(self):
+        model = FlashTimingModel()
+        assert model.get_sleep_time('erase_sector') == 0.0
+        model.record('erase_sector', 0.1)
+        model.record('erase_sector', 0.02)
+        model.record('erase_sector', 0.3)
+        timing = model.timings['erase_sector']
+        assert timing.count == 3
+        assert timing.minimum == 0.02
+        assert timing.maximum == 0.3
+        assert timing.total == pytest.approx(0.42)
+        assert timing.minimum < timing.average < timing.maximum
+        # Sleep is based on the shortest duration.
+        assert model.get_sleep_time('erase_sector') == pytest.approx(0.02 * FlashTimingModel.SLEEP_FRACTION)
+        assert model.get_sleep_time(None) == 0.0
+
+    def test_shared_model(self):
+        assert FlashTimingModel.get_model('t', 'flash') is FlashTimingModel.get_model('t', 'flash')
+        assert FlashTimingModel.get_model('t', 'flash') is not FlashTimingModel.get_model('t', 'flash2')
+
+    def test_wait_sleeps_after_first_poll(self):
+        target = mock.Mock()
+        target.get_state.side_effect = [Target.State.RUNNING, Target.State.HALTED]
+        target.read_core_register.return_value = 0
+        flash = Flash(target, None)
+        flash._timing = FlashTimingModel()
+        flash._timing.record('program_page', 0.05)
+        flash._operation_start = time.time()
+        with mock.patch('pyocd.flash.flash.sleep') as sleep:
+            assert flash.wait_for_completion(timeout=1.0, operation='program_page') == 0
+        sleep.assert_called_once()
+        assert sleep.call_args[0][0] == pytest.approx(0.04, abs=0.01)
+        assert target.get_state.call_count == 2
+        assert flash.timing.timings['program_page'].count == 2
+
+    def test_wait_immediate_poll(self):
+        target = mock.Mock()
+        target.get_state.return_value = Target.State.HALTED
+        target.read_core_register.return_value = 0
+        flash = Flash(target, None)
+        flash._timing = FlashTimingModel()
+        flash._timing.record('program_page', 0.05)
+        flash._operation_start = time.time()
+        with mock.patch('pyocd.flash.flash.sleep') as sleep:
+            assert flash.wait_for_completion(timeout=1.0, operation='program_page') == 0
+        # An operation that has already finished doesn't wait at all.
+        sleep.assert_not_called()
+        assert target.get_state.call_count == 1
+
+class TestEraseSectors:
+    @pytest.fixture
+    def flash(self):
+        algo = {
+            'load_address': 0x20000000,
+            'instructions': [0xE7FDBE00] + [0] * 15,
+            'pc_eraseAll': 0x20000009,
+            'pc_erase_sector': 0x20000011,
+            'pc_program_page': 0x20000021,
+            'page_buffers': [0x20001000],
+            'begin_stack': 0x20002000,
+            'static_base': 0x20000040,
+            'analyzer_supported': False,
+            }
+        target = mock.Mock()
+        target.session.options = {'flash.resident_loop': False}
+        flash = Flash(target, algo)
+        flash.region = FlashRegion(start=0, length=0x4000, blocksize=0x1000, name='flash')
+        flash._active_operation = Flash.Operation.ERASE
+        flash.erase_sector = mock.Mock()
+        flash.erase_all = mock.Mock()
+        return flash
+
+    def test_merge_runs(self, flash):
+        assert flash._merge_sector_runs([0x0, 0x1000, 0x3000]) == [(0x0, 0x2000), (0x3000, 0x4000)]
+
+    def test_sectors(self, flash):
+        progress = []
+        flash.erase_sectors([0x3000, 0x0, 0x1000], progress.append, allow_erase_all=True)
+        assert flash.erase_sector.call_args_list == [mock.call(0x0), mock.call(0x1000), mock.call(0x3000)]
+        assert not flash.erase_all.called
+        assert progress[-1] == 1.0
+
+    def test_whole_region_uses_erase_all(self, flash):
+        flash.erase_sectors([0x0, 0x1000, 0x2000, 0x3000], allow_erase_all=True)
+        assert flash.erase_all.called
+        assert not flash.erase_sector.called
+
+    def test_whole_region_not_allowed(self, flash):
+        flash.erase_sectors([0x0, 0x1000, 0x2000, 0x3000])
+        assert not flash.erase_all.called
+        assert flash.erase_sector.call_count == 4
+
+class CrcTarget:
+    """@brief Fake target with flash contents whose CRCs are computed by a fake analyzer."""
+    def __init__(self, contents):
+        self.session = mock.Mock()
+        self.session.options = {'flash.timeout.analyzer': 1.0}
+        self.contents = bytearray(contents)
+        self.words = {}
+        self.batches = []
+        self.reads = []
+
+    def write_memory_block32(self, addr, data):
+        for i, value in enumerate(data):
+            self.words[addr + i * 4] = value
+
+    def read_memory_block32(self, addr, size):
+        return [self.words[addr + i * 4] for i in range(size)]
+
+    def read_memory_block8(self, addr, size):
+        self.reads.append((addr, size))
+        return list(self.contents[addr:addr + size])
+
+    def call_analyzer(self, pc, r0, r1, r2, timeout=None):
+        assert pc == CRC_ALGO['analyzer_address']
+        assert r2 == CRC_ALGO['analyzer_address'] + 14 * 4
+        # The CRC table is loaded after the code.
+        assert self.words[r2 + 4] == crc32(b'\x01') ^ crc32(b'\x00')
+        self.batches.append(r1)
+        for i in range(r1):
+            addr, size = self.words[r0 + i * 8], self.words[r0 + i * 8 + 4]
+            self.words[r0 + i * 8] = crc32(self.contents[addr:addr + size])
+        return 0
+
+CRC_ALGO = {
+    'load_address': 0x20000000,
+    'instructions': [0xE7FDBE00] + [0] * 15,
+    'pc_init': 0x20000005,
+    'pc_erase_sector': 0x20000011,
+    'pc_program_page': 0x20000021,
+    'page_buffers': [0x20001000],
+    'begin_stack': 0x20002000,
+    'static_base': 0x20000040,
+    'analyzer_supported': True,
+    'analyzer_address': 0x20003000,
+    }
+
+def make_crc_flash(contents, page_size=0x100):
+    target = CrcTarget(contents)
+    flash = Flash(target, CRC_ALGO)
+    flash.region = FlashRegion(start=0, length=0x10000, blocksize=0x1000, page_size=page_size, name='flash')
+    flash._call_function_and_wait = target.call_analyzer
+    flash.init = mock.Mock()
+    flash.cleanup = mock.Mock()
+    return flash
+
+class TestVerify:
+    def test_compute_crcs(self):
+        contents = bytes(range(256)) * 16
+        # Four ranges fit in a 32 byte page buffer.
+        flash = make_crc_flash(contents, page_size=0x20)
+        ranges = [(i * 37, i * 5) for i in range(10)]
+        assert flash.compute_crcs(ranges) == [crc32(contents[a:a + s]) for a, s in ranges]
+        assert flash.target.batches == [4, 4, 2]
+
+    def test_crc_pass(self):
+        contents = bytes(range(256)) * 64
+        flash = make_crc_flash(contents)
+        builder = FlashBuilder(flash)
+        builder.add_data(0x100, contents[0x100:0x2345])
+        builder.verify()
+        assert flash.target.reads == []
+        assert flash.cleanup.called
+
+    def test_crc_mismatch(self):
+        contents = bytearray(range(256)) * 64
+        flash = make_crc_flash(contents)
+        builder = FlashBuilder(flash)
+        builder.add_data(0, bytes(contents[:0x3000]))
+        flash.target.contents[0x1234] ^= 0xff
+        with pytest.raises(FlashVerifyFailure) as err:
+            builder.verify()
+        assert err.value.address == 0x1234
+        # Only the chunk with a bad CRC is read back.
+        assert flash.target.reads == [(VERIFY_CHUNK_SIZE, VERIFY_CHUNK_SIZE)]
+
+    def test_read(self):
+        contents = bytearray(range(256)) * 64
+        flash = make_crc_flash(contents)
+        builder = FlashBuilder(flash)
+        builder.add_data(0, bytes(contents[:0x3000]))
+        builder.verify(method='read')
+        assert flash.target.batches == []
+        assert flash.target.reads == [(0, 0x1000), (0x1000, 0x1000), (0x2000, 0x1000)]
@@ -0,0 +1,231 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from unittest import mock
+
+from pyocd.core.exceptions import (FlashEraseFailure, FlashProgramFailure)
+from pyocd.core.target import Target
+from pyocd.coresight.cortex_m import CortexM
+from pyocd.flash.flash import Flash
+from pyocd.flash.resident import ResidentLoop
+from pyocd.flash.timing import FlashTimingModel
+
+LOAD_ADDRESS = 0x20000000
+RESIDENT_ADDRESS = 0x20001000
+BUFFERS = [0x20002000, 0x20002400]
+
+ALGO = {
+    'load_address': LOAD_ADDRESS,
+    'instructions': [0xE7FDBE00] + [0] * 15,
+    'pc_erase_sector': LOAD_ADDRESS + 0x11,
+    'pc_program_page': LOAD_ADDRESS + 0x21,
+    'page_buffers': BUFFERS,
+    'begin_stack': 0x20003000,
+    'static_base': LOAD_ADDRESS + 0x40,
+    'analyzer_supported': False,
+    'resident_address': RESIDENT_ADDRESS,
+    }
+
+class ResidentLoopTarget:
+    """@brief Fake target that runs the resident loop protocol in Python.
+
+    One queued operation is performed each time the host polls the target.
+    """
+    def __init__(self, fail_at=None, reads_per_op=1):
+        self.session = mock.Mock()
+        self.session.options = {
+            'flash.timeout.program': 1.0,
+            'flash.timeout.erase_sector': 1.0,
+            'flash.timeout.init': 1.0,
+            }
+        self.selected_core = None
+        self.words = {}
+        self.bytes = {}
+        self.regs = {}
+        self.state = Target.State.HALTED
+        self.control = None
+        self.ops = []
+        self.fail_at = fail_at
+        self.max_pending = 0
+        self.reads_per_op = reads_per_op
+        self.reads = 0
+
+    def write_memory_block32(self, addr, data):
+        for i, value in enumerate(data):
+            self.words[addr + i * 4] = value
+
+    def write32(self, addr, value):
+        self.words[addr] = value
+        if self.control is not None:
+            self.max_pending = max(self.max_pending, self.words[self.control] - self.words[self.control + 4])
+
+    def read32(self, addr):
+        return self.words[addr]
+
+    def read_memory_block32(self, addr, size):
+        self.reads += 1
+        if (self.reads % self.reads_per_op) == 0:
+            self._step()
+        return [self.words[addr + i * 4] for i in range(size)]
+
+    def write_memory_block8(self, addr, data):
+        self.bytes[addr] = bytes(data)
+
+    def write_core_registers_raw(self, names, values):
+        self.regs.update(zip(names, values))
+
+    def read_core_register(self, name):
+        return self.regs[name]
+
+    def resume(self):
+        assert self.regs['pc'] == RESIDENT_ADDRESS
+        self.control = self.regs['r0']
+        self.state = Target.State.RUNNING
+
+    def halt(self):
+        self.state = Target.State.HALTED
+
+    def get_state(self):
+        self._step()
+        return self.state
+
+    def _step(self):
+        if self.state != Target.State.RUNNING:
+            return
+        head, tail = self.words[self.control], self.words[self.control + 4]
+        if head == tail:
+            return
+        slot = self.control + 24 + (tail % ResidentLoop.DESCRIPTOR_COUNT) * 12
+        address, size, buffer = (self.words[slot + i * 4] for i in range(3))
+        if size == 0xffffffff:
+            self._return(self.words[self.control + 8])
+            return
+        if size == 0:
+            self.ops.append(('erase', address))
+        else:
+            self.ops.append(('program', address, self.bytes[buffer][:size]))
+        if len(self.ops) == self.fail_at:
+            self.words[self.control + 8] = 5
+            self._return(5)
+        else:
+            self.words[self.control + 4] = tail + 1
+
+    def _return(self, result):
+        self.regs['r0'] = result
+        self.state = Target.State.HALTED
+
+@pytest.fixture
+def pages():
+    return [(0x1000 + i * 0x100, bytes([i]) * 0x100) for i in range(5)]
+
+class TestResidentLoop:
+    def test_program(self, pages):
+        target = ResidentLoopTarget()
+        flash = Flash(target, ALGO)
+        assert flash.is_resident_loop_supported
+        flash.init(Flash.Operation.PROGRAM, address=0)
+        loop = flash.get_resident_loop()
+        loop.start()
+        for addr, data in pages:
+            loop.program_page(addr, data)
+        loop.finish()
+
+        assert target.ops == [('program', addr, data) for addr, data in pages]
+        assert loop.completed_count == len(pages)
+        assert target.state == Target.State.HALTED
+        # Only as many pages as there are buffers can be in flight.
+        assert target.max_pending == len(BUFFERS)
+
+    def test_erase(self):
+        target = ResidentLoopTarget()
+        flash = Flash(target, ALGO)
+        flash.init(Flash.Operation.ERASE, address=0)
+        loop = flash.get_resident_loop()
+        loop.start()
+        for i in range(ResidentLoop.DESCRIPTOR_COUNT + 3):
+            loop.erase_sector(0x1000 * i)
+        loop.finish()
+
+        assert target.ops == [('erase', 0x1000 * i) for i in range(ResidentLoop.DESCRIPTOR_COUNT + 3)]
+        assert target.max_pending <= ResidentLoop.DESCRIPTOR_COUNT
+
+    def test_program_failure(self, pages):
+        target = ResidentLoopTarget(fail_at=3)
+        flash = Flash(target, ALGO)
+        flash.init(Flash.Operation.PROGRAM, address=0)
+        loop = flash.get_resident_loop()
+        loop.start()
+        with pytest.raises(FlashProgramFailure) as err:
+            for addr, data in pages:
+                loop.program_page(addr, data)
+            loop.finish()
+        assert err.value.address == pages[2][0]
+        assert err.value.result_code == 5
+
+    def test_erase_failure(self):
+        target = ResidentLoopTarget(fail_at=1)
+        flash = Flash(target, ALGO)
+        flash.init(Flash.Operation.ERASE, address=0)
+        loop = flash.get_resident_loop()
+        loop.start()
+        loop.erase_sector(0x2000)
+        with pytest.raises(FlashEraseFailure) as err:
+            loop.finish()
+        assert err.value.address == 0x2000
+
+    def test_analyzer_address_fallback(self):
+        algo = dict(ALGO, analyzer_supported=True, analyzer_address=0x20004000)
+        del algo['resident_address']
+        assert Flash(ResidentLoopTarget(), algo).resident_address == 0x20004000
+        algo['analyzer_supported'] = False
+        assert not Flash(ResidentLoopTarget(), algo).is_resident_loop_supported
+
+    @pytest.mark.parametrize(("ccr", "enabled"), [
+            (0, True),
+            (CortexM.CCR_DC, False),
+        ])
+    def test_data_cache_disables_loop(self, ccr, enabled):
+        target = ResidentLoopTarget()
+        target.session.options['flash.resident_loop'] = True
+        target.selected_core = mock.Mock(spec=CortexM)
+        target.words[CortexM.CCR] = ccr
+        flash = Flash(target, ALGO)
+        assert flash.is_resident_loop_enabled == enabled
+
+    def test_poll_back_off(self, pages):
+        target = ResidentLoopTarget(reads_per_op=4)
+        flash = Flash(target, ALGO)
+        flash._timing = FlashTimingModel()
+        flash.init(Flash.Operation.PROGRAM, address=0)
+        loop = flash.get_resident_loop()
+        loop.start()
+        with mock.patch('pyocd.flash.resident.sleep') as sleep:
+            loop.program_page(*pages[0])
+            loop._wait_for(1)
+        # Polling backs off between reads of the control block.
+        assert [c[0][0] for c in sleep.call_args_list] == [
+                FlashTimingModel.MIN_POLL_INTERVAL * (2 ** i) for i in range(3)]
+        assert flash.timing.timings['program_page'].count == 1
+
+        # Once the duration is known, the first sleep is for most of it.
+        flash._timing = FlashTimingModel()
+        flash._timing.record('program_page', 0.05)
+        with mock.patch('pyocd.flash.resident.sleep') as sleep:
+            loop.program_page(*pages[1])
+            loop._wait_for(2)
+        assert sleep.call_args_list[0][0][0] == pytest.approx(0.04, abs=0.01)
+        loop.finish()
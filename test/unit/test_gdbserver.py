@@ -14,10 +14,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import pytest
+import socket
+from unittest import mock
+
+from pyocd.core import exceptions
+from pyocd.core.session import Session
+from pyocd.core.target import Target
+from pyocd.debug.cache import CachingDebugContext
+from pyocd.flash.loader import StreamingMemoryLoader
+from pyocd.gdbserver.context_facade import GDBDebugContextFacade
 from pyocd.gdbserver.gdbserver import (
+    GDBServer,
     escape,
     unescape,
 )
+from pyocd.probe.aggregator import PROBE_CLASSES
+from pyocd.probe.pydapaccess.interface.simulator import SimulatedCMSISDAP
+from pyocd.utility.sockets import ListenerSocket
+from pyocd.utility.timeout import Timeout
 
 # escaped chars: '#$}*'
 # escaped by prefixing with '}' and xor'ing the char with 0x20
@@ -65,3 +80,154 @@ class TestGdbServerEscaping:
     def test_unescape_combined(self):
         assert unescape(b"}\x03}\x04}]}\x0a") == list(b"#$}*")
         assert unescape(b"}]}]}]") == list(b"}}}")
+        # An escaped escape character.
+        assert unescape(b"a}}b") == list(b"a]b")
+
+@pytest.fixture
+def gdbserver():
+    probe = PROBE_CLASSES['sim'](SimulatedCMSISDAP())
+    with Session(probe, no_config=True, target_override='cortex_m', connect_mode='halt',
+            options={'gdbserver_port': 0}) as session:
+        server = GDBServer(session, core=0)
+        server.start()
+        yield server
+        server.stop()
+
+class TestGdbServerXml:
+    def read_xml(self, server, client, query, annex=b''):
+        data = b''
+        while True:
+            resp = server.handle_query_xml(client, query, annex, len(data), 16)
+            data += resp[1:]
+            if resp[0:1] == b'l':
+                return data
+
+    def test_threads_xml_cached(self, gdbserver):
+        client = mock.Mock(threads_xml=None)
+        with mock.patch.object(gdbserver, 'get_threads_xml', wraps=gdbserver.get_threads_xml) as get_xml:
+            xml = self.read_xml(gdbserver, client, b'threads')
+            assert xml.startswith(b'<?xml') and xml.endswith(b'</threads>')
+            assert get_xml.call_count == 1
+
+            # Regenerated after the target runs and after invalidation, but not for every chunk.
+            gdbserver.target.step()
+            assert self.read_xml(gdbserver, client, b'threads') == xml
+            assert get_xml.call_count == 2
+            gdbserver.invalidate_threads()
+            self.read_xml(gdbserver, client, b'threads')
+            assert get_xml.call_count == 3
+
+    def test_memory_map_xml_cached(self, gdbserver):
+        client = mock.Mock(threads_xml=None)
+        client.target_facade = GDBDebugContextFacade(gdbserver.target_context)
+        with mock.patch.object(client.target_facade, '_build_memory_map_xml',
+                wraps=client.target_facade._build_memory_map_xml) as build:
+            xml = self.read_xml(gdbserver, client, b'memory-map')
+            assert xml.endswith(b'</memory-map>')
+            assert build.call_count == 1
+
+class TestWaitForStop:
+    def test_scheduler_timeout(self, gdbserver):
+        # If the scheduler doesn't report the state, it is read from the target.
+        client = mock.Mock(threads_xml=None)
+        client.wait_for_interrupt.return_value = False
+        client.target_facade = GDBDebugContextFacade(gdbserver.target_context)
+        with mock.patch.object(gdbserver.scheduler, 'get_state', side_effect=exceptions.TimeoutError), \
+                mock.patch.object(gdbserver.target, 'get_state', return_value=Target.State.HALTED) as get_state:
+            with gdbserver.lock:
+                val = gdbserver._wait_for_stop(client, Timeout(1.0))
+        assert get_state.called
+        assert val.startswith(b'T')
+
+class TestStopPrefetch:
+    def prefetch(self, server):
+        client = mock.Mock(threads_xml=None)
+        client.target_facade = GDBDebugContextFacade(server.target_context)
+        server._prefetch_stop_state(client)
+        assert server._prefetch_run_token is not None
+
+    @pytest.mark.parametrize("event", [Target.Event.POST_RESET, Target.Event.PRE_RUN])
+    def test_event_invalidates(self, gdbserver, event):
+        assert isinstance(gdbserver.target_context, CachingDebugContext)
+        self.prefetch(gdbserver)
+        # The event may come from another core, so the run token of this core doesn't change.
+        gdbserver.session.notify(event, mock.Mock())
+        assert gdbserver._prefetch_run_token is None
+        with mock.patch.object(gdbserver.target_context.core, 'is_running',
+                return_value=False) as is_running:
+            gdbserver.target_context.read_core_register('pc')
+        assert is_running.called
+
+    def test_monitor_command_invalidates(self, gdbserver):
+        self.prefetch(gdbserver)
+        gdbserver.handle_remote_command(b'echo hi')
+        assert gdbserver._prefetch_run_token is None
+
+class TestFlashLoad:
+    def test_load_pauses_rtt(self, gdbserver):
+        # The RTT poller is paused from vFlashErase until vFlashDone, because the flash algo may
+        # use the RAM of the RTT control block while a streaming load is programming.
+        gdbserver.rtt_server = mock.Mock()
+        poller = gdbserver.rtt_server.poller
+        gdbserver.flash_op(b'FlashErase:0,400')
+        poller.pause.assert_called_once_with()
+        gdbserver.flash_loader = mock.Mock(spec=StreamingMemoryLoader)
+        gdbserver.flash_loader.commit.side_effect = exceptions.FlashFailure("failed")
+        with pytest.raises(exceptions.FlashFailure):
+            gdbserver.flash_op(b'FlashDone')
+        poller.resume.assert_called_once_with()
+        gdbserver.rtt_server = None
+
+    def test_detach_resumes_rtt(self, gdbserver):
+        gdbserver.rtt_server = mock.Mock()
+        gdbserver.flash_op(b'FlashErase:0,400')
+        gdbserver.notify_client_detached(mock.Mock())
+        gdbserver.rtt_server.poller.resume.assert_called_once_with()
+        gdbserver.rtt_server = None
+
+    def test_detach_aborts_load(self, gdbserver):
+        # A load that gdb didn't finish with vFlashDone is stopped when the client detaches.
+        loader = gdbserver.flash_loader = mock.Mock(spec=StreamingMemoryLoader)
+        gdbserver.notify_client_detached(mock.Mock())
+        loader.abort.assert_called_once_with()
+        assert gdbserver.flash_loader is None
+
+class TestRegisterContext:
+    def test_get_register_context(self, gdbserver):
+        facade = GDBDebugContextFacade(gdbserver.target_context)
+        gdbserver.target_context.write_core_register_raw('r1', 0x12345678)
+        context = facade.get_register_context()
+        regs = facade._register_list
+        assert len(context) == sum(reg.bitsize // 4 for reg in regs)
+        # r1 follows r0 in the g packet.
+        assert context[8:16] == b'78563412'
+        assert facade.get_register(regs[1].gdb_regnum) == b'78563412'
+
+    def test_set_register_context(self, gdbserver):
+        facade = GDBDebugContextFacade(gdbserver.target_context)
+        context = facade.get_register_context()
+        facade.set_register_context(b'01000000' + b'efbeadde' + context[16:])
+        assert gdbserver.target_context.read_core_register_raw('r0') == 1
+        assert gdbserver.target_context.read_core_register_raw('r1') == 0xdeadbeef
+        assert facade.get_register_context()[16:] == context[16:]
+
+    def test_unavailable_registers(self, gdbserver):
+        facade = GDBDebugContextFacade(gdbserver.target_context)
+        with mock.patch.object(gdbserver.target_context, 'read_core_registers_raw',
+                side_effect=exceptions.CoreRegisterAccessError):
+            context = facade.get_register_context()
+        assert context == b'x' * len(context)
+
+class TestListenerSocket:
+    def test_accept_no_delay(self):
+        # Replies to gdb must not wait for the client's delayed ACK.
+        listener = ListenerSocket(0, 4096)
+        listener.init()
+        client = socket.create_connection(('localhost', listener.port))
+        try:
+            connected = listener.accept(5.0)
+            assert connected._sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+            connected.close()
+        finally:
+            client.close()
+            listener.close()
@@ -0,0 +1,144 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from pyocd.core import exceptions
+from pyocd.core.target import Target
+from pyocd.gdbserver.scheduler import TransactionScheduler
+
+class FakeCore:
+    """@brief Core whose state reads are logged, to check how they are batched."""
+
+    def __init__(self, name, log, state=Target.State.RUNNING):
+        self.name = name
+        self.log = log
+        self.state = state
+        self.error = None
+
+    def get_state_deferred(self):
+        self.log.append(('start', self.name))
+        def get_state_cb():
+            self.log.append(('complete', self.name))
+            if self.error is not None:
+                raise self.error
+            return self.state
+        return get_state_cb
+
+    def get_state(self):
+        self.log.append(('read', self.name))
+        if self.error is not None:
+            raise self.error
+        return self.state
+
+@pytest.fixture
+def scheduler():
+    session = SimpleNamespace(context_state=SimpleNamespace(), probe=mock.Mock())
+    return TransactionScheduler.for_session(session)
+
+class TestTransactionScheduler:
+    def test_for_session(self, scheduler):
+        assert TransactionScheduler.for_session(scheduler._session) is scheduler
+
+    def test_batched_poll(self, scheduler):
+        log = []
+        core0 = FakeCore(0, log)
+        core1 = FakeCore(1, log, Target.State.HALTED)
+        # Hold off polling until both cores are watched.
+        with scheduler.interactive(2):
+            scheduler.watch(core0, 0)
+            scheduler.watch(core1, 1)
+        assert scheduler.get_state(core0, 1.0) == Target.State.RUNNING
+        assert scheduler.get_state(core1, 1.0) == Target.State.HALTED
+        scheduler.unwatch(core0)
+        scheduler.unwatch(core1)
+        # Both reads are started before either is completed.
+        assert log[:4] == [('start', 0), ('start', 1), ('complete', 0), ('complete', 1)]
+        assert scheduler._session.probe.lock.called
+        assert scheduler.get_metrics(0).polls >= 1
+
+    def test_error_raised_once(self, scheduler):
+        log = []
+        core = FakeCore(0, log)
+        core.error = exceptions.TransferFaultError()
+        scheduler.watch(core, 0)
+        with pytest.raises(exceptions.TransferFaultError):
+            scheduler.get_state(core, 1.0)
+        # The failed batch read is retried on its own.
+        assert ('read', 0) in log
+        core.error = None
+        assert scheduler.get_state(core, 1.0) == Target.State.RUNNING
+        scheduler.unwatch(core)
+
+    def test_unexpected_error(self, scheduler):
+        log = []
+        core = FakeCore(0, log)
+        core.error = KeyError(0)
+        scheduler.watch(core, 0)
+        # Exceptions that aren't pyOCD errors are also reported, and polling continues.
+        with pytest.raises(KeyError):
+            scheduler.get_state(core, 1.0)
+        core.error = None
+        assert scheduler.get_state(core, 1.0) == Target.State.RUNNING
+        scheduler.unwatch(core)
+
+    def test_thread_cleared_on_exit(self, scheduler):
+        core = FakeCore(0, [])
+        with mock.patch.object(scheduler, '_poll_loop', side_effect=RuntimeError):
+            scheduler.watch(core, 0)
+            thread = scheduler._thread
+            thread.join(1.0)
+        assert scheduler._thread is None
+        # Watching again starts a new thread.
+        scheduler.watch(core, 0)
+        assert scheduler.get_state(core, 1.0) == Target.State.RUNNING
+        scheduler.unwatch(core)
+
+    def test_interactive_defers_poll(self, scheduler):
+        log = []
+        core0 = FakeCore(0, log)
+        with scheduler.interactive(1):
+            scheduler.watch(core0, 0)
+            # No poll happens while a request for stopped core 1 is handled.
+            with pytest.raises(exceptions.TimeoutError):
+                scheduler.get_state(core0, 0.03)
+        assert scheduler.get_state(core0, 1.0) == Target.State.RUNNING
+        scheduler.unwatch(core0)
+        metrics = scheduler.get_metrics(1)
+        assert metrics.requests == 1
+        assert metrics.deferred_polls > 0
+        assert metrics.max_request_time >= 0.03
+
+    def test_defer_limit(self, scheduler):
+        log = []
+        core0 = FakeCore(0, log)
+        release = threading.Event()
+        def request():
+            with scheduler.interactive(1):
+                release.wait(5.0)
+        thread = threading.Thread(target=request)
+        thread.start()
+        try:
+            scheduler.watch(core0, 0)
+            # A long request can't starve polling of the running core.
+            assert scheduler.get_state(core0, 1.0) == Target.State.RUNNING
+        finally:
+            release.set()
+            thread.join()
+            scheduler.unwatch(core0)
@@ -0,0 +1,95 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+import sys
+
+from pyocd.__main__ import PyOCDTool
+from pyocd.core.plugin import PluginClassDict
+from pyocd.probe.debug_probe import DebugProbe
+from pyocd.probe.cmsis_dap_probe import CMSISDAPProbe
+from pyocd.rtos import RTOS
+from pyocd.subcommands.base import LazySubcommand
+
+## Modules that must not be imported just to start the pyocd tool.
+HEAVY_MODULES = [
+    'pyocd.gdbserver',
+    'pyocd.target.builtin',
+    'pyocd.probe.aggregator',
+    'pyocd.core.session',
+    'pyocd.subcommands.gdbserver_cmd',
+    'pylink',
+    'cmsis_pack_manager',
+    ]
+
+class TestLazySubcommands:
+    def test_registry_matches_classes(self):
+        for entry in PyOCDTool.SUBCOMMANDS:
+            assert isinstance(entry, LazySubcommand)
+            klass = entry.load()
+            assert klass.NAMES == entry.names
+            assert klass.HELP == entry.help
+
+    def test_selected_subcommand(self):
+        assert PyOCDTool._find_selected_subcommand(['-v', 'list', '-p']) == 'list'
+        assert PyOCDTool._find_selected_subcommand(['--help-options']) is None
+
+    def test_parse_alias(self):
+        tool = PyOCDTool()
+        parser = tool.build_parser(['flash', 'foo.hex'])
+        args = parser.parse_args(['flash', 'foo.hex'])
+        assert args.command_class.NAMES[0] == 'load'
+        assert args.file == ['foo.hex']
+
+    def test_import_time_modules(self):
+        # Run in a new interpreter since this one already has everything imported.
+        code = ("import sys; import pyocd.__main__; "
+                "print(' '.join(m for m in %r if m in sys.modules))" % (HEAVY_MODULES,))
+        output = subprocess.check_output([sys.executable, '-c', code], text=True)
+        assert output.strip() == ""
+
+class TestPluginClassDict:
+    def test_find(self):
+        d = PluginClassDict('pyocd.probe', DebugProbe)
+        assert d.find('CMSISDAP') is CMSISDAPProbe
+        assert d['cmsisdap'] is CMSISDAPProbe
+        assert 'cmsisdap' in d
+        # Only the requested plugin was loaded.
+        assert not d._did_load_all
+
+    def test_missing(self):
+        d = PluginClassDict('pyocd.probe', DebugProbe)
+        assert d.find('nonexistent') is None
+        assert 'nonexistent' not in d
+        assert d._did_load_all
+
+    def test_iterate_loads_all(self):
+        d = PluginClassDict('pyocd.probe', DebugProbe)
+        names = list(d)
+        assert 'cmsisdap' in names
+        assert len(d) == len(names)
+        assert d._did_load_all
+
+    def test_rtos_plugins(self):
+        # Importing the rtos package doesn't import any RTOS plugin modules.
+        modules = ['pyocd.rtos.argon', 'pyocd.rtos.freertos', 'pyocd.rtos.rtx5', 'pyocd.rtos.zephyr']
+        code = ("import sys; import pyocd.rtos; "
+                "print(' '.join(m for m in %r if m in sys.modules))" % (modules,))
+        output = subprocess.check_output([sys.executable, '-c', code], text=True)
+        assert output.strip() == ""
+
+        from pyocd.rtos.freertos import FreeRTOSThreadProvider
+        assert RTOS.find('FreeRTOS') is FreeRTOSThreadProvider
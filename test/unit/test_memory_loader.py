@@ -0,0 +1,191 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import threading
+from unittest import mock
+
+from pyocd.__main__ import PyOCDTool
+from pyocd.core.exceptions import FlashFailure
+from pyocd.core.memory_map import (FlashRegion, MemoryMap, RamRegion)
+from pyocd.flash.builder import ProgrammingInfo
+from pyocd.flash.flash import (PageInfo, SectorInfo)
+from pyocd.flash.loader import StreamingMemoryLoader
+
+SECTOR_SIZE = 0x1000
+BATCH_SIZE = StreamingMemoryLoader.MIN_BATCH_SIZE
+
+class FakeBuilder:
+    """@brief Flash builder that records the data of each batch."""
+
+    def __init__(self, flash):
+        self.flash = flash
+        self.region = flash.region
+        self.chunks = []
+        self.log_performance = True
+
+    @property
+    def buffered_data_size(self):
+        return sum(len(data) for _, data in self.chunks)
+
+    def enable_double_buffer(self, enable):
+        pass
+
+    def add_data(self, addr, data):
+        self.chunks.append((addr, bytes(data)))
+
+    def erase(self, chip_erase=None, **kwargs):
+        assert chip_erase == 'sector'
+
+    def program(self, **kwargs):
+        if self.flash.error is not None:
+            raise self.flash.error
+        self.flash.programmed.append(self.chunks)
+        self.flash.programmed_event.set()
+        return ProgrammingInfo(total_byte_count=self.buffered_data_size)
+
+    def verify(self, method="crc"):
+        pass
+
+class FakeFlash:
+    def __init__(self, region):
+        self.region = region
+        self.programmed = []
+        self.programmed_event = threading.Event()
+        self.error = None
+
+    def get_sector_info(self, addr):
+        return SectorInfo(base_addr=addr & ~(SECTOR_SIZE - 1), erase_weight=0.1, size=SECTOR_SIZE)
+
+    def get_page_info(self, addr):
+        return PageInfo(base_addr=addr & ~0xff, program_weight=0.01, size=0x100)
+
+    def get_flash_builder(self):
+        return FakeBuilder(self)
+
+class MixedSectorFlash(FakeFlash):
+    """@brief Flash with 0x1000 byte sectors up to 0x3000, and 0x2000 byte sectors above."""
+
+    def get_sector_info(self, addr):
+        if addr < 0x3000:
+            return SectorInfo(base_addr=addr & ~0xfff, erase_weight=0.1, size=0x1000)
+        return SectorInfo(base_addr=0x3000 + ((addr - 0x3000) & ~0x1fff), erase_weight=0.1, size=0x2000)
+
+@pytest.fixture
+def flash():
+    region = FlashRegion(start=0, length=0x100000, blocksize=SECTOR_SIZE, page_size=0x100, name='flash')
+    region.flash = FakeFlash(region)
+    return region.flash
+
+def make_loader(flash, **options):
+    memory_map = MemoryMap(flash.region, RamRegion(start=0x20000000, length=0x10000))
+    session = mock.Mock()
+    session.options = {
+        'hide_programming_progress': True,
+        'chip_erase': 'sector',
+        'smart_flash': True,
+        'fast_program': False,
+        'keep_unwritten': False,
+        'load.verify': 'off',
+        }
+    session.options.update(options)
+    session.board.target = mock.Mock(spec=['memory_map', 'debug_sequence_delegate'],
+            memory_map=memory_map, debug_sequence_delegate=None)
+    return StreamingMemoryLoader(session)
+
+def programmed_data(flash):
+    return sorted(chunk for batch in flash.programmed for chunk in batch)
+
+class TestStreamingMemoryLoader:
+    def test_program_while_adding(self, flash):
+        loader = make_loader(flash)
+        data = bytes(range(256)) * ((BATCH_SIZE + 2 * SECTOR_SIZE) // 256)
+        for offset in range(0, len(data), 0x400):
+            loader.add_data(offset, data[offset:offset + 0x400])
+        # Complete sectors are programmed before commit.
+        assert flash.programmed_event.wait(5.0)
+        loader.wait()
+        assert len(flash.programmed) == 1
+        assert sum(len(d) for _, d in flash.programmed[0]) == BATCH_SIZE
+        loader.commit()
+        assert len(flash.programmed) == 2
+        assert b''.join(d for _, d in programmed_data(flash)) == data
+
+    def test_batch_split_at_sector(self, flash):
+        loader = make_loader(flash)
+        loader.add_data(0x100, bytes(BATCH_SIZE + SECTOR_SIZE))
+        loader.wait()
+        # The last sector is incomplete, so it is not programmed yet.
+        assert flash.programmed == [[(0x100, bytes(BATCH_SIZE + SECTOR_SIZE - 0x100))]]
+        loader.commit()
+        assert flash.programmed[1] == [(BATCH_SIZE + SECTOR_SIZE, bytes(0x100))]
+
+    def test_late_data(self, flash):
+        loader = make_loader(flash)
+        loader.add_data(0, bytes(BATCH_SIZE - 0x10))
+        loader.add_data(BATCH_SIZE, bytes(2 * SECTOR_SIZE))
+        loader.wait()
+        assert len(flash.programmed) == 1
+        # Data for a programmed sector rewrites the sector along with its earlier data.
+        loader.add_data(BATCH_SIZE - 0x10, b'\x01' * 0x10)
+        loader.commit()
+        assert flash.programmed[1] == [(0, bytes(BATCH_SIZE - 0x10)), (BATCH_SIZE - 0x10, b'\x01' * 0x10)]
+
+    def test_error(self, flash):
+        loader = make_loader(flash)
+        flash.error = FlashFailure("program failed")
+        loader.add_data(0, bytes(2 * BATCH_SIZE))
+        with pytest.raises(FlashFailure):
+            loader.commit()
+
+    def test_chip_erase_disables_streaming(self, flash):
+        loader = make_loader(flash, chip_erase='chip')
+        loader.add_data(0, bytes(2 * BATCH_SIZE))
+        assert flash.programmed == []
+
+    def test_mixed_sector_sizes(self):
+        region = FlashRegion(start=0, length=0x100000, blocksize=0x1000, page_size=0x100, name='flash')
+        flash = region.flash = MixedSectorFlash(region)
+        loader = make_loader(flash)
+        loader.add_data(0, bytes(0x6000))
+        # The sector at 0x5000 is not complete, although 0x6000 is aligned to the sector size.
+        assert loader._get_complete_end(region) == 0x5000
+
+    def test_abort(self, flash):
+        loader = make_loader(flash)
+        loader.add_data(0, bytes(BATCH_SIZE + SECTOR_SIZE + 0x10))
+        loader.abort()
+        assert loader._executor is None
+        assert not loader._batches and not loader._pending
+        # The loader can be reused after aborting.
+        loader.add_data(0, b'\x01' * 0x10)
+        loader.commit()
+        assert flash.programmed[-1] == [(0, b'\x01' * 0x10)]
+
+class TestVerifyOptions:
+    @pytest.mark.parametrize(("argv", "expected"), [
+        (['load', 'firmware.hex'], None),
+        (['load', '--verify', 'firmware.hex'], 'crc'),
+        (['load', 'firmware.hex', '--verify-read'], 'read'),
+        ])
+    def test_parse(self, argv, expected):
+        args = PyOCDTool().build_parser(argv).parse_args(argv)
+        assert args.verify == expected
+        assert args.file == ['firmware.hex']
+
+    def test_invalid_option(self, flash):
+        with pytest.raises(ValueError):
+            make_loader(flash, **{'load.verify': 'crc32'})
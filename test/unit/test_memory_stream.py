@@ -0,0 +1,140 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import pytest
+
+from pyocd.commands.execution_context import CommandExecutionContext
+from pyocd.core.memory_interface import MemoryInterface
+from pyocd.core.session import Session
+from pyocd.probe.aggregator import PROBE_CLASSES
+from pyocd.probe.pydapaccess.interface.simulator import SimulatedCMSISDAP
+from pyocd.utility.conversion import byte_list_to_u32le_list
+from pyocd.utility.memory_stream import (find_first_difference, read_memory_chunks)
+
+RAM_ADDR = 0x20000000
+DATA = bytes((i * 7) & 0xff for i in range(0x3000))
+
+class FakeMemory(MemoryInterface):
+    """@brief Memory interface that logs when reads are started and completed."""
+
+    def __init__(self, base, data):
+        self.base = base
+        self.data = data
+        self.log = []
+
+    def read_memory_block8(self, addr, size):
+        self.log.append(('read8', addr, size))
+        return list(self.data[addr - self.base:addr - self.base + size])
+
+    def read_memory_block32_deferred(self, addr, size):
+        assert (addr & 3) == 0
+        self.log.append(('start', addr, size * 4))
+        def read_cb():
+            self.log.append(('complete', addr, size * 4))
+            return byte_list_to_u32le_list(self.data[addr - self.base:addr - self.base + size * 4])
+        return read_cb
+
+class TestReadMemoryChunks:
+    def test_pipelined(self):
+        memory = FakeMemory(RAM_ADDR, DATA)
+        chunks = list(read_memory_chunks(memory, RAM_ADDR, 0x3000, chunk_size=0x1000))
+        assert chunks == [(RAM_ADDR + i, DATA[i:i + 0x1000]) for i in (0, 0x1000, 0x2000)]
+        # Each chunk's read is started before the previous chunk is returned.
+        assert memory.log == [
+            ('start', RAM_ADDR, 0x1000),
+            ('start', RAM_ADDR + 0x1000, 0x1000),
+            ('complete', RAM_ADDR, 0x1000),
+            ('start', RAM_ADDR + 0x2000, 0x1000),
+            ('complete', RAM_ADDR + 0x1000, 0x1000),
+            ('complete', RAM_ADDR + 0x2000, 0x1000),
+            ]
+
+    @pytest.mark.parametrize(("offset", "length"), [
+            (1, 0x1800),
+            (3, 2),
+            (0, 0x1001),
+            (2, 0x2ffe),
+            (0, 0),
+        ])
+    def test_unaligned(self, offset, length):
+        memory = FakeMemory(RAM_ADDR, DATA)
+        chunks = list(read_memory_chunks(memory, RAM_ADDR + offset, length, chunk_size=0x1000))
+        assert b"".join(data for _, data in chunks) == DATA[offset:offset + length]
+        addr = RAM_ADDR + offset
+        for chunk_addr, data in chunks:
+            assert chunk_addr == addr
+            addr += len(data)
+
+    def test_close_completes_read(self):
+        memory = FakeMemory(RAM_ADDR, DATA)
+        chunks = read_memory_chunks(memory, RAM_ADDR, 0x3000, chunk_size=0x1000)
+        next(chunks)
+        chunks.close()
+        assert memory.log[-1] == ('complete', RAM_ADDR + 0x1000, 0x1000)
+
+class TestFindFirstDifference:
+    def test_equal(self):
+        assert find_first_difference(DATA, bytes(DATA)) == -1
+
+    @pytest.mark.parametrize("offset", [0, 255, 256, 0x2fff])
+    def test_difference(self, offset):
+        other = bytearray(DATA)
+        other[offset] ^= 0xff
+        assert find_first_difference(DATA, other) == offset
+
+    def test_prefix(self):
+        assert find_first_difference(DATA, DATA[:100]) == 100
+
+@pytest.fixture
+def commander():
+    probe = PROBE_CLASSES['sim'](SimulatedCMSISDAP())
+    with Session(probe, no_config=True, target_override='cortex_m', connect_mode='halt') as session:
+        session.target.write_memory_block8(RAM_ADDR, DATA)
+        output = io.StringIO()
+        context = CommandExecutionContext(output_stream=output)
+        context.attach_session(session)
+        context.output = output
+        yield context
+
+class TestMemoryCommands:
+    def test_savemem(self, commander, tmp_path):
+        path = tmp_path / "mem.bin"
+        commander.process_command_line("savemem 0x%x 0x2ffd '%s'" % (RAM_ADDR + 1, path))
+        assert path.read_bytes() == DATA[1:0x2ffe]
+
+    def test_compare(self, commander, tmp_path):
+        path = tmp_path / "mem.bin"
+        path.write_bytes(DATA)
+        commander.process_command_line("compare 0x%x '%s'" % (RAM_ADDR, path))
+        assert "All 12288 bytes match." in commander.output.getvalue()
+
+        data = bytearray(DATA)
+        data[0x2345] ^= 0xff
+        path.write_bytes(data)
+        commander.process_command_line("compare 0x%x '%s'" % (RAM_ADDR, path))
+        assert "Mismatched byte at 0x%08x (offset 0x2345)" % (RAM_ADDR + 0x2345) in commander.output.getvalue()
+
+    def test_find(self, commander):
+        # The pattern spans the boundary between the first two chunks.
+        commander.session.target.write_memory_block8(RAM_ADDR + 0xbffe, [0xde, 0xad, 0xbe, 0xef])
+        commander.process_command_line("find 0x%x 0x9000 0xde 0xad 0xbe 0xef" % (RAM_ADDR + 0x4000))
+        assert "Found pattern at address 0x%08x" % (RAM_ADDR + 0xbffe) in commander.output.getvalue()
+
+    def test_find_negated(self, commander):
+        commander.session.target.write_memory_block8(RAM_ADDR, [0xa5, 0x5a] * 0x100 + [0xa5, 0x00])
+        commander.process_command_line("find -n 0x%x 0x300 0xa5 0x5a" % RAM_ADDR)
+        assert "Found mismatch with pattern at address 0x%08x" % (RAM_ADDR + 0x201) in commander.output.getvalue()
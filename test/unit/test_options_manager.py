@@ -121,3 +121,22 @@ class TestOptionsManager(object):
         assert flag[0] == False
 
 
+
+    def test_remove_front(self, mgr, layer1, layer2):
+        mgr.add_front(layer1)
+        mgr.add_front(layer2)
+        assert mgr.get('baz') == 33
+        mgr.remove_front()
+        assert mgr.get('baz') == 3
+        assert 'dogcow' not in mgr
+
+    def test_notify_remove_front(self, mgr, layer1, layer2):
+        mgr.add_front(layer1)
+        mgr.add_front(layer2)
+        flag = [False]
+        def cb(note):
+            flag[0] = True
+            assert note.data.new_value == 3 and note.data.old_value == 33
+        mgr.subscribe(cb, 'baz')
+        mgr.remove_front()
+        assert flag[0] == True
@@ -22,6 +22,7 @@ from xml.etree import ElementTree
 from pathlib import Path
 from unittest.mock import MagicMock
 
+from pyocd.flash.resident import ResidentLoop
 from pyocd.target.pack import (cmsis_pack, flash_algo, pack_target)
 from pyocd.target.pack.flm_region_builder import FlmFlashRegionBuilder
 from pyocd.target import TARGET
@@ -236,14 +237,38 @@ class TestFLM:
         assert d['pc_program_page'] == load_addr + 0xc3
 
     def test_algo_dict_two_page_bufs(self, k64algo):
-        # Create the RAM region where we want the algo to be placed.
-        ram = memory_map.RamRegion(0x20000000, length=0x10000)
+        # Create a RAM region with room for two page buffers, but not enough stack for a third.
+        d = k64algo.get_pyocd_flash_algo(k64algo.page_size, memory_map.RamRegion(0x20000000, length=0x10000))
+        ram_size = len(d['instructions']) * 4 + k64algo.page_size * 2 + 0x800
+        ram = memory_map.RamRegion(0x20000000, length=ram_size)
         d = k64algo.get_pyocd_flash_algo(k64algo.page_size, ram)
         instr_base = d['load_address']
         buf_top = align_down(instr_base, flash_algo.PackFlashAlgo._PAGE_BUFFER_ALIGN)
         buf1 = buf_top - k64algo.page_size
         buf2 = buf1 - k64algo.page_size
         assert d['page_buffers'] == [buf1, buf2]
+        assert d['resident_address'] == ram.start
+        assert d['end_stack'] == ram.start + ResidentLoop.SIZE
+        assert not d['analyzer_supported']
+
+    def test_algo_dict_page_buffer_ring(self, k64algo):
+        # With plenty of RAM, the maximum number of buffers is allocated.
+        ram = memory_map.RamRegion(0x20000000, length=0x10000)
+        d = k64algo.get_pyocd_flash_algo(k64algo.page_size, ram, analyzer=True)
+        buf_top = align_down(d['load_address'], flash_algo.PackFlashAlgo._PAGE_BUFFER_ALIGN)
+        assert d['page_buffers'] == [buf_top - k64algo.page_size * n
+                for n in range(1, flash_algo.PackFlashAlgo._MAX_PAGE_BUFFERS + 1)]
+        assert d['begin_stack'] == d['page_buffers'][-1]
+        assert d['analyzer_address'] == ram.start + ResidentLoop.SIZE
+        assert d['end_stack'] == d['analyzer_address'] + flash_algo.PackFlashAlgo._ANALYZER_SIZE
+
+    def test_algo_dict_analyzer_disabled(self, k64algo):
+        # The analyzer is only enabled when requested.
+        ram = memory_map.RamRegion(0x20000000, length=0x10000)
+        d = k64algo.get_pyocd_flash_algo(k64algo.page_size, ram)
+        assert not d['analyzer_supported']
+        assert 'analyzer_address' not in d
+        assert d['end_stack'] == ram.start + ResidentLoop.SIZE
 
     def test_algo_dict_one_page_buf(self, k64algo):
         # First get a full-sized algo allocation.
@@ -356,6 +381,16 @@ class TestFlmRegionBuilder:
         assert not flash.has_subregions
         assert flash.algo
 
+    @pytest.mark.parametrize("enabled", [False, True])
+    def test_pack_analyzer_option(self, nrf5340appflm, enabled):
+        mock_target = MagicMock()
+        mock_target.session.options = {'flash.pack_analyzer': enabled, 'debug.log_flm_info': False}
+        ram = memory_map.RamRegion(0x20000000, length=0x10000, is_default=True)
+        builder = FlmFlashRegionBuilder(mock_target, memory_map.MemoryMap(ram))
+        flash = memory_map.FlashRegion(0, length=0x200000, flm=nrf5340appflm)
+        assert builder.finalise_region(flash)
+        assert flash.algo['analyzer_supported'] == enabled
+
 def has_overlapping_regions(memmap):
     return any((len(memmap.get_intersecting_regions(r.start, r.end)) > 1) for r in memmap.regions)
 
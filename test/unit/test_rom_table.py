@@ -16,16 +16,24 @@
 
 import pytest
 import logging
+import os
+import stat
 from intervaltree import (Interval, IntervalTree)
 
 from .conftest import mock
 
+from pyocd.core import exceptions
 from pyocd.coresight.component import CoreSightCoreComponent
 from pyocd.core import memory_map
 from pyocd.coresight.rom_table import (
     CoreSightComponentID,
     ROMTable,
     )
+from pyocd.coresight.topology_cache import (
+    TargetTopology,
+    TopologyCache,
+    default_cache_path,
+    )
 from pyocd.core.memory_interface import MemoryInterface
 from pyocd.debug.cache import MemoryCache
 from pyocd.debug.context import DebugContext
@@ -378,3 +386,150 @@ class TestRomTable:
         assert ahb.part == 0x9e3
         assert ahb.archid == 0xa17
 
+
+class CountingCoreSight(MockCoreSight):
+    """@brief MockCoreSight that counts block reads."""
+    def __init__(self, components):
+        super().__init__(components)
+        self.read_count = 0
+
+    def read_memory_block32(self, addr, size):
+        self.read_count += 1
+        return super().read_memory_block32(addr, size)
+
+def m4_components():
+    return [
+            MockM4Components.M4_ROM_TABLE,
+            MockM4Components.SCS,
+            MockM4Components.DWT,
+            MockM4Components.FPB,
+            MockM4Components.ITM,
+            MockM4Components.TPIU,
+            MockM4Components.ETM,
+        ]
+
+def create_m4_rom_table(memif):
+    cmpid = CoreSightComponentID(None, memif, MockM4Components.M4_ROM_TABLE_BASE)
+    cmpid.read_id_registers()
+    return ROMTable.create(memif, cmpid)
+
+class TestTopologyCache:
+    def test_snapshot_roundtrip(self, m4_rom):
+        rom_table = create_m4_rom_table(m4_rom)
+        rom_table.init()
+        snapshot = rom_table.snapshot()
+
+        restored = create_m4_rom_table(m4_rom)
+        restored.init_from_snapshot(snapshot)
+        assert [repr(c) for c in restored.components] == [repr(c) for c in rom_table.components]
+        assert [c.factory for c in restored.components] == [c.factory for c in rom_table.components]
+        assert restored.components[4].devid == [0xca1, 0, 0]
+        assert restored.snapshot() == snapshot
+
+    def test_restore_from_cache(self):
+        topology = TargetTopology(TopologyCache(), "dpidr=2ba01477")
+
+        memif = CountingCoreSight(m4_components())
+        rom_table = create_m4_rom_table(memif)
+        topology.init_rom_table(rom_table, "ap#0")
+        full_read_count = memif.read_count
+
+        memif = CountingCoreSight(m4_components())
+        restored = create_m4_rom_table(memif)
+        topology.init_rom_table(restored, "ap#0")
+        assert len(restored.components) == 6
+        assert [repr(c) for c in restored.components] == [repr(c) for c in rom_table.components]
+        # Only the ROM table's ID registers and the spot checks were read.
+        assert memif.read_count == 1 + TargetTopology.SPOT_CHECK_COUNT
+        assert memif.read_count < full_read_count
+
+    def test_mismatch_rereads(self):
+        topology = TargetTopology(TopologyCache(), "dpidr=2ba01477")
+        topology.init_rom_table(create_m4_rom_table(MockCoreSight(m4_components())), "ap#0")
+
+        # Replace the last component (ETM) with a different part number.
+        other_etm = MockCoreSightComponent(MockM4Components.ETM_BASE, cidr=0xb105900d, pidr=0x4000bb9a9,
+                devtype=0x13)
+        memif = CountingCoreSight(m4_components()[:-1] + [other_etm])
+        rom_table = create_m4_rom_table(memif)
+        topology.init_rom_table(rom_table, "ap#0")
+        assert rom_table.components[5].part == 0x9a9
+        assert memif.read_count > 1 + TargetTopology.SPOT_CHECK_COUNT
+
+    def test_file(self, tmp_path):
+        path = str(tmp_path / "topology.json")
+        topology = TargetTopology(TopologyCache(path), "dpidr=2ba01477")
+        topology.init_rom_table(create_m4_rom_table(MockCoreSight(m4_components())), "ap#0")
+
+        # A new cache instance loads the snapshot from the file.
+        topology = TargetTopology(TopologyCache(path), "dpidr=2ba01477")
+        memif = CountingCoreSight(m4_components())
+        rom_table = create_m4_rom_table(memif)
+        topology.init_rom_table(rom_table, "ap#0")
+        assert len(rom_table.components) == 6
+        assert memif.read_count == 1 + TargetTopology.SPOT_CHECK_COUNT
+        # Only the cache file remains; the temporary file was renamed.
+        assert os.listdir(str(tmp_path)) == ["topology.json"]
+
+    def test_file_of_other_user_ignored(self, tmp_path):
+        path = str(tmp_path / "topology.json")
+        TargetTopology(TopologyCache(path), "dpidr=2ba01477").init_rom_table(
+                create_m4_rom_table(MockCoreSight(m4_components())), "ap#0")
+        key = "dpidr=2ba01477:ap#0:rom=e00ff000"
+        assert TopologyCache(path).get(key) is not None
+        with mock.patch('pyocd.coresight.topology_cache.is_owned_by_user', return_value=False):
+            assert TopologyCache(path).get(key) is None
+
+    def test_default_path_private(self, tmp_path):
+        dp = mock.Mock()
+        dp.session.options = {'cache.topology': True, 'cache.topology.path': None}
+        dp.dpidr.version = 1
+        dp.dpidr.idr = 0x2ba01477
+        with mock.patch('tempfile.gettempdir', return_value=str(tmp_path)):
+            path = default_cache_path()
+            topology = TargetTopology.for_dp(dp)
+            assert topology._cache.path == path
+            assert stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode) == 0o700
+
+            # A directory that other users can write is not used.
+            os.chmod(os.path.dirname(path), 0o777)
+            assert TargetTopology.for_dp(dp)._cache.path is None
+
+class DeferredCoreSight(MockCoreSight):
+    """@brief MockCoreSight that tracks how many deferred block reads are queued at once."""
+    def __init__(self, components, fault_address=None):
+        super().__init__(components)
+        self.pending = 0
+        self.max_pending = 0
+        self.fault_address = fault_address
+
+    def read_memory_block32_deferred(self, addr, size):
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        def cb():
+            self.pending -= 1
+            if self.fault_address is not None and (addr & ~0xfff) == self.fault_address:
+                raise exceptions.TransferFaultError()
+            return self.read_memory_block32(addr, size)
+        return cb
+
+class TestBatchedRead:
+    def test_batched(self):
+        memif = DeferredCoreSight(m4_components())
+        rom_table = create_m4_rom_table(memif)
+        rom_table.init()
+        assert len(rom_table.components) == 6
+        assert rom_table.components[4].devid == [0xca1, 0, 0]
+        assert rom_table.components[5].name == 'ETM'
+        # All six components' ID registers were queued together.
+        assert memif.max_pending == 6
+        assert memif.pending == 0
+        assert rom_table.is_complete
+
+    def test_batch_retries_failed(self):
+        # The batched read of the DWT fails, but its individual read succeeds.
+        memif = DeferredCoreSight(m4_components(), fault_address=MockM4Components.DWT_BASE)
+        rom_table = create_m4_rom_table(memif)
+        rom_table.init()
+        assert [c.name for c in rom_table.components] == ['SCS', 'DWT', 'FPB', 'ITM', 'TPIU', 'ETM']
+        assert memif.pending == 0
@@ -0,0 +1,340 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import struct
+import threading
+import time
+from unittest import mock
+
+from pyocd.core import exceptions
+from pyocd.core.memory_map import (FlashRegion, MemoryMap, RamRegion)
+from pyocd.debug.rtt import (GenericRTTControlBlock, GenericRTTUpChannel)
+from pyocd.utility import stdio
+from pyocd.utility.rtt_server import (RTTChanStdioWorker, RTTChannelBuffer, RTTOverflowPolicy,
+        RTTPoller, RTTServer)
+
+DESC_ADDR = 0x1000
+BUFFER_ADDR = 0x2000
+BUFFER_SIZE = 16
+
+class RTTMemoryTarget:
+    """@brief Fake target with a single RTT up buffer descriptor."""
+    def __init__(self):
+        self.memory = bytearray(0x3000)
+        self.set_words(DESC_ADDR, [0, BUFFER_ADDR, BUFFER_SIZE, 0, 0, 0])
+
+    def set_words(self, addr, values):
+        for i, value in enumerate(values):
+            self.memory[addr + i * 4:addr + i * 4 + 4] = value.to_bytes(4, 'little')
+
+    def read_memory_block32(self, addr, size):
+        return [int.from_bytes(self.memory[addr + i * 4:addr + i * 4 + 4], 'little') for i in range(size)]
+
+    def read_memory_block8(self, addr, size):
+        return list(self.memory[addr:addr + size])
+
+    def write32(self, addr, value):
+        self.set_words(addr, [value])
+
+    def fill(self, read_off, write_off):
+        """@brief Set the offsets and fill the buffer with its own offsets."""
+        self.memory[BUFFER_ADDR:BUFFER_ADDR + BUFFER_SIZE] = bytes(range(BUFFER_SIZE))
+        self.set_words(DESC_ADDR + 12, [write_off, read_off])
+
+    @property
+    def read_off(self):
+        return self.read_memory_block32(DESC_ADDR + 16, 1)[0]
+
+class TestUpChannelRead:
+    @pytest.mark.parametrize(("read_off", "write_off", "max_size", "expected"), [
+        (2, 10, None, range(2, 10)),
+        (2, 10, 3, range(2, 5)),
+        (12, 4, None, list(range(12, 16)) + list(range(0, 4))),
+        (12, 4, 3, range(12, 15)),
+        (12, 4, 4, range(12, 16)),
+        (12, 4, 6, list(range(12, 16)) + list(range(0, 2))),
+        (12, 4, 0, []),
+        ])
+    def test_read(self, read_off, write_off, max_size, expected):
+        target = RTTMemoryTarget()
+        channel = GenericRTTUpChannel(target, DESC_ADDR)
+        target.fill(read_off, write_off)
+        data = channel.read(max_size)
+        assert data == bytes(expected)
+        assert target.read_off == (read_off + len(data)) % BUFFER_SIZE
+
+class TestChannelBuffer:
+    def test_wrap(self):
+        buffer = RTTChannelBuffer(8)
+        assert buffer.put(b'abcdef') == 6
+        assert buffer.drain(lambda data: 4) == 4
+        assert buffer.put(b'ghijk') == 5
+        assert len(buffer) == 7
+        chunks = []
+        buffer.drain(lambda data: chunks.append(bytes(data)) or len(data))
+        # Buffered data wraps around the end of the storage, so it's passed to the sink in two pieces.
+        assert chunks == [b'efgh', b'ijk']
+        assert buffer.stats.bytes_in == 11
+        assert buffer.stats.bytes_out == 11
+
+    def test_sink_stalled(self):
+        buffer = RTTChannelBuffer(8)
+        buffer.put(b'abcdef')
+        assert buffer.drain(lambda data: 0) == 0
+        assert buffer.free == 2
+
+    @pytest.mark.parametrize(("policy", "expected"), [
+        (RTTOverflowPolicy.BLOCK, b'abcdefgh'),
+        (RTTOverflowPolicy.DROP_NEWEST, b'abcdefgh'),
+        (RTTOverflowPolicy.DROP_OLDEST, b'efghijkl'),
+        ])
+    def test_overflow(self, policy, expected):
+        buffer = RTTChannelBuffer(8, policy)
+        buffer.put(b'abcdef')
+        buffer.put(b'ghijkl')
+        chunks = []
+        buffer.drain(lambda data: chunks.append(bytes(data)) or len(data))
+        assert b''.join(chunks) == expected
+        assert buffer.stats.bytes_dropped == 4
+
+    def test_drop_oldest_larger_than_capacity(self):
+        buffer = RTTChannelBuffer(4, RTTOverflowPolicy.DROP_OLDEST)
+        buffer.put(b'ab')
+        buffer.put(b'cdefgh')
+        chunks = []
+        buffer.drain(lambda data: chunks.append(bytes(data)) or len(data))
+        assert b''.join(chunks) == b'efgh'
+        assert buffer.stats.bytes_dropped == 4
+
+class FakeStdioBackend:
+    def __init__(self, session, core=0):
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+        return len(data)
+
+class TestStdioWorker:
+    def test_drain_to_stdio(self):
+        session = mock.Mock()
+        session.options.is_set.return_value = False
+        session.options.get.return_value = "console"
+        with mock.patch.dict(stdio._BACKEND_CLASSES, {"console": FakeStdioBackend}):
+            handler = stdio.StdioHandler(session, eot_enabled=True)
+        channel = mock.Mock()
+        channel.read.return_value = b'hello\x04world'
+        control_block = mock.Mock(up_channels=[channel], down_channels=[])
+        with mock.patch('pyocd.utility.rtt_server.RTTControlBlock.from_target', return_value=control_block):
+            server = RTTServer(mock.Mock(), 0, 0, b'SEGGER RTT', buffer_size=4096,
+                    overflow_policy=RTTOverflowPolicy.DROP_NEWEST)
+        server.up_buffers = [RTTChannelBuffer(64, RTTOverflowPolicy.DROP_NEWEST)]
+
+        server._channel_handler(0, RTTChanStdioWorker(0, handler))
+        assert handler._backend.written == [b'hello']
+        assert handler.eot_seen
+        assert server.up_buffers[0].stats.bytes_out == 5
+
+class TestServerOptions:
+    def make_server(self, **options):
+        target = mock.Mock()
+        target.session.options = {'rtt.buffer_size': 65536, 'rtt.overflow': 'block', **options}
+        with mock.patch('pyocd.utility.rtt_server.RTTControlBlock.from_target'):
+            return RTTServer(target, 0, 0, b'SEGGER RTT')
+
+    def test_defaults(self):
+        server = self.make_server()
+        assert server._overflow_policy == RTTOverflowPolicy.BLOCK
+
+    def test_small_buffer(self):
+        with pytest.raises(exceptions.RTTError, match="at least 4096"):
+            self.make_server(**{'rtt.buffer_size': 1024})
+
+    def test_invalid_overflow(self):
+        with pytest.raises(exceptions.RTTError, match="'block', 'drop-oldest', 'drop-newest'"):
+            self.make_server(**{'rtt.overflow': 'drop'})
+
+class FakeServer:
+    def __init__(self, counts):
+        self.counts = list(counts)
+
+    def poll(self):
+        return self.counts.pop(0) if self.counts else 0
+
+class TestPoller:
+    def test_adaptive_interval(self):
+        poller = RTTPoller(FakeServer([0, 0, 0, 10, 0]), None, 0.001, 0.005)
+        intervals = []
+        for _ in range(6):
+            poller.poll_once()
+            intervals.append(poller.interval)
+        assert intervals == [0.002, 0.004, 0.005, 0.001, 0.002, 0.004]
+        assert poller.total_bytes == 10
+
+    def test_thread(self):
+        lock = threading.RLock()
+        server = FakeServer([100] * 5)
+        poller = RTTPoller(server, lock, 0.001, 0.002)
+        poller.start()
+        # The poller can be stopped while another thread holds the shared lock.
+        with lock:
+            time.sleep(0.01)
+            poller.stop()
+        assert not poller.is_alive()
+
+    def test_pause(self):
+        server = FakeServer([])
+        poller = RTTPoller(server, None, 0.001, 0.001)
+        poller.pause()
+        poller.start()
+        try:
+            time.sleep(0.02)
+            assert poller.is_paused
+            with mock.patch.object(server, 'poll', wraps=server.poll) as poll:
+                time.sleep(0.02)
+                assert not poll.called
+                poller.resume()
+                time.sleep(0.02)
+                assert poll.called
+        finally:
+            poller.stop()
+
+RAM_START = 0x20000000
+RAM_SIZE = 0x40000
+
+class RTTSearchTarget:
+    """@brief Fake target with flash and RAM that counts block reads."""
+    def __init__(self, cb_addr):
+        self.memory_map = MemoryMap(
+            FlashRegion(start=0, length=0x1000, blocksize=0x400, is_boot_memory=True),
+            RamRegion(start=RAM_START, length=RAM_SIZE),
+            )
+        self.flash = bytearray(0x1000)
+        self.ram = bytearray(RAM_SIZE)
+        self.ram[cb_addr - RAM_START:cb_addr - RAM_START + 10] = b'SEGGER RTT'
+        self.session = mock.Mock()
+        self.session.target.part_number = 'test'
+        self.node_name = 'core'
+        self.elf = None
+        self.block_reads = 0
+        self.pending_reads = 0
+        self.flash_reads = 0
+
+    def get_memory_map(self):
+        return self.memory_map
+
+    def _get(self, addr, size):
+        if addr < RAM_START:
+            self.flash_reads += 1
+            return self.flash[addr:addr + size]
+        return self.ram[addr - RAM_START:addr - RAM_START + size]
+
+    def read_memory_block8(self, addr, size):
+        return list(self._get(addr, size))
+
+    def read_memory_block32_deferred(self, addr, size):
+        self.block_reads += 1
+        self.pending_reads += 1
+        data = bytes(self._get(addr, size * 4))
+        def read_cb():
+            self.pending_reads -= 1
+            return [int.from_bytes(data[i:i + 4], 'little') for i in range(0, len(data), 4)]
+        return read_cb
+
+@pytest.fixture
+def clear_address_cache():
+    GenericRTTControlBlock._address_cache.clear()
+    yield
+    GenericRTTControlBlock._address_cache.clear()
+
+@pytest.mark.usefixtures("clear_address_cache")
+class TestControlBlockSearch:
+    @pytest.mark.parametrize("cb_addr", [
+        RAM_START,
+        RAM_START + 0x3ffc,     # spans two blocks
+        RAM_START + 0x12346,    # unaligned
+        RAM_START + RAM_SIZE - 0x100,
+        ])
+    def test_search(self, cb_addr):
+        target = RTTSearchTarget(cb_addr)
+        cb = GenericRTTControlBlock(target)
+        assert cb._find_control_block() == cb_addr
+        assert target.pending_reads == 0
+
+    def test_not_found(self):
+        target = RTTSearchTarget(RAM_START + 0x100)
+        cb = GenericRTTControlBlock(target, address=RAM_START + 0x200, size=0x1000)
+        assert cb._find_control_block() is None
+        assert target.pending_reads == 0
+
+    def test_cache(self):
+        cb_addr = RAM_START + RAM_SIZE - 0x100
+        target = RTTSearchTarget(cb_addr)
+        assert GenericRTTControlBlock(target)._find_control_block() == cb_addr
+        reads = target.block_reads
+        assert reads == RAM_SIZE // GenericRTTControlBlock._SEARCH_CHUNK_SIZE
+
+        # The cached address is checked without scanning.
+        assert GenericRTTControlBlock(target)._find_control_block() == cb_addr
+        assert target.block_reads == reads
+
+        # Different firmware is scanned again.
+        target.flash[0] = 1
+        assert GenericRTTControlBlock(target)._find_control_block() == cb_addr
+        assert target.block_reads == reads * 2
+
+    def test_elf_symbol(self):
+        cb_addr = RAM_START + 0x8000
+        target = RTTSearchTarget(cb_addr)
+        target.elf = mock.Mock()
+        target.elf.symbol_decoder.get_symbol_for_name.return_value = mock.Mock(address=cb_addr)
+        assert GenericRTTControlBlock(target)._find_control_block() == cb_addr
+        assert target.block_reads == 0
+        # Boot memory isn't read to identify the firmware.
+        assert target.flash_reads == 0
+
+    def test_elf_cache_key(self):
+        cb_addr = RAM_START + RAM_SIZE - 0x100
+        target = RTTSearchTarget(cb_addr)
+        target.elf = mock.Mock(crc=1)
+        target.elf.symbol_decoder.get_symbol_for_name.return_value = None
+        assert GenericRTTControlBlock(target)._find_control_block() == cb_addr
+        reads = target.block_reads
+
+        # The cache is keyed on the ELF file, so boot memory isn't read.
+        assert GenericRTTControlBlock(target)._find_control_block() == cb_addr
+        assert target.block_reads == reads
+        assert target.flash_reads == 0
+
+        # A different ELF file is scanned again.
+        target.elf.crc = 2
+        assert GenericRTTControlBlock(target)._find_control_block() == cb_addr
+        assert target.block_reads == reads * 2
+
+    def test_cache_checks_buffers(self):
+        old_addr = RAM_START + RAM_SIZE - 0x100
+        target = RTTSearchTarget(old_addr)
+        assert GenericRTTControlBlock(target)._find_control_block() == old_addr
+        reads = target.block_reads
+
+        # New firmware with the same boot memory leaves a stale ID at the cached address, whose
+        # buffer pointer is outside RAM, and has its control block at a different address.
+        new_addr = RAM_START + 0x100
+        target.ram[new_addr - RAM_START:new_addr - RAM_START + 10] = b'SEGGER RTT'
+        target.ram[old_addr - RAM_START + 16:old_addr - RAM_START + 24] = struct.pack("<ii", 1, 0)
+        target.ram[old_addr - RAM_START + 28:old_addr - RAM_START + 36] = struct.pack("<II", 0x10000000, 0x400)
+        assert GenericRTTControlBlock(target)._find_control_block() == new_addr
+        assert target.block_reads > reads
@@ -0,0 +1,138 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import stat
+import subprocess
+import sys
+import time
+import pytest
+from unittest import mock
+
+from pyocd import __version__
+from pyocd.__main__ import PyOCDTool
+from pyocd.core.helpers import ConnectHelper
+from pyocd.core.session_pool import SessionPool
+from pyocd.probe.aggregator import PROBE_CLASSES
+from pyocd.probe.pydapaccess.interface.simulator import SimulatedCMSISDAP
+from pyocd.utility import daemon
+from pyocd.utility.user_files import make_private_dir
+
+CONNECT_ARGS = dict(no_config=True, target_override='cortex_m', connect_mode='halt')
+
+@pytest.fixture
+def pool():
+    def choose_probe(**kwargs):
+        return PROBE_CLASSES['sim'](SimulatedCMSISDAP())
+    pool = SessionPool()
+    pool.activate()
+    with mock.patch.object(ConnectHelper, 'choose_probe', side_effect=choose_probe):
+        yield pool
+    pool.deactivate()
+
+class TestSessionPool:
+    def test_reuse(self, pool):
+        with ConnectHelper.session_with_chosen_probe(**CONNECT_ARGS) as first:
+            session = first.session
+            assert session.is_open
+        # The session stays open when returned to the pool.
+        assert session.is_open
+        with ConnectHelper.session_with_chosen_probe(**CONNECT_ARGS) as second:
+            assert second.session is session
+        assert ConnectHelper.choose_probe.call_count == 1
+
+    def test_connection_options_evict(self, pool):
+        with ConnectHelper.session_with_chosen_probe(frequency=1000000, **CONNECT_ARGS) as first:
+            session = first.session
+        # Another session for the same probe replaces the first one.
+        with ConnectHelper.session_with_chosen_probe(frequency=4000000, **CONNECT_ARGS) as second:
+            assert second.session is not session
+        assert not session.is_open
+
+    def test_stale_session_replaced(self, pool):
+        with ConnectHelper.session_with_chosen_probe(**CONNECT_ARGS) as first:
+            session = first.session
+        # A session whose target can't be accessed is replaced.
+        with mock.patch.object(SessionPool, '_is_alive', return_value=False):
+            with ConnectHelper.session_with_chosen_probe(**CONNECT_ARGS) as second:
+                assert second.session is not session
+        assert not session.is_open
+
+    def test_command_options(self, pool):
+        with ConnectHelper.session_with_chosen_probe(option_defaults={'debug.traceback': True},
+                resume_on_disconnect=False, **CONNECT_ARGS) as first:
+            assert first.options.get('debug.traceback') is True
+            assert first.options.get('resume_on_disconnect') is False
+        # Options and option defaults of each command are applied to a reused session.
+        with ConnectHelper.session_with_chosen_probe(option_defaults={'debug.traceback': False},
+                **CONNECT_ARGS) as second:
+            assert second.options.get('debug.traceback') is False
+            assert second.options.get('resume_on_disconnect') is True
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "daemon.sock")
+
+@pytest.fixture
+def running_daemon(socket_path):
+    # The daemon redirects stdout and stderr while it runs a command, so it must run in another
+    # process than the client.
+    process = subprocess.Popen([sys.executable, '-m', 'pyocd', 'daemon', '--socket', socket_path])
+    try:
+        # Wait for the daemon to listen.
+        for _ in range(200):
+            if daemon.forward_shutdown(socket_path, check_only=True):
+                break
+            time.sleep(0.05)
+        yield process
+    finally:
+        daemon.forward_shutdown(socket_path)
+        try:
+            process.wait(10.0)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+@pytest.mark.skipif(not daemon.is_daemon_supported(), reason="requires Unix domain sockets")
+class TestDaemon:
+    def test_forward_command(self, running_daemon, socket_path, capsys):
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+        assert daemon.forward_command(socket_path, ['--version']) == 0
+        # Output of the command is written to this process's stdout.
+        assert capsys.readouterr().out.strip() == __version__
+        assert daemon.forward_shutdown(socket_path)
+        assert running_daemon.wait(10.0) == 0
+        assert not os.path.exists(socket_path)
+
+    def test_no_daemon(self, socket_path):
+        assert daemon.forward_command(socket_path, ['--version']) is None
+        assert not daemon.forward_shutdown(socket_path)
+
+    def test_fallback(self, socket_path):
+        # The command runs in this process if no daemon is listening.
+        with mock.patch.dict(os.environ, {daemon.SOCKET_ENV_VAR: socket_path}), \
+                mock.patch.object(daemon, 'forward_command', wraps=daemon.forward_command) as forward:
+            assert PyOCDTool().run(['list', '--targets']) == 0
+        assert forward.call_count == 1
+
+    def test_private_dir(self, tmp_path):
+        path = str(tmp_path / "private")
+        make_private_dir(path)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o700
+        make_private_dir(path)
+        os.chmod(path, 0o755)
+        with pytest.raises(RuntimeError):
+            make_private_dir(path)
@@ -0,0 +1,287 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import time
+from unittest import mock
+
+from pyocd.core import exceptions
+from pyocd.core.session import Session
+from pyocd.coresight.cortex_m import CortexM
+from pyocd.debug.cache import CachingDebugContext
+from pyocd.probe.aggregator import PROBE_CLASSES
+from pyocd.probe.debug_probe import DebugProbe
+from pyocd.probe.pydapaccess import DAPAccess
+from pyocd.probe.pydapaccess.cmsis_dap_core import Command
+from pyocd.probe.pydapaccess.interface.simulator import SimulatedCMSISDAP
+
+# Look up the probe class through its plugin so the simulator options are registered.
+SimulatedCMSISDAPProbe = PROBE_CLASSES['sim']
+
+CSW_WORD = 0x23000052
+
+@pytest.fixture
+def probe():
+    probe = SimulatedCMSISDAPProbe(SimulatedCMSISDAP())
+    probe.session = Session(None)
+    probe.open()
+    probe.connect()
+    probe.write_dp(0x4, 0x50000000)
+    yield probe
+    probe.close()
+
+class TestSimulatedProbe:
+    def test_identify(self):
+        link = DAPAccess(None, interface=SimulatedCMSISDAP("abc", packet_size=512, packet_count=8))
+        link.open()
+        assert link.get_unique_id() == "abc"
+        assert link.protocol_version == (2, 1, 0)
+        assert link.identify(DAPAccess.ID.MAX_PACKET_SIZE) == 512
+        assert link.identify(DAPAccess.ID.MAX_PACKET_COUNT) == 8
+        link.close()
+
+    def test_dp(self, probe):
+        assert probe.read_dp(0x0) == SimulatedCMSISDAP.DPIDR
+        assert probe.read_dp(0x4) & 0xf0000000 == 0xf0000000
+        probe.write_dp(0x8, 0xf0)
+        assert probe.read_ap(0xfc) == SimulatedCMSISDAP.AP_IDR
+
+    def test_memory(self, probe):
+        ram = probe.interface.ram
+        probe.write_ap(0x00, CSW_WORD)
+        probe.write_ap(0x04, ram.start + 0xff8)
+        probe.write_ap_multiple(0x0c, [1, 2, 3, 4])
+        probe.flush()
+        # TAR wraps within a 4 kB block.
+        assert probe.interface.read_memory(ram.start + 0xff8, 8) == bytes([1, 0, 0, 0, 2, 0, 0, 0])
+        assert probe.interface.read_memory(ram.start, 8) == bytes([3, 0, 0, 0, 4, 0, 0, 0])
+        probe.write_ap(0x04, ram.start)
+        assert probe.read_ap_multiple(0x0c, 2) == [3, 4]
+
+    @pytest.mark.parametrize("addr", [0x10000000, 0x0])
+    def test_fault(self, probe, addr):
+        probe.write_ap(0x00, CSW_WORD)
+        probe.write_ap(0x04, addr)
+        with pytest.raises(exceptions.TransferFaultError):
+            probe.write_ap(0x0c, 0)
+            probe.flush()
+        assert probe.read_dp(0x4) & 0x20
+        # Further AP accesses fault until STICKYERR is cleared.
+        with pytest.raises(exceptions.TransferFaultError):
+            probe.read_ap(0x00)
+        probe.write_dp(0x0, 0x4)
+        assert probe.read_ap(0x00) == CSW_WORD
+
+    def test_value_match(self):
+        sim = SimulatedCMSISDAP()
+        sim.open()
+        # Match DPIDR under a mask, then fail to match it exactly.
+        sim.write([Command.DAP_TRANSFER, 0, 3,
+                0x20, 0x00, 0x00, 0x00, 0xff,
+                0x12, 0x00, 0x00, 0x00, 0x2b,
+                0x12, 0x00, 0x00, 0x00, 0x00])
+        assert sim.read() == bytes([Command.DAP_TRANSFER, 2, 0x11])
+
+    def test_latency_overlaps(self):
+        sim = SimulatedCMSISDAP(latency=0.05, packet_count=4)
+        sim.open()
+        start = time.perf_counter()
+        for _ in range(4):
+            sim.write([Command.DAP_DELAY, 0, 0])
+        for _ in range(4):
+            assert sim.read() == bytes([Command.DAP_DELAY, 0])
+        assert 0.05 <= time.perf_counter() - start < 0.15
+
+    def test_queue_commands(self):
+        sim = SimulatedCMSISDAP()
+        sim.open()
+        sim.write([Command.DAP_QUEUE_COMMANDS, 2, Command.DAP_DELAY, 0, 0, Command.DAP_INFO, 0xfe])
+        sim.write([Command.DAP_DELAY, 0, 0])
+        assert sim.read() == bytes([Command.DAP_EXECUTE_COMMANDS, 2, Command.DAP_DELAY, 0, Command.DAP_INFO, 1, 4])
+        assert sim.read() == bytes([Command.DAP_DELAY, 0])
+
+class TestSimulatedTarget:
+    def test_session(self):
+        sim = SimulatedCMSISDAP()
+        sim.write_memory(0, bytes([0x00, 0x10, 0x00, 0x20, 0x41, 0x01, 0x00, 0x00]))
+        probe = SimulatedCMSISDAPProbe(sim)
+        with Session(probe, target_override='cortex_m', connect_mode='halt') as session:
+            target = session.target
+            target.write_memory_block32(0x20000100, list(range(300)))
+            assert target.read_memory_block32(0x20000100, 300) == list(range(300))
+            target.reset_and_halt()
+            assert target.read_core_register('sp') == 0x20001000
+            assert target.read_core_register('pc') == 0x140
+            target.write_core_register('r3', 0x1234)
+            assert sim.core.core_registers[3] == 0x1234
+            target.step()
+            assert target.read_core_register('pc') == 0x142
+
+    def test_deferred_state(self):
+        sim = SimulatedCMSISDAP()
+        probe = SimulatedCMSISDAPProbe(sim)
+        with Session(probe, target_override='cortex_m', connect_mode='halt') as session:
+            core = session.target.selected_core
+            state_cb = core.get_state_deferred()
+            assert state_cb() == CortexM.State.HALTED
+            core.resume()
+            assert core.get_state_deferred()() == CortexM.State.RUNNING
+
+class TestPollUntil:
+    def test_probe_poll(self, probe):
+        sim = probe.interface
+        sim.write_memory(sim.ram.start, bytes([0x34, 0x12, 0, 0]))
+        probe.write_ap(0x00, CSW_WORD & ~0x30)
+        probe.write_ap(0x04, sim.ram.start)
+        probe.flush()
+        count = sim.command_count
+        assert probe.poll_ap(0x0c, 0xff00, 0x1200, 10)
+        assert not probe.poll_ap(0x0c, 0xffff, 0x1200, 10)
+        # One match retry configuration plus one transfer per poll.
+        assert sim.command_count - count == 3
+
+    def test_fault(self, probe):
+        probe.write_ap(0x00, CSW_WORD & ~0x30)
+        probe.write_ap(0x04, 0x10000000)
+        with pytest.raises(exceptions.TransferFaultError):
+            probe.poll_ap(0x0c, 1, 1, 10)
+
+    def test_host_fallback(self):
+        probe = mock.Mock(spec=DebugProbe)
+        probe.read_ap.side_effect = [0, 0, 1]
+        assert not DebugProbe.poll_ap(probe, 0x0c, 1, 1, 1)
+        probe.read_ap.side_effect = [0, 0, 1]
+        assert DebugProbe.poll_ap(probe, 0x0c, 1, 1, 2)
+
+    def test_target(self):
+        sim = SimulatedCMSISDAP()
+        probe = SimulatedCMSISDAPProbe(sim)
+        with Session(probe, target_override='cortex_m', connect_mode='halt') as session:
+            target = session.target
+            target.write_memory_block32(0x20000100, [1, 2, 3])
+            assert target.poll_until(0x20000104, 0xff, 2, 4)
+            assert not target.poll_until(0x20000104, 0xff, 3, 4)
+            assert target.poll_until(CortexM.DHCSR, CortexM.S_HALT, CortexM.S_HALT, 4)
+            # Address increment is restored for later block transfers.
+            assert target.read_memory_block32(0x20000100, 3) == [1, 2, 3]
+            assert target.selected_core.dhcsr_poll_retries == CortexM.DHCSR_POLL_RETRIES
+
+class TestPostedCommands:
+    def test_packed_with_transfer(self, probe):
+        sim = probe.interface
+        probe.flush()
+        count = sim.command_count
+        probe.set_clock(4000000)
+        probe._link.swj_sequence(8, 0xff)
+        assert probe.read_dp(0x0) == SimulatedCMSISDAP.DPIDR
+        # Both posted commands and the transfer go in a single DAP_ExecuteCommands.
+        assert sim.command_count - count == 1
+
+    def test_reset(self, probe):
+        sim = probe.interface
+        probe.flush()
+        count = sim.command_count
+        probe._link.reset(0.01)
+        assert sim.command_count - count == 1
+
+    def test_failure(self, probe):
+        sim = probe.interface
+        sim._handlers[Command.DAP_SWJ_CLOCK] = lambda req: (bytes([req[0], 0xff]), 5)
+        probe.set_clock(4000000)
+        with pytest.raises(exceptions.ProbeError):
+            probe.flush()
+        assert probe.read_dp(0x0) == SimulatedCMSISDAP.DPIDR
+
+class TestStopPrefetch:
+    def test_prefetch(self):
+        sim = SimulatedCMSISDAP()
+        sim.write_memory(0, bytes([0x00, 0x10, 0x00, 0x20, 0x41, 0x01, 0x00, 0x00]))
+        probe = SimulatedCMSISDAPProbe(sim)
+        with Session(probe, target_override='cortex_m', connect_mode='halt') as session:
+            target = session.target
+            target.write_memory_block32(0x20000f00, list(range(64)))
+            target.reset_and_halt()
+            context = CachingDebugContext(target.selected_core)
+            assert context.set_halted()
+            context.prefetch_memory([(0x20000f00, 0x100)])
+            target.flush()
+            count = sim.command_count
+            # Halted state and memory both come from the cache.
+            assert context.read_memory_block32(0x20000f40, 16) == list(range(16, 32))
+            assert context.read32(0x20000ff8) == 62
+            assert sim.command_count == count
+            # Running the core invalidates the cache.
+            target.step()
+            count = sim.command_count
+            assert context.read32(0x20000f00) == 0
+            assert sim.command_count > count
+
+    def test_prefetch_requires_halted(self):
+        sim = SimulatedCMSISDAP()
+        probe = SimulatedCMSISDAPProbe(sim)
+        with Session(probe, target_override='cortex_m', connect_mode='halt') as session:
+            target = session.target
+            context = CachingDebugContext(target.selected_core)
+            target.flush()
+            count = sim.command_count
+            context.prefetch_memory([(0x20000000, 0x100)])
+            assert sim.command_count == count
+
+@pytest.fixture
+def other_thread():
+    """@brief Runs functions in one other thread, returning their result or raising their exception."""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        yield lambda fn: executor.submit(fn).result()
+
+class TestThreadedTransfers:
+    def test_flush_is_per_thread(self, probe, other_thread):
+        sim = probe.interface
+        probe.flush()
+        count = sim.command_count
+        # Another thread queues writes without flushing them.
+        other_thread(lambda: probe.write_ap(0x00, CSW_WORD))
+        # A flush from a thread with nothing queued doesn't send the other thread's transfers.
+        probe.flush()
+        assert sim.command_count == count
+        other_thread(probe.flush)
+        assert sim.command_count == count + 1
+
+    def test_shared_packet(self, probe, other_thread):
+        sim = probe.interface
+        probe.flush()
+        count = sim.command_count
+        other_thread(lambda: probe.write_ap(0x00, CSW_WORD))
+        # Transfers from both threads go in the same packet, in the order they were queued.
+        assert probe.read_ap(0x00) == CSW_WORD
+        assert sim.command_count == count + 1
+        other_thread(probe.flush)
+        assert sim.command_count == count + 1
+
+    def test_error_reported_to_each_thread(self, probe, other_thread):
+        def queue_fault():
+            probe.write_ap(0x00, CSW_WORD)
+            probe.write_ap(0x04, 0x10000000)
+            probe.write_ap(0x0c, 0)
+        other_thread(queue_fault)
+        with pytest.raises(exceptions.TransferFaultError):
+            probe.read_dp(0x0)
+        # The thread whose write faulted gets the error from its next flush, once.
+        with pytest.raises(exceptions.TransferFaultError):
+            other_thread(probe.flush)
+        other_thread(probe.flush)
+        probe.write_dp(0x0, 0x4)
+        assert probe.read_dp(0x0) == SimulatedCMSISDAP.DPIDR
@@ -0,0 +1,161 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import io
+import json
+import pytest
+import threading
+from unittest import mock
+
+from pyocd.__main__ import PyOCDTool
+from pyocd.core import exceptions
+from pyocd.trace.capture import SWOCaptureFile
+from pyocd.trace.swo import SWOParser
+from pyocd.trace.swv import SWVReader
+from pyocd.trace.writer import TraceEventWriter
+
+# ITM port 0 byte 'A', ITM port 1 32-bit word, exception 16 entered, local timestamp of 5.
+SWO_DATA = bytes([0x01, 0x41, 0x0b, 0x01, 0x02, 0x03, 0x04, 0x0e, 0x10, 0x10, 0x50])
+
+@pytest.fixture
+def capture_path(tmp_path):
+    return str(tmp_path / "trace.swo")
+
+def decode(data, format):
+    output = io.StringIO()
+    parser = SWOParser(None, TraceEventWriter(output, format))
+    parser.parse(data)
+    parser.flush()
+    return output.getvalue()
+
+class TestSWOCaptureFile:
+    def test_write_read(self, capture_path):
+        with SWOCaptureFile.create(capture_path, 16, swo_clock=2000000) as capture:
+            capture.write(b"0123456789")
+            assert capture.read(0) == (b"0123456789", 10, 0)
+            assert capture.read(4, max_size=3) == (b"456", 7, 0)
+            assert capture.read(10) == (b"", 10, 0)
+        with SWOCaptureFile.open(capture_path) as capture:
+            assert capture.capacity == 16
+            assert capture.swo_clock == 2000000
+            assert capture.total_written == 10
+
+    def test_wrap(self, capture_path):
+        with SWOCaptureFile.create(capture_path, 16) as capture:
+            capture.write(b"0123456789")
+            capture.write(b"abcdefghij")
+            assert capture.oldest_position == 4
+            # Reading from the start reports the overwritten data as lost.
+            assert capture.read(0) == (b"456789abcdefghij", 20, 4)
+            assert capture.read(12) == (b"cdefghij", 20, 0)
+
+    def test_oversized_write(self, capture_path):
+        with SWOCaptureFile.create(capture_path, 16) as capture:
+            capture.write(b"x" * 4)
+            capture.write(bytes(range(40)))
+            assert capture.total_written == 44
+            assert capture.read(capture.oldest_position) == (bytes(range(24, 40)), 44, 0)
+
+    def test_not_capture(self, capture_path):
+        with open(capture_path, 'wb') as f:
+            f.write(SWO_DATA)
+        assert not SWOCaptureFile.is_capture_file(capture_path)
+        with pytest.raises(exceptions.Error):
+            SWOCaptureFile.open(capture_path)
+
+class TestTraceEventWriter:
+    def test_text(self):
+        lines = decode(SWO_DATA, 'text').splitlines()
+        assert lines == [
+            "[5] ITM: port=0 data=0x41",
+            "[5] ITM: port=1 data=0x04030201",
+            "[5] DWT: Exception #16 Entered ",
+            ]
+
+    def test_json(self):
+        events = [json.loads(line) for line in decode(SWO_DATA, 'json').splitlines()]
+        assert events[0] == {'timestamp': 5, 'type': 'itm', 'port': 0, 'data': 0x41, 'width': 1}
+        assert events[2] == {'timestamp': 5, 'type': 'exception', 'exception': 16, 'action': 'entered'}
+
+    def test_csv(self):
+        rows = list(csv.DictReader(io.StringIO(decode(SWO_DATA, 'csv'))))
+        assert len(rows) == 3
+        assert rows[1]['type'] == 'itm'
+        assert rows[1]['data'] == str(0x04030201)
+        assert rows[1]['exception'] == ''
+
+    def test_flush(self):
+        # Without a following timestamp, events are only output by flush().
+        output = io.StringIO()
+        parser = SWOParser(None, TraceEventWriter(output))
+        parser.parse(SWO_DATA[:2])
+        assert output.getvalue() == ""
+        parser.flush()
+        assert output.getvalue() == "[0] ITM: port=0 data=0x41\n"
+
+class TestSWVReaderCapture:
+    def test_decode(self, capture_path):
+        session = mock.Mock()
+        session.target.cores = [mock.Mock()]
+        reader = SWVReader(session)
+        reader._parser = mock.Mock()
+        reader._capture = SWOCaptureFile.create(capture_path, 64)
+        reader._capture.write(SWO_DATA)
+        # The reader thread isn't running, so decoding stops when the capture is consumed.
+        reader._decode()
+        reader._parser.parse.assert_called_once_with(SWO_DATA)
+        reader._parser.flush.assert_called_once_with()
+        reader._capture.close()
+
+    def test_capture_does_not_hold_lock(self, capture_path):
+        session = mock.Mock()
+        session.target.cores = [mock.Mock()]
+        session.options.get.return_value = False
+        # The probe always has data, so the reader never sleeps.
+        session.probe.swo_read.return_value = SWO_DATA
+        lock = threading.RLock()
+        reader = SWVReader(session, lock=lock)
+        reader._capture = SWOCaptureFile.create(capture_path, 64)
+        reader.start()
+        try:
+            assert lock.acquire(timeout=1.0)
+            lock.release()
+        finally:
+            reader._shutdown_event.set()
+            reader.join(5.0)
+            reader._capture.close()
+        assert session.probe.swo_stop.called
+
+class TestSWODecodeSubcommand:
+    def run(self, argv):
+        tool = PyOCDTool()
+        return tool.run(argv)
+
+    def test_decode_capture(self, capture_path, tmp_path):
+        with SWOCaptureFile.create(capture_path, 8) as capture:
+            capture.write(b"\xff" * 8)
+            capture.write(SWO_DATA[:8])
+        output = tmp_path / "events.json"
+        assert self.run(['swo', 'decode', capture_path, '--format', 'json', '-o', str(output)]) == 0
+        events = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [e['type'] for e in events] == ['itm', 'itm']
+
+    def test_decode_raw(self, capture_path, capsys):
+        with open(capture_path, 'wb') as f:
+            f.write(SWO_DATA)
+        assert self.run(['swo', 'decode', capture_path]) == 0
+        assert "[5] ITM: port=0 data=0x41" in capsys.readouterr().out
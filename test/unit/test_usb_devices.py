@@ -0,0 +1,158 @@
+# pyOCD debugger
+# Copyright (c) 2026 Arm Limited
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib.util
+import pytest
+import sys
+from unittest.mock import Mock
+
+from pyocd.probe import usb_devices
+from pyocd.probe.usb_devices import USBDeviceEnumerator
+from pyocd.probe.aggregator import DebugProbeAggregator
+
+class FakeDevice:
+    def __init__(self, address, vid=0x0d28, pid=0x0204, serial="1234"):
+        self.bus = 1
+        self.address = address
+        self.port_numbers = (address,)
+        self.idVendor = vid
+        self.idProduct = pid
+        self._manufacturer = None
+        self._product = None
+        self._serial_number = None
+        self.serial_reads = 0
+        self._serial = serial
+
+    @property
+    def serial_number(self):
+        if self._serial_number is None:
+            self.serial_reads += 1
+            self._serial_number = self._serial
+        return self._serial_number
+
+class FakeBus:
+    def __init__(self, *addresses):
+        self.addresses = list(addresses)
+        self.enumerations = 0
+
+    def __call__(self, find_all=True):
+        self.enumerations += 1
+        return [FakeDevice(a) for a in self.addresses]
+
+@pytest.fixture(scope='function')
+def bus(monkeypatch):
+    fake_bus = FakeBus(2, 3)
+    monkeypatch.setattr('pyocd.probe.usb_devices.usb_find', fake_bus)
+    return fake_bus
+
+class TestUSBDeviceEnumerator:
+    def test_find(self, bus):
+        e = USBDeviceEnumerator()
+        devs = e.find(lambda d: d.address == 3)
+        assert [d.address for d in devs] == [3]
+        assert bus.enumerations == 1
+        e.find(lambda d: True)
+        assert bus.enumerations == 2
+
+    def test_scan_shares_enumeration(self, bus):
+        e = USBDeviceEnumerator()
+        with e.scan():
+            a = e.find(lambda d: True)
+            with e.scan():
+                b = e.find(lambda d: True)
+        assert bus.enumerations == 1
+        assert a[0] is b[0]
+        e.find(lambda d: True)
+        assert bus.enumerations == 2
+
+    def test_strings_cached(self, bus):
+        e = USBDeviceEnumerator()
+        dev, = e.find(lambda d: d.address == 2 and d.serial_number == "1234")
+        assert dev.serial_reads == 1
+        dev, = e.find(lambda d: d.address == 2 and d.serial_number == "1234")
+        assert dev.serial_reads == 0
+
+    def test_match_cached(self, bus):
+        e = USBDeviceEnumerator()
+        match = Mock(return_value=True)
+        assert len(e.find(match, cache_key='m')) == 2
+        assert len(e.find(match, cache_key='m')) == 2
+        assert match.call_count == 2
+
+    def test_skipped_match_not_cached(self, bus):
+        e = USBDeviceEnumerator()
+        def match(dev):
+            # Simulate a device that can't be opened yet.
+            if dev.address == 3:
+                e.skip_match_cache()
+            return dev.address == 2
+        match = Mock(side_effect=match)
+        e.find(match, cache_key='m')
+        e.find(match, cache_key='m')
+        assert [c.args[0].address for c in match.call_args_list] == [2, 3, 3]
+
+    def test_no_pyusb(self, monkeypatch):
+        # Load a separate copy of the module as if neither pyusb nor libusb_package is installed.
+        for name in ('usb', 'usb.core', 'libusb_package'):
+            monkeypatch.setitem(sys.modules, name, None)
+        spec = importlib.util.spec_from_file_location('usb_devices_copy', usb_devices.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        assert not module.IS_AVAILABLE
+        with pytest.raises(module.NoBackendError):
+            module.USBDeviceEnumerator().find(lambda d: True)
+
+    def test_hotplug_invalidates(self, bus):
+        e = USBDeviceEnumerator()
+        match = Mock(return_value=True)
+        e.find(match, cache_key='m')
+        e.find(lambda d: d.serial_number is not None)
+
+        # Device 3 is unplugged and reattached with a new address.
+        bus.addresses = [2, 4]
+        devs = e.find(match, cache_key='m')
+        assert [d.address for d in devs] == [2, 4]
+        assert match.call_count == 3
+        assert devs[0]._serial_number == "1234"
+        assert devs[1]._serial_number is None
+
+    def test_invalidate(self, bus):
+        e = USBDeviceEnumerator()
+        match = Mock(return_value=False)
+        e.find(match, cache_key='m')
+        e.invalidate()
+        e.find(match, cache_key='m')
+        assert match.call_count == 4
+
+class TestAggregatorQuery:
+    def test_order_preserved(self):
+        klasses = [Mock(n=i) for i in range(5)]
+        assert DebugProbeAggregator._query_classes(klasses, lambda cls: cls.n) == list(range(5))
+
+    def test_probe_with_id_stops_at_first_match(self):
+        klasses = [Mock(), Mock(), Mock()]
+        klasses[0].get_probe_with_id.return_value = None
+        klasses[1].get_probe_with_id.return_value = 'probe'
+        assert DebugProbeAggregator._find_probe_with_id(klasses, '1234', False) == 'probe'
+        assert not klasses[2].get_probe_with_id.called
+
+    def test_exception_propagates(self):
+        def fn(cls):
+            if cls.n == 1:
+                raise ValueError()
+            return cls.n
+        with pytest.raises(ValueError):
+            DebugProbeAggregator._query_classes([Mock(n=0), Mock(n=1)], fn)